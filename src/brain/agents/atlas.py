@@ -30,6 +30,7 @@ from src.brain.core.orchestration.context import shared_context
 from src.brain.core.orchestration.mode_router import ModeProfile, mode_router
 from src.brain.mcp.mcp_manager import mcp_manager
 from src.brain.memory import long_term_memory
+from src.brain.memory.file_index import workspace_files_context
 from src.brain.monitoring.logger import logger
 from src.brain.prompts import AgentPrompts
 from src.brain.prompts.atlas_chat import (
@@ -567,13 +568,27 @@ Respond in JSON:
                 logger.warning(f"[ATLAS] Tool discovery failed: {e}")
             return new_tools
 
+        async def get_files():
+            # Files named in the request, from the workspace file index. The first
+            # call waits for the initial scan; past the timeout it finishes in the
+            # background and later requests use it.
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(workspace_files_context(resolved_query)), timeout=2.0
+                )
+            except Exception:
+                return ""
+
         # Gather all context in parallel (chat, deep_chat, recall, status modes)
-        results = await asyncio.gather(
+        graph_ctx, vector_ctx, tools, files_ctx = await asyncio.gather(
             get_graph(),
             get_vector(),
             get_tools(),
+            get_files(),
         )
-        return cast("tuple[str, str, list[dict[str, Any]]]", tuple(results))
+        if files_ctx:
+            graph_ctx = f"{graph_ctx}\n{files_ctx}" if graph_ctx else files_ctx
+        return graph_ctx, vector_ctx, tools
 
     async def _get_solo_tools(
         self, mode_profile: ModeProfile | None = None
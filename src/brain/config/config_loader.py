@@ -20,24 +20,48 @@ except ImportError:  # pragma: no cover
 
     # type: ignore[reportAssignmentType]
 
-import re
+import logging
+import threading
+from collections.abc import Callable
 
 from src.brain.config import CONFIG_ROOT, MCP_DIR, PROJECT_ROOT, deep_merge
+from src.brain.config.config_runtime import (
+    ConfigSnapshot,
+    build_view,
+    compile_config,
+    substitute_placeholders,
+)
+
+logger = logging.getLogger("brain.config")
+
+Subscriber = Callable[[frozenset[str]], None]
 
 
 class SystemConfig:
-    """Singleton for system configuration with synchronization logic."""
+    """Singleton for system configuration with synchronization logic.
+
+    Lookups go through a compiled snapshot (see config_runtime); ``reload``
+    builds a new one and swaps it in, then notifies subscribers.
+    """
 
     _instance = None
     _config: dict[str, Any] = {}
+    _snapshot: ConfigSnapshot
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._sync_configs()
-            cls._instance._load_config()
+            cls._instance._init()
         return cls._instance
 
+    def _init(self):
+        self._subscribers: list[tuple[str | None, Subscriber]] = []
+        self._reload_lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._watch_stop = threading.Event()
+        self._sync_configs()
+        self._load_config()
+
     def _sync_configs(self):
         """Ensure global configuration directories exist.
         Config is read ONLY from global location (~/.config/atlastrinity/).
@@ -102,16 +126,124 @@ class SystemConfig:
 
     def _load_config(self):
         """Loads configuration exclusively from the global system folder."""
+        self._source_stamp = self._stamp()
         config_path = CONFIG_ROOT / "config.yaml"
         if not config_path.exists():
-            self._config = self._get_defaults()
+            self._install(self._get_defaults())
             return
         try:
             with open(config_path, encoding="utf-8") as f:
                 loaded = yaml.safe_load(f) or {}
-                self._config = deep_merge(self._get_defaults(), loaded)
+                self._install(deep_merge(self._get_defaults(), loaded))
         except Exception:
-            self._config = self._get_defaults()
+            self._install(self._get_defaults())
+
+    def _compile(self, raw: dict[str, Any]) -> ConfigSnapshot:
+        previous = getattr(self, "_snapshot", None)
+        return compile_config(
+            raw,
+            previous.generation + 1 if previous else 0,
+            inherited_model=lambda: self.get("models.reasoning") or self.get("models.default"),
+        )
+
+    def _install(self, raw: dict[str, Any], snapshot: ConfigSnapshot | None = None) -> None:
+        """Swap in the compiled ``raw`` as the current snapshot."""
+        # one attribute assignment: a reader sees either the old or the new snapshot
+        self._snapshot = snapshot or self._compile(raw)
+        self._config = raw
+
+    @staticmethod
+    def _stamp() -> tuple[tuple[int, int] | None, ...]:
+        """(mtime_ns, size) of the files the configuration is built from."""
+        stamps = []
+        for path in (CONFIG_ROOT / "config.yaml", PROJECT_ROOT / "config" / "config.yaml.template"):
+            try:
+                st = path.stat()
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def reload(self) -> frozenset[str]:
+        """Re-read config.yaml; swap in the new snapshot and notify subscribers.
+
+        Unlike the first load, a file that fails to parse keeps the current
+        configuration instead of falling back to the defaults.
+        Returns the dotted keys whose values changed.
+        """
+        with self._reload_lock:
+            self._source_stamp = self._stamp()
+            config_path = CONFIG_ROOT / "config.yaml"
+            try:
+                loaded = {}
+                if config_path.exists():
+                    with open(config_path, encoding="utf-8") as f:
+                        loaded = yaml.safe_load(f) or {}
+                raw = deep_merge(self._get_defaults(), loaded)
+            except Exception as e:
+                logger.warning(f"[CONFIG] Reload failed, keeping the current configuration: {e}")
+                return frozenset()
+            snapshot = self._compile(raw)
+            changed = self._snapshot.changed_keys(snapshot)
+            if not changed:
+                return changed
+            self._install(raw, snapshot)
+            subscribers = list(self._subscribers)
+        logger.info(f"[CONFIG] Reloaded: {len(changed)} keys changed")
+        for prefix, callback in subscribers:
+            relevant = (
+                changed
+                if prefix is None
+                else frozenset(k for k in changed if k == prefix or k.startswith(prefix + "."))
+            )
+            if relevant:
+                try:
+                    callback(relevant)
+                except Exception as e:
+                    logger.warning(f"[CONFIG] Subscriber {callback!r} failed: {e}")
+        return changed
+
+    def reload_if_changed(self) -> frozenset[str]:
+        """Reload when config.yaml or the template changed on disk since the last load."""
+        if self._stamp() == self._source_stamp:
+            return frozenset()
+        return self.reload()
+
+    def subscribe(self, callback: Subscriber, prefix: str | None = None) -> Callable[[], None]:
+        """Call ``callback(changed_keys)`` after a reload that changes keys under ``prefix``.
+
+        Returns a function that removes the subscription.
+        """
+        entry = (prefix, callback)
+        self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            if entry in self._subscribers:
+                self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Poll the configuration files and hot-reload on change (daemon thread)."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._watch_stop.clear()
+
+        def loop() -> None:
+            while not self._watch_stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    logger.warning(f"[CONFIG] Watcher error: {e}")
+
+        self._watcher = threading.Thread(target=loop, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._watch_stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
 
     def _get_defaults(self) -> dict[str, Any]:
         """Default configuration with fallback to environment variables."""
@@ -201,43 +333,22 @@ class SystemConfig:
 
     def _substitute_placeholders(self, value: Any) -> Any:
         """Substitute ${VAR} placeholders recursively in strings, lists, or dicts."""
-        if isinstance(value, str):
-
-            def replace_match(match):
-                var_name = match.group(1)
-                if var_name == "PROJECT_ROOT":
-                    return str(PROJECT_ROOT)
-                if var_name == "CONFIG_ROOT":
-                    return str(CONFIG_ROOT)
-                if var_name == "HOME":
-                    return str(Path.home())
-                # Fallback to environment variables
-                return os.getenv(var_name, match.group(0))
+        return substitute_placeholders(value)
 
-            return re.sub(r"\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}", replace_match, value)
-
-        if isinstance(value, list):
-            return [self._substitute_placeholders(item) for item in value]
-
-        if isinstance(value, dict):
-            return {k: self._substitute_placeholders(v) for k, v in value.items()}
+    def get(self, key_path: str, default: Any = None) -> Any:
+        return self._snapshot.get(key_path, default)
 
-        return value
+    def view[T](self, section: str, schema: type[T]) -> T:
+        """Typed, validated view of one section, e.g. ``view("orchestrator", OrchestratorSettings)``.
 
-    def get(self, key_path: str, default: Any = None) -> Any:
-        keys = key_path.split(".")
-        value = self._config
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-
-        # Custom logic for sequential thinking model inheritance
-        if key_path == "mcp.sequential_thinking.model" and not value:
-            return self.get("models.reasoning") or self.get("models.default")
-
-        return self._substitute_placeholders(value)
+        Built once per snapshot; a reload produces a new one.
+        """
+        snapshot = self._snapshot
+        key = (section, schema)
+        cached = snapshot._views.get(key)
+        if cached is None:
+            cached = snapshot._views[key] = build_view(section, schema, self.get(section, {}))
+        return cast("T", cached)
 
     def get_api_key(self, key_name: str) -> str:
         env_map = {
@@ -0,0 +1,244 @@
+"""AtlasTrinity Configuration Runtime
+
+Compiles the merged configuration into a frozen snapshot so ``config.get``
+is a single dictionary lookup instead of a dotted-path walk plus a
+placeholder substitution on every call:
+- every reachable dotted key is materialized once, with ${PROJECT_ROOT} and
+  ${CONFIG_ROOT} already substituted
+- dicts and lists are returned as fresh copies, as before, so callers may
+  still mutate what they get
+- values that reference the environment (${HOME} or any other variable) are
+  resolved on access, so they follow the process environment exactly as
+  the uncompiled lookup did
+- typed views: frozen dataclasses built from one config section, checked
+  against the field types, cached per snapshot
+"""
+
+import logging
+import os
+import re
+import types
+import typing
+from collections.abc import Callable, Mapping
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
+from pathlib import Path
+from typing import Any
+
+from src.brain.config import CONFIG_ROOT, PROJECT_ROOT
+
+logger = logging.getLogger("brain.config")
+
+PLACEHOLDER = re.compile(r"\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+STATIC_PLACEHOLDERS = {"PROJECT_ROOT": str(PROJECT_ROOT), "CONFIG_ROOT": str(CONFIG_ROOT)}
+INHERITED_MODEL_KEY = "mcp.sequential_thinking.model"
+
+
+def substitute_placeholders(value: Any) -> Any:
+    """Substitute ${VAR} placeholders recursively in strings, lists, or dicts."""
+    if isinstance(value, str):
+
+        def replace_match(match):
+            var_name = match.group(1)
+            if var_name in STATIC_PLACEHOLDERS:
+                return STATIC_PLACEHOLDERS[var_name]
+            if var_name == "HOME":
+                return str(Path.home())
+            # Fallback to environment variables
+            return os.getenv(var_name, match.group(0))
+
+        return PLACEHOLDER.sub(replace_match, value)
+
+    if isinstance(value, list):
+        return [substitute_placeholders(item) for item in value]
+
+    if isinstance(value, dict):
+        return {k: substitute_placeholders(v) for k, v in value.items()}
+
+    return value
+
+
+def _copy(value: Any) -> Any:
+    """Fresh dicts and lists all the way down; other values are shared."""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+class _Deferred:
+    """A stored value that is produced on access: ``resolve(default)``."""
+
+    __slots__ = ("payload", "resolve")
+
+    def __init__(self, resolve: Callable[[Any], Any], payload: Any = None):
+        self.resolve = resolve
+        self.payload = payload
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, _Deferred)
+            and self.resolve.__name__ == other.resolve.__name__
+            and self.payload == other.payload
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+_MISSING = _Deferred(lambda default: default)
+
+
+def _compile(value: Any) -> tuple[Any, bool]:
+    """(value with static placeholders substituted, whether it depends on the environment)."""
+    if isinstance(value, str):
+        names = PLACEHOLDER.findall(value)
+        if not names:
+            return value, False
+        if any(name not in STATIC_PLACEHOLDERS for name in names):
+            return value, True
+        return PLACEHOLDER.sub(lambda m: STATIC_PLACEHOLDERS[m.group(1)], value), False
+    if isinstance(value, list):
+        items = [_compile(item) for item in value]
+        return [item for item, _ in items], any(live for _, live in items)
+    if isinstance(value, dict):
+        entries = {k: _compile(v) for k, v in value.items()}
+        return {k: v for k, (v, _) in entries.items()}, any(live for _, live in entries.values())
+    return value, False
+
+
+def _stored(raw: Any, compiled: Any, live: bool) -> Any:
+    if live:
+
+        def substituted(default: Any) -> Any:
+            return substitute_placeholders(raw)
+
+        return _Deferred(substituted, raw)
+    if isinstance(compiled, dict | list):
+
+        def copied(default: Any) -> Any:
+            return _copy(compiled)
+
+        return _Deferred(copied, compiled)
+    return compiled
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One compiled configuration; replaced as a whole on reload."""
+
+    raw: dict[str, Any]
+    values: Mapping[str, Any]  # dotted key -> value or _Deferred
+    generation: int = 0
+    _views: dict[Any, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def get(self, key_path: str, default: Any = None) -> Any:
+        value = self.values.get(key_path, _MISSING)
+        if value.__class__ is _Deferred:
+            return value.resolve(default)
+        return value
+
+    def changed_keys(self, other: "ConfigSnapshot") -> frozenset[str]:
+        """Dotted keys whose value differs between the two snapshots."""
+        return frozenset(
+            key
+            for key in self.values.keys() | other.values.keys()
+            if self.values.get(key, _MISSING) != other.values.get(key, _MISSING)
+        )
+
+
+def compile_config(
+    raw: dict[str, Any], generation: int = 0, *, inherited_model: Callable[[], Any] | None = None
+) -> ConfigSnapshot:
+    """Flatten ``raw`` into every dotted key ``get`` can reach.
+
+    ``inherited_model`` supplies ``mcp.sequential_thinking.model`` when that
+    key is present but empty (it falls back to the reasoning/default model).
+    """
+    values: dict[str, Any] = {}
+
+    def walk(node: dict[Any, Any], prefix: str | None) -> None:
+        for key, raw_value in node.items():
+            # a key containing "." (or a non-string key) is not reachable by a dotted path
+            if not isinstance(key, str) or "." in key:
+                continue
+            path = key if prefix is None else f"{prefix}.{key}"
+            values[path] = _stored(raw_value, *_compile(raw_value))
+            if isinstance(raw_value, dict):
+                walk(raw_value, path)
+
+    walk(raw, None)
+    if INHERITED_MODEL_KEY in values and inherited_model is not None:
+        section = raw.get("mcp", {}).get("sequential_thinking", {})
+        if not section.get("model"):
+
+            def inherited(default: Any) -> Any:
+                return inherited_model()
+
+            values[INHERITED_MODEL_KEY] = _Deferred(inherited)
+    return ConfigSnapshot(raw=raw, values=types.MappingProxyType(values), generation=generation)
+
+
+# --- Typed views ---
+
+
+def _accepts(value: Any, annotation: Any) -> tuple[bool, Any]:
+    """(value fits the annotation, value converted where that is lossless: int -> float)."""
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        for option in typing.get_args(annotation):
+            ok, converted = _accepts(value, option)
+            if ok:
+                return True, converted
+        return False, value
+    if annotation is Any:
+        return True, value
+    if annotation is type(None):
+        return value is None, value
+    target = origin or annotation
+    if target is float and isinstance(value, int) and not isinstance(value, bool):
+        return True, float(value)
+    if target is int and isinstance(value, bool):
+        return False, value
+    if isinstance(target, type):
+        return isinstance(value, target), value
+    return True, value
+
+
+def build_view[T](section: str, schema: type[T], data: Any) -> T:
+    """An instance of the dataclass ``schema`` from one config section.
+
+    Missing keys take the field default; values of the wrong type are logged
+    and replaced by the default; keys the schema does not declare are ignored.
+    """
+    if not is_dataclass(schema):
+        raise TypeError(f"{schema!r} is not a dataclass")
+    data = data if isinstance(data, dict) else {}
+    hints = typing.get_type_hints(schema)
+    kwargs = {}
+    for f in fields(schema):
+        if f.name not in data:
+            continue
+        ok, value = _accepts(data[f.name], hints[f.name])
+        if ok:
+            kwargs[f.name] = value
+        elif f.default is not MISSING or f.default_factory is not MISSING:
+            logger.warning(
+                f"[CONFIG] {section}.{f.name}: expected {hints[f.name]}, "
+                f"got {type(data[f.name]).__name__}; using the default"
+            )
+        else:
+            raise ValueError(f"{section}.{f.name}: expected {hints[f.name]}, got {data[f.name]!r}")
+    return schema(**kwargs)
+
+
+@dataclass(frozen=True)
+class OrchestratorSettings:
+    """Typed view of the ``orchestrator`` section."""
+
+    max_recursion_depth: int = 5
+    task_timeout: float = 1200.0
+    subtask_timeout: float = 120.0
+    user_input_timeout: float = 12.0
+    recovery_voice_agent: str = "atlas"
+    validate_failed_steps_with_grisha: bool = False
+    state_buffers: dict[str, int] = field(default_factory=dict)
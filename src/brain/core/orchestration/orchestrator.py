@@ -38,10 +38,12 @@ from src.brain.agents.tetyana import StepResult
 from src.brain.behavior.behavior_engine import behavior_engine, workflow_engine
 from src.brain.config import IS_MACOS, PLATFORM_NAME
 from src.brain.config.config_loader import config
+from src.brain.config.config_runtime import OrchestratorSettings
 from src.brain.core.orchestration.context import shared_context
 from src.brain.core.orchestration.error_router import error_router
 from src.brain.core.server.message_bus import AgentMsg, MessageType, message_bus
 from src.brain.core.services.state_manager import state_manager
+from src.brain.core.services.state_store import state_store, stream_total
 from src.brain.healing.parallel_healing import parallel_healing_manager
 from src.brain.mcp.mcp_manager import mcp_manager
 from src.brain.memory import long_term_memory
@@ -81,6 +83,9 @@ class TrinityState(TypedDict):
     system_state: str
     current_plan: Any | None
     step_results: list[dict[str, Any]]
+    # Outcomes kept apart from the bounded step_results buffer (see _record_step_outcome)
+    completed_steps: list[str]
+    step_rejections: dict[str, int]
     error: str | None
     logs: list[dict[str, Any]]
     session_id: str | None
@@ -125,11 +130,27 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
 
         mcp_manager.register_log_callback(self._mcp_log_voice_callback)
 
+    @property
+    def state(self) -> dict[str, Any]:
+        return self._state
+
+    @state.setter
+    def state(self, value: dict[str, Any]) -> None:
+        # Logs, messages and step results live in bounded ring buffers; older
+        # entries spill to disk and stay reachable via state_store.page()
+        self._state = state_store.bind(
+            value, getattr(self, "current_session_id", "current_session")
+        )
+
     async def initialize(self):
         """Async initialization of system components via Config-Driven Workflow"""
         # Синхронізація shared_context з конфігурацією
 
         shared_context.sync_from_config(config.all)
+        if getattr(self, "_config_unsubscribe", None) is None:
+            self._config_unsubscribe = config.subscribe(
+                lambda _changed: shared_context.sync_from_config(config.all), prefix="orchestrator"
+            )
 
         # Execute 'startup' workflow from behavior config
         # This replaces hardcoded service checks and state init
@@ -262,7 +283,10 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             await state_manager.clear_session(self.current_session_id)
 
         # Create a new unique session ID
+        previous_session_id = self.current_session_id
         self.current_session_id = str(uuid.uuid4())
+        state_store.release(previous_session_id)
+        state_store.bind(self.state, self.current_session_id)
 
         await self._log(f"Нова сесія розпочата ({self.current_session_id})", "system")
         return {"status": "success", "session_id": self.current_session_id}
@@ -274,8 +298,10 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
 
         saved_state = await state_manager.restore_session(session_id)
         if saved_state:
-            self.state = saved_state
+            if self.current_session_id != session_id:
+                state_manager.release_session(self.current_session_id)
             self.current_session_id = session_id
+            self.state = saved_state
             await self._log(f"Сесія {session_id} відновлена з пам'яті", "system")
             return {"status": "success"}
 
@@ -338,6 +364,9 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                     )
 
                 # Initial Fresh State
+                if self.current_session_id != session_id:
+                    state_manager.release_session(self.current_session_id)
+                self.current_session_id = session_id
                 self.state = {
                     "messages": reconstructed_messages,
                     "system_state": SystemState.IDLE.value,
@@ -347,7 +376,6 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                     "logs": reconstructed_logs,
                     "_theme": db_sess_obj.metadata_blob.get("theme", "Restored Session"),
                 }
-                self.current_session_id = session_id
                 await self._log(f"Сесія {session_id} відновлена з бази даних", "system")
                 return {"status": "success"}
 
@@ -553,7 +581,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
         if db_manager.available:
             async with self._log_lock:
                 try:
-                    async with await db_manager.get_session() as session:
+                    async with db_manager.write_session() as session:
                         entry = DBLog(
                             session_id=self.current_session_id,
                             level=type.upper(),
@@ -578,6 +606,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             }
             if "logs" not in self.state:
                 self.state["logs"] = []
+                state_store.bind(self.state, self.current_session_id)
             self.state["logs"].append(log_entry)
 
             # 3. Publish to Redis for real-time UI updates
@@ -618,7 +647,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             return
 
         try:
-            async with await db_manager.get_session() as session:
+            async with db_manager.write_session() as session:
                 msg = DBChatMessage(
                     session_id=self.current_session_id,
                     role=role,
@@ -658,8 +687,8 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
 
                 saved_state = await state_manager.restore_session(session_id)
                 if saved_state:
-                    self.state = saved_state
                     self.current_session_id = session_id
+                    self.state = saved_state
 
                     if state_manager.redis_client:
                         await state_manager.redis_client.delete(restart_key)
@@ -696,7 +725,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                 "current_goal": shared_context.current_goal,
             }
 
-            async with await db_manager.get_session() as db_sess:
+            async with db_manager.write_session() as db_sess:
                 task_id = self.state.get("db_task_id")
                 if task_id and isinstance(task_id, str):
                     await db_sess.execute(
@@ -793,7 +822,10 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
 
         msg_list = self.state.get("messages")
         if isinstance(msg_list, list):
-            for m in msg_list:
+            # Walk newest-first and stop at the UI window so cost doesn't grow with history
+            for m in reversed(msg_list):
+                if len(messages) >= 50:
+                    break
                 # Support both LangChain objects and plain dicts (from Redis serialization)
                 m_type = ""
                 if hasattr(m, "type"):
@@ -868,12 +900,14 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                         },
                     )
 
+        messages.reverse()
+
         return {
             "system_state": sys_state,
             "current_task": task_summary,
             "active_agent": active_agent,
             "session_id": self.current_session_id,
-            "messages": messages[-50:],
+            "messages": messages,
             "logs": (self.state.get("logs") or [])[-100:],
             "step_results": self.state.get("step_results") or [],
             "metrics": metrics_collector.get_metrics(),
@@ -901,7 +935,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             try:
                 plan = await asyncio.wait_for(
                     planning_task,
-                    timeout=config.get("orchestrator", {}).get("task_timeout", 1200.0),
+                    timeout=config.view("orchestrator", OrchestratorSettings).task_timeout,
                 )
             finally:
                 logger_task.cancel()
@@ -1004,7 +1038,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             ):
                 return
 
-            async with await db_manager.get_session() as db_sess:
+            async with db_manager.write_session() as db_sess:
                 new_task = DBTask(
                     session_id=self.state["db_session_id"],
                     goal=user_request,
@@ -1020,11 +1054,12 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                 await db_sess.commit()
                 self.state["db_task_id"] = str(new_task.id)
 
-                await knowledge_graph.add_node(
-                    node_type="TASK",
-                    node_id=f"task:{new_task.id}",
-                    attributes={"goal": user_request, "steps_count": len(plan.steps)},
-                )
+            # Outside the writer session: the graph takes its own write slot.
+            await knowledge_graph.add_node(
+                node_type="TASK",
+                node_id=f"task:{new_task.id}",
+                attributes={"goal": user_request, "steps_count": len(plan.steps)},
+            )
         except Exception as e:
             logger.error(f"DB Task creation failed: {e}")
 
@@ -1076,6 +1111,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             self.current_session_id = session_id
         else:
             self.state["session_id"] = session_id
+        state_store.bind(self.state, self.current_session_id)
 
         if not self.state.get("_theme"):
             self.state["_theme"] = user_request[:40] + ("..." if len(user_request) > 40 else "")
@@ -1111,7 +1147,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                 and getattr(db_manager, "available", False)
                 and "db_session_id" not in self.state
             ):
-                async with await db_manager.get_session() as db_sess:
+                async with db_manager.write_session() as db_sess:
                     # Use existing session_id if available (and valid UUID), otherwise create new
                     s_id = uuid.uuid4()
                     if session_id and session_id != "current_session":
@@ -1305,13 +1341,19 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             return {"status": "completed", "result": "No plan generated.", "type": "chat"}
 
         self.state["system_state"] = SystemState.EXECUTING.value
+        # Task boundaries for the trace analyzer (devtools_analyze_trace)
+        logger.info(
+            f"[ORCHESTRATOR] Task started: {len(plan.steps or [])} steps: {user_request[:120]}"
+        )
         try:
             if plan and plan.steps:
                 await self._execute_steps_recursive(plan.steps)
         except Exception as e:
             await self._log(f"Execution error: {e}", "error")
+            logger.info("[ORCHESTRATOR] Task finished: error")
             self.active_task = None
             return {"status": "error", "error": str(e)}
+        logger.info("[ORCHESTRATOR] Task finished: ok")
 
         is_subtask = getattr(self, "_in_subtask", False)
         msgs = self.state.get("messages", [])
@@ -1414,14 +1456,12 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
         plan = await self._planning_loop(segment_analysis, segment.text, is_subtask, history)
 
         if plan and plan.steps:
-            step_results = self.state.get("step_results")
-            steps_before = len(step_results) if isinstance(step_results, list) else 0
+            steps_before = stream_total(self.state.get("step_results"))
             await self._create_db_task(segment.text, plan)
             await self._execute_steps_recursive(plan.steps)
 
             # Evaluate this segment immediately for better feedback
-            all_results = self.state.get("step_results")
-            current_results = all_results[steps_before:] if isinstance(all_results, list) else []
+            current_results = self._step_results_since(steps_before)
 
             evaluation = await self._evaluate_and_remember(
                 segment.text,
@@ -1560,7 +1600,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
     async def _mark_db_golden_path(self):
         """Mark task as golden path in DB."""
 
-        async with await db_manager.get_session() as db_sess:
+        async with db_manager.write_session() as db_sess:
             task_id = self.state.get("db_task_id")
             if task_id and isinstance(task_id, str):
                 await db_sess.execute(
@@ -1615,7 +1655,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             # B. Store in Structured DB
             try:
                 if db_manager and getattr(db_manager, "available", False):
-                    async with await db_manager.get_session() as db_sess:
+                    async with db_manager.write_session() as db_sess:
                         new_summary = DBConvSummary(
                             session_id=session_id,
                             summary=summary,
@@ -1740,7 +1780,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             if not (db_manager and getattr(db_manager, "available", False)):
                 return None
 
-            async with await db_manager.get_session() as db_sess:
+            async with db_manager.write_session() as db_sess:
                 if attempt_id:
                     rec = await db_sess.get(RecoveryAttempt, attempt_id)
                     if rec:
@@ -2059,11 +2099,31 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
 
     def _is_step_already_completed(self, step_id: str) -> bool:
         """Check if a step has already been successfully completed."""
-        step_results = self.state.get("step_results") or []
-        return any(
-            isinstance(res, dict) and str(res.get("step_id")) == str(step_id) and res.get("success")
-            for res in step_results
+        return str(step_id) in (self.state.get("completed_steps") or [])
+
+    def _step_results_since(self, start: int) -> list[Any]:
+        """Step results appended after the ``start``-th one (spilled entries included)."""
+        results = self.state.get("step_results")
+        if not isinstance(results, list):
+            return []
+        total = stream_total(results)
+        evicted = total - len(results)
+        if start >= evicted:
+            return results[start - evicted :]
+        page = state_store.page(
+            self.current_session_id, "step_results", offset=start, limit=total - start
         )
+        return page["items"]
+
+    def _record_step_outcome(self, step_id: str, result: StepResult) -> None:
+        """Track completions and Grisha rejections outside the bounded results buffer."""
+        if result.success:
+            completed = self.state.setdefault("completed_steps", [])
+            if step_id not in completed:
+                completed.append(step_id)
+        elif "rejected" in str(result.error or ""):
+            rejections = self.state.setdefault("step_rejections", {})
+            rejections[step_id] = rejections.get(step_id, 0) + 1
 
     async def _execute_step_attempt(
         self,
@@ -2074,7 +2134,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
     ) -> StepResult | None:
         """Execute a single attempt of a step with timeout handling."""
         try:
-            timeout = float(config.get("orchestrator", {}).get("task_timeout", 1200.0))
+            timeout = config.view("orchestrator", OrchestratorSettings).task_timeout
             return await asyncio.wait_for(
                 self.execute_node(
                     cast("TrinityState", self.state),
@@ -2228,7 +2288,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
         self, step: dict[str, Any], step_id: str, step_result: StepResult | None, last_error: str
     ) -> bool:
         """Consult Grisha for a second opinion on a failed step."""
-        if not config.get("orchestrator", {}).get("validate_failed_steps_with_grisha", False):
+        if not config.view("orchestrator", OrchestratorSettings).validate_failed_steps_with_grisha:
             return False
 
         try:
@@ -2251,7 +2311,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                 await self._log(f"Grisha verified step {step_id} despite failure.", "orchestrator")
                 return True
 
-            recovery_agent = config.get("orchestrator", {}).get("recovery_voice_agent", "atlas")
+            recovery_agent = config.view("orchestrator", OrchestratorSettings).recovery_voice_agent
             await self._speak(
                 recovery_agent, verify_result.voice_message or "Крок потребує відновлення."
             )
@@ -2267,7 +2327,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
     ) -> bool:
         """Standard Atlas help as ultimate fallback."""
         try:
-            recovery_agent = config.get("orchestrator", {}).get("recovery_voice_agent", "atlas")
+            recovery_agent = config.view("orchestrator", OrchestratorSettings).recovery_voice_agent
             await self._log(
                 f"Recovery for Step {step_id} (announced by {recovery_agent})...", "orchestrator"
             )
@@ -2507,8 +2567,8 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
 
             self._last_constraint_check_time = now
             monitor_logs = await self._get_recent_logs(20)
-            state_logs = [l for l in (self.state.get("logs", []) or []) if isinstance(l, dict)][
-                -20:
+            state_logs = [
+                l for l in (self.state.get("logs", []) or [])[-20:] if isinstance(l, dict)
             ]
             asyncio.create_task(constraint_monitor.check_compliance(monitor_logs, state_logs))
         except Exception as cm_err:
@@ -2550,7 +2610,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                 and getattr(db_manager, "available", False)
                 and self.state.get("db_task_id")
             ):
-                async with await db_manager.get_session() as db_sess:
+                async with db_manager.write_session() as db_sess:
                     new_step = DBStep(
                         task_id=self.state["db_task_id"],
                         sequence_number=str(step_id),
@@ -2586,15 +2646,9 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             if isinstance(plan_steps, list):
                 for s in plan_steps:
                     s_dict = s if isinstance(s, dict) else {}
-                    step_results = self.state.get("step_results") or []
                     status = (
                         "DONE"
-                        if any(
-                            isinstance(res, dict)
-                            and str(res.get("step_id")) == str(s_dict.get("id"))
-                            and res.get("success")
-                            for res in step_results
-                        )
+                        if self._is_step_already_completed(str(s_dict.get("id")))
                         else "PENDING"
                     )
                     step_list.append(
@@ -2734,7 +2788,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             await self._speak("tetyana", result.voice_message)
             result.voice_message = None  # Clear it so it won't be spoken again
 
-        timeout_val = float(config.get("orchestrator.user_input_timeout", 12.0))
+        timeout_val = config.view("orchestrator", OrchestratorSettings).user_input_timeout
         await self._log(
             f"User input needed for step {step_id}. Waiting {timeout_val} seconds...",
             "orchestrator",
@@ -2746,16 +2800,14 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
         # Wait for user message on the bus or timeout
         user_response = None
         try:
-            start_wait = asyncio.get_event_loop().time()
-            while asyncio.get_event_loop().time() - start_wait < timeout_val:
-                bus_msgs = await message_bus.receive("orchestrator", mark_read=True)
-                for m in bus_msgs:
-                    if m.message_type == MessageType.CHAT and m.from_agent == "USER":
-                        user_response = m.payload.get("text")
-                        break
-                if user_response:
-                    break
-                await asyncio.sleep(0.5)
+            user_msg = await message_bus.wait_for(
+                "orchestrator",
+                MessageType.CHAT,
+                timeout=timeout_val,
+                predicate=lambda m: m.from_agent == "USER",
+            )
+            if user_msg:
+                user_response = user_msg.payload.get("text")
 
         except Exception as wait_err:
             logger.warning(f"Error during user wait: {wait_err}")
@@ -2839,7 +2891,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
         """Log tool execution to DB for Grisha's audit."""
         try:
             if db_manager and getattr(db_manager, "available", False) and db_step_id:
-                async with await db_manager.get_session() as db_sess:
+                async with db_manager.write_session() as db_sess:
                     tool_call_data = result.tool_call or {}
                     tool_exec = DBToolExecution(
                         step_id=db_step_id,
@@ -2944,7 +2996,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             if db_manager and getattr(db_manager, "available", False) and db_step_id:
                 try:
                     duration_ms = int((asyncio.get_event_loop().time() - step_start_time) * 1000)
-                    async with await db_manager.get_session() as db_sess:
+                    async with db_manager.write_session() as db_sess:
                         # Ensure db_step_id is a valid UUID string
                         target_step_id = (
                             uuid.UUID(db_step_id) if isinstance(db_step_id, str) else db_step_id
@@ -2995,16 +3047,9 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
 
             if not verify_result.verified:
                 # Add check for verification attempts to avoid infinite loops
-                # (Simple heuristic using step results)
-                rejections = [
-                    res
-                    for res in (self.state.get("step_results") or [])
-                    if isinstance(res, dict)
-                    and res.get("step_id") == step_id
-                    and "rejected" in str(res.get("error", ""))
-                ]
-
-                if len(rejections) >= 3:
+                rejections = (self.state.get("step_rejections") or {}).get(str(step_id), 0)
+
+                if rejections >= 3:
                     await self._log(
                         f"Verification for step {step_id} failed multiple times. Escalating.",
                         "error",
@@ -3128,6 +3173,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
                 "error": result.error,
             },
         )
+        self._record_step_outcome(str(result.step_id), result)
 
         # Extract and store critical discoveries
         if result.success and result.result:
@@ -3297,7 +3343,7 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
         if state.get("current_plan") and not state.get("error"):
             # Simple check: if all steps have results, it might be completed
             plan = state["current_plan"]
-            if isinstance(plan, list) and len(plan) == len(state.get("step_results", [])):
+            if isinstance(plan, list) and len(plan) == stream_total(state.get("step_results")):
                 context["task_completed"] = True
                 context["needs_verification"] = True  # Default to verify before ending
 
@@ -3311,6 +3357,16 @@ class Trinity(TourMixin, VoiceOrchestrationMixin):
             await mcp_manager.shutdown()
         except Exception:
             pass
+        try:
+            # Write-behind rows still queued in the bus need the database
+            await message_bus.close()
+        except Exception as e:
+            logger.warning(f"[ORCHESTRATOR] Message bus flush failed: {e}")
+        try:
+            # Evicted state entries short of a full segment are still in memory
+            state_store.spill.close()
+        except Exception as e:
+            logger.warning(f"[ORCHESTRATOR] State spill flush failed: {e}")
         try:
             await db_manager.close()
         except Exception:
@@ -1,5 +1,7 @@
 import asyncio
+import hashlib
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, cast
@@ -684,17 +686,35 @@ class ToolDispatcher:
             self._macos_use_calls += 1
 
         logger.info(f"[DISPATCHER] Calling {server}.{tool}")
+        started = time.perf_counter()
         try:
             result = await self.mcp_manager.call_tool(server, tool, args)
-            return self._process_mcp_result(server, tool, args, result)
+            result = self._process_mcp_result(server, tool, args, result)
         except Exception as e:
             logger.error(f"[DISPATCHER] MCP call failed: {e}")
-            return {
+            result = {
                 "success": False,
                 "error": f"MCP call failed: {e!s}",
                 "server": server,
                 "tool": tool,
             }
+        self._log_call_finished(server, tool, args, result, started)
+        return result
+
+    def _log_call_finished(
+        self, server: str, tool: str, args: dict[str, Any], result: Any, started: float
+    ) -> None:
+        """One machine-readable line per call for the trace analyzer (devtools_analyze_trace)."""
+        status = "error" if isinstance(result, dict) and result.get("success") is False else "ok"
+        try:
+            encoded = json.dumps(args, sort_keys=True, default=str).encode()
+        except (TypeError, ValueError):
+            encoded = repr(args).encode()
+        logger.info(
+            f"[DISPATCHER] Finished {server}.{tool} status={status} "
+            f"duration_ms={(time.perf_counter() - started) * 1000:.1f} "
+            f"args={hashlib.blake2b(encoded, digest_size=6).hexdigest()}"
+        )
 
     def _process_mcp_result(
         self, server: str, tool: str, args: dict[str, Any], result: Any
@@ -4,12 +4,16 @@ Typed inter-agent communication system with DB persistence.
 Provides reliable message passing between Atlas, Tetyana, and Grisha.
 """
 
+import asyncio
 import logging
+import time
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from src.brain.memory.db.manager import db_manager
 
@@ -52,6 +56,7 @@ class AgentMsg:
     message_id: UUID | None = None
     timestamp: datetime = field(default_factory=datetime.now)
     read_at: datetime | None = None
+    ttl_seconds: float | None = None  # None -> bus default
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for DB storage"""
@@ -66,24 +71,124 @@ class AgentMsg:
         }
 
 
+class _Entry:
+    """Queue slot shared by the recipient and type indexes (lazy deletion)."""
+
+    __slots__ = ("consumed", "expires_at", "msg", "queue")
+
+    def __init__(self, msg: AgentMsg, queue: str, expires_at: float):
+        self.msg = msg
+        self.queue = queue
+        self.expires_at = expires_at
+        self.consumed = False
+
+
+class _PersistenceBatcher:
+    """Write-behind persistence: messages are committed in batches off the send path."""
+
+    def __init__(self, batch_size: int = 200, flush_interval: float = 0.25):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: list[AgentMsg] = []
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.stats = {"db_writes": 0, "rows_persisted": 0, "failed_rows": 0}
+
+    def submit(self, msg: AgentMsg) -> None:
+        self._pending.append(msg)
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._pending:
+            if self._wakeup is not None and len(self._pending) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            await self._write(batch)
+
+    async def _write(self, batch: list[AgentMsg]) -> None:
+        try:
+            await self._insert(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                self.stats["failed_rows"] += 1
+                logger.warning(
+                    f"[MESSAGE_BUS] DB persist failed for message {batch[0].message_id}: {e}"
+                )
+                return
+            # One bad row (e.g. an unknown session_id) must not cost the whole batch
+            logger.debug(f"[MESSAGE_BUS] Batch of {len(batch)} failed, retrying row by row: {e}")
+            for msg in batch:
+                await self._write([msg])
+            return
+        self.stats["db_writes"] += 1
+        self.stats["rows_persisted"] += len(batch)
+
+    async def _insert(self, batch: list[AgentMsg]) -> None:
+        from src.brain.memory.db.schema import AgentMessage
+
+        async with db_manager.write_session() as session:
+            session.add_all(
+                [
+                    AgentMessage(
+                        id=msg.message_id,
+                        session_id=msg.session_id,
+                        from_agent=msg.from_agent,
+                        to_agent=msg.to_agent,
+                        message_type=msg.message_type.value,
+                        step_id=msg.step_id,
+                        payload=msg.payload,
+                        read_at=msg.read_at,
+                    )
+                    for msg in batch
+                ]
+            )
+            await session.commit()
+
+    async def close(self) -> None:
+        # Let an in-flight batch finish instead of cancelling it mid-commit
+        if self._task is not None and not self._task.done():
+            if self._wakeup is not None:
+                self._wakeup.set()
+            await self._task
+        await self.flush()
+        self._task = None
+
+
 class MessageBus:
     """Typed inter-agent communication bus with optional DB persistence.
 
     Features:
     - Typed messages with MessageType enum
-    - In-memory queue for fast access
-    - Optional DB persistence for recovery
-    - Read tracking for message acknowledgment
+    - Per-recipient and per-(recipient, type) deque indexes
+    - O(1) consumption / acknowledgement with lazy deletion
+    - TTL expiry of undelivered messages
+    - Async waiters (wait_for) instead of polling
+    - Write-behind, batched DB persistence
     """
 
-    def __init__(self) -> None:
-        self._queue: dict[str, list[AgentMsg]] = {
-            "atlas": [],
-            "tetyana": [],
-            "grisha": [],
-            "orchestrator": [],
-            "all": [],
-        }
+    RECIPIENTS = ("atlas", "tetyana", "grisha", "orchestrator", "all")
+
+    def __init__(self, default_ttl: float = 3600.0) -> None:
+        self.default_ttl = default_ttl
+        self._queues: dict[str, deque[_Entry]] = {name: deque() for name in self.RECIPIENTS}
+        self._by_type: dict[tuple[str, MessageType], deque[_Entry]] = {}
+        self._by_id: dict[UUID, _Entry] = {}
+        self._pending: dict[str, int] = dict.fromkeys(self.RECIPIENTS, 0)
+        self._waiters: dict[str, list[tuple[Callable[[AgentMsg], bool], asyncio.Future]]] = {}
+        self._batcher = _PersistenceBatcher()
         self._db_available = False
         self._init_db()
 
@@ -99,6 +204,48 @@ class MessageBus:
             logger.warning(f"[MESSAGE_BUS] DB not available: {e}")
             self._db_available = False
 
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"pending": sum(self._pending.values()), **self._batcher.stats}
+
+    def _consume(self, entry: _Entry, now: datetime | None, mark_read: bool) -> None:
+        if not mark_read or entry.consumed:
+            return
+        entry.consumed = True
+        entry.msg.read_at = now or datetime.now()
+        self._pending[entry.queue] -= 1
+        if entry.msg.message_id is not None:
+            self._by_id.pop(entry.msg.message_id, None)
+
+    def _compact(self, index: deque[_Entry], now: float) -> None:
+        """Drop consumed/expired entries from the head of an index."""
+        while index and (index[0].consumed or index[0].expires_at <= now):
+            entry = index.popleft()
+            if not entry.consumed:
+                self._expire(entry)
+
+    def _expire(self, entry: _Entry) -> None:
+        entry.consumed = True
+        self._pending[entry.queue] -= 1
+        if entry.msg.message_id is not None:
+            self._by_id.pop(entry.msg.message_id, None)
+
+    def _deliver_to_waiter(self, target: str, msg: AgentMsg) -> bool:
+        names = list(self._waiters) if target == "all" else [target]
+        for name in names:
+            waiters = self._waiters.get(name)
+            if not waiters:
+                continue
+            for i, (predicate, future) in enumerate(waiters):
+                if future.done():
+                    continue
+                if predicate(msg):
+                    del waiters[i]
+                    msg.read_at = datetime.now()
+                    future.set_result(msg)
+                    return True
+        return False
+
     async def send(self, msg: AgentMsg) -> bool:
         """Send message to target agent.
 
@@ -110,27 +257,72 @@ class MessageBus:
 
         """
         try:
-            # Add to in-memory queue
+            if msg.message_id is None:
+                msg.message_id = uuid4()
+
             target = msg.to_agent.lower()
-            if target in self._queue:
-                self._queue[target].append(msg)
-            else:
-                self._queue["all"].append(msg)
+            if target not in self._queues:
+                target = "all"
 
             logger.info(
                 f"[MESSAGE_BUS] {msg.from_agent} -> {msg.to_agent}: "
                 f"{msg.message_type.value} (step={msg.step_id})",
             )
 
-            # Persist to DB if available
+            # Persist to DB if available (write-behind, batched)
             if self._db_available:
-                await self._persist_message(msg)
-
+                self._batcher.submit(msg)
+
+            # A blocked wait_for() takes the message directly
+            if self._deliver_to_waiter(target, msg):
+                return True
+
+            ttl = msg.ttl_seconds if msg.ttl_seconds is not None else self.default_ttl
+            mono = time.monotonic()
+            self._compact(self._queues[target], mono)
+            entry = _Entry(msg, target, mono + ttl)
+            self._queues[target].append(entry)
+            type_index = self._by_type.setdefault((target, msg.message_type), deque())
+            self._compact(type_index, mono)
+            type_index.append(entry)
+            self._by_id[msg.message_id] = entry
+            self._pending[target] += 1
             return True
         except Exception as e:
             logger.error(f"[MESSAGE_BUS] Send failed: {e}")
             return False
 
+    def _take(
+        self, queue: str, message_type: MessageType | None, mark_read: bool, now: datetime
+    ) -> list[AgentMsg]:
+        mono = time.monotonic()
+        if message_type is None:
+            index = self._queues[queue]
+        else:
+            index = self._by_type.get((queue, message_type))
+            if index is None:
+                return []
+
+        messages: list[AgentMsg] = []
+        if mark_read:
+            while index:
+                entry = index.popleft()
+                if entry.consumed:
+                    continue
+                if entry.expires_at <= mono:
+                    self._expire(entry)
+                    continue
+                self._consume(entry, now, mark_read)
+                messages.append(entry.msg)
+            if message_type is None:
+                self._by_type = {k: v for k, v in self._by_type.items() if k[0] != queue}
+            else:
+                self._compact(self._queues[queue], mono)
+        else:
+            self._compact(index, mono)
+            messages = [e.msg for e in index if not e.consumed and e.expires_at > mono]
+        return messages
+
     async def receive(
         self,
         agent: str,
@@ -141,7 +333,7 @@ class MessageBus:
 
         Args:
             agent: The receiving agent name
-            message_type: Optional filter by message type
+            message_type: Optional filter by message type (others stay queued)
             mark_read: Whether to mark messages as read
 
         Returns:
@@ -149,67 +341,91 @@ class MessageBus:
 
         """
         agent = agent.lower()
-        messages = []
+        now = datetime.now()
+        messages: list[AgentMsg] = []
 
         # Get from specific queue
-        if agent in self._queue:
-            messages.extend(self._queue[agent])
-            if mark_read:
-                self._queue[agent] = []
+        if agent in self._queues and agent != "all":
+            messages.extend(self._take(agent, message_type, mark_read, now))
 
         # Also get broadcast messages
-        messages.extend(self._queue.get("all", []))
-        if mark_read:
-            self._queue["all"] = []
+        messages.extend(self._take("all", message_type, mark_read, now))
+        return messages
 
-        # Filter by type if specified
-        if message_type:
-            messages = [m for m in messages if m.message_type == message_type]
+    async def ack(self, message_id: UUID) -> bool:
+        """Acknowledge (consume) a single message by id in O(1)."""
+        entry = self._by_id.get(message_id)
+        if entry is None or entry.consumed:
+            return False
+        self._consume(entry, None, True)
+        return True
 
-        # Mark as read
-        if mark_read:
-            now = datetime.now()
-            for msg in messages:
-                msg.read_at = now
+    async def wait_for(
+        self,
+        agent: str,
+        message_type: MessageType | None = None,
+        timeout: float | None = None,
+        predicate: Callable[[AgentMsg], bool] | None = None,
+    ) -> AgentMsg | None:
+        """Wait until a matching message arrives (or is already queued) and consume it.
 
-        return messages
+        Returns None on timeout.
+        """
+        agent = agent.lower()
+
+        def matches(msg: AgentMsg) -> bool:
+            if message_type is not None and msg.message_type != message_type:
+                return False
+            return predicate(msg) if predicate else True
+
+        # Already queued?
+        mono = time.monotonic()
+        for queue in (agent, "all"):
+            index = (
+                self._queues.get(queue)
+                if message_type is None
+                else self._by_type.get((queue, message_type))
+            )
+            for entry in index or ():
+                if not entry.consumed and entry.expires_at > mono and matches(entry.msg):
+                    self._consume(entry, datetime.now(), True)
+                    return entry.msg
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(agent, [])
+        waiters.append((matches, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            return None
+        finally:
+            if (matches, future) in waiters:
+                waiters.remove((matches, future))
 
     async def get_unread_count(self, agent: str) -> int:
         """Get count of unread messages for an agent"""
         agent = agent.lower()
-        count = len(self._queue.get(agent, []))
-        count += len([m for m in self._queue.get("all", []) if not m.read_at])
+        count = self._pending.get(agent, 0) if agent != "all" else 0
+        count += self._pending.get("all", 0)
         return count
 
-    async def _persist_message(self, msg: AgentMsg) -> bool:
-        """Persist message to database"""
-        try:
-            from src.brain.memory.db.schema import AgentMessage
-
-            async with await db_manager.get_session() as session:
-                db_msg = AgentMessage(
-                    session_id=msg.session_id,
-                    from_agent=msg.from_agent,
-                    to_agent=msg.to_agent,
-                    message_type=msg.message_type.value,
-                    step_id=msg.step_id,
-                    payload=msg.payload,
-                )
-                session.add(db_msg)
-                await session.commit()
-                msg.message_id = db_msg.id
-            return True
-        except Exception as e:
-            logger.warning(f"[MESSAGE_BUS] DB persist failed: {e}")
-            return False
+    async def flush(self) -> None:
+        """Write any buffered messages to the DB now."""
+        await self._batcher.flush()
+
+    async def close(self) -> None:
+        await self._batcher.close()
 
     async def clear(self, agent: str | None = None):
         """Clear message queue for agent or all"""
-        if agent:
-            self._queue[agent.lower()] = []
-        else:
-            for key in self._queue:
-                self._queue[key] = []
+        names = [agent.lower()] if agent else list(self._queues)
+        for name in names:
+            for entry in self._queues.get(name, ()):
+                if not entry.consumed:
+                    self._expire(entry)
+            self._queues[name] = deque()
+            self._pending[name] = 0
+            self._by_type = {k: v for k, v in self._by_type.items() if k[0] != name}
 
 
 # Singleton instance
@@ -114,6 +114,9 @@ async def lifespan(app: FastAPI):
     # Initialize components
     await trinity.initialize()
 
+    # Hot-reload config.yaml edits (subscribers are notified of changed keys)
+    config.start_watching()
+
     # Start Process Watchdog
     try:
         from src.brain.monitoring.watchdog import watchdog
@@ -143,6 +146,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("AtlasTrinity Brain is going to sleep...")
+    config.stop_watching()
 
     # Shutdown monitoring
     try:
@@ -382,6 +386,26 @@ async def restore_session(payload: dict[str, str]):
     return await trinity.load_session(session_id)
 
 
+@app.get("/api/sessions/{session_id}/history/{stream}")
+async def get_session_history(session_id: str, stream: str, offset: int = 0, limit: int = 100):
+    """Paginated logs/messages/step_results of a session (memory + spilled segments)"""
+    from src.brain.core.services.state_store import state_store
+
+    if stream not in state_store.capacities:
+        raise HTTPException(status_code=404, detail=f"Unknown stream: {stream}")
+    return await asyncio.to_thread(
+        state_store.page, session_id, stream, offset, max(0, min(limit, 1000))
+    )
+
+
+@app.get("/api/sessions/{session_id}/memory")
+async def get_session_memory(session_id: str):
+    """Approximate in-memory footprint of a session's state buffers"""
+    from src.brain.core.services.state_store import state_store
+
+    return state_store.memory_usage(session_id).get(session_id, {})
+
+
 @app.get("/api/state")
 async def get_state():
     """Get current system state for UI polling"""
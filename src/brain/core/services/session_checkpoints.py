@@ -0,0 +1,329 @@
+"""AtlasTrinity Session Checkpoints
+
+Delta-based session persistence on top of Redis:
+- Compacted snapshot per session (``session:{id}``), optionally zstd-compressed
+- Append-only delta log per session (``session:{id}:deltas``, a Redis list)
+- Session index as a sorted set scored by last activity (no ``KEYS`` scans),
+  back-filled once from pre-index snapshots (guarded by a marker key)
+- Restore path that replays the delta log over the snapshot
+- In-memory diff bases kept for at most ``max_sessions`` sessions (LRU); an
+  evicted session's next save simply writes a fresh snapshot
+"""
+
+import asyncio
+import base64
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+from src.brain.monitoring.logger import logger
+
+# Marker for compressed payloads (JSON text never starts with it)
+_ZSTD_MARKER = "z:"
+
+# Shared encoder: json.dumps(default=...) would build a new encoder per call
+_ENCODER = json.JSONEncoder(default=str)
+
+
+class PayloadCodec:
+    """JSON encoding with optional zstd compression for large payloads."""
+
+    def __init__(self, compression: str = "zstd", min_size: int = 1024, level: int = 3):
+        self.enabled = compression == "zstd" and zstandard is not None
+        self.min_size = min_size
+        if self.enabled:
+            self._compressor = zstandard.ZstdCompressor(level=level)
+
+    def encode(self, text: str) -> str:
+        if not self.enabled or len(text) < self.min_size:
+            return text
+        packed = self._compressor.compress(text.encode("utf-8"))
+        return _ZSTD_MARKER + base64.b64encode(packed).decode("ascii")
+
+    def decode(self, data: str | bytes) -> str:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        if not data.startswith(_ZSTD_MARKER):
+            return data
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read compressed session data")
+        raw = base64.b64decode(data[len(_ZSTD_MARKER) :])
+        return zstandard.ZstdDecompressor().decompress(raw).decode("utf-8")
+
+
+def _list_shift(old: list[str], new: list[str]) -> int | None:
+    """Number of leading items dropped if ``new`` continues ``old`` (ring-buffer style)."""
+    if not old:
+        return 0
+    if not new:
+        return None
+    first = new[0]
+    for drop, item in enumerate(old):
+        if item != first:
+            continue
+        overlap = len(old) - drop
+        if overlap <= len(new) and new[:overlap] == old[drop:]:
+            return drop
+    return None
+
+
+def diff_state(previous: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]]:
+    """Compute delta ops between two *encoded* states.
+
+    Both states map top-level keys to either a JSON string (scalars/dicts) or a
+    list of JSON strings (list values), as produced by ``encode_state``.
+    """
+    ops: list[dict[str, Any]] = []
+    for key, value in current.items():
+        old = previous.get(key)
+        if old == value:
+            continue
+        if isinstance(value, list) and isinstance(old, list):
+            drop = _list_shift(old, value)
+            if drop is not None:
+                kept = len(old) - drop
+                ops.append({"op": "list", "k": key, "drop": drop, "add": value[kept:]})
+                continue
+        ops.append({"op": "set", "k": key, "v": value})
+    ops.extend({"op": "del", "k": key} for key in previous if key not in current)
+    return ops
+
+
+def encode_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Serialize each top-level value (list items individually) to JSON text."""
+    encoded: dict[str, Any] = {}
+    for key, value in state.items():
+        if isinstance(value, list):
+            encoded[key] = [_ENCODER.encode(item) for item in value]
+        else:
+            encoded[key] = _ENCODER.encode(value)
+    return encoded
+
+
+def apply_ops(state: dict[str, Any], ops: list[dict[str, Any]]) -> dict[str, Any]:
+    """Replay delta ops (with JSON-text values) onto a decoded state dict."""
+    for op in ops:
+        key = op["k"]
+        kind = op["op"]
+        if kind == "del":
+            state.pop(key, None)
+        elif kind == "list":
+            current = state.get(key)
+            if not isinstance(current, list):
+                current = []
+            del current[: op["drop"]]
+            current.extend(json.loads(item) for item in op["add"])
+            state[key] = current
+        else:
+            value = op["v"]
+            state[key] = (
+                [json.loads(item) for item in value]
+                if isinstance(value, list)
+                else json.loads(value)
+            )
+    return state
+
+
+class SessionCheckpointer:
+    """Writes session state as deltas with periodic compacted snapshots."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        key_fn: Any,
+        *,
+        compression: str = "zstd",
+        compact_every: int = 50,
+        compress_min_bytes: int = 1024,
+        max_sessions: int = 16,
+    ):
+        self.redis_client = redis_client
+        self._key = key_fn
+        self.codec = PayloadCodec(compression, min_size=compress_min_bytes)
+        self.compact_every = max(1, compact_every)
+        self.max_sessions = max(1, max_sessions)
+        # session_id -> encoded state last persisted + delta/snapshot accounting (LRU)
+        self._persisted: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._index_migrated = False
+        self.stats = {"snapshots": 0, "deltas": 0, "bytes_written": 0, "skipped": 0}
+
+    @property
+    def index_key(self) -> str:
+        return self._key("sessions")
+
+    @property
+    def migration_key(self) -> str:
+        return self._key("sessions:migrated")
+
+    def snapshot_key(self, session_id: str) -> str:
+        return self._key(f"session:{session_id}")
+
+    def deltas_key(self, session_id: str) -> str:
+        return self._key(f"session:{session_id}:deltas")
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+    def _remember(self, session_id: str, meta: dict[str, Any]) -> None:
+        self._persisted[session_id] = meta
+        self._persisted.move_to_end(session_id)
+        while len(self._persisted) > self.max_sessions:
+            evicted, _ = self._persisted.popitem(last=False)
+            self._drop_lock(evicted)
+
+    def _drop_lock(self, session_id: str) -> None:
+        lock = self._locks.get(session_id)
+        if lock is not None and not lock.locked():
+            del self._locks[session_id]
+
+    def release(self, session_id: str) -> None:
+        """Forget the cached diff base of a session that is no longer active.
+
+        Redis is untouched; a later save of the session writes a snapshot.
+        """
+        self._persisted.pop(session_id, None)
+        self._drop_lock(session_id)
+
+    async def save(self, session_id: str, state: dict[str, Any]) -> int:
+        """Persist ``state``; returns the number of payload bytes written."""
+        async with self._lock(session_id):
+            encoded = encode_state(state)
+            meta = self._persisted.get(session_id)
+            now = time.time()
+
+            if meta is not None:
+                self._persisted.move_to_end(session_id)
+                ops = diff_state(meta["encoded"], encoded)
+                if not ops:
+                    self.stats["skipped"] += 1
+                    await self.redis_client.zadd(self.index_key, {session_id: now})
+                    return 0
+                payload = self.codec.encode(json.dumps({"ts": now, "ops": ops}))
+                delta_bytes = meta["delta_bytes"] + len(payload)
+                if meta["deltas"] + 1 < self.compact_every and delta_bytes < meta["snapshot_bytes"]:
+                    async with self.redis_client.pipeline(transaction=True) as pipe:
+                        pipe.rpush(self.deltas_key(session_id), payload)
+                        pipe.zadd(self.index_key, {session_id: now})
+                        await pipe.execute()
+                    meta.update(encoded=encoded, deltas=meta["deltas"] + 1, delta_bytes=delta_bytes)
+                    self.stats["deltas"] += 1
+                    self.stats["bytes_written"] += len(payload)
+                    return len(payload)
+
+            return await self._write_snapshot(session_id, state, encoded, now)
+
+    async def _write_snapshot(
+        self, session_id: str, state: dict[str, Any], encoded: dict[str, Any], now: float
+    ) -> int:
+        payload = self.codec.encode(_ENCODER.encode(state))
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(self.snapshot_key(session_id), payload)
+            pipe.delete(self.deltas_key(session_id))
+            pipe.zadd(self.index_key, {session_id: now})
+            await pipe.execute()
+        self._remember(
+            session_id,
+            {
+                "encoded": encoded,
+                "deltas": 0,
+                "delta_bytes": 0,
+                "snapshot_bytes": len(payload),
+            },
+        )
+        self.stats["snapshots"] += 1
+        self.stats["bytes_written"] += len(payload)
+        return len(payload)
+
+    async def compact(self, session_id: str) -> bool:
+        """Fold the delta log into a fresh snapshot."""
+        async with self._lock(session_id):
+            state = await self._load(session_id)
+            if state is None:
+                return False
+            await self._write_snapshot(session_id, state, encode_state(state), time.time())
+            return True
+
+    async def restore(self, session_id: str) -> dict[str, Any] | None:
+        async with self._lock(session_id):
+            state = await self._load(session_id)
+            if state is not None:
+                # Unchanged saves are skipped; the first real change compacts
+                self._remember(
+                    session_id,
+                    {
+                        "encoded": encode_state(state),
+                        "deltas": self.compact_every,
+                        "delta_bytes": 0,
+                        "snapshot_bytes": 0,
+                    },
+                )
+            return state
+
+    async def _load(self, session_id: str) -> dict[str, Any] | None:
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.get(self.snapshot_key(session_id))
+            pipe.lrange(self.deltas_key(session_id), 0, -1)
+            snapshot, deltas = await pipe.execute()
+        if not snapshot:
+            return None
+        state = json.loads(self.codec.decode(snapshot))
+        if not isinstance(state, dict):
+            return None
+        for raw in deltas or []:
+            delta = json.loads(self.codec.decode(raw))
+            apply_ops(state, delta.get("ops", []))
+        return state
+
+    async def delete(self, session_id: str) -> None:
+        async with self._lock(session_id):
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(self.snapshot_key(session_id), self.deltas_key(session_id))
+                pipe.zrem(self.index_key, session_id)
+                await pipe.execute()
+            self._persisted.pop(session_id, None)
+        self._locks.pop(session_id, None)
+
+    async def touch(self, session_id: str) -> None:
+        await self.redis_client.zadd(self.index_key, {session_id: time.time()})
+
+    async def list(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Sessions ordered by last activity, newest first."""
+        if not self._index_migrated:
+            # save() creates the index, so its existence says nothing about old snapshots
+            if not await self.redis_client.exists(self.migration_key):
+                await self._rebuild_index()
+                await self.redis_client.set(self.migration_key, 1)
+            self._index_migrated = True
+        end = -1 if limit is None else max(0, limit - 1)
+        entries = await self.redis_client.zrevrange(self.index_key, 0, end, withscores=True)
+        return [
+            {
+                "id": session_id,
+                "key": self.snapshot_key(session_id),
+                "last_activity": score,
+            }
+            for session_id, score in entries
+        ]
+
+    async def _rebuild_index(self) -> None:
+        """One-time migration: index sessions saved before the index existed (SCAN, not KEYS)."""
+        prefix = self.snapshot_key("")
+        found: dict[str, float] = {}
+        async for key in self.redis_client.scan_iter(match=f"{prefix}*", count=500):
+            session_id = key[len(prefix) :]
+            if session_id and not session_id.endswith(":deltas"):
+                found[session_id] = 0.0
+        if found:
+            # nx: sessions saved since the upgrade keep their activity score
+            await self.redis_client.zadd(self.index_key, found, nx=True)
+            logger.info(f"[STATE] Indexed {len(found)} existing sessions")
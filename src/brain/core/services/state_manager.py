@@ -3,7 +3,7 @@
 Redis-based state persistence for:
 - Surviving restarts
 - Checkpointing task progress
-- Session recovery
+- Session recovery (delta log + compacted snapshots, see session_checkpoints)
 """
 
 import asyncio
@@ -23,6 +23,7 @@ else:
         except ImportError:
             aioredis = None
 
+from src.brain.core.services.session_checkpoints import SessionCheckpointer
 from src.brain.monitoring.logger import logger
 
 
@@ -30,9 +31,10 @@ class StateManager:
     """Manages orchestrator state persistence using Redis.
 
     Features:
-    - Save/restore task state
+    - Save/restore task state (append-only deltas, periodic snapshots)
     - Checkpointing during execution
     - Session recovery after restart
+    - Session index ordered by last activity
     """
 
     def __init__(self, host: str = "localhost", port: int = 6379, prefix: str = "atlastrinity"):
@@ -49,7 +51,7 @@ class StateManager:
         redis_url = os.getenv("REDIS_URL") or config.get("state.redis_url")
 
         if redis_url:
-            self.redis_client: aioredis.Redis = aioredis.Redis.from_url(
+            self.redis_client = aioredis.Redis.from_url(
                 redis_url,
                 decode_responses=True,
                 socket_connect_timeout=2,
@@ -64,9 +66,30 @@ class StateManager:
             )
             logger.info(f"[STATE] Redis connected at {host}:{port}")
 
+        self.checkpointer = SessionCheckpointer(
+            self.redis_client,
+            self._key,
+            compression=config.get("state.checkpoint.compression", "zstd"),
+            compact_every=int(config.get("state.checkpoint.compact_every", 50)),
+            compress_min_bytes=int(config.get("state.checkpoint.compress_min_bytes", 1024)),
+            max_sessions=int(config.get("state.checkpoint.max_sessions", 16)),
+        )
+
         # Connection will be tested lazily or in initialize
         self.available = True
 
+    @property
+    def redis_client(self) -> "aioredis.Redis | None":
+        return getattr(self, "_redis_client", None)
+
+    @redis_client.setter
+    def redis_client(self, client: "aioredis.Redis | None") -> None:
+        self._redis_client = client
+        # The checkpointer must follow a swapped client (reconnects, tests)
+        checkpointer = getattr(self, "checkpointer", None)
+        if checkpointer is not None:
+            checkpointer.redis_client = client
+
     def _key(self, name: str) -> str:
         return f"{self.prefix}:{name}"
 
@@ -75,12 +98,11 @@ class StateManager:
         if not self.available or self.redis_client is None:
             return
         try:
-            key = self._key(f"session:{session_id}")
-            # Ensure state is JSON serializable
-            await self.redis_client.set(key, json.dumps(state, default=str))
+            # Only the delta since the last save is written; snapshots are periodic
+            written = await self.checkpointer.save(session_id, state)
             # Also update last session pointer
             await self.redis_client.set(self._key("last_session"), session_id)
-            logger.info(f"[STATE] Session {session_id} saved")
+            logger.info(f"[STATE] Session {session_id} saved ({written} bytes)")
         except Exception as e:
             logger.error(f"[STATE] Failed to save session: {e}")
 
@@ -89,28 +111,17 @@ class StateManager:
         if not self.available or self.redis_client is None:
             return None
         try:
-            key = self._key(f"session:{session_id}")
-            data = await self.redis_client.get(key)
-            if data:
-                return cast("dict[Any, Any] | None", json.loads(data))
-            return None
+            return await self.checkpointer.restore(session_id)
         except Exception as e:
             logger.error(f"[STATE] Failed to restore session: {e}")
             return None
 
-    async def list_sessions(self) -> list[dict]:
-        """List all available sessions"""
+    async def list_sessions(self, limit: int | None = None) -> list[dict]:
+        """List available sessions, most recently active first"""
         if not self.available or self.redis_client is None:
             return []
         try:
-            pattern = self._key("session:*")
-            keys = await self.redis_client.keys(pattern)
-            sessions = []
-            for k in keys:
-                # Key is byte if decode_responses=False, but we set it True
-                s_id = k.split(":")[-1]
-                sessions.append({"id": s_id, "key": k})
-            return sessions
+            return await self.checkpointer.list(limit)
         except Exception as e:
             logger.error(f"[STATE] Failed to list sessions: {e}")
             return []
@@ -120,11 +131,16 @@ class StateManager:
         if not self.available or self.redis_client is None:
             return
         try:
-            key = self._key(f"session:{session_id}")
-            await self.redis_client.delete(key)
+            await self.checkpointer.delete(session_id)
         except Exception as e:
             logger.error(f"[STATE] Failed to delete session: {e}")
 
+    def release_session(self, session_id: str):
+        """Drop in-memory checkpoint bookkeeping for a session we switched away from"""
+        checkpointer = getattr(self, "checkpointer", None)
+        if checkpointer is not None:
+            checkpointer.release(session_id)
+
     async def clear_session(self, session_id: str):
         """Alias for delete_session for compatibility"""
         await self.delete_session(session_id)
@@ -213,6 +229,24 @@ class StateManager:
             if "Event loop is closed" not in str(e):
                 logger.error(f"[STATE] Failed to publish event: {e}")
 
+    async def publish_events(self, channel: str, messages: list[dict]):
+        """Publish several messages to a Redis channel in one round trip (pipeline).
+
+        Subscribers still receive one message per entry, as with publish_event.
+        """
+        if not messages or not self.available or self.redis_client is None:
+            return
+        try:
+            full_channel = self._key(f"events:{channel}")
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for message in messages:
+                    pipe.publish(full_channel, json.dumps(message, default=str))
+                await pipe.execute()
+        except Exception as e:
+            # Avoid logging if it's just a loop closure error
+            if "Event loop is closed" not in str(e):
+                logger.error(f"[STATE] Failed to publish {len(messages)} events: {e}")
+
     async def get_key(self, key: str) -> Any | None:
         """Get a raw key value with prefix"""
         if not self.available or self.redis_client is None:
@@ -0,0 +1,354 @@
+"""AtlasTrinity State Store
+
+Bounded storage for the orchestrator's per-session collections:
+- Fixed-capacity ring buffers for logs, messages and step results
+- Spill-to-disk SQLite segments for evicted entries (paginated queries)
+- Per-session memory accounting
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from src.brain.config import MEMORY_DIR
+from src.brain.monitoring.logger import logger
+
+# Default capacities per state stream (overridable via orchestrator.state_buffers.*)
+DEFAULT_CAPACITIES: dict[str, int] = {
+    "logs": 1000,
+    "messages": 500,
+    "step_results": 500,
+}
+
+# Evicted entries are written to disk in segments of this many rows
+DEFAULT_SEGMENT_SIZE = 256
+
+
+def _to_jsonable(entry: Any) -> Any:
+    """Convert LangChain messages / pydantic models to plain structures."""
+    if hasattr(entry, "model_dump"):
+        try:
+            return entry.model_dump()
+        except Exception:
+            return str(entry)
+    return entry
+
+
+class RingBuffer(list):
+    """A list with a fixed capacity.
+
+    Appending beyond capacity evicts the oldest entries and hands them to
+    ``on_evict``. It stays a real ``list`` so slicing, ``isinstance`` checks
+    and JSON serialization in the rest of the orchestrator keep working.
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[Any] = (),
+        capacity: int = 1000,
+        on_evict: Callable[[list[Any], int], None] | None = None,
+        evicted: int = 0,
+    ):
+        super().__init__()
+        self.capacity = max(1, int(capacity))
+        self.on_evict = on_evict
+        # Number of entries already moved out of memory (sequence of self[0])
+        self.evicted = evicted
+        self.extend(iterable)
+
+    @property
+    def total(self) -> int:
+        """Total entries ever appended (in memory + spilled)."""
+        return self.evicted + len(self)
+
+    def _trim(self) -> None:
+        overflow = len(self) - self.capacity
+        if overflow <= 0:
+            return
+        dropped = self[:overflow]
+        del self[:overflow]
+        if self.on_evict:
+            self.on_evict(dropped, self.evicted)
+        self.evicted += overflow
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        if len(self) > self.capacity:
+            self._trim()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        super().extend(items)
+        self._trim()
+
+    def insert(self, index: Any, item: Any) -> None:
+        super().insert(index, item)
+        self._trim()
+
+    def __iadd__(self, items: Iterable[Any]):  # type: ignore[override]
+        self.extend(items)
+        return self
+
+    def __reduce__(self):
+        # Copies and pickles degrade to plain lists (no callback / DB handle)
+        return (list, (list(self),))
+
+
+def stream_total(entries: Any) -> int:
+    """Entries ever appended to a state stream, counting those spilled to disk."""
+    if isinstance(entries, RingBuffer):
+        return entries.total
+    return len(entries) if isinstance(entries, list) else 0
+
+
+class SpillStore:
+    """SQLite-backed segments for entries evicted from ring buffers."""
+
+    def __init__(self, db_path: Path | str | None = None, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        self.db_path = str(db_path or (MEMORY_DIR / "state_spill.db"))
+        self.segment_size = max(1, segment_size)
+        self._pending: list[tuple[str, str, int, float, str]] = []
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        # Partial segments live only in memory; write them out on interpreter exit.
+        # Not unregistered by close(): the store reopens lazily if spilled to again
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS state_segments (
+                    session_id TEXT NOT NULL,
+                    stream TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (session_id, stream, seq)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def spill(self, session_id: str, stream: str, entries: list[Any], first_seq: int) -> None:
+        """Queue evicted entries; a full segment is written in one transaction."""
+        now = time.time()
+        rows = [
+            (
+                session_id,
+                stream,
+                first_seq + i,
+                now,
+                json.dumps(_to_jsonable(e), default=str, ensure_ascii=False),
+            )
+            for i, e in enumerate(entries)
+        ]
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.segment_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO state_segments VALUES (?, ?, ?, ?, ?)", rows
+                )
+        except Exception as e:
+            logger.error(f"[STATE_STORE] Failed to spill {len(rows)} entries: {e}")
+
+    def count(self, session_id: str, stream: str) -> int:
+        """Highest spilled sequence + 1 (0 if nothing was spilled)."""
+        with self._lock:
+            self._flush_locked()
+            try:
+                row = (
+                    self._connect()
+                    .execute(
+                        "SELECT MAX(seq) FROM state_segments WHERE session_id = ? AND stream = ?",
+                        (session_id, stream),
+                    )
+                    .fetchone()
+                )
+            except Exception as e:
+                logger.error(f"[STATE_STORE] Failed to count spilled entries: {e}")
+                return 0
+        return (row[0] + 1) if row and row[0] is not None else 0
+
+    def fetch(self, session_id: str, stream: str, start: int, end: int) -> list[Any]:
+        """Return spilled entries with ``start <= seq < end`` in order."""
+        if end <= start:
+            return []
+        with self._lock:
+            self._flush_locked()
+            try:
+                rows = (
+                    self._connect()
+                    .execute(
+                        "SELECT payload FROM state_segments "
+                        "WHERE session_id = ? AND stream = ? AND seq >= ? AND seq < ? "
+                        "ORDER BY seq",
+                        (session_id, stream, start, end),
+                    )
+                    .fetchall()
+                )
+            except Exception as e:
+                logger.error(f"[STATE_STORE] Failed to read spilled entries: {e}")
+                return []
+        return [json.loads(r[0]) for r in rows]
+
+    def delete_session(self, session_id: str) -> None:
+        with self._lock:
+            self._pending = [r for r in self._pending if r[0] != session_id]
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM state_segments WHERE session_id = ?", (session_id,))
+            except Exception as e:
+                logger.error(f"[STATE_STORE] Failed to delete session segments: {e}")
+
+    def close(self) -> None:
+        """Write out the partial segment and release the connection."""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class StateStore:
+    """Binds orchestrator state dicts to bounded, spillable buffers.
+
+    Features:
+    - ``bind`` wraps the configured list streams of a state dict in RingBuffers
+    - ``page`` reads a stream across disk segments and memory
+    - ``memory_usage`` reports per-session entry counts and approximate bytes
+    """
+
+    def __init__(
+        self,
+        spill: SpillStore | None = None,
+        capacities: dict[str, int] | None = None,
+    ):
+        self.spill = spill or SpillStore()
+        if capacities is None:
+            from src.brain.config.config_loader import config
+
+            configured = config.get("orchestrator.state_buffers", {}) or {}
+            capacities = {
+                name: int(configured.get(name, default))
+                for name, default in DEFAULT_CAPACITIES.items()
+            }
+        self.capacities = capacities
+        # session_id -> stream -> live buffer of the most recently bound state
+        self._buffers: dict[str, dict[str, RingBuffer]] = {}
+
+    def _evict_callback(self, session_id: str, stream: str) -> Callable[[list[Any], int], None]:
+        def _on_evict(entries: list[Any], first_seq: int) -> None:
+            self.spill.spill(session_id, stream, entries, first_seq)
+
+        return _on_evict
+
+    def bind(self, state: Any, session_id: str) -> Any:
+        """Wrap list streams of ``state`` in ring buffers owned by ``session_id``."""
+        if not isinstance(state, dict):
+            return state
+        buffers = self._buffers.setdefault(session_id, {})
+        for stream, capacity in self.capacities.items():
+            current = state.get(stream)
+            if not isinstance(current, list):
+                continue
+            if isinstance(current, RingBuffer) and buffers.get(stream) is current:
+                continue
+            # Resume numbering after anything this session already spilled
+            buf = RingBuffer(
+                capacity=capacity,
+                on_evict=self._evict_callback(session_id, stream),
+                evicted=self.spill.count(session_id, stream),
+            )
+            buf.extend(current)
+            state[stream] = buf
+            buffers[stream] = buf
+        return state
+
+    def release(self, session_id: str) -> None:
+        """Forget in-memory buffers of a session (spilled segments stay queryable)."""
+        self._buffers.pop(session_id, None)
+        self.spill.flush()
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session entirely, including its spilled segments."""
+        self._buffers.pop(session_id, None)
+        self.spill.delete_session(session_id)
+
+    def page(self, session_id: str, stream: str, offset: int = 0, limit: int = 100) -> dict:
+        """Paginated, chronological view of a stream (disk segments + memory)."""
+        offset = max(0, offset)
+        limit = max(0, limit)
+        buf = self._buffers.get(session_id, {}).get(stream)
+        if buf is not None:
+            total = buf.total
+            spilled = buf.evicted
+        else:
+            total = spilled = self.spill.count(session_id, stream)
+
+        end = min(offset + limit, total)
+        items: list[Any] = []
+        if offset < spilled:
+            items.extend(self.spill.fetch(session_id, stream, offset, min(end, spilled)))
+        if buf is not None and end > spilled:
+            start = max(offset, spilled) - spilled
+            items.extend(_to_jsonable(e) for e in buf[start : end - spilled])
+
+        return {
+            "session_id": session_id,
+            "stream": stream,
+            "offset": offset,
+            "limit": limit,
+            "total": total,
+            "items": items,
+        }
+
+    def memory_usage(self, session_id: str | None = None) -> dict[str, Any]:
+        """Approximate in-memory footprint per session and stream."""
+        sessions = [session_id] if session_id else list(self._buffers)
+        report: dict[str, Any] = {}
+        for sid in sessions:
+            streams: dict[str, Any] = {}
+            session_bytes = 0
+            for stream, buf in self._buffers.get(sid, {}).items():
+                approx = sum(
+                    len(json.dumps(_to_jsonable(e), default=str, ensure_ascii=False)) for e in buf
+                )
+                session_bytes += approx
+                streams[stream] = {
+                    "entries": len(buf),
+                    "capacity": buf.capacity,
+                    "spilled": buf.evicted,
+                    "approx_bytes": approx,
+                }
+            report[sid] = {"streams": streams, "approx_bytes": session_bytes}
+        return report
+
+
+# Singleton instance
+state_store = StateStore()
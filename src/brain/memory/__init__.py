@@ -1,10 +1,13 @@
 from .db.manager import db_manager  # pyre-ignore
+from .file_index import FileIndexService, file_index  # pyre-ignore
 from .knowledge_graph import knowledge_graph  # pyre-ignore
 from .memory import LongTermMemory, long_term_memory  # pyre-ignore
 
 __all__ = [
+    "FileIndexService",
     "LongTermMemory",
     "db_manager",
+    "file_index",
     "knowledge_graph",
     "long_term_memory",
 ]
@@ -0,0 +1,208 @@
+"""AtlasTrinity Bulk DataFrame Loader
+
+Vectorized DataFrame -> table loading for DatabaseManager:
+- Column names and SQL types inferred once per frame
+- Chunked streaming: ``executemany`` on SQLite, ``COPY`` on Postgres (asyncpg)
+- Secondary indexes built after the data is in, in the same transaction
+- Load report with rows/sec
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np  # pyre-ignore
+import pandas as pd  # pyre-ignore
+
+_NATIVE = (str, int, float, type(None))
+
+# Identifier-like columns get an index after the load unless told otherwise
+_INDEX_HINT = re.compile(r"(^id$|_id$|^code$|_code$|edrpou|^ipn$|_ipn$)")
+
+
+@dataclass
+class LoadColumn:
+    source: Any  # original DataFrame label
+    name: str  # sanitized SQL column name
+    kind: str  # integer | float | datetime | boolean | text
+
+
+@dataclass
+class LoadReport:
+    table: str
+    rows: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+    index_seconds: float = 0.0
+    backend: str = "sqlite"
+    indexes: list[str] = field(default_factory=list)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "table": self.table,
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 3),
+            "index_seconds": round(self.index_seconds, 3),
+            "rows_per_sec": round(self.rows_per_sec),
+            "backend": self.backend,
+            "indexes": self.indexes,
+        }
+
+
+def sanitize_column(label: Any) -> str:
+    return str(label).lower().replace(" ", "_").replace("-", "_")
+
+
+def infer_columns(df: pd.DataFrame) -> list[LoadColumn]:
+    """Map every DataFrame column to a sanitized name and storage kind (once per load)."""
+    columns: list[LoadColumn] = []
+    seen: set[str] = {"row_id"}
+    for label in df.columns:
+        name = sanitize_column(label)
+        # The table has its own 'row_id' primary key; keep the source column alongside it
+        if name == "row_id":
+            name = f"original_{name}"
+        base, n = name, 1
+        while name in seen:
+            n += 1
+            name = f"{base}_{n}"
+        seen.add(name)
+
+        t = df[label].dtype
+        if pd.api.types.is_bool_dtype(t):
+            kind = "boolean"
+        elif pd.api.types.is_integer_dtype(t):
+            kind = "integer"
+        elif pd.api.types.is_float_dtype(t):
+            kind = "float"
+        elif pd.api.types.is_datetime64_any_dtype(t):
+            kind = "datetime"
+        else:
+            kind = "text"  # Default to Text for objects/strings
+        columns.append(LoadColumn(label, name, kind))
+    return columns
+
+
+def default_index_columns(columns: list[LoadColumn]) -> list[str]:
+    return [c.name for c in columns if _INDEX_HINT.search(c.name)]
+
+
+def _column_values(series: pd.Series, kind: str, for_copy: bool) -> list[Any]:
+    """Convert one column of a chunk to DB-API values, NaN/NaT -> None."""
+    mask = series.isna().to_numpy()
+    if kind == "datetime":
+        if for_copy:
+            values = series.dt.tz_localize(None) if series.dt.tz is not None else series
+            out = values.dt.to_pydatetime().astype(object)
+        else:
+            # Same textual format SQLAlchemy's SQLite DateTime type writes
+            out = series.dt.strftime("%Y-%m-%d %H:%M:%S.%f").to_numpy(dtype=object)
+    elif kind == "boolean" and not for_copy:
+        out = series.astype(object).to_numpy(copy=True)
+        out = np.array([v if v is None else int(v) for v in out], dtype=object)
+    elif kind == "text":
+        out = series.to_numpy(dtype=object, copy=True)
+        # Drivers bind str/int/float natively; stringify anything else (Decimal, dicts, ...)
+        for i, v in enumerate(out):
+            if type(v) not in _NATIVE and not mask[i]:
+                out[i] = str(v)
+    else:
+        out = series.astype(object).to_numpy(copy=True)
+    if mask.any():
+        out[mask] = None
+    return out.tolist()
+
+
+def chunk_rows(
+    df: pd.DataFrame, columns: list[LoadColumn], start: int, stop: int, for_copy: bool = False
+) -> list[tuple]:
+    """Row tuples for ``df[start:stop]`` built column-wise (no per-row pandas access)."""
+    chunk = df.iloc[start:stop]
+    values = [_column_values(chunk[c.source], c.kind, for_copy) for c in columns]
+    return list(zip(*values, strict=True))
+
+
+class BulkLoader:
+    """Streams a DataFrame into an existing table in fixed-size chunks."""
+
+    def __init__(self, engine: Any, chunk_size: int = 50_000, writer: Any = None):
+        self.engine = engine
+        self.chunk_size = max(1, chunk_size)
+        self.writer = writer  # optional WriterQueue (SQLite single writer)
+
+    @property
+    def backend(self) -> str:
+        return self.engine.dialect.name
+
+    async def load(
+        self,
+        table_name: str,
+        df: pd.DataFrame,
+        columns: list[LoadColumn],
+        index_columns: list[str] | None = None,
+    ) -> LoadReport:
+        """Insert ``df`` and build indexes in one transaction (all or nothing).
+
+        Chunks bound memory, not the transaction: a failure part-way leaves
+        the table as it was before the load.
+        """
+        report = LoadReport(table=table_name, backend=self.backend)
+        use_copy = self.backend == "postgresql" and self._is_asyncpg()
+        indexed = index_columns if index_columns is not None else default_index_columns(columns)
+
+        async def go():
+            async with self.engine.begin() as conn:
+                t0 = time.perf_counter()
+                for start in range(0, len(df), self.chunk_size):
+                    rows = chunk_rows(
+                        df, columns, start, start + self.chunk_size, for_copy=use_copy
+                    )
+                    if use_copy:
+                        await self._copy(conn, table_name, columns, rows)
+                    else:
+                        await self._executemany(conn, table_name, columns, rows)
+                    report.rows += len(rows)
+                    report.chunks += 1
+                report.seconds = time.perf_counter() - t0
+
+                t1 = time.perf_counter()
+                for col in indexed:
+                    index_name = f"ix_{table_name}_{col}"[:63]
+                    await conn.exec_driver_sql(
+                        f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ("{col}")'
+                    )
+                    report.indexes.append(index_name)
+                if self.backend == "sqlite" and report.indexes:
+                    await conn.exec_driver_sql(f'ANALYZE "{table_name}"')
+                report.index_seconds = time.perf_counter() - t1
+
+        if self.writer is None:
+            await go()
+        else:
+            async with self.writer:
+                await go()
+        return report
+
+    def _is_asyncpg(self) -> bool:
+        return getattr(self.engine.dialect, "driver", "") == "asyncpg"
+
+    async def _executemany(
+        self, conn: Any, table: str, columns: list[LoadColumn], rows: list[tuple]
+    ) -> None:
+        cols = ", ".join(f'"{c.name}"' for c in columns)
+        marks = ", ".join("?" if self.backend == "sqlite" else "%s" for _ in columns)
+        await conn.exec_driver_sql(f'INSERT INTO "{table}" ({cols}) VALUES ({marks})', rows)
+
+    async def _copy(
+        self, conn: Any, table: str, columns: list[LoadColumn], rows: list[tuple]
+    ) -> None:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table, records=rows, columns=[c.name for c in columns]
+        )
@@ -3,6 +3,7 @@
 import asyncio
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, cast
 
@@ -17,13 +18,26 @@ from sqlalchemy.ext.asyncio import (  # pyre-ignore
 from src.brain.config import CONFIG_ROOT  # pyre-ignore
 from src.brain.config.config_loader import config  # pyre-ignore
 from src.brain.memory.db.schema import Base  # pyre-ignore
+from src.brain.memory.db.storage_profile import (  # pyre-ignore
+    LockMetrics,
+    StorageMaintenance,
+    WriterQueue,
+    apply_pragmas,
+    get_profile,
+    is_busy_error,
+)
 
 
 class DatabaseManager:
     _engine: Any = None  # pyre-ignore
     _session_maker: Any = None  # pyre-ignore
+    _writer_engine: Any = None  # pyre-ignore
+    _writer_session_maker: Any = None  # pyre-ignore
+    _writer_queue: WriterQueue | None = None
+    _maintenance: StorageMaintenance | None = None
     _semaphore: asyncio.Semaphore = asyncio.Semaphore(15)
     available: bool = False
+    last_load_report: dict[str, Any] | None = None
 
     def __init__(self):
         # Resolve DB_URL dynamically
@@ -44,26 +58,40 @@ class DatabaseManager:
 
         self.db_url = url
 
+        # SQLite tuning (WAL, single writer, maintenance) - see storage_profile.py
+        self.storage_profile = get_profile(
+            config.get("database_management.sqlite.storage.profile", "balanced"),
+            config.get("database_management.sqlite.storage.pragmas", None),
+        )
+        self.lock_metrics = LockMetrics()
+
+    def _create_engine(self, pool_size: int, max_overflow: int) -> Any:
+        engine = create_async_engine(
+            self.db_url,
+            echo=False,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+        )
+        if "sqlite" in self.db_url:
+            from sqlalchemy import event  # pyre-ignore
+
+            profile = self.storage_profile
+
+            @event.listens_for(engine.sync_engine, "connect")  # pyre-ignore
+            def set_sqlite_pragma(dbapi_connection, connection_record):
+                apply_pragmas(dbapi_connection, profile)
+
+        return engine
+
     async def initialize(self):
         """Initialize DB connection and create tables if missing."""
         try:
-            self._engine = create_async_engine(
-                self.db_url,
-                echo=False,
-                pool_size=20,
-                max_overflow=10,
-                pool_pre_ping=True,
-            )
-
-            # Enable Foreign Key support for SQLite
-            if "sqlite" in self.db_url:
-                from sqlalchemy import event  # pyre-ignore
-
-                @event.listens_for(self._engine.sync_engine, "connect")  # pyre-ignore
-                def set_sqlite_pragma(dbapi_connection, connection_record):
-                    cursor = dbapi_connection.cursor()
-                    cursor.execute("PRAGMA foreign_keys=ON")
-                    cursor.close()
+            is_sqlite = "sqlite" in self.db_url
+            if is_sqlite:
+                self._engine = self._create_engine(self.storage_profile.reader_pool_size, 10)
+            else:
+                self._engine = self._create_engine(20, 10)
 
             # Create tables
             async with self._engine.begin() as conn:  # pyre-ignore
@@ -73,6 +101,20 @@ class DatabaseManager:
             await self.verify_schema(fix=True)
 
             self._session_maker = async_sessionmaker(self._engine, expire_on_commit=False)
+
+            # Dedicated single write connection behind a FIFO queue
+            if is_sqlite and self.storage_profile.single_writer:
+                self._writer_engine = self._create_engine(1, 0)
+                self._writer_session_maker = async_sessionmaker(
+                    self._writer_engine, expire_on_commit=False
+                )
+                self._writer_queue = WriterQueue(self.lock_metrics)
+            if is_sqlite:
+                self._maintenance = StorageMaintenance(
+                    self._writer_engine or self._engine, self.storage_profile, self._writer_queue
+                )
+                self._maintenance.start()
+
             self.available = True
 
             # Ensure seed data exists
@@ -286,7 +328,7 @@ class DatabaseManager:
 
         from src.brain.memory.db.schema import KGNode  # pyre-ignore
 
-        async with await self.get_session() as session:
+        async with self.write_session() as session:
             # 1. Ensure core system node exists in Knowledge Graph
             # Use cast(Any, ...) to satisfy linter regarding SQLAlchemy operator overloading
             stmt = select(KGNode).where(cast("Any", KGNode.id == "entity:trinity"))
@@ -305,9 +347,18 @@ class DatabaseManager:
                 await session.commit()
                 print("[DB] Seeding complete.", file=sys.stderr)
 
-    async def create_table_from_df(self, table_name: str, df: pd.DataFrame) -> bool:
+    async def create_table_from_df(
+        self,
+        table_name: str,
+        df: pd.DataFrame,
+        index_columns: list[str] | None = None,
+        chunk_size: int = 50_000,
+    ) -> bool:
         """Dynamically create a table in the database matching the DataFrame schema.
         Used for High-Precision Ingestion.
+
+        Rows are streamed in chunks (executemany / COPY) and indexes are built
+        after the load; the load report is kept in ``last_load_report``.
         """
         if not self.available:
             return False
@@ -323,31 +374,24 @@ class DatabaseManager:
             Text,
         )
 
-        # 1. Map pandas dtypes to SQLAlchemy types
-        def map_dtype(col):
-            t = df[col].dtype
-            if pd.api.types.is_integer_dtype(t):
-                return Integer
-            if pd.api.types.is_float_dtype(t):
-                return Float
-            if pd.api.types.is_datetime64_any_dtype(t):
-                return DateTime
-            if pd.api.types.is_bool_dtype(t):
-                return Boolean
-            return Text  # Default to Text for objects/strings
-
-        # 2. Define the new table
+        from src.brain.memory.db.bulk_loader import BulkLoader, infer_columns  # pyre-ignore
+
+        # 1. Infer column names/types once
+        load_columns = infer_columns(df)
+        sql_types = {
+            "integer": Integer,
+            "float": Float,
+            "datetime": DateTime,
+            "boolean": Boolean,
+            "text": Text,
+        }
+
+        # 2. Define the new table (no secondary indexes until the data is in)
         metadata = MetaData()
         columns = [Column("row_id", Integer, primary_key=True, autoincrement=True)]
-        for col_name in df.columns:
-            safe_col = str(col_name).lower().replace(" ", "_").replace("-", "_")
-            # If the CSV has an 'id' or 'row_id' column, we rename the existing one to avoid collision
-            if safe_col in ["row_id"]:
-                safe_col = f"original_{safe_col}"
-
+        for col in load_columns:
             # Explicitly cast to Any to satisfy strict linters regarding the positional type argument
-            col_type = map_dtype(col_name)
-            columns.append(Column(safe_col, cast("Any", col_type)))  # pyre-ignore
+            columns.append(Column(col.name, cast("Any", sql_types[col.kind])))  # pyre-ignore
 
         # 3. Create the table sync-style via engine.run_sync
         def sync_create(connection):
@@ -362,44 +406,19 @@ class DatabaseManager:
             async with self._engine.begin() as conn:  # pyre-ignore
                 await conn.run_sync(sync_create)
 
-            # 4. Bulk insert data
-            async with await self.get_session() as session:
-                # Convert DF to list of dicts with sanitized keys
-                sanitized_data = []
-                for _, row in df.iterrows():
-                    d = {}
-                    for col_name in df.columns:
-                        safe_col = str(col_name).lower().replace(" ", "_").replace("-", "_")
-                        cell_value = row[col_name]  # pyre-ignore
-                        # Check if value is not None and not NaN
-                        if cell_value is not None:
-                            import numpy as np  # pyre-ignore
-
-                            if isinstance(cell_value, float) and np.isnan(cell_value):
-                                d[safe_col] = None
-                            else:
-                                d[safe_col] = cell_value
-                        else:
-                            d[safe_col] = None
-                    sanitized_data.append(d)
-
-                # Dynamic insert is tricky with SQLAlchemy async,
-                # we'll use raw SQL text for simplicity and performance in bulk ingestion
-                from sqlalchemy import text  # pyre-ignore
-
-                cols = ", ".join(
-                    [f'"{str(c).lower().replace(" ", "_").replace("-", "_")}"' for c in df.columns],
-                )
-                placeholders = ", ".join(
-                    [f":{str(c).lower().replace(' ', '_').replace('-', '_')}" for c in df.columns],
-                )
-                sql = f'INSERT INTO "{table_name}" ({cols}) VALUES ({placeholders})'
-
-                await session.execute(text(sql), sanitized_data)  # pyre-ignore
-                await session.commit()
+            # 4. Chunked bulk load, then indexes
+            loader = BulkLoader(
+                self._writer_engine or self._engine,
+                chunk_size=chunk_size,
+                writer=self._writer_queue,
+            )
+            report = await loader.load(table_name, df, load_columns, index_columns)
+            self.last_load_report = report.to_dict()
 
             print(
-                f"[DB] Dynamic table '{table_name}' created and populated with {len(df)} rows.",
+                f"[DB] Dynamic table '{table_name}' created and populated with {report.rows} rows "
+                f"({report.rows_per_sec:,.0f} rows/s, {report.chunks} chunks, "
+                f"{len(report.indexes)} indexes in {report.index_seconds:.2f}s).",
                 file=sys.stderr,
             )
             return True
@@ -408,11 +427,54 @@ class DatabaseManager:
             return False
 
     async def get_session(self) -> AsyncSession:
-        """Get a new async session."""
+        """Get a new async session on the reader pool (use ``write_session`` to write)."""
         if not self.available or not self._session_maker:
             raise RuntimeError("Database not initialized")
         return cast("AsyncSession", self._session_maker())
 
+    @asynccontextmanager
+    async def write_session(self):
+        """Session on the single-writer connection (FIFO-queued).
+
+        Every runtime write in the brain and MCP servers (orchestrator,
+        knowledge graph, memory, seeding) goes through here; ``get_session``
+        is for reads. The queue is not re-entrant, so never open a second
+        write session (or call a writer such as ``knowledge_graph.add_node``)
+        inside one. Offline tools under ``src/maintenance`` and
+        ``src/testing`` still write via ``get_session``: they run with the
+        brain stopped, so there is no writer to contend with.
+
+        Falls back to a regular session when the profile has no dedicated
+        writer (Postgres, or the ``legacy`` SQLite profile).
+        """
+        if not self.available or not self._session_maker:
+            raise RuntimeError("Database not initialized")
+        if self._writer_queue is None:
+            async with self._session_maker() as session:
+                try:
+                    yield session
+                except Exception as e:
+                    if is_busy_error(e):
+                        self.lock_metrics.busy_errors += 1
+                    raise
+            return
+        async with self._writer_queue, self._writer_session_maker() as session:
+            try:
+                yield session
+            except Exception as e:
+                if is_busy_error(e):
+                    self.lock_metrics.busy_errors += 1
+                raise
+
+    def storage_metrics(self) -> dict[str, Any]:
+        """Profile name, writer lock-wait metrics and maintenance counters."""
+        return {
+            "profile": self.storage_profile.name,
+            "single_writer": self._writer_queue is not None,
+            "lock": self.lock_metrics.snapshot(),
+            "maintenance": dict(self._maintenance.stats) if self._maintenance else {},
+        }
+
     async def list_sessions(self, limit: int = 50) -> list[dict[str, Any]]:  # pyre-ignore
         """Retrieve persistent session history from the database."""
         if not self.available:
@@ -441,6 +503,13 @@ class DatabaseManager:
             return []
 
     async def close(self):
+        if self._maintenance:
+            await self._maintenance.stop()
+            self._maintenance = None
+        if self._writer_engine:
+            await self._writer_engine.dispose()  # pyre-ignore
+            self._writer_engine = None
+            self._writer_queue = None
         if self._engine:
             await self._engine.dispose()  # pyre-ignore
 
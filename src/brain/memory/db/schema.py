@@ -327,7 +327,7 @@ class FileIndex(Base):
     path: Mapped[str] = mapped_column(String(500), index=True, unique=True)
     name: Mapped[str] = mapped_column(String(255))
     size: Mapped[int] = mapped_column(Integer, default=0)
-    mtime: Mapped[float] = mapped_column(Float, default=0.0)
+    mtime: Mapped[float] = mapped_column(Float, default=0.0, index=True)
     is_dir: Mapped[bool] = mapped_column(Boolean, default=False)
     content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
@@ -0,0 +1,807 @@
+"""Workspace File Index - keeps the ``files`` table (FileIndex) current.
+
+Atlas context gathering used to find files by walking directories on every
+request. The service scans the configured roots once, answers queries from an
+in-memory view and mirrors that view into the FileIndex table:
+- initial scan: directories are listed by a thread pool, one task per
+  directory; rows already in the table are reused, so the content hashes of
+  unchanged files survive a restart
+- incremental refresh: with watchdog (inotify on Linux, FSEvents on macOS)
+  only the reported paths are checked again. Without it the known directories
+  are stat'ed and only those whose mtime changed are listed again, recently
+  modified files are re-stat'ed, and a full pass runs every
+  ``full_scan_interval`` seconds to catch in-place edits of older files
+- content hashes (sha256) are computed on request and then stored
+- queries: glob (``**`` aware), extension, most recently modified, and name
+  search over a trigram index of file names (substring, then fuzzy)
+"""
+
+import asyncio
+import hashlib
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import bindparam, delete, insert, or_, select, update  # pyre-ignore
+
+from src.brain.config import WORKSPACE_DIR  # pyre-ignore
+from src.brain.config.config_loader import config  # pyre-ignore
+from src.brain.memory.db.manager import DatabaseManager, db_manager  # pyre-ignore
+from src.brain.memory.db.schema import FileIndex  # pyre-ignore
+
+try:
+    from watchdog.events import FileSystemEventHandler  # pyre-ignore
+    from watchdog.observers import Observer  # pyre-ignore
+except ImportError:  # polling only
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger("brain.file_index")
+
+IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    "__pycache__",
+    "node_modules",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".tox",
+    ".cache",
+    ".DS_Store",
+}
+MAX_PATH = 500  # FileIndex.path is String(500)
+HOT_WINDOW_S = 600.0  # files modified this recently are re-stat'ed on every refresh
+HOT_LIMIT = 256
+DB_CHUNK = 500
+HASH_CHUNK = 1024 * 1024
+
+# File-like words in a chat request: names with an extension, paths, globs
+_FILE_TOKEN = re.compile(r"[\w*?./-]*\w\.[A-Za-z0-9]{1,8}\b|[\w.-]+(?:/[\w*?.-]+)+|\S*\*\S*")
+
+
+@dataclass(slots=True)
+class FileEntry:
+    id: int
+    path: str
+    name: str
+    size: int
+    mtime: float
+    is_dir: bool
+    content_hash: str | None = None
+
+    @property
+    def extension(self) -> str:
+        return "" if self.is_dir else os.path.splitext(self.name)[1].lower()
+
+    def row(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "name": self.name,
+            "size": self.size,
+            "mtime": self.mtime,
+            "is_dir": self.is_dir,
+            "content_hash": self.content_hash,
+            "last_scanned": datetime.now(UTC),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "name": self.name,
+            "size": self.size,
+            "mtime": self.mtime,
+            "modified": datetime.fromtimestamp(self.mtime).isoformat(timespec="seconds"),
+            "is_dir": self.is_dir,
+        }
+
+
+@dataclass(slots=True)
+class _View:
+    """Lookup structures of the in-memory index.
+
+    A full rebuild fills a fresh view in a worker thread and swaps it in, so
+    queries on the event loop never wait for it or see it half built.
+    """
+
+    entries: dict[str, FileEntry] = field(default_factory=dict)
+    by_id: list[FileEntry | None] = field(default_factory=list)
+    by_ext: dict[str, set[str]] = field(default_factory=dict)
+    postings: dict[str, array] = field(default_factory=dict)  # trigram -> ids (stale skipped)
+    hot: set[str] = field(default_factory=set)
+
+    @classmethod
+    def build(cls, scanned: Iterable[tuple[str, str, int, float, bool]]) -> "_View":
+        view = cls()
+        for item in sorted(scanned):
+            view.add(*item)
+        return view
+
+    def add(self, path: str, name: str, size: int, mtime: float, is_dir: bool) -> FileEntry:
+        entry = FileEntry(len(self.by_id), path, name, size, mtime, is_dir)
+        self.by_id.append(entry)
+        self.entries[path] = entry
+        self.by_ext.setdefault(entry.extension, set()).add(path)
+        for gram in trigrams(name):
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = array("I")
+            postings.append(entry.id)
+        if not is_dir and time.time() - mtime < HOT_WINDOW_S and len(self.hot) < HOT_LIMIT:
+            self.hot.add(path)
+        return entry
+
+
+def trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a glob where ``**`` spans directories and ``*``/``?`` stay within one."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (end := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : end]
+            out.append("[^" + body[1:] + "]" if body.startswith("!") else "[" + body + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def _literal_runs(pattern: str) -> list[str]:
+    """Wildcard-free pieces of a glob's last segment, longest first."""
+    name = re.sub(r"\[[^\]]*\]", "*", pattern.rsplit("/", 1)[-1])
+    return sorted((p for p in re.split(r"[*?]+", name) if p), key=len, reverse=True)
+
+
+class _Watcher(FileSystemEventHandler):  # pyre-ignore
+    """Collects the paths watchdog reports; the next refresh checks them."""
+
+    def __init__(self, service: "FileIndexService"):
+        super().__init__()
+        self.service = service
+
+    def on_any_event(self, event: Any) -> None:
+        if event.event_type in ("opened", "closed", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        with self.service._lock:
+            for path in paths:
+                if path:
+                    path = os.fsdecode(path)
+                    self.service._dirty.add(path)
+                    self.service._dirty.add(os.path.dirname(path))
+
+
+class FileIndexService:
+    """In-memory file index over ``roots``, mirrored into the FileIndex table."""
+
+    def __init__(
+        self,
+        roots: Iterable[str | Path] | None = None,
+        *,
+        db: DatabaseManager | None = None,
+        workers: int | None = None,
+        watch: bool = True,
+        poll_interval: float = 5.0,
+        full_scan_interval: float = 300.0,
+        ignored_dirs: Iterable[str] = (),
+    ):
+        self._configured_roots = list(roots) if roots is not None else None
+        self.db = db
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)  # I/O bound
+        self.watch = watch
+        self.poll_interval = poll_interval
+        self.full_scan_interval = full_scan_interval
+        self.ignored_dirs = IGNORED_DIRS | set(ignored_dirs)
+        self.roots: list[str] = []
+
+        self._use_view(_View())
+        self._dir_mtimes: dict[str, float] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._observer: Any = None
+        self._db_synced = False
+        self.ready = False
+        self.last_refresh = 0.0
+        self.last_full_scan = 0.0
+        self.stats: dict[str, Any] = {"scans": 0, "refreshes": 0, "hashed": 0}
+
+    # ---------------------------------------------------------------- lifecycle
+
+    def _resolve_roots(self) -> list[str]:
+        roots = self._configured_roots
+        if roots is None:
+            roots = config.get("file_index.roots", None) or [
+                config.get("system.workspace_path", str(WORKSPACE_DIR))
+            ]
+        resolved = []
+        for root in roots:
+            path = Path(os.path.expandvars(str(root))).expanduser().resolve()
+            if path.is_dir():
+                resolved.append(str(path))
+        return resolved
+
+    async def start(self) -> dict[str, Any]:
+        """Initial parallel scan, reconcile with the table, then start watching."""
+        async with self._refresh_lock:
+            if self.ready:
+                return {"files": len(self._entries)}
+            t0 = time.perf_counter()
+            self.roots = self._resolve_roots()
+            view, dir_mtimes = await asyncio.to_thread(self._scan_view)
+            self._use_view(view)
+            self._dir_mtimes = dir_mtimes
+            await self._sync_db()
+            self._start_watcher()
+            self.ready = True
+            self.last_refresh = self.last_full_scan = time.monotonic()
+            self.stats["scans"] += 1
+            elapsed = time.perf_counter() - t0
+            logger.info(
+                f"[FILE INDEX] {len(self._entries)} entries under {len(self.roots)} roots"
+                f" in {elapsed:.2f}s (watcher: {'on' if self._observer else 'off'})"
+            )
+            return {"files": len(self._entries), "elapsed_s": round(elapsed, 3)}
+
+    async def ensure_current(self) -> None:
+        """Start on first use, then refresh at most every ``poll_interval`` seconds."""
+        if not self.ready:
+            await self.start()
+        elif time.monotonic() - self.last_refresh >= self.poll_interval:
+            await self.refresh()
+
+    async def stop(self) -> None:
+        if self._observer is not None:
+            observer, self._observer = self._observer, None
+            observer.stop()
+            await asyncio.to_thread(observer.join, 5)
+
+    def _start_watcher(self) -> None:
+        if not self.watch or Observer is None or self._observer is not None:
+            return
+        try:
+            observer = Observer()
+            handler = _Watcher(self)
+            for root in self.roots:
+                observer.schedule(handler, root, recursive=True)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+        except Exception as e:  # e.g. inotify watch limit reached
+            logger.warning(f"[FILE INDEX] Watcher unavailable, polling instead: {e}")
+
+    # -------------------------------------------------------------------- scan
+
+    def _list_dir(self, directory: str) -> tuple[list[tuple[str, str, int, float, bool]], float]:
+        """(path, name, size, mtime, is_dir) of a directory's entries, plus its mtime."""
+        found = []
+        try:
+            dir_mtime = os.stat(directory).st_mtime
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in self.ignored_dirs:
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                            found.append((entry.path, entry.name, 0, st.st_mtime, True))
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            found.append((entry.path, entry.name, st.st_size, st.st_mtime, False))
+                    except OSError:
+                        continue
+        except OSError:
+            return [], -1.0
+        return [f for f in found if len(f[0]) <= MAX_PATH], dir_mtime
+
+    def _scan(
+        self, directories: Iterable[str]
+    ) -> tuple[list[tuple[str, str, int, float, bool]], dict[str, float]]:
+        """List ``directories`` and everything below them, one pool task per directory."""
+        scanned: list[tuple[str, str, int, float, bool]] = []
+        dir_mtimes: dict[str, float] = {}
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="file-index") as pool:
+            pending = {pool.submit(self._list_dir, d): d for d in directories}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory = pending.pop(future)
+                    found, dir_mtime = future.result()
+                    if dir_mtime < 0:
+                        continue
+                    dir_mtimes[directory] = dir_mtime
+                    scanned += found
+                    for path, _, _, _, is_dir in found:
+                        if is_dir:
+                            pending[pool.submit(self._list_dir, path)] = path
+        return scanned, dir_mtimes
+
+    # ----------------------------------------------------------- in-memory view
+
+    def _scan_view(self) -> tuple[_View, dict[str, float]]:
+        """Scan the roots and build their view (worker thread)."""
+        scanned, dir_mtimes = self._scan(self.roots)
+        return _View.build(scanned), dir_mtimes
+
+    def _use_view(self, view: _View) -> None:
+        self._view = view
+        self._entries = view.entries
+        self._by_id = view.by_id
+        self._by_ext = view.by_ext
+        self._postings = view.postings
+        self._hot = view.hot
+        self._by_mtime: list[FileEntry] | None = None  # files, newest first; rebuilt on change
+
+    def _add(self, path: str, name: str, size: int, mtime: float, is_dir: bool) -> FileEntry:
+        self._by_mtime = None
+        return self._view.add(path, name, size, mtime, is_dir)
+
+    def _remove(self, path: str) -> list[str]:
+        """Forget ``path`` and, for a directory, everything below it; the removed paths."""
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return []
+        removed = [path]
+        self._by_mtime = None
+        self._by_id[entry.id] = None
+        self._by_ext.get(entry.extension, set()).discard(path)
+        self._hot.discard(path)
+        if entry.is_dir:
+            self._dir_mtimes.pop(path, None)
+            prefix = path + os.sep
+            for child in [p for p in self._entries if p.startswith(prefix)]:
+                removed += self._remove(child)
+        return removed
+
+    async def _compact(self) -> None:
+        """Rebuild the id space once most ids belong to removed entries."""
+        if len(self._by_id) < 1024 or len(self._entries) * 2 > len(self._by_id):
+            return
+        entries = list(self._entries.values())
+        items = [(e.path, e.name, e.size, e.mtime, e.is_dir) for e in entries]
+        view = await asyncio.to_thread(_View.build, items)
+        view.hot = set(self._hot)
+        # content hashes, including any computed while the view was being built
+        for entry in entries:
+            if entry.content_hash is not None:
+                view.entries[entry.path].content_hash = entry.content_hash
+        self._use_view(view)
+
+    # ----------------------------------------------------------------- refresh
+
+    async def refresh(self, *, full: bool = False) -> dict[str, Any]:
+        """Bring the index up to date: watcher events, or changed directories and hot files."""
+        if not self.ready:
+            return await self.start()
+        async with self._refresh_lock:
+            t0 = time.perf_counter()
+            full = full or time.monotonic() - self.last_full_scan >= self.full_scan_interval
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            changes = await asyncio.to_thread(self._changes, dirty, full)
+            upserts, removed = self._apply(*changes)
+            if upserts or removed:
+                await self._persist(upserts, removed)
+            if not self._db_synced:
+                await self._sync_db()
+            await self._compact()
+            self.last_refresh = time.monotonic()
+            if full:
+                self.last_full_scan = self.last_refresh
+            self.stats["refreshes"] += 1
+            return {
+                "files": len(self._entries),
+                "upserted": len(upserts),
+                "removed": len(removed),
+                "full": full,
+                "elapsed_s": round(time.perf_counter() - t0, 3),
+            }
+
+    def _changes(
+        self, dirty: set[str], full: bool
+    ) -> tuple[list[tuple[str, str, int, float, bool]], set[str], dict[str, float]]:
+        """(entries seen in re-listed directories or re-stat'ed, paths gone, dir mtimes)."""
+        if full:
+            scanned, dir_mtimes = self._scan(self.roots)
+            seen = {item[0] for item in scanned}
+            gone = {p for p in self._entries if p not in seen}
+            return scanned, gone, dir_mtimes
+
+        relist: set[str] = set()
+        restat: set[str] = set(self._hot)
+        if self._observer is not None:
+            for path in dirty:
+                if path in self._dir_mtimes:
+                    relist.add(path)
+                elif path in self._entries:
+                    restat.add(path)
+        else:
+            for directory, known in self._dir_mtimes.items():
+                try:
+                    if os.stat(directory).st_mtime != known:
+                        relist.add(directory)
+                except OSError:
+                    relist.add(directory)
+
+        seen: list[tuple[str, str, int, float, bool]] = []
+        gone: set[str] = set()
+        dir_mtimes: dict[str, float] = {}
+        new_dirs: list[str] = []
+        children: dict[str, list[str]] = {}
+        if relist:
+            for path in self._entries:
+                parent = os.path.dirname(path)
+                if parent in relist:
+                    children.setdefault(parent, []).append(path)
+        for directory in relist:
+            found, dir_mtime = self._list_dir(directory)
+            if dir_mtime < 0:
+                gone.add(directory)
+                continue
+            dir_mtimes[directory] = dir_mtime
+            names = {item[0] for item in found}
+            gone.update(p for p in children.get(directory, ()) if p not in names)
+            for item in found:
+                seen.append(item)
+                if item[4] and item[0] not in self._dir_mtimes:
+                    new_dirs.append(item[0])
+        if new_dirs:
+            scanned, scanned_mtimes = self._scan(new_dirs)
+            seen += scanned
+            dir_mtimes.update(scanned_mtimes)
+        for path in restat - {item[0] for item in seen}:
+            try:
+                st = os.stat(path)
+            except OSError:
+                gone.add(path)
+                continue
+            seen.append((path, os.path.basename(path), st.st_size, st.st_mtime, False))
+        return seen, gone, dir_mtimes
+
+    def _apply(
+        self,
+        seen: list[tuple[str, str, int, float, bool]],
+        gone: set[str],
+        dir_mtimes: dict[str, float],
+    ) -> tuple[list[FileEntry], list[str]]:
+        removed: list[str] = []
+        for path in sorted(gone):  # parents first: their subtree goes with them
+            removed += self._remove(path)
+        upserts = []
+        now = time.time()
+        for path, name, size, mtime, is_dir in seen:
+            entry = self._entries.get(path)
+            if entry is not None and entry.is_dir == is_dir:
+                if (entry.size, entry.mtime) == (size, mtime):
+                    continue
+                entry.size, entry.mtime, entry.content_hash = size, mtime, None
+                self._by_mtime = None
+                if not is_dir and now - mtime < HOT_WINDOW_S and len(self._hot) < HOT_LIMIT:
+                    self._hot.add(path)
+                upserts.append(entry)
+                continue
+            if entry is not None:
+                removed += self._remove(path)
+            upserts.append(self._add(path, name, size, mtime, is_dir))
+        self._dir_mtimes.update(dir_mtimes)
+        for path in list(self._hot):
+            entry = self._entries.get(path)
+            if entry is None or now - entry.mtime >= HOT_WINDOW_S:
+                self._hot.discard(path)
+        upserted = {e.path for e in upserts}
+        return upserts, [p for p in removed if p not in upserted]
+
+    # ---------------------------------------------------------------- database
+
+    def _database(self) -> DatabaseManager | None:
+        db = self.db or db_manager
+        return db if db.available else None
+
+    def _root_filter(self) -> Any:
+        clauses = []
+        for root in self.roots:
+            escaped = root.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses += [
+                FileIndex.path == root,
+                FileIndex.path.like(escaped + os.sep + "%", escape="\\"),
+            ]
+        return or_(*clauses)
+
+    async def _sync_db(self) -> None:
+        """Reconcile the table with the in-memory view; keeps stored hashes of unchanged files."""
+        db = self._database()
+        if db is None or not self.roots:
+            return
+        try:
+            async with await db.get_session() as session:
+                result = await session.execute(
+                    select(
+                        FileIndex.path, FileIndex.size, FileIndex.mtime, FileIndex.content_hash
+                    ).where(self._root_filter())
+                )
+                stored = {row[0]: row[1:] for row in result}
+            upserts = []
+            for path, entry in self._entries.items():
+                row = stored.pop(path, None)
+                if row is not None and (row[0], row[1]) == (entry.size, entry.mtime):
+                    entry.content_hash = entry.content_hash or row[2]
+                    continue
+                upserts.append(entry)
+            await self._persist(upserts, list(stored))
+            self._db_synced = True
+        except Exception as e:
+            logger.warning(f"[FILE INDEX] Could not sync the files table: {e}")
+
+    async def _persist(self, upserts: list[FileEntry], removed: list[str]) -> None:
+        db = self._database()
+        if db is None:
+            self._db_synced = False
+            return
+        stale = removed + [e.path for e in upserts]
+        try:
+            async with db.write_session() as session:
+                for i in range(0, len(stale), DB_CHUNK):
+                    await session.execute(
+                        delete(FileIndex).where(FileIndex.path.in_(stale[i : i + DB_CHUNK]))
+                    )
+                rows = [e.row() for e in upserts]
+                for i in range(0, len(rows), 10_000):
+                    await session.execute(insert(FileIndex), rows[i : i + 10_000])
+                await session.commit()
+        except Exception as e:
+            self._db_synced = False  # reconciled on the next refresh
+            logger.warning(f"[FILE INDEX] Could not update the files table: {e}")
+
+    # ------------------------------------------------------------------ hashes
+
+    async def content_hash(self, path: str | Path) -> str | None:
+        """sha256 of a file's content, computed on first request and stored."""
+        return (await self.content_hashes([path])).get(str(path))
+
+    async def content_hashes(self, paths: Iterable[str | Path]) -> dict[str, str | None]:
+        wanted = {str(p): self._entries.get(str(p)) for p in paths}
+        missing = [
+            e for e in wanted.values() if e is not None and not e.is_dir and not e.content_hash
+        ]
+        if missing:
+            digests = await asyncio.to_thread(lambda: [_sha256(e.path) for e in missing])
+            updates = []
+            for entry, digest in zip(missing, digests, strict=True):
+                if digest is not None:
+                    entry.content_hash = digest
+                    updates.append({"p": entry.path, "h": digest})
+            self.stats["hashed"] += len(updates)
+            db = self._database()
+            if db is not None and updates:
+                try:
+                    table = FileIndex.__table__
+                    stmt = (
+                        update(table)
+                        .where(table.c.path == bindparam("p"))
+                        .values(content_hash=bindparam("h"))
+                    )
+                    async with db.write_session() as session:
+                        await session.execute(stmt, updates)
+                        await session.commit()
+                except Exception as e:
+                    logger.warning(f"[FILE INDEX] Could not store content hashes: {e}")
+        return {p: (e.content_hash if e else None) for p, e in wanted.items()}
+
+    # ----------------------------------------------------------------- queries
+
+    def _under(self, root: str | Path | None) -> str | None:
+        return None if root is None else os.path.join(str(Path(root).expanduser()), "")
+
+    def glob(
+        self, pattern: str, *, root: str | Path | None = None, limit: int | None = 200
+    ) -> list[FileEntry]:
+        """Files matching ``pattern`` relative to ``root`` (or to any indexed root), by path."""
+        regex = glob_to_regex(pattern)
+        bases = (
+            [self._under(root)] if root is not None else [os.path.join(r, "") for r in self.roots]
+        )
+        runs = _literal_runs(pattern)
+        extension = os.path.splitext(pattern)[1].lower()
+        if runs and len(runs[0]) >= 3:
+            by_id = self._by_id
+            candidates: Iterable[FileEntry | None] = (by_id[i] for i in self._trigram_ids(runs[0]))
+        elif extension and not re.search(r"[*?\[]", extension):
+            candidates = (self._entries[p] for p in self._by_ext.get(extension, ()))
+        else:
+            candidates = self._entries.values()
+        # the last segment must match the name: a cheap test before the full path
+        last = pattern.rsplit("/", 1)[-1]
+        name_match = None if "**" in last else glob_to_regex(last).match
+        found = []
+        for entry in candidates:
+            if entry is None or entry.is_dir or (name_match and not name_match(entry.name)):
+                continue
+            for base in bases:
+                if entry.path.startswith(base) and regex.match(entry.path[len(base) :]):
+                    found.append(entry)
+                    break
+        found.sort(key=lambda e: e.path)
+        return found[:limit] if limit else found
+
+    def by_extension(
+        self, extension: str, *, root: str | Path | None = None, limit: int | None = 200
+    ) -> list[FileEntry]:
+        extension = extension.lower() if extension.startswith(".") else f".{extension.lower()}"
+        base = self._under(root)
+        paths = sorted(
+            p for p in self._by_ext.get(extension, ()) if base is None or p.startswith(base)
+        )
+        return [self._entries[p] for p in (paths[:limit] if limit else paths)]
+
+    def recent(
+        self,
+        limit: int = 20,
+        *,
+        root: str | Path | None = None,
+        extension: str | None = None,
+        since: float | None = None,
+    ) -> list[FileEntry]:
+        """Most recently modified files, newest first."""
+        if self._by_mtime is None:
+            files = (e for e in self._entries.values() if not e.is_dir)
+            self._by_mtime = sorted(files, key=lambda e: e.mtime, reverse=True)
+        if extension:
+            extension = extension.lower() if extension.startswith(".") else f".{extension.lower()}"
+        base = self._under(root)
+        found = []
+        for entry in self._by_mtime:
+            if since is not None and entry.mtime < since:
+                break
+            if (base is None or entry.path.startswith(base)) and (
+                not extension or entry.extension == extension
+            ):
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def _name_candidates(self, text: str) -> list[FileEntry]:
+        """Live entries whose name contains ``text`` (case-insensitive)."""
+        text = text.lower()
+        if len(text) < 3:
+            return [e for e in self._entries.values() if text in e.name.lower()]
+        found = []
+        for i in self._trigram_ids(text):
+            entry = self._by_id[i]
+            if entry is not None and text in entry.name.lower():
+                found.append(entry)
+        return found
+
+    def _trigram_ids(self, text: str) -> set[int]:
+        """Ids whose name has every trigram of ``text``; may include removed entries."""
+        lists = sorted((self._postings.get(g, array("I")) for g in trigrams(text)), key=len)
+        ids = set(lists[0])
+        for postings in lists[1:]:
+            if not ids:
+                break
+            ids.intersection_update(postings)
+        return ids
+
+    def search(
+        self, query: str, *, limit: int = 20, root: str | Path | None = None
+    ) -> list[FileEntry]:
+        """Files and directories by name: substring matches, then trigram-similar names."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        base = self._under(root)
+        in_root = [
+            e for e in self._name_candidates(query) if base is None or e.path.startswith(base)
+        ]
+
+        def rank(entry: FileEntry) -> tuple[Any, ...]:
+            name = entry.name.lower()
+            stem = os.path.splitext(name)[0]
+            return (
+                query not in (name, stem),
+                not name.startswith(query),
+                len(name),
+                -entry.mtime,
+            )
+
+        found = sorted(in_root, key=rank)[:limit]
+        grams = trigrams(query)
+        if len(found) < limit and len(grams) > 1:
+            seen = {e.id for e in found}
+            hits: Counter[int] = Counter()
+            for gram in grams:
+                hits.update(self._postings.get(gram, ()))
+            fuzzy = []
+            for i, count in hits.items():
+                entry = self._by_id[i]
+                if entry is None or i in seen or count * 2 < len(grams):
+                    continue
+                if base is None or entry.path.startswith(base):
+                    score = count / len(grams | trigrams(entry.name))
+                    fuzzy.append((-score, len(entry.name), entry.path, entry))
+            found += [item[3] for item in heapq.nsmallest(limit - len(found), fuzzy)]
+        return found
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "roots": self.roots,
+            "entries": len(self._entries),
+            "directories": len(self._dir_mtimes),
+            "watcher": self._observer is not None,
+            "db_synced": self._db_synced,
+            **self.stats,
+        }
+
+
+def _sha256(path: str) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+async def workspace_files_context(
+    query: str, service: FileIndexService | None = None, *, limit: int = 8
+) -> str:
+    """Indexed files matching the file names, paths or globs mentioned in ``query``."""
+    tokens = [t.strip(".,:;!?()'\"`") for t in _FILE_TOKEN.findall(query)]
+    tokens = [t for t in dict.fromkeys(tokens) if len(t) >= 3]
+    if not tokens:
+        return ""
+    service = service or file_index
+    await service.ensure_current()
+    lines: list[str] = []
+    seen: set[str] = set()
+    for token in tokens[:5]:
+        if any(c in token for c in "*?["):
+            matches = service.glob(token if "/" in token else f"**/{token}", limit=limit)
+        else:
+            matches = service.search(token.rsplit("/", 1)[-1], limit=limit)
+            if "/" in token:
+                matches = [e for e in matches if e.path.endswith(token)] or matches
+        for entry in matches:
+            if entry.path not in seen and len(lines) < limit:
+                seen.add(entry.path)
+                modified = datetime.fromtimestamp(entry.mtime).strftime("%Y-%m-%d %H:%M")
+                kind = "dir" if entry.is_dir else f"{entry.size} B"
+                lines.append(f"- {entry.path} ({kind}, modified {modified})")
+    return "Workspace files:\n" + "\n".join(lines) if lines else ""
+
+
+file_index = FileIndexService()
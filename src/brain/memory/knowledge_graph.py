@@ -57,7 +57,7 @@ class KnowledgeGraph:
         attributes = attributes or {}
 
         try:
-            async with await db_manager.get_session() as session:
+            async with db_manager.write_session() as session:
                 # Attempt insert; if it conflicts (existing id), update fields
                 try:
                     new_node = KGNode(
@@ -149,7 +149,7 @@ class KnowledgeGraph:
             return False
 
         try:
-            async with await db_manager.get_session() as session:
+            async with db_manager.write_session() as session:
                 new_edge = KGEdge(
                     source_id=source_id,
                     target_id=target_id,
@@ -210,7 +210,8 @@ class KnowledgeGraph:
                     },
                 )
 
-            async with await db_manager.get_session() as session:
+            conflict = False
+            async with db_manager.write_session() as session:
                 # Use bulk upsert/insert logic
                 # For SQLite, we can't easily do 'on conflict', but for new batches we use insert
                 # To be safe and simple, we do it in a loop if overhead is low,
@@ -223,16 +224,19 @@ class KnowledgeGraph:
                     await session.commit()
                 except IntegrityError:
                     await session.rollback()
-                    # Fallback to individual add for mixed state
-                    for row in rows:
-                        await self.add_node(
-                            node_type=str(row["type"]),
-                            node_id=str(row["id"]),
-                            attributes=cast("dict[str, Any]", row["attributes"]),
-                            namespace=str(row["namespace"]),
-                            task_id=cast("str | None", row["task_id"]),
-                            sync_to_vector=True,  # Batch vectorization is harder
-                        )
+                    conflict = True
+
+            if conflict:
+                # Fallback to individual add for mixed state (each takes its own write slot)
+                for row in rows:
+                    await self.add_node(
+                        node_type=str(row["type"]),
+                        node_id=str(row["id"]),
+                        attributes=cast("dict[str, Any]", row["attributes"]),
+                        namespace=str(row["namespace"]),
+                        task_id=cast("str | None", row["task_id"]),
+                        sync_to_vector=True,  # Batch vectorization is harder
+                    )
 
             return {"success": True, "count": len(nodes)}
         except Exception as e:
@@ -252,7 +256,7 @@ class KnowledgeGraph:
             return False
 
         try:
-            async with await db_manager.get_session() as session:
+            async with db_manager.write_session() as session:
                 # 1. Update Node in SQL
                 existing = await session.get(KGNode, node_id)
                 if not existing:
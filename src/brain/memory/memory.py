@@ -504,7 +504,7 @@ class LongTermMemory:
                             logger.warning("[MEMORY] Skipping SQL sync: session_id is missing")
                             return
 
-                        async with await db_manager.get_session() as session:
+                        async with db_manager.write_session() as session:
                             # Validate step_id is a valid UUID
                             step_uuid = context.get("step_id")
                             try:
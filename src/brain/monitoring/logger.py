@@ -1,12 +1,34 @@
+"""Brain logging setup.
+
+Callers only pay for a queue put: the "brain" logger has a single
+``MaskingQueueHandler`` that formats each record's message once, masks it once
+and hands it to a ``QueueListener`` thread. The listener fans the record out to
+the rotating file, the console and the UI handler; the UI handler publishes to
+Redis in small batches on the application's event loop.
+"""
+
+import asyncio
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from .utils.security import mask_sensitive_data  # pyre-ignore
 
+# Running queue listeners by logger name
+_listeners: dict[str, QueueListener] = {}
+
 
 class SecretFilter(logging.Filter):
-    """Filter that masks sensitive information in logs."""
+    """Filter that masks sensitive information in logs.
+
+    The "brain" logger masks in ``MaskingQueueHandler``; this filter is kept for
+    handlers attached elsewhere.
+    """
 
     def __init__(self, name: str = ""):
         super().__init__(name)
@@ -29,6 +51,110 @@ class SecretFilter(logging.Filter):
         return True
 
 
+class UIHandler(logging.Handler):
+    """Streams log entries to Redis for Electron, batched per ``interval``.
+
+    Runs on the listener thread: entries are buffered (bounded, oldest dropped)
+    and one flush per interval is scheduled on the bound event loop, which
+    publishes the whole batch in a single pipeline.
+    """
+
+    def __init__(
+        self, level: int = logging.NOTSET, *, interval: float = 0.1, max_pending: int = 1000
+    ):
+        super().__init__(level)
+        self.interval = interval
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._pending: deque[dict] = deque(maxlen=max_pending)
+        self._scheduled = False
+        self._schedule_lock = threading.Lock()
+
+    def bind_running_loop(self) -> None:
+        """Remember the caller's running event loop (if any) for publishing."""
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            return
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop in this thread
+            pass
+
+    def emit(self, record):
+        loop = self.loop
+        if loop is None or loop.is_closed() or not loop.is_running():
+            return
+        try:
+            self._pending.append(
+                {
+                    "source": record.name,
+                    "type": record.levelname.lower(),
+                    "content": self.format(record),
+                    # Format: HH:MM
+                    "timestamp": datetime.fromtimestamp(record.created).strftime("%H:%M"),
+                }
+            )
+            with self._schedule_lock:
+                if self._scheduled:
+                    return
+                self._scheduled = True
+            asyncio.run_coroutine_threadsafe(self._flush(), loop)
+        except RuntimeError:
+            # Loop closed between the check and scheduling
+            self._scheduled = False
+        except Exception:
+            pass
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.interval)
+        with self._schedule_lock:
+            self._scheduled = False
+        entries = []
+        while self._pending:
+            try:
+                entries.append(self._pending.popleft())
+            except IndexError:
+                break
+        if not entries:
+            return
+
+        # Local import to avoid circular dependency with setup_logging
+        from src.brain.core.services.state_manager import state_manager  # pyre-ignore
+
+        await state_manager.publish_events("logs", entries)
+
+
+class MaskingQueueHandler(QueueHandler):
+    """Queue front end: message formatted and masked once per record."""
+
+    def __init__(self, log_queue, ui_handler: UIHandler | None = None):
+        super().__init__(log_queue)
+        self.ui_handler = ui_handler
+
+    def prepare(self, record):
+        # Merges args and traceback into the message, then masks the result
+        record = super().prepare(record)
+        record.msg = record.message = mask_sensitive_data(record.msg)
+        return record
+
+    def emit(self, record):
+        if self.ui_handler is not None:
+            self.ui_handler.bind_running_loop()
+        super().emit(record)
+
+
+def _stop_listener(name: str) -> None:
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+def _stop_listeners() -> None:
+    """Drain and stop every listener (registered with atexit)."""
+    for name in list(_listeners):
+        _stop_listener(name)
+
+
 def setup_logging(name: str = "brain"):
     """Setup logging configuration"""
     from src.brain.config import LOG_DIR  # pyre-ignore
@@ -46,6 +172,7 @@ def setup_logging(name: str = "brain"):
 
     # Clear any existing handlers to prevent duplicates
     logger.handlers.clear()
+    _stop_listener(name)
 
     # File Handler (Rotating)
     # Max 10MB per file, keep 5 backups
@@ -58,76 +185,35 @@ def setup_logging(name: str = "brain"):
     file_handler.setLevel(logging.INFO)
     file_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     file_handler.setFormatter(file_formatter)
-    file_handler.addFilter(SecretFilter())
-    logger.addHandler(file_handler)
+    handlers: list[logging.Handler] = [file_handler]
 
     # Stream Handler (Console)
     stream_handler = logging.StreamHandler()
     stream_handler.setLevel(logging.INFO)
     stream_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     stream_handler.setFormatter(stream_formatter)
-    stream_handler.addFilter(SecretFilter())
-    logger.addHandler(stream_handler)
+    handlers.append(stream_handler)
 
     # UI Log Handler (Streams to Redis for Electron)
+    ui_handler = None
     try:
-
-        class UIHandler(logging.Handler):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
-                self._is_emitting = False
-
-            def emit(self, record):
-                if self._is_emitting:
-                    return
-
-                try:
-                    self._is_emitting = True
-                    import asyncio
-                    from datetime import datetime
-
-                    # Local import to avoid circular dependency with setup_logging
-                    from src.brain.core.services.state_manager import state_manager  # pyre-ignore
-
-                    # Format: HH:MM
-                    log_time = datetime.fromtimestamp(record.created).strftime("%H:%M")
-                    log_entry = {
-                        "source": record.name,
-                        "type": record.levelname.lower(),
-                        "content": self.format(record),
-                        "timestamp": log_time,
-                    }
-
-                    # Use fire-and-forget task if loop is running
-                    try:
-                        # Try to get the current loop, if it exists and is running
-                        loop = None
-                        try:
-                            loop = asyncio.get_running_loop()
-                        except RuntimeError:
-                            # No running loop in this thread
-                            pass
-
-                        if loop and loop.is_running() and not loop.is_closed():
-                            loop.create_task(state_manager.publish_event("logs", log_entry))
-                    except (RuntimeError, AttributeError):
-                        # Fallback for synchronous contexts or closed loop
-                        pass
-                except Exception:
-                    pass
-                finally:
-                    self._is_emitting = False
-
         ui_handler = UIHandler()
         ui_handler.setLevel(logging.INFO)
         # Cleaner formatter for UI: [SOURCE] MESSAGE
         ui_formatter = logging.Formatter("[%(name)s] %(message)s")
         ui_handler.setFormatter(ui_formatter)
-        ui_handler.addFilter(SecretFilter())
-        logger.addHandler(ui_handler)
+        handlers.append(ui_handler)
     except Exception as e:
         print(f"Failed to setup UI Log Handler: {e}", file=sys.stderr)
 
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(MaskingQueueHandler(log_queue, ui_handler))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+    atexit.unregister(_stop_listeners)
+    atexit.register(_stop_listeners)
+
     return logger
 
 
@@ -94,13 +94,17 @@ class MetricsCollector:
 
                 monitoring_system = get_monitoring_system()
 
-                monitoring_system.log_for_grafana(
-                    f"Custom metric: {name} = {value}",
-                    level="info",
-                    metric_name=name,
-                    metric_value=value,
-                    tags=tags or {},
-                )
+                if isinstance(value, int | float) and not isinstance(value, bool):
+                    # numeric series are downsampled into rollups, not one row per sample
+                    monitoring_system.record_metric(name, value, tags)
+                else:
+                    monitoring_system.log_for_grafana(
+                        f"Custom metric: {name} = {value}",
+                        level="info",
+                        metric_name=name,
+                        metric_value=value,
+                        tags=tags or {},
+                    )
             except ImportError:
                 # Monitoring system not available, continue without it
                 pass
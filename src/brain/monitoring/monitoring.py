@@ -13,6 +13,8 @@ from opentelemetry.sdk.trace import TracerProvider  # pyre-ignore
 from opentelemetry.sdk.trace.export import BatchSpanProcessor  # pyre-ignore
 from prometheus_client import Counter, Gauge, Histogram, start_http_server  # pyre-ignore
 
+from .telemetry import TelemetryStore
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -27,7 +29,7 @@ class MonitoringSystem:
     Provides:
     - Real-time metrics (Prometheus - embedded)
     - Tracing (OpenTelemetry)
-    - Persistent Logs & Metrics (SQLite)
+    - Persistent Logs & Metrics (SQLite, written behind by TelemetryStore)
     """
 
     # Metrics collectors (declared for Pyre2)
@@ -73,6 +75,7 @@ class MonitoringSystem:
         # Initialize SQLite for Logs/Metrics
         self.db_path = Path.home() / ".config" / "atlastrinity" / "data" / "monitoring.db"
         self._init_db()
+        self.telemetry = self._create_telemetry_store()
 
         # Initialize metrics collectors
         self._initialize_metrics()
@@ -90,6 +93,7 @@ class MonitoringSystem:
         try:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
             with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
                 # Logs table
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS logs (
@@ -138,18 +142,38 @@ class MonitoringSystem:
         except Exception as e:
             logger.error(f"Failed to init monitoring DB: {e}")
 
+    def _create_telemetry_store(self) -> TelemetryStore:
+        """Write-behind store over the monitoring DB (monitoring.storage.* settings)."""
+        storage = self.config.get("storage", {})
+        retention_days = storage.get("retention_days", {})
+        rollup_retention_hours = storage.get("rollup_retention_hours", {})
+        return TelemetryStore(
+            self.db_path,
+            flush_interval=float(storage.get("flush_interval", 0.5)),
+            batch_size=int(storage.get("batch_size", 5000)),
+            max_pending=int(storage.get("max_pending", 100_000)),
+            retention={table: days * 86400 for table, days in retention_days.items()},
+            rollup_retention={res: hours * 3600 for res, hours in rollup_retention_hours.items()},
+        )
+
     def _save_to_db(self, table: str, data: dict):
-        """Helper to save dict data to SQLite."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                columns = ", ".join(data.keys())
-                placeholders = ", ".join(["?"] * len(data))
-                sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-                conn.execute(sql, list(data.values()))
-                conn.commit()
-        except Exception as e:
-            # Don't crash app on monitoring failure
-            logger.error(f"Failed to write to monitoring DB ({table}): {e}")
+        """Queue a row for the monitoring DB (written in batches by the telemetry thread)."""
+        if not self.telemetry.put(table, data):
+            # Queue full: the row is counted in telemetry stats instead of blocking
+            logger.debug(f"Telemetry queue full, dropped {table} row")
+
+    def record_metric(self, name: str, value: float, tags: dict[str, Any] | None = None) -> None:
+        """
+        Record a sample of a numeric metric series.
+
+        Samples are stored as 1s/1m/1h rollups (count/sum/min/max/last).
+
+        Args:
+            name: Metric name
+            value: Numeric sample
+            tags: Optional tags; each distinct tag set is its own series
+        """
+        self.telemetry.record_metric(name, value, tags)
 
     def _load_config(self) -> dict[str, Any]:
         """
@@ -167,6 +191,7 @@ class MonitoringSystem:
                 "opensearch": monitoring_config.get_opensearch_config(),
                 "tracing": monitoring_config.get_tracing_config(),
                 "etl": monitoring_config.get_etl_config(),
+                "storage": monitoring_config.get_storage_config(),
             }
         except ImportError:
             logger.warning("Monitoring config not available, using defaults")
@@ -317,6 +342,8 @@ class MonitoringSystem:
                 "metric_snapshots",
                 {"timestamp": metrics["timestamp"], "metrics": json.dumps(metrics)},
             )
+            self.record_metric("system.cpu_usage_percent", cpu_percent)
+            self.record_metric("system.memory_used_bytes", mem.used)
 
             return metrics
 
@@ -346,6 +373,7 @@ class MonitoringSystem:
                     "duration": duration,
                 },
             )
+            self.record_metric("request.duration", duration, {"request_type": request_type})
 
             logger.info(
                 f"Recorded {request_type} request: status={status}, duration={duration:.2f}s"
@@ -451,6 +479,7 @@ class MonitoringSystem:
                     "active_requests": int(self.active_requests._value.get()),
                     "timestamp": datetime.now().isoformat(),
                 },
+                "telemetry": self.telemetry.stats(),
             }
         except Exception as e:
             logger.error(f"Error getting metrics snapshot: {e}")
@@ -530,10 +559,10 @@ class MonitoringSystem:
             True if monitoring system is operational, False otherwise
         """
         try:
-            # Check if we can write to DB
+            # Check if we can write to DB and the writer thread keeps up
             with sqlite3.connect(str(self.db_path)) as conn:
                 conn.execute("SELECT 1")
-            return True
+            return self.telemetry.is_alive()
         except Exception:
             return False
 
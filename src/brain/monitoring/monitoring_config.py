@@ -65,6 +65,10 @@ class MonitoringConfig:
         """Get ETL monitoring configuration."""
         return cast("dict[str, Any]", self._get_config_section().get("etl", {}))
 
+    def get_storage_config(self) -> dict[str, Any]:
+        """Get local telemetry storage configuration (write-behind, retention)."""
+        return cast("dict[str, Any]", self._get_config_section().get("storage", {}))
+
     def get_alerts_config(self) -> dict[str, Any]:
         """Get alerts configuration."""
         return cast("dict[str, Any]", self._get_config_section().get("alerts", {}))
@@ -0,0 +1,357 @@
+"""
+Telemetry Store
+
+Write-behind storage for MonitoringSystem's SQLite database:
+- Callers append events to a deque (no lock on the hot path) and return
+  immediately; past ``max_pending`` queued events new ones are dropped and
+  counted instead of blocking the application
+- A dedicated writer thread drains the queue in batched transactions over one
+  persistent WAL connection
+- Numeric metric series are downsampled into 1s/1m/1h rollups
+  (count/sum/min/max/last) instead of one row per sample
+- Retention policies delete expired rows incrementally (bounded per pass)
+- ``stats()`` exposes queue depth, lag, drops and write counters
+"""
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Rollup resolutions: name -> bucket width in seconds
+ROLLUPS: dict[str, int] = {"1s": 1, "1m": 60, "1h": 3600}
+
+# Default retention in seconds per table (rows keyed by ISO ``timestamp``)
+DEFAULT_RETENTION: dict[str, float] = {
+    "logs": 14 * 86400,
+    "request_logs": 30 * 86400,
+    "metric_snapshots": 7 * 86400,
+    "healing_events": 90 * 86400,
+}
+
+# Default retention in seconds per rollup resolution
+DEFAULT_ROLLUP_RETENTION: dict[str, float] = {
+    "1s": 6 * 3600,
+    "1m": 14 * 86400,
+    "1h": 400 * 86400,
+}
+
+_METRIC = "__metric__"
+_BARRIER = "__barrier__"
+
+_UPSERT_ROLLUP = """
+    INSERT INTO metric_rollups
+        (resolution, bucket, name, tags, count, total, value_min, value_max, last)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (resolution, name, tags, bucket) DO UPDATE SET
+        count = count + excluded.count,
+        total = total + excluded.total,
+        value_min = MIN(value_min, excluded.value_min),
+        value_max = MAX(value_max, excluded.value_max),
+        last = excluded.last
+"""
+
+
+class TelemetryStore:
+    """Write-behind queue + single writer thread for the monitoring database."""
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        *,
+        flush_interval: float = 0.5,
+        batch_size: int = 5000,
+        max_pending: int = 100_000,
+        retention: dict[str, float] | None = None,
+        rollup_retention: dict[str, float] | None = None,
+        retention_interval: float = 60.0,
+        retention_batch: int = 2000,
+    ):
+        self.db_path = str(db_path)
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max_pending
+        self.retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self.rollup_retention = {**DEFAULT_ROLLUP_RETENTION, **(rollup_retention or {})}
+        self.retention_interval = retention_interval
+        self.retention_batch = retention_batch
+
+        self._queue: deque[tuple[float, str, Any]] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._drop_lock = threading.Lock()
+        self._sql: dict[tuple[str, tuple[str, ...]], str] = {}
+
+        # Counters: ``dropped`` is written by callers (under _drop_lock, off the
+        # hot path); everything else only by the writer thread
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.rollup_points = 0
+        self.retention_deleted = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.last_flush_ms = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------ callers
+
+    def put(self, table: str, row: dict[str, Any]) -> bool:
+        """Queue one row for ``table``. Returns False if it was dropped."""
+        return self._enqueue(table, row)
+
+    def record_metric(
+        self,
+        name: str,
+        value: float,
+        tags: dict[str, Any] | None = None,
+        timestamp: float | None = None,
+    ) -> bool:
+        """Queue one sample of a numeric series; it is stored only as rollups."""
+        key = json.dumps(tags, sort_keys=True, default=str) if tags else ""
+        return self._enqueue(_METRIC, (name, key, float(value), timestamp or time.time()))
+
+    def _enqueue(self, kind: str, payload: Any) -> bool:
+        if len(self._queue) >= self.max_pending:
+            with self._drop_lock:
+                self.dropped += 1
+            return False
+        self._queue.append((time.time(), kind, payload))
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued before this call is committed."""
+        if not self._thread.is_alive():
+            return not self._queue
+        done = threading.Event()
+        self._queue.append((time.time(), _BARRIER, done))
+        self._wake.set()
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the writer after a final drain."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def lag(self) -> float:
+        """Age in seconds of the oldest event still waiting to be written."""
+        try:
+            return max(0.0, time.time() - self._queue[0][0])
+        except IndexError:
+            return 0.0
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "lag_ms": round(self.lag * 1000, 1),
+            "last_commit_lag_ms": round(self.last_lag * 1000, 1),
+            "max_commit_lag_ms": round(self.max_lag * 1000, 1),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "rollup_points": self.rollup_points,
+            "retention_deleted": self.retention_deleted,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "writer_alive": self.is_alive(),
+        }
+
+    def read_rollups(
+        self, name: str, resolution: str = "1m", since: float | None = None
+    ) -> list[dict[str, Any]]:
+        """Rollup buckets of a series (oldest first), read on a separate connection."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(
+                """
+                SELECT bucket, tags, count, total, value_min, value_max, last
+                FROM metric_rollups
+                WHERE resolution = ? AND name = ? AND bucket >= ?
+                ORDER BY bucket, tags
+                """,
+                (resolution, name, int(since or 0)),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {**dict(row), "tags": json.loads(row["tags"]) if row["tags"] else {}} for row in rows
+        ]
+
+    # ------------------------------------------------------------ writer thread
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS metric_rollups (
+                resolution TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                total REAL NOT NULL,
+                value_min REAL NOT NULL,
+                value_max REAL NOT NULL,
+                last REAL NOT NULL,
+                PRIMARY KEY (resolution, name, tags, bucket)
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_metric_rollups_bucket "
+            "ON metric_rollups (resolution, bucket)"
+        )
+        conn.commit()
+        return conn
+
+    def _run(self) -> None:
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"Telemetry store unavailable ({self.db_path}): {e}")
+            return
+        next_retention = time.monotonic() + self.retention_interval
+        try:
+            while not self._stop.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._drain(conn)
+                if time.monotonic() >= next_retention:
+                    backlog = self._apply_retention(conn)
+                    # keep deleting on the next cycles while a table is behind
+                    delay = self.flush_interval if backlog else self.retention_interval
+                    next_retention = time.monotonic() + delay
+            self._drain(conn)
+        finally:
+            conn.close()
+
+    def _drain(self, conn: sqlite3.Connection) -> None:
+        while self._queue:
+            batch = []
+            for _ in range(self.batch_size):
+                try:
+                    batch.append(self._queue.popleft())
+                except IndexError:
+                    break
+            self._write(conn, batch)
+
+    def _write(self, conn: sqlite3.Connection, batch: list[tuple[float, str, Any]]) -> None:
+        started = time.perf_counter()
+        tables: dict[tuple[str, tuple[str, ...]], list[tuple[Any, ...]]] = {}
+        rollups: dict[tuple[str, int, str, str], list[float]] = {}
+        barriers: list[threading.Event] = []
+        events = 0
+        for _, table, payload in batch:
+            if table == _BARRIER:
+                barriers.append(payload)
+                continue
+            events += 1
+            if table == _METRIC:
+                name, tags, value, ts = payload
+                for resolution, width in ROLLUPS.items():
+                    key = (resolution, int(ts // width) * width, name, tags)
+                    agg = rollups.get(key)
+                    if agg is None:
+                        rollups[key] = [1, value, value, value, value]
+                    else:
+                        agg[0] += 1
+                        agg[1] += value
+                        agg[2] = min(agg[2], value)
+                        agg[3] = max(agg[3], value)
+                        agg[4] = value
+                continue
+            tables.setdefault((table, tuple(payload)), []).append(tuple(payload.values()))
+
+        try:
+            with conn:
+                for (table, columns), rows in tables.items():
+                    conn.executemany(self._insert_sql(table, columns), rows)
+                conn.executemany(_UPSERT_ROLLUP, [(*key, *agg) for key, agg in rollups.items()])
+            self.written += events
+            self.rollup_points += len(rollups)
+        except sqlite3.Error as e:
+            self.failed += events
+            logger.error(f"Failed to write {events} telemetry events: {e}")
+        finally:
+            for done in barriers:
+                done.set()
+
+        self.batches += 1
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        if batch:
+            self.last_lag = time.time() - batch[0][0]
+            self.max_lag = max(self.max_lag, self.last_lag)
+
+    def _insert_sql(self, table: str, columns: tuple[str, ...]) -> str:
+        sql = self._sql.get((table, columns))
+        if sql is None:
+            placeholders = ", ".join(["?"] * len(columns))
+            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+            self._sql[(table, columns)] = sql
+        return sql
+
+    def _apply_retention(self, conn: sqlite3.Connection) -> bool:
+        """Delete up to ``retention_batch`` expired rows per table.
+
+        Returns True when some table still has expired rows left.
+        """
+        backlog = False
+        now = datetime.now()
+        deletes: list[tuple[str, tuple[Any, ...]]] = [
+            (
+                # rows are appended in time order: only the oldest ids can expire
+                (
+                    f"DELETE FROM {table} WHERE id IN "
+                    f"(SELECT id FROM {table} ORDER BY id LIMIT ?) AND timestamp < ?"
+                ),
+                (self.retention_batch, (now - timedelta(seconds=seconds)).isoformat()),
+            )
+            for table, seconds in self.retention.items()
+        ]
+        deletes += [
+            (
+                (
+                    "DELETE FROM metric_rollups WHERE rowid IN (SELECT rowid FROM metric_rollups "
+                    "WHERE resolution = ? AND bucket < ? LIMIT ?)"
+                ),
+                (resolution, int(time.time() - seconds), self.retention_batch),
+            )
+            for resolution, seconds in self.rollup_retention.items()
+        ]
+        for sql, params in deletes:
+            try:
+                with conn:
+                    deleted = conn.execute(sql, params).rowcount
+            except sqlite3.OperationalError:
+                continue  # table not created by this database's owner
+            self.retention_deleted += deleted
+            backlog = backlog or deleted >= self.retention_batch
+        return backlog
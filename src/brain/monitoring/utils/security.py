@@ -1,40 +1,86 @@
 import re
+import string
+
+# Ordered (pattern, replacement) pairs, all matched case-insensitively. Order
+# matters: a replacement can create or remove matches for the patterns after it
+# (e.g. "Bearer token=abc"), so they are applied one after another.
+SENSITIVE_PATTERNS: list[tuple[str, str]] = [
+    # Keywords based masking (keeps the label)
+    (
+        r"(password|passwd|pwd|apikey|token|secret|sshpass)[:\s=]+([^\s\n\"']+)",
+        r"\1=****MASKED****",
+    ),
+    (r"-p\s+([^\s\n\"']+)", r"-p ****MASKED****"),
+    (r"--password[:\s=]+([^\s\n\"']+)", r"--password=****MASKED****"),
+    # Hardcoded patterns
+    (r"gh[up]_[a-zA-Z0-9]{30,60}", "****MASKED_GH_TOKEN****"),
+    (r"AIzaSy[a-zA-Z0-9_-]{33}", "****MASKED_GOOGLE_KEY****"),
+    (r"Bearer\s+[a-zA-Z0-9._-]+", "Bearer ****MASKED_TOKEN****"),
+    # Generic long character sequences often used as passwords/keys
+    (r"(?<!\w)(?:[A-Za-z0-9@#$%^&+=]{16,})(?!\w)", "****MASKED_SECRET****"),
+    # Identity
+    (r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", "****MASKED_EMAIL****"),
+    (r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b", "****MASKED_CC****"),
+]
+
+_COMPILED = [
+    (re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in SENSITIVE_PATTERNS
+]
+
+# All patterns as one compiled alternation: matches iff some pattern matches
+_SCREEN = re.compile("|".join(f"(?:{p})" for p, _ in SENSITIVE_PATTERNS), re.IGNORECASE)
+
+# Pre-check tables. Every pattern needs one of: a literal marker, a run of 16
+# characters from the generic-secret class, or 16 digits (card numbers).
+_RUN_CHARS = (string.ascii_letters + string.digits + "@#$%^&+=").encode()
+_RUN_TABLE = bytes.maketrans(_RUN_CHARS, b"\x01" * len(_RUN_CHARS))
+_RUN = b"\x01" * 16
+_NON_DIGITS = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
+_ASCII_CHARS = frozenset(map(chr, range(128)))
+# Non-ASCII characters that IGNORECASE matches against ASCII letters
+_CASE_HAZARDS = frozenset("İıſK")
+
+
+def has_sensitive_candidates(text: str) -> bool:
+    """Cheap pre-check: False only when no sensitive pattern can match ``text``."""
+    if text.isascii():
+        raw = text.encode()
+    else:
+        # \d and case-insensitive ASCII classes also match a few non-ASCII
+        # characters; such text gets the exact (slower) screen
+        others = set(text).difference(_ASCII_CHARS)
+        if not _CASE_HAZARDS.isdisjoint(others) or any(c.isdecimal() for c in others):
+            return _SCREEN.search(text) is not None
+        raw = text.encode("ascii", "replace")
+    low = text.lower()
+    return (
+        "pass" in low
+        or "pwd" in low
+        or "apikey" in low
+        or "token" in low
+        or "secret" in low
+        or "-p" in low
+        or "ghp_" in low
+        or "ghu_" in low
+        or "aizasy" in low
+        or "bearer" in low
+        or "@" in low
+        or _RUN in raw.translate(_RUN_TABLE)
+        or len(raw.translate(None, _NON_DIGITS)) >= 16
+    )
 
 
 def mask_sensitive_data(text: str) -> str:
     """Masks sensitive data (passwords, API keys, SSH credentials, tokens) in text.
 
     Combining patterns from Agent logic and Logging filters for project-wide consistency.
+    Text without any candidate marker is returned as is without running the patterns.
     """
-    if not isinstance(text, str):
+    if not isinstance(text, str) or not has_sensitive_candidates(text):
         return text
 
-    sensitive_patterns = [
-        # Keywords based masking
-        (
-            r"(password|passwd|pwd|apikey|token|secret|sshpass)[:\s=]+([^\s\n\"']+)",
-            r"\1=****MASKED****",
-        ),
-        (r"-p\s+([^\s\n\"']+)", r"-p ****MASKED****"),
-        (r"--password[:\s=]+([^\s\n\"']+)", r"--password=****MASKED****"),
-        # Hardcoded patterns
-        (r"gh[up]_[a-zA-Z0-9]{30,60}", "****MASKED_GH_TOKEN****"),
-        (r"AIzaSy[a-zA-Z0-9_-]{33}", "****MASKED_GOOGLE_KEY****"),
-        (r"Bearer\s+[a-zA-Z0-9._-]+", "Bearer ****MASKED_TOKEN****"),
-        # Generic long character sequences often used as passwords/keys
-        (r"(?<!\w)(?:[A-Za-z0-9@#$%^&+=]{16,})(?!\w)", "****MASKED_SECRET****"),
-        # Identity
-        (r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", "****MASKED_EMAIL****"),
-        (r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b", "****MASKED_CC****"),
-    ]
-
     masked_text = text
-    for pattern, replacement in sensitive_patterns:
-        # Use simple replacement or regex substitution
-        if replacement.startswith("****"):
-            masked_text = re.sub(pattern, replacement, masked_text, flags=re.IGNORECASE)
-        else:
-            # For keyword-based, we want to keep the label
-            masked_text = re.sub(pattern, replacement, masked_text, flags=re.IGNORECASE)
+    for pattern, replacement in _COMPILED:
+        masked_text = pattern.sub(replacement, masked_text)
 
     return masked_text
@@ -127,10 +127,15 @@ async def verify_redis():
         if val and (val == test_val or (hasattr(val, "decode") and val.decode() == test_val)):
             print("✅ Redis Connection: OK (Write/Read success)")
 
-            # Check distinct active sessions if possible
-            # Iterate keys safely
-            keys = await state_manager.redis_client.keys("session:*")
-            print(f"   - Active Session Keys in Redis: {len(keys)}")
+            # Count session snapshots with SCAN (KEYS blocks Redis on large keyspaces);
+            # each session also has a ``:deltas`` list, which is not a session
+            sessions = 0
+            async for key in state_manager.redis_client.scan_iter(
+                match=state_manager._key("session:*"), count=500
+            ):
+                if not key.endswith(":deltas"):
+                    sessions += 1
+            print(f"   - Active Session Keys in Redis: {sessions}")
 
         else:
             print(f"❌ Redis Write/Read Mismatch. Got: {val}")
@@ -29,6 +29,9 @@ import numpy as np
 import pandas as pd
 from mcp.server import FastMCP
 
+from .dataset_cache import ColumnSelector, DatasetCache, apply_subset
+from .dataset_profile import DatasetProfile, ProfileStore
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,26 +53,59 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 MAX_ROWS_PREVIEW = 1000
 MAX_ROWS_FULL = 100000
 
+# Parsed local files are kept as memory-mapped Arrow copies between tool calls
+FRAME_CACHE_BUDGET = 2 * 1024**3
+FRAME_CACHE = DatasetCache(DATA_DIR / "frames", FRAME_CACHE_BUDGET)
+# Column sketches per file version answer summary statistics without rescans
+PROFILES = ProfileStore(DATA_DIR / "profiles")
+
+_FILE_SUFFIXES = {".csv", ".xlsx", ".xls", ".json", ".parquet"}
+
+
+def _read_source(path: Path, nrows: int | None = None, **kwargs) -> pd.DataFrame:
+    """Parse a local file; JSON and Parquet are read whole, then limited."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(path, nrows=nrows, **kwargs)
+    if suffix in [".xlsx", ".xls"]:
+        return pd.read_excel(path, nrows=nrows, **kwargs)
+    if suffix == ".json":
+        df = pd.read_json(path, **kwargs)
+    else:
+        df = pd.read_parquet(path, **kwargs)
+    return df if nrows is None else df.head(nrows)
+
 
-def _load_dataframe(data_source: str, **kwargs) -> tuple[pd.DataFrame | None, str | None]:
-    """Load data from various sources into a DataFrame."""
+def _numeric_columns(*extra: str | None) -> ColumnSelector:
+    """Projection for tools that only look at numeric columns (plus ``extra``)."""
+    return lambda numeric: [c for c, is_numeric in numeric.items() if is_numeric or c in extra]
+
+
+def _load_dataframe(
+    data_source: str,
+    *,
+    columns: list[str] | ColumnSelector | None = None,
+    filters: list | None = None,
+    **kwargs,
+) -> tuple[pd.DataFrame | None, str | None]:
+    """Load data from various sources into a DataFrame.
+
+    Local files go through FRAME_CACHE. ``columns`` (names or a selector over
+    {name: is_numeric}) and ``filters`` ([column, op, value] rows) narrow the
+    load; filters are applied before ``nrows``.
+    """
     try:
         path = Path(data_source).expanduser()
+        nrows = kwargs.pop("nrows", None)
 
         if path.exists():
             # Local file
             suffix = path.suffix.lower()
-            if suffix == ".csv":
-                df = pd.read_csv(path, **kwargs)
-            elif suffix in [".xlsx", ".xls"]:
-                df = pd.read_excel(path, **kwargs)
-            elif suffix == ".json":
-                df = pd.read_json(path, **kwargs)
-            elif suffix == ".parquet":
-                df = pd.read_parquet(path, **kwargs)
-            else:
+            if suffix not in _FILE_SUFFIXES:
                 return None, f"Unsupported file format: {suffix}"
-
+            df = FRAME_CACHE.load(
+                path, _read_source, kwargs, nrows=nrows, columns=columns, filters=filters
+            )
             logger.info(f"Loaded {len(df)} rows from {path}")
             return df, None
 
@@ -83,6 +119,7 @@ def _load_dataframe(data_source: str, **kwargs) -> tuple[pd.DataFrame | None, st
                 # Try CSV by default
                 df = pd.read_csv(data_source, **kwargs)
 
+            df = apply_subset(df, columns=columns, filters=filters, nrows=nrows)
             logger.info(f"Loaded {len(df)} rows from URL")
             return df, None
 
@@ -92,6 +129,30 @@ def _load_dataframe(data_source: str, **kwargs) -> tuple[pd.DataFrame | None, st
         return None, f"Failed to load data: {e!s}"
 
 
+def _load_profile(
+    data_source: str, *, filters: list | None = None, **kwargs
+) -> DatasetProfile | None:
+    """Sketch profile of a whole local file (or its filtered rows).
+
+    Returns None for URLs and unreadable sources; callers then fall back to
+    _load_dataframe, which reports the error.
+    """
+    path = Path(data_source).expanduser()
+    if not path.exists() or path.suffix.lower() not in _FILE_SUFFIXES:
+        return None
+    try:
+        return PROFILES.profile(FRAME_CACHE, path, _read_source, kwargs, filters=filters)
+    except Exception as e:
+        logger.warning(f"Profiling {path.name} failed, loading rows instead: {e}")
+        return None
+
+
+def _top_values(profile: DatasetProfile, column: str, n: int | None = None) -> dict[Any, int]:
+    """Most frequent values of ``column`` (exact while it has <= TOPK_CAPACITY values)."""
+    topk = profile.columns[column].topk
+    return dict(topk.top(n or len(topk.counts)))
+
+
 def _get_column_stats(series: pd.Series) -> dict[str, Any]:
     """Get comprehensive statistics for a column."""
     stats: dict[str, Any] = {
@@ -201,6 +262,19 @@ async def analyze_dataset(
     """Analyze a dataset with statistical methods and generate insights."""
     logger.info(f"Analyzing dataset: {data_source} (type={analysis_type})")
 
+    profile = _load_profile(data_source) if analysis_type == "summary" else None
+    if profile is not None:
+        results = {
+            "success": True,
+            "analysis_type": analysis_type,
+            "row_count": profile.rows,
+            "column_count": len(profile.columns),
+        }
+        _profile_summary(profile, results)
+        if target_path:
+            _save_analysis_results(results, target_path)
+        return results
+
     df, error = _load_dataframe(data_source, nrows=MAX_ROWS_FULL)
     if error:
         return {"success": False, "error": error}
@@ -243,6 +317,15 @@ def _analyze_summary(df, results: dict[str, Any]) -> None:
     results["missing_values"] = df.isna().sum().to_dict()
 
 
+def _profile_summary(profile: DatasetProfile, results: dict[str, Any]) -> None:
+    """Summary statistics of the whole file from its sketches (quartiles approximate)."""
+    results["numeric_summary"] = profile.describe()
+    results["categorical_summary"] = {
+        col: _top_values(profile, col, 10) for col in profile.categorical_columns[:5]
+    }
+    results["missing_values"] = {name: sketch.nulls for name, sketch in profile.columns.items()}
+
+
 def _analyze_correlation(df, results: dict[str, Any]) -> None:
     """Helper for correlation analysis."""
     numeric_df = df.select_dtypes(include=[np.number])
@@ -335,6 +418,7 @@ async def generate_statistics(
     statistics_type: str = "descriptive",
     group_by: str | None = None,
     output_format: str = "json",
+    filters: list | None = None,
 ) -> dict[str, Any]:
     """Generate statistical analysis from a dataset.
 
@@ -343,13 +427,22 @@ async def generate_statistics(
         statistics_type: Type - 'descriptive', 'inferential', 'frequency'
         group_by: Optional column name to group by
         output_format: Output format - 'json', 'markdown'
+        filters: Optional row filters, e.g. [["region", "==", "Kyiv"], ["amount", ">", 0]]
 
     Returns:
         Statistical analysis results
     """
     logger.info(f"Generating statistics: {data_source} (type={statistics_type})")
 
-    df, error = _load_dataframe(data_source, nrows=MAX_ROWS_FULL)
+    profile = _load_profile(data_source, filters=filters)
+    if profile is not None and (not group_by or group_by not in profile.columns):
+        results = {"success": True, "statistics_type": statistics_type}
+        if _profile_statistics(profile, statistics_type, results):
+            return results
+
+    # frequency tables need the categorical columns; everything else is numeric
+    columns = None if statistics_type == "frequency" else _numeric_columns(group_by)
+    df, error = _load_dataframe(data_source, nrows=MAX_ROWS_FULL, columns=columns, filters=filters)
     if error:
         return {"success": False, "error": error}
 
@@ -430,6 +523,40 @@ async def generate_statistics(
     return results
 
 
+def _profile_statistics(
+    profile: DatasetProfile, statistics_type: str, results: dict[str, Any]
+) -> bool:
+    """Overall statistics from sketches; False when only an exact pass can answer."""
+    numeric_cols = profile.numeric_columns
+    if statistics_type == "descriptive":
+        results["descriptive"] = profile.describe()
+        for col in numeric_cols[:10]:
+            if profile.columns[col].count > 0:
+                results.setdefault("additional", {})[col] = profile.shape_stats(col)
+
+    elif statistics_type == "frequency":
+        categorical_cols = profile.categorical_columns[:5]
+        if not all(profile.columns[col].topk.exact for col in categorical_cols):
+            return False  # frequency tables of high-cardinality columns need the rows
+        results["frequency_tables"] = {col: _top_values(profile, col) for col in categorical_cols}
+
+    elif statistics_type == "inferential":
+        results["sample_size"] = profile.rows
+        for col in numeric_cols[:5]:
+            moments = profile.columns[col].moments
+            if moments is None or moments.n <= 1:
+                continue
+            std = moments.std or 0.0
+            se = std / np.sqrt(moments.n)
+            results.setdefault("confidence_intervals", {})[col] = {
+                "mean": round(moments.mean, 4),
+                "std_error": round(float(se), 4),
+                "ci_95_lower": round(float(moments.mean - 1.96 * se), 4),
+                "ci_95_upper": round(float(moments.mean + 1.96 * se), 4),
+            }
+    return True
+
+
 @server.tool()
 async def create_visualization(
     data_source: str,
@@ -450,7 +577,11 @@ async def create_visualization(
     except ImportError:
         return {"success": False, "error": "matplotlib not available"}
 
-    df, error = _load_dataframe(data_source, nrows=MAX_ROWS_PREVIEW)
+    df, error = _load_dataframe(
+        data_source,
+        nrows=MAX_ROWS_PREVIEW,
+        columns=_chart_columns(visualization_type, x_axis, y_axis),
+    )
     if error:
         return {"success": False, "error": error}
     if df is None:
@@ -497,6 +628,19 @@ async def create_visualization(
         return {"success": False, "error": f"Visualization failed: {e!s}"}
 
 
+def _chart_columns(
+    visualization_type: str, x_axis: str | None, y_axis: str | None
+) -> list[str] | ColumnSelector | None:
+    """The columns a chart reads, so the cached load can skip the rest."""
+    if visualization_type in ("scatter", "line", "bar"):
+        return [c for c in (x_axis, y_axis) if c]
+    if visualization_type == "histogram":
+        return lambda numeric: [x_axis] if x_axis in numeric else _numeric_columns()(numeric)
+    if visualization_type in ("box", "heatmap"):
+        return _numeric_columns()
+    return None
+
+
 def _plot_histogram(ax, df, x_axis):
     """Helper for histogram plotting."""
     target_col = x_axis if (x_axis and x_axis in df.columns) else None
@@ -706,6 +850,7 @@ async def data_aggregation(
     group_by: str,
     aggregation_methods: list[str] | None = None,
     output_format: str = "json",
+    filters: list | None = None,
 ) -> dict[str, Any]:
     """Aggregate and summarize data by grouping.
 
@@ -714,6 +859,7 @@ async def data_aggregation(
         group_by: Column name to group by
         aggregation_methods: List of methods - 'sum', 'mean', 'count', 'min', 'max', 'std'
         output_format: Output format - 'json', 'csv'
+        filters: Optional row filters, e.g. [["year", ">=", 2020]]
 
     Returns:
         Aggregated data
@@ -723,7 +869,7 @@ async def data_aggregation(
     if aggregation_methods is None:
         aggregation_methods = ["count", "mean", "sum"]
 
-    df, error = _load_dataframe(data_source)
+    df, error = _load_dataframe(data_source, columns=_numeric_columns(group_by), filters=filters)
     if error:
         return {"success": False, "error": error}
 
@@ -781,17 +927,45 @@ async def interpret_column_data(
     if sheet_name is not None:
         kwargs["sheet_name"] = sheet_name
 
-    df, error = _load_dataframe(file_path, **kwargs)
-    if error:
-        return {"success": False, "error": error}
+    # columns whose values all fit the top-k sketch are answered from the profile
+    profile = _load_profile(file_path, **kwargs)
+    from_profile: dict[str, dict[str, Any]] = {}
+    if profile is not None:
+        for col_name in column_names:
+            sketch = profile.columns.get(col_name)
+            if sketch is not None and sketch.topk.exact:
+                from_profile[col_name] = {
+                    "column_name": col_name,
+                    "data_type": sketch.dtype,
+                    "total_values": profile.rows,
+                    "null_count": sketch.nulls,
+                    "unique_count": sketch.distinct,
+                    "unique_values_with_counts": [
+                        [str(k), int(v)] for k, v in sketch.topk.top(100)
+                    ],
+                }
+
+    df = None
+    pending = [
+        c
+        for c in column_names
+        if c not in from_profile and (profile is None or c in profile.columns)
+    ]
+    if pending or profile is None:
+        df, error = _load_dataframe(file_path, columns=pending, **kwargs)
+        if error:
+            return {"success": False, "error": error}
 
-    if df is None:
-        return {"success": False, "error": "Failed to load dataframe"}
+        if df is None:
+            return {"success": False, "error": "Failed to load dataframe"}
 
     interpretations = []
 
     for col_name in column_names:
-        if col_name not in df.columns:
+        if col_name in from_profile:
+            interpretations.append(from_profile[col_name])
+            continue
+        if df is None or col_name not in df.columns:
             interpretations.append({"column_name": col_name, "error": "Column not found in data"})
             continue
 
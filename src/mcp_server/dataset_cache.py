@@ -0,0 +1,418 @@
+"""Dataset Cache - memory-mapped Arrow copies of analysed data files
+
+The data-analysis tools are usually chained over one file (metadata -> analysis ->
+statistics -> aggregation -> charts), and each call used to re-parse the source.
+The first full load of a file is converted to an Arrow IPC (Feather v2) file; later
+loads memory-map it, so only the pages of the columns a tool touches are read.
+
+Entries are keyed by (resolved path, size, mtime, read options) and evicted
+least-recently-used under a byte budget (recency is tracked in process; file
+mtimes only order the entries left by earlier runs). Loads can project columns
+and push row filters (``[("region", "==", "Kyiv"), ("amount", ">", 0)]``) down
+into Arrow.
+
+Author: AtlasTrinity Team
+Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import logging
+import operator
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Formats whose readers can stop after ``nrows``: a row-limited miss reads just
+# those rows and converts the whole file in the background.
+PARTIAL_SUFFIXES = frozenset({".csv", ".xlsx", ".xls"})
+
+Reader = Callable[..., pd.DataFrame]
+Filter = Sequence[Any]  # (column, op, value)
+# Receives {column name: is numeric} and returns the columns to load
+ColumnSelector = Callable[[dict[str, bool]], list[str]]
+
+_OPS: dict[str, Callable[[pd.Series, Any], pd.Series]] = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda s, v: s.isin(v),
+    "not in": lambda s, v: ~s.isin(v),
+}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    partial_reads: int = 0
+    conversions: int = 0
+    fallbacks: int = 0
+    evictions: int = 0
+    bytes_written: int = 0
+
+
+def _digest(value: str, size: int = 16) -> str:
+    return hashlib.sha1(value.encode(), usedforsecurity=False).hexdigest()[:size]
+
+
+def validate_filters(filters: Sequence[Filter] | None) -> list[tuple[str, str, Any]]:
+    """Normalize ``[[col, op, value], ...]`` (as sent by tool calls) to tuples."""
+    normalized = []
+    for item in filters or []:
+        if len(item) != 3 or str(item[1]) not in _OPS:
+            raise ValueError(f"Invalid filter {item!r}: expected [column, op, value]")
+        column, op, value = item
+        normalized.append((str(column), str(op), value))
+    return normalized
+
+
+def apply_subset(
+    df: pd.DataFrame,
+    *,
+    columns: list[str] | ColumnSelector | None = None,
+    filters: Sequence[Filter] | None = None,
+    nrows: int | None = None,
+) -> pd.DataFrame:
+    """Pandas equivalent of the Arrow pushdown: filter, then project, then limit."""
+    for column, op, value in validate_filters(filters):
+        df = df[_OPS[op](df[column], value).fillna(False).astype(bool)]
+    if columns is not None:
+        if callable(columns):
+            numeric = {
+                str(c): pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t)
+                for c, t in df.dtypes.items()
+            }
+            columns = columns(numeric)
+        df = df[[c for c in columns if c in df.columns]]
+    if nrows is not None:
+        df = df.head(nrows)
+    if filters:
+        df = df.reset_index(drop=True)
+    return df
+
+
+class DatasetCache:
+    """Arrow IPC copies of parsed data files under ``root``, bounded by ``budget_bytes``."""
+
+    def __init__(self, root: Path, budget_bytes: int = 2 << 30, *, background: bool = True):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.budget_bytes = budget_bytes
+        self.background = background
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future[Path | None]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        # entry name -> None, least recently used first. Timestamp granularity makes
+        # mtimes tie, so they only seed the order of entries from earlier runs
+        self._recency: OrderedDict[str, None] = OrderedDict(
+            (entry.name, None)
+            for entry in sorted(self.root.glob("*.arrow"), key=lambda p: p.stat().st_mtime_ns)
+        )
+
+    def _entry(self, path: Path, read_options: dict[str, Any]) -> tuple[str, Path]:
+        st = path.stat()
+        options = json.dumps(read_options, sort_keys=True, default=str)
+        prefix = f"{_digest(str(path))}-{_digest(options, 8)}"
+        version = _digest(f"{st.st_size}:{st.st_mtime_ns}")
+        return prefix, self.root / f"{prefix}-{version}.arrow"
+
+    def version(self, path: Path, read_options: dict[str, Any] | None = None) -> str:
+        """Identity of the current content of ``path`` under ``read_options``."""
+        return self._entry(Path(path).resolve(), dict(read_options or {}))[1].stem
+
+    def load(
+        self,
+        path: Path,
+        reader: Reader,
+        read_options: dict[str, Any] | None = None,
+        *,
+        nrows: int | None = None,
+        columns: list[str] | ColumnSelector | None = None,
+        filters: Sequence[Filter] | None = None,
+    ) -> pd.DataFrame:
+        """``reader(path, **read_options)`` through the cache.
+
+        ``reader`` must also accept ``nrows``. Filters are applied before the
+        ``nrows`` limit, columns that do not exist are skipped.
+        """
+        path = Path(path).resolve()
+        read_options = dict(read_options or {})
+        filters = validate_filters(filters)
+        if not ARROW_AVAILABLE or self.budget_bytes <= 0:
+            df = reader(path, nrows=None if filters else nrows, **read_options)
+            return apply_subset(df, columns=columns, filters=filters, nrows=nrows)
+
+        prefix, target = self._entry(path, read_options)
+        if target.exists():
+            self.stats.hits += 1
+            self._touch(target)
+            return self._read(target, nrows=nrows, columns=columns, filters=filters)
+
+        self.stats.misses += 1
+        with self._lock:
+            future = self._inflight.get(target.name)
+        # the first row-limited miss reads just its rows and converts in the background;
+        # later loads wait for that conversion rather than parse alongside it
+        if (
+            future is None
+            and nrows is not None
+            and not filters
+            and self.background
+            and path.suffix.lower() in PARTIAL_SUFFIXES
+        ):
+            self.stats.partial_reads += 1
+            self._submit(path, reader, read_options, prefix, target)
+            df = reader(path, nrows=nrows, **read_options)
+            return apply_subset(df, columns=columns)
+
+        if future is not None:
+            converted = future.result()
+        else:
+            converted, df = self._convert(path, reader, read_options, prefix, target)
+            if converted is None:
+                return apply_subset(df, columns=columns, filters=filters, nrows=nrows)
+        if converted is None:
+            df = reader(path, **read_options)
+            return apply_subset(df, columns=columns, filters=filters, nrows=nrows)
+        return self._read(converted, nrows=nrows, columns=columns, filters=filters)
+
+    def iter_frames(
+        self,
+        path: Path,
+        reader: Reader,
+        read_options: dict[str, Any] | None = None,
+        *,
+        columns: list[str] | ColumnSelector | None = None,
+        filters: Sequence[Filter] | None = None,
+        batch_rows: int = 1_000_000,
+    ) -> Iterator[pd.DataFrame]:
+        """Scan the whole source in frames of about ``batch_rows`` rows.
+
+        Reads go through the Arrow copy (converted first if needed), so a scan
+        holds one filtered, projected chunk in pandas at a time.
+        """
+        path = Path(path).resolve()
+        read_options = dict(read_options or {})
+        filters = validate_filters(filters)
+        converted: Path | None = None
+        if ARROW_AVAILABLE and self.budget_bytes > 0:
+            prefix, target = self._entry(path, read_options)
+            with self._lock:
+                future = self._inflight.get(target.name)
+            if target.exists():
+                self.stats.hits += 1
+                self._touch(target)
+                converted = target
+            elif future is not None:
+                converted = future.result()
+            else:
+                self.stats.misses += 1
+                converted, df = self._convert(path, reader, read_options, prefix, target)
+                if converted is None:
+                    yield from _slices(
+                        apply_subset(df, columns=columns, filters=filters), batch_rows
+                    )
+                    return
+        if converted is None:
+            df = apply_subset(reader(path, **read_options), columns=columns, filters=filters)
+            yield from _slices(df, batch_rows)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        expression = pq.filters_to_expression(filters) if filters else None
+        with pa.memory_map(str(converted)) as source:
+            ipc = pa.ipc.open_file(source)
+            names = _select(ipc.schema, columns)
+            pending: list[Any] = []
+            rows = 0
+            for i in range(ipc.num_record_batches + 1):
+                if i < ipc.num_record_batches:
+                    batch = ipc.get_batch(i)
+                    pending.append(batch)
+                    rows += batch.num_rows
+                    if rows < batch_rows:
+                        continue
+                if not pending:
+                    break
+                table = pa.Table.from_batches(pending, schema=ipc.schema)
+                pending, rows = [], 0
+                if expression is not None:
+                    table = table.filter(expression)
+                if names is not None:
+                    table = table.select(names)
+                yield table.to_pandas()
+
+    def _submit(
+        self, path: Path, reader: Reader, read_options: dict[str, Any], prefix: str, target: Path
+    ) -> None:
+        with self._lock:
+            if target.name in self._inflight:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frames")
+            future = self._executor.submit(
+                lambda: self._convert(path, reader, read_options, prefix, target)[0]
+            )
+            self._inflight[target.name] = future
+        future.add_done_callback(lambda _: self._inflight.pop(target.name, None))
+
+    def _convert(
+        self, path: Path, reader: Reader, read_options: dict[str, Any], prefix: str, target: Path
+    ) -> tuple[Path | None, pd.DataFrame]:
+        """Parse the whole source once and persist it as Arrow IPC.
+
+        Returns (entry or None, parsed frame); None means the frame could not be
+        cached (mixed-type columns, over budget) and the caller should use it directly.
+        """
+        import pyarrow as pa
+
+        df = reader(path, **read_options)
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, ValueError, TypeError) as e:
+            self.stats.fallbacks += 1
+            logger.info(f"Not caching {path.name}: {e}")
+            return None, df
+        if table.nbytes > self.budget_bytes:
+            self.stats.fallbacks += 1
+            return None, df
+
+        tmp = self.root / f".{uuid.uuid4().hex}.tmp"
+        try:
+            # uncompressed, so later loads map column buffers without copying
+            with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=64_000)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.stats.conversions += 1
+        self.stats.bytes_written += target.stat().st_size
+        self._touch(target)
+        for stale in self.root.glob(f"{prefix}-*.arrow"):
+            if stale != target:
+                self._remove(stale)
+        self._evict(keep=target)
+        logger.info(f"Cached {path.name} as Arrow ({table.num_rows} rows, {table.nbytes} bytes)")
+        return target, df
+
+    def _read(
+        self,
+        target: Path,
+        *,
+        nrows: int | None,
+        columns: list[str] | ColumnSelector | None,
+        filters: list[tuple[str, str, Any]],
+    ) -> pd.DataFrame:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with pa.memory_map(str(target)) as source:
+            reader = pa.ipc.open_file(source)
+            schema = reader.schema
+            names = _select(schema, columns)
+            if filters:
+                table = reader.read_all().filter(pq.filters_to_expression(filters))
+            elif nrows is not None:
+                batches, rows = [], 0
+                for i in range(reader.num_record_batches):
+                    if rows >= nrows:
+                        break
+                    batch = reader.get_batch(i)
+                    batches.append(batch)
+                    rows += batch.num_rows
+                table = pa.Table.from_batches(batches, schema=schema)
+            else:
+                table = reader.read_all()
+            if names is not None:
+                table = table.select(names)
+            if nrows is not None:
+                table = table.slice(0, nrows)
+            return table.to_pandas()
+
+    def _touch(self, target: Path) -> None:
+        with self._lock:
+            self._recency[target.name] = None
+            self._recency.move_to_end(target.name)
+        os.utime(target)  # orders the entry for the next process
+
+    def _remove(self, entry: Path) -> None:
+        entry.unlink(missing_ok=True)
+        with self._lock:
+            self._recency.pop(entry.name, None)
+
+    def _evict(self, keep: Path) -> None:
+        on_disk = {entry.name: entry for entry in self.root.glob("*.arrow")}
+        with self._lock:
+            known = [on_disk.pop(name) for name in reversed(self._recency) if name in on_disk]
+        # entries this process has not used (written by another one) are older than any it has
+        others = sorted(on_disk.values(), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        used = 0
+        for entry in known + others:
+            size = entry.stat().st_size
+            if entry != keep and used + size > self.budget_bytes:
+                self._remove(entry)
+                self.stats.evictions += 1
+                continue
+            used += size
+
+    def wait(self) -> None:
+        """Block until background conversions are done (tests, benchmarks, shutdown)."""
+        with self._lock:
+            futures = list(self._inflight.values())
+        for future in futures:
+            future.result()
+
+    def clear(self) -> None:
+        self.wait()
+        for entry in self.root.glob("*.arrow"):
+            self._remove(entry)
+
+    def info(self) -> dict[str, Any]:
+        entries = list(self.root.glob("*.arrow"))
+        return {
+            "entries": len(entries),
+            "bytes": sum(e.stat().st_size for e in entries),
+            "budget_bytes": self.budget_bytes,
+            **asdict(self.stats),
+        }
+
+
+def _slices(df: pd.DataFrame, size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), size):
+        yield df.iloc[start : start + size]
+
+
+def _select(schema: Any, columns: list[str] | ColumnSelector | None) -> list[str] | None:
+    import pyarrow as pa
+
+    if columns is None:
+        return None
+    if callable(columns):
+        numeric = {
+            f.name: pa.types.is_integer(f.type) or pa.types.is_floating(f.type) for f in schema
+        }
+        columns = columns(numeric)
+    return [c for c in columns if c in schema.names]
@@ -10,11 +10,17 @@ from pathlib import Path
 from typing import Any, TypedDict, cast
 
 from mcp.server import FastMCP
+from mcp.server.fastmcp import Context
 
 from .context_check import run_test_suite
 from .diagram_generator import generate_architecture_diagram
 from .git_manager import ensure_git_repository, get_git_changes, setup_github_remote
-from .project_analyzer import analyze_project_structure, detect_changed_components
+from .project_analyzer import (
+    analyze_project_structure,
+    detect_changed_components,
+    get_workspace_index,
+)
+from .static_analysis import get_analysis_engine
 from .trace_analyzer import analyze_log_file
 
 server = FastMCP("devtools-server")
@@ -1039,6 +1045,60 @@ def devtools_check_types_ts() -> dict[str, Any]:
     return results
 
 
+@server.tool()
+async def devtools_run_static_analysis(
+    path: str = "src",
+    analyzers: str = "",
+    max_diagnostics: int = 200,
+    ctx: Context | None = None,
+) -> dict[str, Any]:
+    """Run the Python analyzers (ruff, pyright, vulture, radon, bandit) in parallel.
+
+    Analyzers run concurrently, up to one subprocess per CPU, and per-file analyzers
+    are split into shards. Results are cached per file by content hash and tool
+    version/config, so unchanged files are not analyzed again. Diagnostics of all
+    analyzers are merged and deduplicated; partial results are streamed to the
+    client as progress while the run goes on.
+
+    Args:
+        path: File or directory relative to the project root (comma-separated for several).
+        analyzers: Comma-separated subset of ruff, pyright, vulture, radon, bandit (default all).
+        max_diagnostics: Maximum number of merged diagnostics returned.
+    """
+    engine = get_analysis_engine(PROJECT_ROOT)
+    paths = [p.strip() for p in path.split(",") if p.strip()] or ["."]
+    selected = [a.strip() for a in analyzers.split(",") if a.strip()] or None
+    report: dict[str, Any] = {}
+    done = 0
+    try:
+        async for event in engine.stream(paths, selected):
+            if event["event"] == "done":
+                report = event["report"]
+                continue
+            if not ctx:
+                continue
+            done += 1
+            if event["event"] == "error":
+                message = f"{event['analyzer']}: {event['error']}"
+            else:
+                message = (
+                    f"{event['analyzer']}: {event['files']} files"
+                    f"{' (cached)' if event['event'] == 'cached' else ''},"
+                    f" {len(event['diagnostics'])} diagnostics"
+                )
+            try:
+                await ctx.report_progress(done, None, message)
+                await ctx.info(message)
+            except Exception:
+                pass  # progress is best effort
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    diagnostics = report.get("diagnostics", [])
+    report["diagnostics"] = diagnostics[:max_diagnostics]
+    report["truncated"] = len(diagnostics) > max_diagnostics
+    return report
+
+
 @server.tool()
 def devtools_run_context_check(test_file: str) -> dict[str, Any]:
     """Run logic validation tests from a YAML/JSON file against a mock runner (dry run).
@@ -1058,7 +1118,10 @@ def devtools_analyze_trace(log_path: str = "") -> dict[str, Any]:
     """Analyze an MCP execution log file for logic issues.
 
     Detects infinite loops (repeated tool calls), inefficiencies, and
-    potential hallucinations in tool usage.
+    potential hallucinations in tool usage, plus retry storms, latency
+    outliers, per-tool latency and the critical path of the slowest tasks.
+    The log is ingested incrementally (only bytes added since the last call
+    are read); spans are kept in a trace store next to the log.
 
     Args:
         log_path: Path to the log file. Defaults to ~/.config/atlastrinity/logs/brain.log
@@ -1130,8 +1193,9 @@ def devtools_update_architecture_diagrams(
     }
 
     try:
-        # Step 1: Analyze project structure (UNIVERSAL)
-        project_analysis = analyze_project_structure(project_path_obj)
+        # Step 1: Analyze project structure (UNIVERSAL), from the incremental workspace index
+        workspace_index = get_workspace_index(project_path_obj)
+        project_analysis = analyze_project_structure(project_path_obj, workspace_index)
         response["project_type"] = project_analysis.get("project_type", "unknown")
         response["components_detected"] = len(project_analysis.get("components", []))  # type: ignore[typeddict-item]
 
@@ -1160,7 +1224,9 @@ def devtools_update_architecture_diagrams(
         modified_files: list[str] = git_changes.get("modified_files", [])  # type: ignore[assignment]
 
         # Step 5: Detect affected components (UNIVERSAL)
-        affected_components = detect_changed_components(project_analysis, git_diff, modified_files)
+        affected_components = detect_changed_components(
+            project_analysis, git_diff, modified_files, index=workspace_index
+        )
 
         # Step 5.5: Deep reasoning analysis (if enabled)
         reasoning_analysis = None
@@ -1243,6 +1309,7 @@ def devtools_update_architecture_diagrams(
 
 # Old hardcoded functions removed - replaced by universal modules:
 # - project_analyzer.py: analyze_project_structure, detect_changed_components
+# - workspace_index.py: persistent file/import index behind project_analyzer
 # - diagram_generator.py: generate_architecture_diagram
 # - git_manager.py: ensure_git_repository, setup_github_remote, get_git_changes
 
@@ -1448,6 +1515,8 @@ def devtools_get_system_map() -> dict[str, Any]:
                 "vibe_workspace": str(config_root / "vibe_workspace"),
                 "models_dir": str(config_root / "models"),
                 "cache_dir": str(config_root / "cache"),
+                "workspace_index_dir": str(data_dir / "workspace_index"),
+                "static_analysis_cache": str(data_dir / "static_analysis.db"),
             },
         },
         "logs": logs_found,
@@ -212,6 +212,19 @@ def _generate_components_list(analysis: dict[str, Any]) -> str:
             "### Detected Components\n" + "\n".join(f"- **{comp}**" for comp in components[:10])
         )
 
+    # Internal imports between the listed components (from the workspace index)
+    shown = set(components[:10])
+    dependencies = {
+        component: [dep for dep in deps if dep in shown]
+        for component, deps in analysis.get("component_dependencies", {}).items()
+        if component in shown
+    }
+    dependency_lines = [
+        f"- **{component}** → {', '.join(deps)}" for component, deps in dependencies.items() if deps
+    ]
+    if dependency_lines:
+        sections.append("### Component Dependencies\n" + "\n".join(dependency_lines))
+
     if key_files:
         sections.append(
             "### Key Configuration Files\n" + "\n".join(f"- `{kf}`" for kf in key_files)
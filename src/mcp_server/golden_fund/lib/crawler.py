@@ -0,0 +1,656 @@
+"""
+Enrichment Crawler for Golden Fund
+Discovers open-data resources through CKAN and downloads / ingests them with a
+bounded worker pool: per-host rate limits, conditional requests, URL and
+content-hash dedupe across runs, a persistent relevance-ranked frontier and
+overall time / byte budgets.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+
+from .storage.pool import SQLitePool
+from .storage.runtime import StorageRuntime
+from .streaming import IngestResult
+
+logger = logging.getLogger("golden_fund.crawler")
+
+# ingest(path, type=..., process_pipeline=..., runtime=..., source_url=...) -> IngestResult
+Ingest = Callable[..., Awaitable[IngestResult]]
+
+FORMATS = ("CSV", "JSON")
+MAX_ATTEMPTS = 3
+CHUNK_SIZE = 1 << 16
+
+# Relevance: share of query terms found per package field, weighted
+_FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "resource": 1.5, "notes": 1.0}
+_TOKEN = re.compile(r"\w+")
+_STEM = 5  # Ukrainian inflects word endings; compare leading characters only
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_frontier (
+    url TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    priority REAL NOT NULL,
+    package_id TEXT,
+    title TEXT,
+    format TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_frontier_pending
+    ON crawl_frontier (query, status, priority DESC);
+CREATE TABLE IF NOT EXISTS crawl_urls (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    bytes INTEGER,
+    fetched_at REAL
+);
+CREATE TABLE IF NOT EXISTS crawl_content (
+    content_hash TEXT PRIMARY KEY,
+    url TEXT,
+    bytes INTEGER,
+    ingested_at REAL,
+    summary TEXT
+);
+"""
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised inside a download when the crawl's time or byte budget runs out."""
+
+
+def _stems(text: str) -> set[str]:
+    return {t[:_STEM] for t in _TOKEN.findall(text.casefold()) if len(t) > 1}
+
+
+def query_key(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def relevance(
+    query: str, package: dict[str, Any], resource: dict[str, Any] | None = None, rank: int = 0
+) -> float:
+    """Score in ~[0, 1.1]: weighted term overlap plus a small bonus for CKAN's own rank."""
+    terms = _stems(query)
+    if not terms:
+        return 0.0
+    tags = package.get("tags") or []
+    fields = {
+        "title": str(package.get("title") or package.get("name") or ""),
+        "tags": " ".join(str(t.get("name", "")) if isinstance(t, dict) else str(t) for t in tags),
+        "resource": " ".join(str((resource or {}).get(k) or "") for k in ("name", "description")),
+        "notes": str(package.get("notes") or ""),
+    }
+    overlap = sum(
+        weight * len(terms & _stems(fields[name])) / len(terms)
+        for name, weight in _FIELD_WEIGHTS.items()
+    )
+    return round(overlap / sum(_FIELD_WEIGHTS.values()) + 0.1 / (1 + rank), 6)
+
+
+@dataclass
+class FrontierItem:
+    url: str
+    query: str
+    priority: float
+    package_id: str | None = None
+    title: str | None = None
+    format: str = "CSV"
+
+
+@dataclass
+class CrawlItem:
+    url: str
+    title: str | None
+    priority: float
+    # ingested | duplicate | not_modified | fresh | failed | too_large | deferred
+    status: str = "pending"
+    bytes: int = 0
+    ms: float = 0.0
+    detail: str = ""
+
+
+@dataclass
+class CrawlReport:
+    query: str
+    discovered: int = 0
+    items: list[CrawlItem] = field(default_factory=list)
+    bytes: int = 0
+    elapsed: float = 0.0
+    stopped: str | None = None  # time | bytes | items
+
+    def counts(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for item in self.items:
+            out[item.status] = out.get(item.status, 0) + 1
+        return out
+
+    def summary_lines(self) -> list[str]:
+        lines = []
+        for item in self.items:
+            if item.status == "ingested":
+                lines.append(f"Ingested '{item.title}': {item.detail}")
+            else:
+                detail = f" ({item.detail})" if item.detail else ""
+                lines.append(f"{item.status.replace('_', ' ').capitalize()} '{item.title}'{detail}")
+        stats = ", ".join(f"{k}={v}" for k, v in sorted(self.counts().items()))
+        lines.append(
+            f"Crawl: {self.discovered} resources discovered, {stats or 'nothing to do'}, "
+            f"{self.bytes / 1e6:.1f} MB in {self.elapsed:.1f}s"
+            + (f", stopped by {self.stopped} budget" if self.stopped else "")
+        )
+        return lines
+
+
+@dataclass
+class _Fetch:
+    status: str  # ok | not_modified | budget | too_large | error
+    path: Path | None = None
+    content_hash: str | None = None
+    bytes: int = 0
+    etag: str | None = None
+    last_modified: str | None = None
+    error: str = ""
+
+
+class CrawlBudget:
+    """Time, byte and download-count limits shared by all workers (thread-safe)."""
+
+    def __init__(self, max_seconds: float, max_bytes: int, max_items: int):
+        self.deadline = time.monotonic() + max_seconds
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.bytes = 0
+        self.items = 0
+        self.stopped: str | None = None
+        self._lock = threading.Lock()
+
+    def exhausted(self) -> bool:
+        if self.stopped is None and time.monotonic() >= self.deadline:
+            self.stopped = "time"
+        return self.stopped is not None
+
+    def claim_item(self) -> bool:
+        with self._lock:
+            if self.exhausted():
+                return False
+            if self.items >= self.max_items:
+                self.stopped = "items"
+                return False
+            self.items += 1
+            return True
+
+    def release_item(self) -> None:
+        with self._lock:
+            self.items -= 1
+
+    def fits(self, size: int) -> bool:
+        """Whether an announced ``size`` still fits; if not the byte budget is spent."""
+        with self._lock:
+            if self.bytes + size <= self.max_bytes:
+                return True
+            self.stopped = "bytes"
+            return False
+
+    def spend(self, size: int) -> None:
+        with self._lock:
+            self.bytes += size
+            # an exhausted item count only stops new downloads, not running ones
+            if self.bytes > self.max_bytes:
+                self.stopped = "bytes"
+                raise BudgetExceededError("bytes budget exhausted")
+            if time.monotonic() >= self.deadline:
+                self.stopped = "time"
+                raise BudgetExceededError("time budget exhausted")
+
+
+class HostLimiter:
+    """Per-host concurrency cap and minimum spacing between request starts.
+
+    Built per crawl: asyncio primitives belong to the running event loop.
+    """
+
+    def __init__(self, per_host: int = 2, interval: float = 0.5):
+        self.per_host = max(1, per_host)
+        self.interval = max(0.0, interval)
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._next: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        semaphore = self._slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, 0.0))
+            self._next[host] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class CrawlState:
+    """Persistent frontier, per-URL validators and ingested content hashes."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pool = SQLitePool(self.db_path, readers=2)
+        with self.pool.writer() as conn:
+            conn.executescript(_SCHEMA)
+
+    def push(self, items: list[FrontierItem]) -> None:
+        """Add discovered resources; rediscovered ones become pending again (revalidation)."""
+        now = time.time()
+        with self.pool.writer() as conn:
+            conn.executemany(
+                "INSERT INTO crawl_frontier "
+                "(url, query, priority, package_id, title, format, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET query = excluded.query, "
+                "priority = excluded.priority, package_id = excluded.package_id, "
+                "title = excluded.title, format = excluded.format, "
+                "status = 'pending', updated_at = excluded.updated_at",
+                [(i.url, i.query, i.priority, i.package_id, i.title, i.format, now) for i in items],
+            )
+
+    def pending(self, query: str) -> list[FrontierItem]:
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                "SELECT url, query, priority, package_id, title, format FROM crawl_frontier "
+                "WHERE query = ? AND status = 'pending' AND attempts < ? "
+                "ORDER BY priority DESC, url",
+                (query, MAX_ATTEMPTS),
+            ).fetchall()
+        return [FrontierItem(*row) for row in rows]
+
+    def mark(self, url: str, status: str, *, failed: bool = False) -> None:
+        with self.pool.writer() as conn:
+            conn.execute(
+                "UPDATE crawl_frontier SET status = ?, attempts = attempts + ?, updated_at = ? "
+                "WHERE url = ?",
+                (status, int(failed), time.time(), url),
+            )
+
+    def validators(self, urls: list[str]) -> dict[str, dict[str, Any]]:
+        """Stored ETag / Last-Modified / content hash / fetch time per URL."""
+        out: dict[str, dict[str, Any]] = {}
+        with self.pool.reader() as conn:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start : start + 500]
+                rows = conn.execute(
+                    "SELECT url, etag, last_modified, content_hash, fetched_at FROM crawl_urls "
+                    f"WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for url, *values in rows:
+                    out[url] = dict(
+                        zip(
+                            ("etag", "last_modified", "content_hash", "fetched_at"),
+                            values,
+                            strict=True,
+                        )
+                    )
+        return out
+
+    def record_fetch(self, url: str, fetch: _Fetch) -> None:
+        with self.pool.writer() as conn:
+            conn.execute(
+                "INSERT INTO crawl_urls "
+                "(url, etag, last_modified, content_hash, bytes, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, "
+                "last_modified = excluded.last_modified, content_hash = excluded.content_hash, "
+                "bytes = excluded.bytes, fetched_at = excluded.fetched_at",
+                (
+                    url,
+                    fetch.etag,
+                    fetch.last_modified,
+                    fetch.content_hash,
+                    fetch.bytes,
+                    time.time(),
+                ),
+            )
+
+    def touch(self, url: str) -> None:
+        with self.pool.writer() as conn:
+            conn.execute("UPDATE crawl_urls SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def has_content(self, content_hash: str) -> bool:
+        with self.pool.reader() as conn:
+            return (
+                conn.execute(
+                    "SELECT 1 FROM crawl_content WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                is not None
+            )
+
+    def record_content(self, content_hash: str, url: str, size: int, summary: str) -> None:
+        with self.pool.writer() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO crawl_content "
+                "(content_hash, url, bytes, ingested_at, summary) VALUES (?, ?, ?, ?, ?)",
+                (content_hash, url, size, time.time(), summary),
+            )
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class EnrichmentCrawler:
+    """Concurrent CKAN resource crawler feeding the ingestion pipeline.
+
+    Downloads run in ``concurrency`` workers (threads, streamed to disk with an
+    incremental SHA-256); at most ``ingest_concurrency`` ingestions overlap them.
+    A resource is skipped when fetched within ``revisit_after`` seconds, when the
+    server answers 304 to its stored ETag / Last-Modified, or when its content
+    hash was already ingested from any URL. Whatever the budgets leave undone
+    stays pending in the frontier for the next run of the same query.
+    """
+
+    def __init__(
+        self,
+        ckan: Any,
+        ingest: Ingest,
+        *,
+        runtime: StorageRuntime | None = None,
+        state_path: Path | None = None,
+        download_dir: Path | None = None,
+        concurrency: int = 4,
+        ingest_concurrency: int = 2,
+        per_host: int = 2,
+        host_interval: float = 0.5,
+        timeout: float = 60.0,
+        rows: int = 5,
+        max_items: int = 10,
+        max_seconds: float = 120.0,
+        max_bytes: int = 256 << 20,
+        revisit_after: float = 3600.0,
+        process_pipeline: list[str] | None = None,
+        formats: tuple[str, ...] = FORMATS,
+    ):
+        self.ckan = ckan
+        self.ingest = ingest
+        self.runtime = runtime
+        root = runtime.data_root if runtime else Path.home() / ".config" / "atlastrinity" / "data"
+        self.state_path = state_path or root / "golden_fund" / "crawl.db"
+        self.download_dir = download_dir or root / "golden_fund" / "crawl"
+        self.concurrency = max(1, concurrency)
+        self.ingest_concurrency = max(1, ingest_concurrency)
+        self.per_host = per_host
+        self.host_interval = host_interval
+        self.timeout = timeout
+        self.rows = rows
+        self.max_items = max_items
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.revisit_after = revisit_after
+        self.process_pipeline = process_pipeline
+        self.formats = formats
+        self._state: CrawlState | None = None
+        self._state_lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def state(self) -> CrawlState:
+        if self._state is None:
+            with self._state_lock:
+                if self._state is None:
+                    self._state = CrawlState(self.state_path)
+        return self._state
+
+    def close(self) -> None:
+        if self._state is not None:
+            self._state.close()
+            self._state = None
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": "AtlasTrinity-GoldenFund/1.0"})
+            self._local.session = session
+        return session
+
+    def discover(self, query: str, packages: list[dict[str, Any]]) -> list[FrontierItem]:
+        key = query_key(query)
+        wanted = list(self.formats)
+        items: dict[str, FrontierItem] = {}
+        for rank, package in enumerate(packages):
+            for resource in self.ckan.find_resources_by_format(package, wanted):
+                url = self.ckan.get_resource_url(resource)
+                if not url.startswith(("http://", "https://")) or url in items:
+                    continue
+                items[url] = FrontierItem(
+                    url=url,
+                    query=key,
+                    priority=relevance(query, package, resource, rank),
+                    package_id=package.get("id"),
+                    title=package.get("title") or package.get("name"),
+                    format=str(resource.get("format", "")).upper(),
+                )
+        return list(items.values())
+
+    async def crawl(
+        self,
+        query: str,
+        *,
+        max_items: int | None = None,
+        max_seconds: float | None = None,
+        max_bytes: int | None = None,
+    ) -> CrawlReport:
+        t0 = time.monotonic()
+        budget = CrawlBudget(
+            max_seconds if max_seconds is not None else self.max_seconds,
+            max_bytes if max_bytes is not None else self.max_bytes,
+            max_items if max_items is not None else self.max_items,
+        )
+        report = CrawlReport(query=query)
+        limiter = HostLimiter(self.per_host, self.host_interval)
+        state = self.state
+
+        async with limiter.slot(urlsplit(getattr(self.ckan, "base_url", "")).netloc):
+            packages = await asyncio.to_thread(self.ckan.search_packages, query, self.rows)
+        discovered = self.discover(query, packages)
+        report.discovered = len(discovered)
+        await asyncio.to_thread(state.push, discovered)
+        pending = await asyncio.to_thread(state.pending, query_key(query))
+        seen = await asyncio.to_thread(state.validators, [i.url for i in pending])
+        # popped in priority order; budgets are claimed without awaiting, so
+        # the most relevant resources win when they run out
+        work: asyncio.Queue[tuple[FrontierItem, dict[str, Any] | None]] = asyncio.Queue()
+        for item in pending:
+            work.put_nowait((item, seen.get(item.url)))
+
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        ingest_slots = asyncio.Semaphore(self.ingest_concurrency)
+        claimed: set[str] = set()
+        workers = [
+            asyncio.create_task(
+                self._worker(
+                    work=work,
+                    budget=budget,
+                    limiter=limiter,
+                    ingest_slots=ingest_slots,
+                    claimed=claimed,
+                    report=report,
+                )
+            )
+            for _ in range(min(self.concurrency, work.qsize()))
+        ]
+        await asyncio.gather(*workers)
+
+        report.items.sort(key=lambda i: i.priority, reverse=True)
+        report.bytes = budget.bytes
+        report.stopped = budget.stopped
+        report.elapsed = time.monotonic() - t0
+        logger.info(f"Crawl for '{query}': {report.counts()} in {report.elapsed:.2f}s")
+        return report
+
+    async def _worker(
+        self,
+        *,
+        work: asyncio.Queue[tuple[FrontierItem, dict[str, Any] | None]],
+        budget: CrawlBudget,
+        limiter: HostLimiter,
+        ingest_slots: asyncio.Semaphore,
+        claimed: set[str],
+        report: CrawlReport,
+    ) -> None:
+        while not work.empty():
+            item, seen = work.get_nowait()
+            result = CrawlItem(item.url, item.title, item.priority)
+            t0 = time.perf_counter()
+            try:
+                await self._process(
+                    item=item,
+                    seen=seen,
+                    result=result,
+                    budget=budget,
+                    limiter=limiter,
+                    ingest_slots=ingest_slots,
+                    claimed=claimed,
+                )
+            except Exception as e:
+                logger.warning(f"Crawl of {item.url} failed: {e}")
+                result.status, result.detail = "failed", str(e)
+                await asyncio.to_thread(self.state.mark, item.url, "pending", failed=True)
+            result.ms = round((time.perf_counter() - t0) * 1000, 2)
+            report.items.append(result)
+
+    async def _process(
+        self,
+        *,
+        item: FrontierItem,
+        seen: dict[str, Any] | None,
+        result: CrawlItem,
+        budget: CrawlBudget,
+        limiter: HostLimiter,
+        ingest_slots: asyncio.Semaphore,
+        claimed: set[str],
+    ) -> None:
+        state = self.state
+        if seen and seen["fetched_at"] and time.time() - seen["fetched_at"] < self.revisit_after:
+            result.status = "fresh"
+            await asyncio.to_thread(state.mark, item.url, "done")
+            return
+        if not budget.claim_item():
+            result.status, result.detail = "deferred", f"{budget.stopped} budget"
+            return
+
+        async with limiter.slot(urlsplit(item.url).netloc):
+            fetch = await asyncio.to_thread(self._download, item, seen, budget)
+        result.bytes = fetch.bytes
+
+        if fetch.status == "not_modified":
+            budget.release_item()
+            result.status = "not_modified"
+            await asyncio.to_thread(state.touch, item.url)
+            await asyncio.to_thread(state.mark, item.url, "done")
+            return
+        if fetch.status == "budget":
+            result.status, result.detail = "deferred", fetch.error
+            return
+        if fetch.status == "too_large":
+            result.status, result.detail = "too_large", fetch.error
+            await asyncio.to_thread(state.mark, item.url, "skipped")
+            return
+        if fetch.status == "error" or fetch.path is None or fetch.content_hash is None:
+            result.status, result.detail = "failed", fetch.error
+            await asyncio.to_thread(state.mark, item.url, "pending", failed=True)
+            return
+
+        digest = fetch.content_hash
+        try:
+            unchanged = seen is not None and seen["content_hash"] == digest
+            if unchanged or digest in claimed or await asyncio.to_thread(state.has_content, digest):
+                result.status = "duplicate"
+                result.detail = "unchanged" if unchanged else f"sha256 {digest[:12]}"
+                await asyncio.to_thread(state.record_fetch, item.url, fetch)
+                await asyncio.to_thread(state.mark, item.url, "done")
+                return
+
+            claimed.add(digest)
+            async with ingest_slots:
+                outcome = await self.ingest(
+                    str(fetch.path),
+                    type=item.format.lower(),
+                    process_pipeline=self.process_pipeline,
+                    runtime=self.runtime,
+                    source_url=item.url,
+                )
+            if not outcome.success:
+                # validators are not stored, so the next run downloads it again
+                claimed.discard(digest)
+                result.status, result.detail = "failed", outcome.summary
+                await asyncio.to_thread(state.mark, item.url, "pending", failed=True)
+                return
+            result.status, result.detail = "ingested", outcome.summary
+            await asyncio.to_thread(
+                state.record_content, digest, item.url, fetch.bytes, outcome.summary
+            )
+            await asyncio.to_thread(state.record_fetch, item.url, fetch)
+            await asyncio.to_thread(state.mark, item.url, "done")
+        finally:
+            fetch.path.unlink(missing_ok=True)
+
+    def _download(self, item: FrontierItem, seen: dict[str, Any] | None, budget: CrawlBudget):
+        """Conditional, streamed GET into ``download_dir`` (runs in a worker thread)."""
+        headers = {}
+        if seen and seen.get("etag"):
+            headers["If-None-Match"] = seen["etag"]
+        if seen and seen.get("last_modified"):
+            headers["If-Modified-Since"] = seen["last_modified"]
+        name = hashlib.sha1(item.url.encode(), usedforsecurity=False).hexdigest()[:16]
+        path = self.download_dir / f"{name}.{item.format.lower() or 'bin'}"
+        size = 0
+        try:
+            with self._session().get(
+                item.url, headers=headers, stream=True, timeout=self.timeout
+            ) as response:
+                if response.status_code == 304:
+                    return _Fetch("not_modified")
+                response.raise_for_status()
+                length = int(response.headers.get("Content-Length") or 0)
+                if length > budget.max_bytes:
+                    return _Fetch("too_large", error=f"{length} bytes exceed the byte budget")
+                if length and not budget.fits(length):
+                    return _Fetch("budget", error="bytes budget exhausted")
+                digest = hashlib.sha256()
+                with open(path, "wb") as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        size += len(chunk)
+                        budget.spend(len(chunk))
+                        digest.update(chunk)
+                        f.write(chunk)
+                return _Fetch(
+                    "ok",
+                    path=path,
+                    content_hash=digest.hexdigest(),
+                    bytes=size,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+        except BudgetExceededError as e:
+            with suppress(OSError):
+                path.unlink(missing_ok=True)
+            return _Fetch("budget", bytes=size, error=str(e))
+        except Exception as e:
+            with suppress(OSError):
+                path.unlink(missing_ok=True)
+            return _Fetch("error", bytes=size, error=str(e))
@@ -3,13 +3,35 @@ Unified Data Format Parsers for Golden Fund
 Ported and consolidated from etl_module/src/parsing/formats/
 """
 
+import codecs
+import io
 import json
+import mmap
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 import pandas as pd
 
+DEFAULT_BATCH_SIZE = 50_000
+# Bump whenever parsing output changes: cached parse results are keyed by it
+PARSER_VERSION = "1"
+CSV_ENCODINGS = ("utf-8", "latin1", "cp1252", "iso-8859-1")
+_DECODE_CHUNK = 1 << 20
+
+
+@contextmanager
+def mapped(file_path: Path) -> Iterator[BinaryIO]:
+    """Read-only memory map of a file as a binary file object (no read copies into Python)."""
+    with open(file_path, "rb") as f:
+        if f.seek(0, io.SEEK_END) == 0:
+            yield io.BytesIO(b"")  # empty files cannot be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm  # type: ignore[misc]
+
 
 class ParseResult:
     """Result container for parsed data."""
@@ -36,13 +58,44 @@ class JSONParser:
         except Exception as e:
             return ParseResult(False, error=f"JSON parse error: {e}")
 
+    def iter_batches(
+        self,
+        file_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        *,
+        memory_map: bool = False,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """JSON Lines stream in chunks; regular JSON documents are parsed whole, then sliced."""
+        lines = kwargs.pop("lines", False)
+        if lines or file_path.suffix.lower() in (".jsonl", ".ndjson"):
+            if memory_map:
+                # pandas joins the raw lines, so decode them as they are read off the map
+                with (
+                    mapped(file_path) as source,
+                    pd.read_json(
+                        codecs.getreader("utf-8")(source),
+                        lines=True,
+                        chunksize=batch_size,
+                        **kwargs,
+                    ) as reader,
+                ):
+                    yield from reader
+                return
+            with pd.read_json(file_path, lines=True, chunksize=batch_size, **kwargs) as reader:
+                yield from reader
+            return
+        result = self.parse(file_path, **kwargs)
+        if not result.success:
+            raise ValueError(result.error)
+        yield from _slice_batches(_to_frame(result.data), batch_size)
+
 
 class CSVParser:
     def parse(self, file_path: Path, **kwargs) -> ParseResult:
-        encodings = ["utf-8", "latin1", "cp1252", "iso-8859-1"]
         last_error = ""
 
-        for encoding in encodings:
+        for encoding in CSV_ENCODINGS:
             try:
                 df = pd.read_csv(file_path, encoding=encoding, **kwargs)
                 return ParseResult(True, data=df)
@@ -54,6 +107,34 @@ class CSVParser:
 
         return ParseResult(False, error=f"CSV parse error: {last_error or 'Unknown encoding'}")
 
+    def iter_batches(
+        self,
+        file_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        *,
+        memory_map: bool = False,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """Chunked CSV reader.
+
+        The encoding is chosen the way ``parse`` chooses it, for the whole file:
+        an incremental decode pass finds the first one that decodes every byte,
+        so a stray latin-1 byte past the first chunk cannot fail the stream
+        midway. With ``memory_map`` the C tokenizer reads straight from a
+        mapping of the file.
+        """
+        encoding = _detect_encoding(file_path, CSV_ENCODINGS)
+        if encoding is None:
+            raise ValueError("CSV parse error: Unknown encoding")
+        with pd.read_csv(
+            file_path,
+            encoding=encoding,
+            chunksize=batch_size,
+            memory_map=memory_map,
+            **kwargs,
+        ) as reader:
+            yield from reader
+
 
 class XMLParser:
     def parse(self, file_path: Path, **kwargs) -> ParseResult:
@@ -65,6 +146,54 @@ class XMLParser:
         except Exception as e:
             return ParseResult(False, error=f"XML parse error: {e}")
 
+    def iter_batches(
+        self,
+        file_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        *,
+        memory_map: bool = False,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """Incremental parse: each child of the root element is one record.
+
+        Record fields are the record's attributes plus the text of its direct
+        children; processed elements are cleared so memory stays bounded.
+        """
+        if memory_map:
+            with mapped(file_path) as source:
+                yield from self._iter_records(source, batch_size)
+            return
+        yield from self._iter_records(file_path, batch_size)
+
+    def _iter_records(self, source: Path | BinaryIO, batch_size: int) -> Iterator[pd.DataFrame]:
+        records: list[dict[str, Any]] = []
+        depth = 0
+        root: ET.Element | None = None
+        for event, elem in ET.iterparse(source, events=("start", "end")):  # nosec B314
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+            record: dict[str, Any] = dict(elem.attrib)
+            for child in elem:
+                text = (child.text or "").strip()
+                record[child.tag] = text if len(child) == 0 else self._element_to_dict(child)
+            if not record and elem.text and elem.text.strip():
+                record["#text"] = elem.text.strip()
+            records.append(record)
+            elem.clear()
+            if root is not None:
+                root.clear()  # drop references to processed siblings
+            if len(records) >= batch_size:
+                yield pd.DataFrame(records)
+                records = []
+        if records:
+            yield pd.DataFrame(records)
+
     def _element_to_dict(self, element: ET.Element) -> dict[str, Any]:
         result: dict[str, Any] = {}
         if element.attrib:
@@ -104,6 +233,22 @@ class ExcelParser:
         except Exception as e:
             return ParseResult(False, error=f"Excel parse error: {e}")
 
+    def iter_batches(
+        self,
+        file_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        *,
+        memory_map: bool = False,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """Workbooks are read whole (first sheet), then sliced into batches.
+
+        ``memory_map`` is accepted for interface parity only: a workbook is a zip
+        archive that openpyxl seeks through with regular file reads.
+        """
+        df = pd.read_excel(file_path, **kwargs)
+        yield from _slice_batches(_to_frame(df), batch_size)
+
 
 class ParquetParser:
     def parse(self, file_path: Path, **kwargs) -> ParseResult:
@@ -112,3 +257,55 @@ class ParquetParser:
             return ParseResult(True, data=df)
         except Exception as e:
             return ParseResult(False, error=f"Parquet parse error: {e}")
+
+    def iter_batches(
+        self,
+        file_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        *,
+        memory_map: bool = False,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """Row-group aware reader (pyarrow), yielding at most ``batch_size`` rows at a time."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # pyarrow's own mapping: column buffers are read zero-copy from the page cache
+        parquet_file = pq.ParquetFile(pa.memory_map(str(file_path)) if memory_map else file_path)
+        try:
+            for batch in parquet_file.iter_batches(batch_size=batch_size, **kwargs):
+                yield batch.to_pandas()
+        finally:
+            parquet_file.close()
+
+
+def _detect_encoding(file_path: Path, encodings: Iterable[str]) -> str | None:
+    """First of ``encodings`` that decodes the whole file, read in bounded chunks."""
+    for encoding in encodings:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(file_path, "rb") as f:
+                while chunk := f.read(_DECODE_CHUNK):
+                    decoder.decode(chunk)
+                decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return None
+
+
+def _to_frame(data: Any) -> pd.DataFrame:
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, dict) and data and all(isinstance(v, pd.DataFrame) for v in data.values()):
+        return next(iter(data.values()))
+    if isinstance(data, list):
+        return pd.DataFrame(data)
+    if isinstance(data, dict):
+        return pd.DataFrame([data])
+    return pd.DataFrame()
+
+
+def _slice_batches(df: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start : start + batch_size]
@@ -3,9 +3,13 @@ Main Data Parser Interface for Golden Fund
 Ported from etl_module/src/parsing/data_parser.py
 """
 
+from collections.abc import Iterator
 from pathlib import Path
 
+import pandas as pd
+
 from .formats import (
+    DEFAULT_BATCH_SIZE,
     CSVParser,
     ExcelParser,
     JSONParser,
@@ -42,3 +46,36 @@ class DataParser:
             return ParseResult(False, error=f"No parser for format: {format_hint}")
 
         return parser.parse(file_path)
+
+    def iter_batches(
+        self,
+        file_path: str | Path,
+        format_hint: str | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        *,
+        memory_map: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a file as DataFrame batches of at most ``batch_size`` rows.
+
+        Raises FileNotFoundError / ValueError instead of returning a ParseResult,
+        since errors may surface mid-stream. ``memory_map`` reads through a
+        read-only mapping of the file instead of buffered reads.
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        if format_hint is None:
+            format_hint = file_path.suffix.lstrip(".").lower()
+        options = {}
+        if format_hint in ("jsonl", "ndjson"):
+            # explicit, since content-addressed artifacts carry no file suffix
+            format_hint, options = "json", {"lines": True}
+
+        parser = self._parsers.get(format_hint)
+        if not parser:
+            raise ValueError(f"No parser for format: {format_hint}")
+
+        return parser.iter_batches(
+            file_path, batch_size=batch_size, memory_map=memory_map, **options
+        )
@@ -0,0 +1,322 @@
+"""
+Hybrid Retrieval for Golden Fund
+Runs keyword (FTS5), vector and structured (SQL) lookups concurrently under a
+deadline, normalizes their scores and fuses them with weighted reciprocal rank
+fusion, deduplicating hits that describe the same entity or record.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .storage.structured import normalize_key
+
+logger = logging.getLogger("golden_fund.retrieval")
+
+# A source returns hits for (query, limit); each hit is a dict with
+# id, score (higher = better), record (dict), optional snippet and record_key
+Backend = Callable[[str, int], list[dict[str, Any]]]
+
+DEFAULT_WEIGHTS = {"keyword": 1.0, "vector": 0.8, "structured": 0.7}
+ENTITY_FIELDS = ("edrpou", "ipn", "tax_id", "entity_id")
+
+# Keyword documents from ingestion are '<run_id>_<row>' and mirror row <row> of dataset_<run_id>
+_INGEST_DOC_ID = re.compile(r"^(\d{8}_\d{6}_[0-9a-f]{6})_(\d+)$")
+
+
+class SourceUnavailableError(RuntimeError):
+    """Raised by a backend whose store is disabled (reported, not logged as an error)."""
+
+
+@dataclass
+class SourceReport:
+    status: str = "ok"  # ok | empty | timeout | error | unavailable
+    hits: int = 0
+    ms: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class FusedResult:
+    key: str
+    score: float = 0.0
+    record: dict[str, Any] = field(default_factory=dict)
+    sources: dict[str, dict[str, float]] = field(default_factory=dict)
+    snippet: str | None = None
+    keys: set[str] = field(default_factory=set)
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "id": self.key,
+            "score": round(self.score, 6),
+            "sources": self.sources,
+            "record": self.record,
+        }
+        if self.snippet:
+            out["snippet"] = self.snippet
+        return out
+
+
+@dataclass
+class HybridResponse:
+    query: str
+    results: list[FusedResult] = field(default_factory=list)
+    sources: dict[str, SourceReport] = field(default_factory=dict)
+    took_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "query": self.query,
+            "results": [r.to_dict() for r in self.results],
+            "total": len(self.results),
+            "sources": {name: vars(report) for name, report in self.sources.items()},
+            "took_ms": round(self.took_ms, 2),
+        }
+
+
+def normalize_scores(hits: list[dict[str, Any]]) -> list[float]:
+    """Min-max normalize one source's scores to [0, 1] (all-equal -> 1.0)."""
+    scores = [float(h.get("score") or 0.0) for h in hits]
+    if not scores:
+        return []
+    lo, hi = min(scores), max(scores)
+    if hi - lo < 1e-12:
+        return [1.0] * len(scores)
+    return [(s - lo) / (hi - lo) for s in scores]
+
+
+def identity_keys(source: str, hit: dict[str, Any]) -> list[str]:
+    """Keys under which hits from different sources are the same result."""
+    keys = []
+    record = hit.get("record") or {}
+    for name, value in record.items():
+        if str(name).lower() in ENTITY_FIELDS and (key := normalize_key(value)) is not None:
+            keys.append(f"{str(name).lower()}:{key}")
+    if hit.get("record_key"):
+        keys.append(str(hit["record_key"]))
+    keys.append(f"{source}:{hit.get('id')}")
+    return keys
+
+
+def _ranked(hits: list[dict[str, Any]]) -> list[tuple[int, dict[str, Any], float]]:
+    """(rank, hit, normalized) with tied scores sharing a rank (1, 2, 2, 4...).
+
+    Coarse sources (e.g. structured exact/partial) would otherwise impose an
+    arbitrary order on equally good hits.
+    """
+    out = []
+    rank, previous = 0, None
+    for pos, (hit, norm) in enumerate(zip(hits, normalize_scores(hits), strict=True), 1):
+        score = float(hit.get("score") or 0.0)
+        if score != previous:
+            rank, previous = pos, score
+        out.append((rank, hit, norm))
+    return out
+
+
+class HybridRetriever:
+    """Concurrent multi-source search with weighted reciprocal rank fusion.
+
+    ``score = (1 - blend) * rrf / rrf_max + blend * weighted_mean(normalized)``
+    where ``rrf = sum(w_s / (k + rank_s))`` over the sources that returned the hit.
+    """
+
+    def __init__(
+        self,
+        backends: dict[str, Backend],
+        weights: dict[str, float] | None = None,
+        *,
+        k: int = 60,
+        blend: float = 0.3,
+        deadline: float = 2.0,
+        per_source_limit: int = 20,
+    ):
+        self.backends = backends
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.k = k
+        self.blend = min(1.0, max(0.0, blend))
+        self.deadline = deadline
+        self.per_source_limit = per_source_limit
+
+    async def search(self, query: str, limit: int = 10) -> HybridResponse:
+        t0 = time.perf_counter()
+        response = HybridResponse(query=query)
+        tasks = {
+            name: asyncio.create_task(self._run_source(name, backend, query, response))
+            for name, backend in self.backends.items()
+        }
+        done, pending = await asyncio.wait(tasks.values(), timeout=self.deadline)
+        for name, task in tasks.items():
+            if task in pending:
+                # The worker thread finishes on its own; its result is dropped
+                task.cancel()
+                response.sources[name] = SourceReport(status="timeout", ms=self.deadline * 1000)
+        per_source = {name: task.result() for name, task in tasks.items() if task in done}
+        response.results = self.fuse(per_source)[:limit]
+        response.took_ms = (time.perf_counter() - t0) * 1000
+        return response
+
+    async def _run_source(
+        self, name: str, backend: Backend, query: str, response: HybridResponse
+    ) -> list[dict[str, Any]]:
+        t0 = time.perf_counter()
+        report = SourceReport()
+        try:
+            hits = await asyncio.to_thread(backend, query, self.per_source_limit)
+        except SourceUnavailableError as e:
+            hits, report.status, report.error = [], "unavailable", str(e)
+        except Exception as e:
+            logger.warning(f"Hybrid source '{name}' failed: {e}")
+            hits, report.status, report.error = [], "error", str(e)
+        report.ms = round((time.perf_counter() - t0) * 1000, 2)
+        report.hits = len(hits)
+        if report.status == "ok" and not hits:
+            report.status = "empty"
+        response.sources[name] = report
+        return hits
+
+    def fuse(self, per_source: dict[str, list[dict[str, Any]]]) -> list[FusedResult]:
+        groups: list[FusedResult] = []
+        by_key: dict[str, FusedResult] = {}
+        total_weight = sum(self.weights.get(name, 1.0) for name in per_source) or 1.0
+        rrf_max = sum(self.weights.get(name, 1.0) / (self.k + 1) for name in per_source) or 1.0
+
+        for name, hits in per_source.items():
+            for rank, hit, norm in _ranked(hits):
+                keys = identity_keys(name, hit)
+                matches = {id(by_key[k]): by_key[k] for k in keys if k in by_key}
+                if matches:
+                    group, *others = matches.values()
+                    for other in others:  # this hit links two earlier groups
+                        self._merge(group, other, by_key)
+                        groups.remove(other)
+                else:
+                    group = FusedResult(key=keys[0])
+                    groups.append(group)
+                for k in keys:
+                    by_key[k] = group
+                group.keys.update(keys)
+
+                if name in group.sources:
+                    continue  # a source's duplicate rows count once, at their best rank
+                group.sources[name] = {
+                    "rank": rank,
+                    "score": float(hit.get("score") or 0.0),
+                    "normalized": round(norm, 6),
+                }
+                for col, value in (hit.get("record") or {}).items():
+                    group.record.setdefault(col, value)
+                if hit.get("snippet") and not group.snippet:
+                    group.snippet = hit["snippet"]
+
+        for group in groups:
+            rrf = sum(
+                self.weights.get(name, 1.0) / (self.k + s["rank"])
+                for name, s in group.sources.items()
+            )
+            dense = sum(
+                self.weights.get(name, 1.0) * s["normalized"] for name, s in group.sources.items()
+            )
+            group.score = (1 - self.blend) * rrf / rrf_max + self.blend * dense / total_weight
+        groups.sort(key=lambda g: g.score, reverse=True)
+        return groups
+
+    @staticmethod
+    def _merge(into: FusedResult, other: FusedResult, by_key: dict[str, FusedResult]) -> None:
+        for name, stats in other.sources.items():
+            if name not in into.sources or stats["rank"] < into.sources[name]["rank"]:
+                into.sources[name] = stats
+        for col, value in other.record.items():
+            into.record.setdefault(col, value)
+        into.snippet = into.snippet or other.snippet
+        into.keys.update(other.keys)
+        for k in other.keys:
+            by_key[k] = into
+
+
+# -- adapters for the Golden Fund stores -------------------------------------
+
+
+def keyword_backend(search_storage: Any) -> Backend:
+    def run(query: str, limit: int) -> list[dict[str, Any]]:
+        if not search_storage.enabled:
+            raise SourceUnavailableError("keyword index disabled")
+        res = search_storage.search(query, limit=limit)
+        if not res.success:
+            raise RuntimeError(res.error)
+        hits = []
+        for item in (res.data or {}).get("results", []):
+            hit = {
+                "id": item["id"],
+                "score": item["score"],
+                "record": dict(item.get("source") or {}),
+                "snippet": item.get("snippet"),
+            }
+            m = _INGEST_DOC_ID.match(str(item["id"]))
+            if m:
+                hit["record_key"] = f"dataset_{m.group(1)}#{m.group(2)}"
+            hits.append(hit)
+        return hits
+
+    return run
+
+
+def vector_backend(vector_storage: Any) -> Backend:
+    def run(query: str, limit: int) -> list[dict[str, Any]]:
+        if not vector_storage.enabled:
+            raise SourceUnavailableError("vector store disabled")
+        res = vector_storage.search(query, limit=limit)
+        if not res.success:
+            if not vector_storage.enabled:
+                raise SourceUnavailableError(res.error)
+            raise RuntimeError(res.error)
+        hits = []
+        for item in (res.data or {}).get("results", []):
+            record = dict(item.get("metadata") or {})
+            if not record and isinstance(item.get("content"), str):
+                try:
+                    record = json.loads(item["content"])
+                except ValueError:
+                    record = {"content": item["content"]}
+            hit = {"id": item["id"], "score": item.get("score", 0.0), "record": record}
+            if record.get("sql_table"):
+                hit["record_key"] = f"table:{record['sql_table']}"
+            hits.append(hit)
+        return hits
+
+    return run
+
+
+def structured_backend(lookup: Callable[[str, int], list[dict[str, Any]]]) -> Backend:
+    """Wraps a row lookup ``(query, per_table_limit)`` returning dicts with
+    ``_source_table`` and ``_rowid``. Rows are not truncated across tables: a
+    match that is missing here counts as disagreement in the fusion."""
+
+    def run(query: str, limit: int) -> list[dict[str, Any]]:
+        needle = query.strip().lower()
+        hits = []
+        for row in lookup(query, limit):
+            record = {k: v for k, v in row.items() if not str(k).startswith("_")}
+            table = row.get("_source_table", "")
+            rowid = row.get("_rowid")
+            exact = row.get("_match") == "exact" or any(
+                str(v).strip().lower() == needle for v in record.values()
+            )
+            hit = {
+                "id": f"{table}#{rowid}",
+                "score": 1.0 if exact else 0.5,
+                "record": {**record, "_source_table": table},
+            }
+            if rowid is not None:
+                # dataset tables are appended in order: rowid n is source row n - 1
+                hit["record_key"] = f"{table}#{int(rowid) - 1}"
+            hits.append(hit)
+        hits.sort(key=lambda h: h["score"], reverse=True)
+        return hits
+
+    return run
@@ -8,6 +8,7 @@ Ported from etl_module/src/scraping/data_scraper.py
 import csv
 import json
 import logging
+import shutil
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from enum import Enum
@@ -151,6 +152,48 @@ class DataScraper:
         except Exception as e:
             return ScrapeResult(False, error=f"File download failed: {e!s}")
 
+    def download_to_file(
+        self, url: str, file_path: str | Path, timeout: int = 60, chunk_size: int = 1 << 20
+    ) -> ScrapeResult:
+        """Stream a file from a URL (or local path) straight to disk.
+
+        Unlike ``download_file`` the payload is never held in memory as a whole.
+        """
+        file_path = Path(file_path)
+        try:
+            logger.info(f"Downloading file: {url} -> {file_path}")
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            if url.startswith("file://") or "://" not in url:
+                path = Path(url.replace("file://", ""))
+                if not path.exists():
+                    return ScrapeResult(False, error=f"Local file not found: {path}")
+                shutil.copyfile(path, file_path)
+                result = ScrapeResult(True, data=str(file_path))
+                result.metadata = {
+                    "url": url,
+                    "status_code": 200,
+                    "bytes": file_path.stat().st_size,
+                }
+                return result
+
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                with open(file_path, "wb") as f:
+                    f.writelines(response.iter_content(chunk_size=chunk_size))
+                result = ScrapeResult(True, data=str(file_path))
+                result.metadata = {
+                    "url": url,
+                    "status_code": response.status_code,
+                    "content_type": response.headers.get(
+                        "Content-Type", "application/octet-stream"
+                    ),
+                    "bytes": file_path.stat().st_size,
+                }
+            return result
+        except Exception as e:
+            return ScrapeResult(False, error=f"File download failed: {e!s}")
+
     def scrape_html_tables(self, url: str, timeout: int = 30) -> ScrapeResult:
         """Scrape HTML tables from a web page as a fallback when structured data is not available.
 
@@ -0,0 +1,587 @@
+"""
+Artifact Store for Golden Fund
+Content-addressed raw artifacts (SHA-256, refcounted, zstd) with a parse-result cache
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from ..formats import DEFAULT_BATCH_SIZE, PARSER_VERSION
+from .pool import SQLitePool
+
+logger = logging.getLogger("golden_fund.storage.artifacts")
+
+ZSTD_AVAILABLE = importlib.util.find_spec("zstandard") is not None
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Containers that are already compressed: zstd would only burn CPU on them
+INCOMPRESSIBLE = {".parquet", ".xlsx", ".xls", ".zip", ".gz", ".bz2", ".xz", ".zst", ".7z"}
+MIN_SAVING = 0.1  # keep the zstd copy only if it is at least 10% smaller
+# Parse results are lz4 record batches: ~3x smaller than plain IPC, still cheap to replay
+PARSED_CODEC = "lz4"
+# In-flight writes land in tmp/ and objects/ before they are bound to a ref
+WRITE_GRACE = 3600.0
+# maybe_gc() runs a full collection at most this often
+GC_INTERVAL = 600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    refcount INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifact_refs (
+    ref TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifact_refs_sha ON artifact_refs(sha256);
+CREATE TABLE IF NOT EXISTS parse_cache (
+    sha256 TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    options TEXT NOT NULL,
+    path TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (sha256, parser_version, options)
+);
+"""
+
+
+@dataclass
+class Artifact:
+    sha256: str
+    size: int
+    stored_size: int
+    codec: str
+    refcount: int
+    path: Path
+    deduplicated: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["path"] = str(self.path)
+        return data
+
+
+def _options_key(format_hint: str) -> str:
+    # everything besides content and PARSER_VERSION that shapes the parse result
+    return json.dumps({"format": format_hint}, sort_keys=True)
+
+
+class ArtifactStore:
+    """Raw source files stored once per distinct content.
+
+    Objects live under ``objects/ab/<sha256>[.zst]`` and are shared by any
+    number of named refs (``ingest/<url>``, ``blob/<bucket>/<name>``); rebinding
+    or releasing a ref decrements the object's refcount and ``gc()`` removes
+    what nothing references. Parsed batches are cached as Arrow IPC files keyed
+    by (content hash, PARSER_VERSION, options), so re-ingesting unchanged bytes
+    skips parsing entirely.
+
+    The ``unpacked/`` and ``parsed/`` budgets are enforced as files are written:
+    an unpacked copy is dropped once its parse result is cached, and the least
+    recently used files go when a budget is exceeded.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        *,
+        level: int = 3,
+        unpacked_budget: int = 1 << 30,
+        parsed_budget: int = 2 << 30,
+        readers: int = 2,
+        gc_interval: float = GC_INTERVAL,
+    ):
+        self.root = Path(
+            root or Path.home() / ".config" / "atlastrinity" / "data" / "golden_fund" / "artifacts"
+        )
+        self.level = level
+        self.unpacked_budget = unpacked_budget
+        self.parsed_budget = parsed_budget
+        for sub in ("objects", "unpacked", "parsed", "tmp"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self.pool = SQLitePool(self.root / "artifacts.db", readers=readers)
+        with self.pool.writer() as conn:
+            conn.executescript(SCHEMA)
+        self._unpack_lock = threading.Lock()
+        self.gc_interval = gc_interval
+        self._last_gc = 0.0
+        self.stats = {"puts": 0, "deduplicated": 0, "parse_hits": 0, "parse_misses": 0}
+        logger.info(f"ArtifactStore initialized at {self.root}")
+
+    # ---- objects -----------------------------------------------------------
+
+    def _object_path(self, sha256: str, codec: str) -> Path:
+        suffix = ".zst" if codec == "zstd" else ""
+        return self.root / "objects" / sha256[:2] / f"{sha256}{suffix}"
+
+    def _tmp(self) -> Path:
+        return self.root / "tmp" / uuid.uuid4().hex
+
+    def _write_object(self, source: Path, sha256: str, *, move: bool) -> tuple[str, int]:
+        """Materialize ``source`` as the object for ``sha256``; returns (codec, stored size)."""
+        size = source.stat().st_size
+        if ZSTD_AVAILABLE and size and source.suffix.lower() not in INCOMPRESSIBLE:
+            import zstandard as zstd
+
+            tmp = self._tmp()
+            with open(source, "rb") as src, open(tmp, "wb") as dst:
+                zstd.ZstdCompressor(level=self.level).copy_stream(src, dst, size=size)
+            stored = tmp.stat().st_size
+            if stored <= size * (1 - MIN_SAVING):
+                target = self._object_path(sha256, "zstd")
+                target.parent.mkdir(exist_ok=True)
+                os.replace(tmp, target)
+                if move:
+                    # the plain bytes become the unpacked copy: the first parse needs no inflate
+                    shutil.move(str(source), self.root / "unpacked" / sha256)
+                    self._trim_unpacked(keep=sha256)
+                return "zstd", stored
+            tmp.unlink(missing_ok=True)
+
+        target = self._object_path(sha256, "raw")
+        target.parent.mkdir(exist_ok=True)
+        tmp = self._tmp()
+        if move:
+            shutil.move(str(source), tmp)
+        else:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+        return "raw", size
+
+    def put_file(self, path: Path, ref: str, *, move: bool = False) -> Artifact:
+        """Store a file under ``ref``; identical content is only reference-counted.
+
+        The file is hashed first, so a duplicate never pays for compression or
+        a second copy on disk. ``move`` consumes the source file.
+        """
+        path = Path(path)
+        with open(path, "rb") as f:
+            sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+        size = path.stat().st_size
+        existing = self.info(sha256)
+        codec, stored = (existing.codec, existing.stored_size) if existing else ("", 0)
+        if existing is None:
+            codec, stored = self._write_object(path, sha256, move=move)
+        artifact = self._bind(
+            sha256, ref, size=size, codec=codec, stored=stored, source=path, move=move
+        )
+        artifact.deduplicated = existing is not None
+        if move:
+            path.unlink(missing_ok=True)
+        self.stats["puts"] += 1
+        self.stats["deduplicated"] += artifact.deduplicated
+        return artifact
+
+    def put_bytes(self, data: bytes, ref: str, *, suffix: str = "") -> Artifact:
+        tmp = self._tmp().with_suffix(suffix)
+        tmp.write_bytes(data)
+        try:
+            return self.put_file(tmp, ref, move=True)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _bind(
+        self, sha256: str, ref: str, *, size: int, codec: str, stored: int, source: Path, move: bool
+    ) -> Artifact:
+        now = time.time()
+        with self.pool.writer() as conn:
+            row = conn.execute(
+                "SELECT codec, stored_size FROM artifacts WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            if row is not None:
+                codec, stored = row
+            if not self._object_path(sha256, codec).exists():
+                # gc removed the object between hashing and binding: write it again
+                if not source.exists():
+                    raise FileNotFoundError(f"Artifact {sha256} vanished during store")
+                codec, stored = self._write_object(source, sha256, move=move)
+                conn.execute("DELETE FROM artifacts WHERE sha256 = ?", (sha256,))
+                row = None
+            if row is None:
+                conn.execute(
+                    "INSERT INTO artifacts VALUES (?, ?, ?, ?, 0, ?, ?)",
+                    (sha256, size, stored, codec, now, now),
+                )
+            old = conn.execute("SELECT sha256 FROM artifact_refs WHERE ref = ?", (ref,)).fetchone()
+            if old is None or old[0] != sha256:
+                if old is not None:
+                    conn.execute(
+                        "UPDATE artifacts SET refcount = refcount - 1 WHERE sha256 = ?", old
+                    )
+                conn.execute(
+                    "INSERT OR REPLACE INTO artifact_refs VALUES (?, ?, ?)", (ref, sha256, now)
+                )
+                conn.execute(
+                    "UPDATE artifacts SET refcount = refcount + 1 WHERE sha256 = ?", (sha256,)
+                )
+            conn.execute("UPDATE artifacts SET last_used = ? WHERE sha256 = ?", (now, sha256))
+            (refcount,) = conn.execute(
+                "SELECT refcount FROM artifacts WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        return Artifact(sha256, size, stored, codec, refcount, self._object_path(sha256, codec))
+
+    def release(self, ref: str) -> bool:
+        """Drop a ref; the object stays on disk until ``gc()`` finds it unreferenced."""
+        with self.pool.writer() as conn:
+            row = conn.execute("SELECT sha256 FROM artifact_refs WHERE ref = ?", (ref,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM artifact_refs WHERE ref = ?", (ref,))
+            conn.execute("UPDATE artifacts SET refcount = refcount - 1 WHERE sha256 = ?", row)
+        return True
+
+    def resolve(self, ref: str) -> str | None:
+        with self.pool.reader() as conn:
+            row = conn.execute("SELECT sha256 FROM artifact_refs WHERE ref = ?", (ref,)).fetchone()
+        return row[0] if row else None
+
+    def info(self, sha256: str) -> Artifact | None:
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT size, stored_size, codec, refcount FROM artifacts WHERE sha256 = ?",
+                (sha256,),
+            ).fetchone()
+        if row is None:
+            return None
+        size, stored, codec, refcount = row
+        return Artifact(sha256, size, stored, codec, refcount, self._object_path(sha256, codec))
+
+    def _require(self, sha256: str) -> Artifact:
+        artifact = self.info(sha256)
+        if artifact is None or not artifact.path.exists():
+            raise FileNotFoundError(f"Unknown artifact: {sha256}")
+        return artifact
+
+    def read_bytes(self, sha256: str) -> bytes:
+        artifact = self._require(sha256)
+        if artifact.codec == "zstd":
+            import zstandard as zstd
+
+            with open(artifact.path, "rb") as f:
+                return zstd.ZstdDecompressor().stream_reader(f).read()
+        return artifact.path.read_bytes()
+
+    def local_path(self, sha256: str) -> Path:
+        """A plain file with the artifact's bytes (decompressed once into ``unpacked/``)."""
+        artifact = self._require(sha256)
+        if artifact.codec == "raw":
+            return artifact.path
+        target = self.root / "unpacked" / sha256
+        with self._unpack_lock:
+            if target.exists():
+                os.utime(target)  # LRU clock for gc's unpacked budget
+                return target
+            import zstandard as zstd
+
+            tmp = self._tmp()
+            with open(artifact.path, "rb") as src, open(tmp, "wb") as dst:
+                zstd.ZstdDecompressor().copy_stream(src, dst)
+            os.replace(tmp, target)
+        self._trim_unpacked(keep=sha256)
+        return target
+
+    def _unpacked_over_budget(self, keep: str = "") -> list[Path]:
+        """Unpacked copies beyond ``unpacked_budget``, least recently used first out."""
+        files = []
+        for path in (self.root / "unpacked").iterdir():
+            with suppress(FileNotFoundError):
+                st = path.stat()
+                files.append((st.st_mtime, st.st_size, path))
+        files.sort(reverse=True)
+        used = 0
+        over = []
+        for _, size, path in files:
+            used += size
+            if used > self.unpacked_budget and path.name != keep:
+                over.append(path)
+        return over
+
+    def _trim_unpacked(self, keep: str) -> None:
+        for path in self._unpacked_over_budget(keep):
+            path.unlink(missing_ok=True)
+
+    # ---- parse cache -------------------------------------------------------
+
+    def iter_batches(
+        self,
+        sha256: str,
+        parser: Any,
+        format_hint: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """Batches of the parsed artifact, served from the parse cache when possible.
+
+        On a miss the artifact is parsed through a memory map and the batches
+        are teed into an Arrow IPC file; the cache entry is only committed once
+        the whole file parsed cleanly. Like DataParser.iter_batches, unknown
+        artifacts and formats raise before the first batch. Batch boundaries are
+        not part of the key: cached results are re-sliced to ``batch_size``.
+        """
+        key = _options_key(format_hint)
+        if ARROW_AVAILABLE:
+            cached = self._cached(sha256, key)
+            if cached is not None:
+                self.stats["parse_hits"] += 1
+                logger.info(f"Parse cache hit for sha256:{sha256[:12]} ({format_hint})")
+                return self._read_cached(cached, batch_size)
+        self.stats["parse_misses"] += 1
+        path = self.local_path(sha256)
+        batches = parser.iter_batches(path, format_hint, batch_size=batch_size, memory_map=True)
+        if not ARROW_AVAILABLE:
+            return batches
+        return self._tee(sha256, key, batches)
+
+    def _cached(self, sha256: str, key: str) -> Path | None:
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT path FROM parse_cache WHERE sha256 = ? AND parser_version = ? "
+                "AND options = ?",
+                (sha256, PARSER_VERSION, key),
+            ).fetchone()
+        if row is None or not (self.root / row[0]).exists():
+            return None
+        with self.pool.writer() as conn:
+            conn.execute(
+                "UPDATE parse_cache SET last_used = ? WHERE sha256 = ? AND parser_version = ? "
+                "AND options = ?",
+                (time.time(), sha256, PARSER_VERSION, key),
+            )
+        return self.root / row[0]
+
+    @staticmethod
+    def _read_cached(path: Path, batch_size: int) -> Iterator[pd.DataFrame]:
+        import pyarrow as pa
+
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            offset = 0
+            pending: list[Any] = []
+            pending_rows = 0
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                while pending_rows >= batch_size:
+                    table = pa.Table.from_batches(pending)
+                    head, rest = table.slice(0, batch_size), table.slice(batch_size)
+                    yield _to_frame(head, offset)
+                    offset += batch_size
+                    pending, pending_rows = rest.to_batches(), rest.num_rows
+            if pending_rows:
+                yield _to_frame(pa.Table.from_batches(pending), offset)
+
+    def _tee(
+        self, sha256: str, key: str, batches: Iterator[pd.DataFrame]
+    ) -> Iterator[pd.DataFrame]:
+        import pyarrow as pa
+
+        digest = hashlib.sha1(f"{PARSER_VERSION}\0{key}".encode(), usedforsecurity=False)
+        name = f"parsed/{sha256}.{digest.hexdigest()[:16]}.arrow"
+        tmp = self._tmp()
+        writer = None
+        rows = 0
+        caching = True
+        try:
+            for batch in batches:
+                if caching:
+                    try:
+                        table = pa.Table.from_pandas(batch, preserve_index=False)
+                        if writer is None:
+                            options = pa.ipc.IpcWriteOptions(compression=PARSED_CODEC)
+                            writer = pa.ipc.new_file(str(tmp), table.schema, options=options)
+                        writer.write_table(table)
+                    except (pa.ArrowException, ValueError, TypeError) as e:
+                        # mixed-type object columns or a dtype that drifts between chunks
+                        logger.debug(f"Not caching parse of {sha256[:12]}: {e}")
+                        caching = False
+                rows += len(batch)
+                yield batch
+            if caching and writer is not None:
+                writer.close()
+                writer = None
+                os.replace(tmp, self.root / name)
+                now = time.time()
+                with self.pool.writer() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            sha256,
+                            PARSER_VERSION,
+                            key,
+                            name,
+                            rows,
+                            (self.root / name).stat().st_size,
+                            now,
+                            now,
+                        ),
+                    )
+                    over = self._parsed_over_budget(conn)
+                    self._forget_parsed(conn, over)
+                for *_, path in over:
+                    (self.root / path).unlink(missing_ok=True)
+                # replays come from the parse result now, not the plain bytes
+                (self.root / "unpacked" / sha256).unlink(missing_ok=True)
+        finally:
+            if writer is not None:
+                with suppress(Exception):
+                    writer.close()
+            tmp.unlink(missing_ok=True)
+
+    # ---- maintenance -------------------------------------------------------
+
+    def _parsed_over_budget(self, conn: Any) -> list[tuple[str, str, str, str]]:
+        """Current parse results beyond ``parsed_budget``, least recently used first out."""
+        parsed = conn.execute(
+            "SELECT sha256, parser_version, options, path, bytes FROM parse_cache "
+            "WHERE parser_version = ? AND sha256 IN (SELECT sha256 FROM artifacts) "
+            "ORDER BY last_used DESC",
+            (PARSER_VERSION,),
+        ).fetchall()
+        used = 0
+        over = []
+        for sha256, version, options, path, size in parsed:
+            used += size
+            if used > self.parsed_budget:
+                over.append((sha256, version, options, path))
+        return over
+
+    @staticmethod
+    def _forget_parsed(conn: Any, rows: list[tuple[str, str, str, str]]) -> None:
+        conn.executemany(
+            "DELETE FROM parse_cache WHERE sha256 = ? AND parser_version = ? AND options = ?",
+            [row[:3] for row in rows],
+        )
+
+    def maybe_gc(self) -> dict[str, int] | None:
+        """Run ``gc()`` if the last collection is older than ``gc_interval``."""
+        now = time.monotonic()
+        if self._last_gc and now - self._last_gc < self.gc_interval:
+            return None
+        self._last_gc = now
+        return self.gc()
+
+    def gc(self, grace: float = 0.0) -> dict[str, int]:
+        """Collect unreferenced objects, stale parse results and files over budget.
+
+        - objects with refcount 0 (untouched for ``grace`` seconds) and their
+          unpacked copies and parse results
+        - parse results from an older PARSER_VERSION
+        - unpacked copies whose current parse result is cached, then least
+          recently used unpacked / parsed files beyond their byte budgets
+        - orphan files left by interrupted writes
+        """
+        cutoff = time.time() - grace
+        write_cutoff = time.time() - max(grace, WRITE_GRACE)
+        report = {"objects": 0, "parsed": 0, "unpacked": 0, "orphans": 0, "bytes_freed": 0}
+
+        def remove(path: Path, kind: str) -> None:
+            with suppress(FileNotFoundError):
+                size = path.stat().st_size
+                path.unlink()
+                report[kind] += 1
+                report["bytes_freed"] += size
+
+        with self.pool.writer() as conn:
+            dead = conn.execute(
+                "SELECT sha256, codec FROM artifacts WHERE refcount <= 0 AND last_used < ?",
+                (cutoff,),
+            ).fetchall()
+            for sha256, codec in dead:
+                remove(self._object_path(sha256, codec), "objects")
+                remove(self.root / "unpacked" / sha256, "unpacked")
+            conn.executemany("DELETE FROM artifacts WHERE sha256 = ?", [(s,) for s, _ in dead])
+            stale = conn.execute(
+                "SELECT sha256, parser_version, options, path FROM parse_cache "
+                "WHERE parser_version != ? OR sha256 NOT IN (SELECT sha256 FROM artifacts)",
+                (PARSER_VERSION,),
+            ).fetchall()
+            stale += self._parsed_over_budget(conn)
+            for *_, path in stale:
+                remove(self.root / path, "parsed")
+            self._forget_parsed(conn, stale)
+            known = set(conn.execute("SELECT sha256, codec FROM artifacts"))
+            cached = {r[0] for r in conn.execute("SELECT path FROM parse_cache")}
+            replayable = {
+                r[0]
+                for r in conn.execute(
+                    "SELECT DISTINCT sha256 FROM parse_cache WHERE parser_version = ?",
+                    (PARSER_VERSION,),
+                )
+            }
+
+            # unbound objects may belong to a store that has not reached _bind yet
+            for path in (self.root / "objects").glob("*/*"):
+                sha256, _, suffix = path.name.partition(".")
+                codec = "zstd" if suffix == "zst" else "raw"
+                if (sha256, codec) not in known and path.stat().st_mtime < write_cutoff:
+                    remove(path, "orphans")
+            for path in (self.root / "parsed").iterdir():
+                if f"parsed/{path.name}" not in cached and path.stat().st_mtime < cutoff:
+                    remove(path, "orphans")
+            for path in (self.root / "tmp").iterdir():
+                if path.stat().st_mtime < write_cutoff:
+                    remove(path, "orphans")
+
+        for path in (self.root / "unpacked").iterdir():
+            if path.name in replayable:
+                remove(path, "unpacked")
+        for path in self._unpacked_over_budget():
+            remove(path, "unpacked")
+        if any(report.values()):
+            logger.info(f"Artifact gc: {report}")
+        return report
+
+    def usage(self) -> dict[str, Any]:
+        with self.pool.reader() as conn:
+            objects, size, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) "
+                "FROM artifacts"
+            ).fetchone()
+            refs = conn.execute("SELECT COUNT(*) FROM artifact_refs").fetchone()[0]
+            parsed, parsed_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM parse_cache"
+            ).fetchone()
+        return {
+            "objects": objects,
+            "refs": refs,
+            "logical_bytes": size,
+            "stored_bytes": stored,
+            "parsed_results": parsed,
+            "parsed_bytes": parsed_bytes,
+            **self.stats,
+        }
+
+    def health_check(self) -> dict[str, Any]:
+        return {**self.pool.health_check(), **self.usage()}
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def _to_frame(table: Any, offset: int) -> pd.DataFrame:
+    df = table.to_pandas()
+    df.index = pd.RangeIndex(offset, offset + len(df))
+    return df
@@ -8,10 +8,13 @@ import logging
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .types import StorageResult
 
+if TYPE_CHECKING:
+    from .artifacts import ArtifactStore
+
 logger = logging.getLogger("golden_fund.storage.blob")
 
 
@@ -19,9 +22,16 @@ class BlobStorage:
     """
     Blob storage adapter (MinIO-style).
     Persists data to local disk in a structured way (simulating bucket storage).
+    With an ArtifactStore, blobs are content-addressed: ``bucket/filename`` is a
+    ref and identical payloads share one compressed object.
     """
 
-    def __init__(self, root_path: str | None = None, bucket: str = "default"):
+    def __init__(
+        self,
+        root_path: str | None = None,
+        bucket: str = "default",
+        artifacts: "ArtifactStore | None" = None,
+    ):
         if root_path is None:
             self.root = Path.home() / ".config" / "atlastrinity" / "data" / "golden_fund" / "blobs"
         else:
@@ -30,6 +40,7 @@ class BlobStorage:
         self.root.mkdir(parents=True, exist_ok=True)
         self.bucket_path = self.root / self.bucket
         self.bucket_path.mkdir(exist_ok=True)
+        self.artifacts = artifacts
         logger.info(f"BlobStorage initialized at {self.bucket_path}")
 
     def store(self, data: Any, filename: str | None = None) -> StorageResult:
@@ -37,6 +48,9 @@ class BlobStorage:
             if not filename:
                 filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.json"
 
+            if self.artifacts is not None:
+                return self._store_artifact(self.artifacts, data, filename)
+
             file_path = self.bucket_path / filename
 
             with open(file_path, "w", encoding="utf-8") as f:
@@ -61,8 +75,43 @@ class BlobStorage:
         except Exception as e:
             return StorageResult(False, "blob", error=str(e))
 
+    def _ref(self, filename: str) -> str:
+        return f"blob/{self.bucket}/{filename}"
+
+    def _store_artifact(
+        self, artifacts: "ArtifactStore", data: Any, filename: str
+    ) -> StorageResult:
+        if isinstance(data, dict | list):
+            payload = json.dumps(data, indent=2, default=str).encode("utf-8")
+        else:
+            payload = str(data).encode("utf-8")
+        artifact = artifacts.put_bytes(payload, self._ref(filename), suffix=Path(filename).suffix)
+        logger.info(f"Stored blob: {self._ref(filename)} -> sha256:{artifact.sha256[:12]}")
+        return StorageResult(
+            True,
+            "blob",
+            data={
+                "path": str(artifact.path),
+                "filename": filename,
+                "url": f"file://{artifact.path.absolute()}",
+                "size": artifact.size,
+                "stored_size": artifact.stored_size,
+                "sha256": artifact.sha256,
+                "deduplicated": artifact.deduplicated,
+            },
+        )
+
     def retrieve(self, filename: str) -> StorageResult:
         try:
+            if self.artifacts is not None and (
+                sha256 := self.artifacts.resolve(self._ref(filename))
+            ):
+                text = self.artifacts.read_bytes(sha256).decode("utf-8")
+                try:
+                    return StorageResult(True, "blob", data=json.loads(text))
+                except json.JSONDecodeError:
+                    return StorageResult(True, "blob", data=text)
+
             file_path = self.bucket_path / filename
             if not file_path.exists():
                 return StorageResult(False, "blob", error="File not found")
@@ -0,0 +1,360 @@
+"""
+FTS5 Keyword Index Engine for Golden Fund
+External-content FTS5 tables over a compact document table, batch loading,
+tokenizer profiles, merge/optimize scheduling, BM25 weighting and snippets.
+"""
+
+import itertools
+import json
+import logging
+import re
+import sqlite3
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .pool import SQLitePool
+
+logger = logging.getLogger("golden_fund.storage.fts")
+
+# Named tokenizer profiles. SQLite's remove_diacritics only folds Latin letters
+# (café == cafe); Ukrainian letters are handled by query expansion below.
+TOKENIZERS: dict[str, str] = {
+    "unicode61": "unicode61 remove_diacritics 2",
+    "porter": "porter unicode61 remove_diacritics 2",
+    "trigram": "trigram",
+}
+
+FIELDS = ("title", "content", "description")
+_WORD = re.compile(r"\w+", re.UNICODE)
+_FTS_SYNTAX = re.compile(r'["*:^()+]|\b(?:AND|OR|NOT|NEAR)\b')
+# A base letter typed in a query may stand for its diacritic form (Киів -> Київ)
+_UK_VARIANTS = {"и": "й", "і": "ї", "г": "ґ", "е": "є"}
+_MAX_VARIANTS = 16
+_COLUMN_KEYS = frozenset((*FIELDS, "id"))
+_JSON = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+@dataclass
+class FTSConfig:
+    tokenizer: str = "unicode61"
+    # Secondary trigram index for substring queries (larger on disk)
+    trigram: bool = False
+    # BM25 weights for title, content, description
+    weights: tuple[float, float, float] = (10.0, 1.0, 2.0)
+    batch_size: int = 10_000
+    automerge: int = 8
+    # Run 'optimize' once this many documents were written since the last one (0 disables)
+    optimize_every: int = 500_000
+    # Incremental 'merge' work (pages) done after each batch (0 disables)
+    merge_pages: int = 0
+
+    def tokenize_clause(self, name: str | None = None) -> str:
+        spec = TOKENIZERS.get(name or self.tokenizer, name or self.tokenizer)
+        return f"tokenize='{spec}'"
+
+
+def _variants(word: str) -> list[str]:
+    word = word.lower()
+    slots = [(c, _UK_VARIANTS[c]) if c in _UK_VARIANTS else (c,) for c in word]
+    if 2 ** sum(len(s) > 1 for s in slots) > _MAX_VARIANTS:
+        return [word]
+    return ["".join(p) for p in itertools.product(*slots)]
+
+
+def match_expression(query: str, expand: Callable[[str], list[str]] = _variants) -> str:
+    """Quote each word so user text cannot break FTS5 query syntax (all words required).
+
+    Words with Ukrainian base letters expand to an OR-group of their diacritic forms.
+    """
+    groups = []
+    for word in _WORD.findall(query):
+        variants = expand(word)
+        if len(variants) == 1:
+            groups.append(f'"{variants[0]}"')
+        else:
+            groups.append("(" + " OR ".join(f'"{v}"' for v in variants) + ")")
+    return " AND ".join(groups)
+
+
+class FTSIndex:
+    """Keyword index: ``<name>_docs`` holds documents, ``<name>_fts`` indexes them.
+
+    The FTS tables are external-content (they store only the inverted index).
+    They are kept in step set-wise per batch rather than by per-row triggers,
+    so all writes must go through this class.
+    """
+
+    def __init__(self, pool: SQLitePool, name: str, config: FTSConfig | None = None):
+        self.pool = pool
+        self.name = name
+        self.config = config or FTSConfig()
+        self.docs = f"{name}_docs"
+        self.fts = f"{name}_fts"
+        self.tri = f"{name}_tri"
+        self._since_optimize = 0
+        self.stats = {"indexed": 0, "batches": 0, "merges": 0, "optimizes": 0, "rebuilds": 0}
+
+    # -- schema -------------------------------------------------------------
+
+    def create(self) -> None:
+        with self.pool.writer() as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.docs} (
+                    rowid INTEGER PRIMARY KEY,
+                    doc_id TEXT NOT NULL UNIQUE,
+                    title TEXT,
+                    content TEXT,
+                    description TEXT,
+                    extra TEXT
+                )
+                """
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fts_index_meta (name TEXT PRIMARY KEY, tokenizer TEXT)"
+            )
+            self._create_fts(conn, self.fts, self.config.tokenizer)
+            if self.config.trigram:
+                self._create_fts(conn, self.tri, "trigram")
+            self._migrate_legacy(conn)
+
+    def _create_fts(self, conn: sqlite3.Connection, table: str, tokenizer: str) -> None:
+        spec = TOKENIZERS.get(tokenizer, tokenizer)
+        row = conn.execute(
+            "SELECT tokenizer FROM fts_index_meta WHERE name = ?", (table,)
+        ).fetchone()
+        if row is not None and row[0] != spec:
+            # Tokenizer changed: drop the index and rebuild it from the document table
+            logger.info(f"Tokenizer for '{table}' changed ({row[0]} -> {spec}), rebuilding")
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            f"{', '.join(FIELDS)}, content='{self.docs}', content_rowid='rowid', "
+            f"{self.config.tokenize_clause(tokenizer)})"
+        )
+        conn.execute(
+            f"INSERT INTO {table}({table}, rank) VALUES ('automerge', ?)", (self.config.automerge,)
+        )
+        if row is None or row[0] != spec:
+            if row is not None:
+                conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+                self.stats["rebuilds"] += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO fts_index_meta (name, tokenizer) VALUES (?, ?)",
+                (table, spec),
+            )
+
+    def _migrate_legacy(self, conn: sqlite3.Connection) -> None:
+        """Move documents out of the old self-contained ``<name>`` FTS5 table."""
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ? AND sql LIKE '%source_json%'", (self.name,)
+        ).fetchone()
+        if legacy is None:
+            return
+        rows = conn.execute(
+            f"SELECT id, title, content, description, source_json FROM {self.name}"
+        ).fetchall()
+        docs = []
+        for doc_id, *fields, source_json in rows:
+            try:
+                source = json.loads(source_json)
+            except (TypeError, ValueError):
+                source = {}
+            source.update(zip(FIELDS, fields, strict=True), id=doc_id)
+            docs.append(source)
+        self._insert(conn, docs)
+        conn.execute(f"DROP TABLE {self.name}")
+        logger.info(f"Migrated {len(docs)} documents from legacy FTS table '{self.name}'")
+
+    # -- writes -------------------------------------------------------------
+
+    @staticmethod
+    def _row(item: dict[str, Any]) -> tuple:
+        doc_id = item.get("id")
+        title = item.get("title")
+        content = item.get("content")
+        description = item.get("description")
+        # The document table keeps everything else as one compact JSON blob
+        extra = {k: v for k, v in item.items() if k not in _COLUMN_KEYS}
+        return (
+            uuid.uuid4().hex if doc_id is None else str(doc_id),
+            "" if title is None else str(title),
+            "" if content is None else str(content),
+            "" if description is None else str(description),
+            _JSON.encode(extra) if extra else None,
+        )
+
+    def _fts_tables(self) -> list[str]:
+        return [self.fts, self.tri] if self.config.trigram else [self.fts]
+
+    @property
+    def _staged_docs(self) -> str:
+        # CROSS JOIN pins the batch as the outer loop (index probes, not a full scan)
+        return f"temp.fts_batch b CROSS JOIN {self.docs} d ON d.doc_id = b.doc_id"
+
+    def _stage_ids(self, conn: sqlite3.Connection, doc_ids: list[tuple[str]]) -> None:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS fts_batch (doc_id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.fts_batch")
+        conn.executemany("INSERT OR IGNORE INTO temp.fts_batch VALUES (?)", doc_ids)
+
+    def _unindex_staged(self, conn: sqlite3.Connection) -> None:
+        cols = ", ".join(FIELDS)
+        selected = ", ".join(f"d.{c}" for c in FIELDS)
+        for table in self._fts_tables():
+            conn.execute(
+                f"INSERT INTO {table}({table}, rowid, {cols}) "
+                f"SELECT 'delete', d.rowid, {selected} FROM {self._staged_docs}"
+            )
+
+    def _insert(self, conn: sqlite3.Connection, items: list[dict[str, Any]]) -> int:
+        rows = [self._row(item) for item in items]
+        cols = ", ".join(FIELDS)
+        selected = ", ".join(f"d.{c}" for c in FIELDS)
+        self._stage_ids(conn, [(r[0],) for r in rows])
+        # Replaced documents leave the index first ('delete' needs the old values)
+        self._unindex_staged(conn)
+        conn.executemany(
+            f"""
+            INSERT INTO {self.docs} (doc_id, title, content, description, extra)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(doc_id) DO UPDATE SET
+                title = excluded.title,
+                content = excluded.content,
+                description = excluded.description,
+                extra = excluded.extra
+            """,
+            rows,
+        )
+        for table in self._fts_tables():
+            conn.execute(
+                f"INSERT INTO {table}(rowid, {cols}) "
+                f"SELECT d.rowid, {selected} FROM {self._staged_docs}"
+            )
+        return len(items)
+
+    def add(self, items: Iterable[dict[str, Any]]) -> int:
+        """Upsert documents in ``batch_size`` chunks, one transaction per chunk."""
+        total = 0
+        batch: list[dict[str, Any]] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.config.batch_size:
+                total += self._write_batch(batch)
+                batch = []
+        if batch:
+            total += self._write_batch(batch)
+        return total
+
+    def _write_batch(self, batch: list[dict[str, Any]]) -> int:
+        with self.pool.writer() as conn:
+            count = self._insert(conn, batch)
+            if self.config.merge_pages:
+                self._command(conn, "merge", self.config.merge_pages)
+                self.stats["merges"] += 1
+        self.stats["indexed"] += count
+        self.stats["batches"] += 1
+        self._since_optimize += count
+        if self.config.optimize_every and self._since_optimize >= self.config.optimize_every:
+            self.optimize()
+        return count
+
+    def delete(self, doc_ids: Iterable[str]) -> int:
+        with self.pool.writer() as conn:
+            self._stage_ids(conn, [(str(d),) for d in doc_ids])
+            self._unindex_staged(conn)
+            cur = conn.execute(
+                f"DELETE FROM {self.docs} WHERE doc_id IN (SELECT doc_id FROM temp.fts_batch)"
+            )
+            return cur.rowcount
+
+    def _command(self, conn: sqlite3.Connection, command: str, arg: int | None = None) -> None:
+        for table in self._fts_tables():
+            if arg is None:
+                conn.execute(f"INSERT INTO {table}({table}) VALUES (?)", (command,))
+            else:
+                conn.execute(f"INSERT INTO {table}({table}, rank) VALUES (?, ?)", (command, arg))
+
+    def optimize(self) -> None:
+        """Merge all index segments into one (best query speed, costly on big indexes)."""
+        with self.pool.writer() as conn:
+            self._command(conn, "optimize")
+        self._since_optimize = 0
+        self.stats["optimizes"] += 1
+
+    def rebuild(self) -> None:
+        with self.pool.writer() as conn:
+            self._command(conn, "rebuild")
+        self.stats["rebuilds"] += 1
+
+    # -- reads --------------------------------------------------------------
+
+    def count(self) -> int:
+        with self.pool.reader() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {self.docs}").fetchone()[0]
+
+    def _indexed_variants(self, conn: sqlite3.Connection, word: str) -> list[str]:
+        """Diacritic variants of ``word`` that occur in the index (OR-groups cost per row)."""
+        variants = _variants(word)
+        if len(variants) == 1:
+            return variants
+        probe = f"SELECT 1 FROM {self.fts} WHERE {self.fts} MATCH ? LIMIT 1"
+        found = [v for v in variants if conn.execute(probe, (f'"{v}"',)).fetchone()]
+        return found or variants[:1]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        *,
+        substring: bool = False,
+        snippet: bool = True,
+        highlight: bool = False,
+        weights: tuple[float, float, float] | None = None,
+    ) -> list[dict[str, Any]]:
+        """BM25-ranked matches; ``substring`` uses the trigram index when enabled."""
+        table = self.tri if substring and self.config.trigram else self.fts
+        rank = "bm25({})".format(", ".join(str(float(x)) for x in weights or self.config.weights))
+        extra_cols = ""
+        if snippet:
+            extra_cols += f", snippet({table}, -1, '[', ']', '…', 12)"
+        if highlight:
+            extra_cols += f", highlight({table}, 0, '[', ']')"
+        # 'ORDER BY rank' lets FTS5 sort internally, so the document join and
+        # snippets are only evaluated for the rows actually returned
+        sql = (
+            f"SELECT d.doc_id, d.title, d.content, d.description, d.extra, rank{extra_cols} "
+            f"FROM {table} JOIN {self.docs} d ON d.rowid = {table}.rowid "
+            f"WHERE {table} MATCH ? AND rank MATCH ? ORDER BY rank LIMIT ?"
+        )
+        with self.pool.reader() as conn:
+            if table == self.tri:
+                expression = '"{}"'.format(query.replace('"', '""'))
+            elif _FTS_SYNTAX.search(query):
+                expression = query  # caller wrote an FTS5 query (phrases, prefixes, OR, ...)
+            else:
+                expression = match_expression(query, lambda w: self._indexed_variants(conn, w))
+            if not expression:
+                return []
+            try:
+                rows = conn.execute(sql, (expression, rank, limit)).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax: fall back to quoted terms
+                safe = match_expression(query)
+                if not safe or safe == expression:
+                    return []
+                rows = conn.execute(sql, (safe, rank, limit)).fetchall()
+
+        results = []
+        for row in rows:
+            doc_id, title, content, description, extra, score = row[:6]
+            source = json.loads(extra) if extra else {}
+            source.update(id=doc_id, title=title, content=content, description=description)
+            result = {"id": doc_id, "score": -score, "source": source}
+            if snippet:
+                result["snippet"] = row[6]
+            if highlight:
+                result["highlight"] = row[-1]
+            results.append(result)
+        return results
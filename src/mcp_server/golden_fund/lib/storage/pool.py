@@ -0,0 +1,136 @@
+"""
+SQLite Connection Pool for Golden Fund storage backends.
+One serialized writer connection plus a small pool of reader connections (WAL).
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("golden_fund.storage.pool")
+
+DEFAULT_PRAGMAS: dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+    "cache_size": -32 * 1024,  # KiB
+}
+
+
+class SQLitePool:
+    """Thread-safe reader/writer connections for one SQLite file.
+
+    Connections are long-lived, so sqlite3's per-connection statement cache
+    (``cached_statements``) keeps hot queries prepared across calls.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        readers: int = 4,
+        pragmas: dict[str, Any] | None = None,
+        cached_statements: int = 256,
+    ):
+        self.db_path = Path(db_path)
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+        self._size = max(1, readers)
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._created = 0
+        self._all: list[sqlite3.Connection] = []
+        self._writer: sqlite3.Connection | None = None
+        self._write_lock = threading.RLock()
+        self._create_lock = threading.Lock()
+        self._closed = False
+        self.stats = {"connections_opened": 0, "reads": 0, "writes": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for key, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {key}={value}")
+        self._all.append(conn)
+        self.stats["connections_opened"] += 1
+        return conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """The single write connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self.stats["writes"] += 1
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """A pooled read connection (lazily opened, up to ``readers``)."""
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self.stats["reads"] += 1
+            if self._closed:
+                conn.close()
+            else:
+                self._readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._create_lock:
+            if self._created < self._size:
+                self._created += 1
+                return self._connect()
+        return self._readers.get()
+
+    def health_check(self) -> dict[str, Any]:
+        try:
+            with self.reader() as conn:
+                conn.execute("SELECT 1").fetchone()
+                journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            return {"ok": True, "path": str(self.db_path), "journal_mode": journal, **self.stats}
+        except Exception as e:
+            return {"ok": False, "path": str(self.db_path), "error": str(e)}
+
+    def close(self) -> None:
+        """Checkpoint the WAL and close every connection."""
+        if self._closed:
+            return
+        with self._write_lock:
+            self._closed = True
+            try:
+                if self._writer is not None:
+                    self._writer.execute("PRAGMA optimize")
+                    self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                logger.warning(f"Checkpoint on close failed for {self.db_path}: {e}")
+            for conn in self._all:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._all.clear()
+            self._writer = None
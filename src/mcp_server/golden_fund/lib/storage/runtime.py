@@ -0,0 +1,154 @@
+"""
+Storage Runtime for Golden Fund
+Owns one long-lived, thread-safe set of storage backends and helpers per process.
+"""
+
+import atexit
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ..parser import DataParser
+from ..scraper import DataScraper
+from ..validation import DataValidator
+from .artifacts import ArtifactStore
+from .blob import BlobStorage
+from .search import SearchStorage
+from .sql import SQLStorage
+from .vector import VectorStorage
+
+logger = logging.getLogger("golden_fund.storage.runtime")
+
+T = TypeVar("T")
+
+
+class StorageRuntime:
+    """Lazily constructed, shared backends for ingestion and search.
+
+    SQL and keyword storage keep pooled SQLite connections (one writer, N readers)
+    for the life of the runtime; Chroma is opened on first vector use.
+    """
+
+    def __init__(self, data_root: Path | None = None, readers: int = 4):
+        self.data_root = data_root or Path.home() / ".config" / "atlastrinity" / "data"
+        self.readers = readers
+        self._lock = threading.RLock()
+        self._components: dict[str, Any] = {}
+        self._closed = False
+
+    def _get(self, name: str, factory: Callable[[], T]) -> T:
+        component = self._components.get(name)
+        if component is not None:
+            return component
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("StorageRuntime is closed")
+            if name not in self._components:
+                self._components[name] = factory()
+            return self._components[name]
+
+    @property
+    def sql(self) -> SQLStorage:
+        return self._get(
+            "sql",
+            lambda: SQLStorage(self.data_root / "golden_fund" / "golden.db", readers=self.readers),
+        )
+
+    @property
+    def search(self) -> SearchStorage:
+        return self._get(
+            "search",
+            lambda: SearchStorage(
+                db_path=self.data_root / "search" / "golden_fund_index.db", readers=self.readers
+            ),
+        )
+
+    @property
+    def vector(self) -> VectorStorage:
+        return self._get(
+            "vector", lambda: VectorStorage(str(self.data_root / "golden_fund" / "chroma_db"))
+        )
+
+    @property
+    def artifacts(self) -> ArtifactStore:
+        return self._get(
+            "artifacts", lambda: ArtifactStore(self.data_root / "golden_fund" / "artifacts")
+        )
+
+    @property
+    def blob(self) -> BlobStorage:
+        return self._get(
+            "blob",
+            lambda: BlobStorage(
+                str(self.data_root / "golden_fund" / "blobs"), artifacts=self.artifacts
+            ),
+        )
+
+    @property
+    def scraper(self) -> DataScraper:
+        return self._get("scraper", DataScraper)
+
+    @property
+    def parser(self) -> DataParser:
+        return self._get("parser", DataParser)
+
+    @property
+    def validator(self) -> DataValidator:
+        return self._get("validator", DataValidator)
+
+    def health(self) -> dict[str, Any]:
+        """Health of every backend constructed so far (nothing is opened just to check)."""
+        report: dict[str, Any] = {}
+        for name in ("sql", "search", "vector", "artifacts"):
+            component = self._components.get(name)
+            if component is None:
+                report[name] = {"ok": None, "status": "not started"}
+                continue
+            try:
+                report[name] = component.health_check()
+            except Exception as e:
+                report[name] = {"ok": False, "error": str(e)}
+        report["ok"] = all(r.get("ok") is not False for r in report.values())
+        return report
+
+    def close(self) -> None:
+        """Close backends in reverse construction order; safe to call twice."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for name, component in reversed(list(self._components.items())):
+                close = getattr(component, "close", None)
+                if close is None:
+                    continue
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Failed to close {name} storage: {e}")
+            self._components.clear()
+        logger.info("Golden Fund storage runtime closed")
+
+
+_runtime: StorageRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> StorageRuntime:
+    """The process-wide runtime (created on first use, closed at exit)."""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = StorageRuntime()
+                atexit.register(_runtime.close)
+    return _runtime
+
+
+def shutdown_runtime() -> None:
+    global _runtime
+    with _runtime_lock:
+        if _runtime is not None:
+            _runtime.close()
+            _runtime = None
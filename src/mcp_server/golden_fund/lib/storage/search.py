@@ -1,10 +1,9 @@
-import json
 import logging
-import sqlite3
-import uuid
 from pathlib import Path
 from typing import Any
 
+from .fts import FTSConfig, FTSIndex
+from .pool import SQLitePool
 from .types import StorageResult
 
 logger = logging.getLogger("golden_fund.storage.search")
@@ -14,6 +13,8 @@ class SearchStorage:
     """
     Search engine storage adapter (SQLite with FTS5).
     Provides full-text search capabilities without external dependencies.
+    Documents live in a compact table indexed by external-content FTS5 tables
+    (see ``fts.FTSIndex``).
     """
 
     def __init__(
@@ -22,15 +23,21 @@ class SearchStorage:
         index_name: str = "golden_fund_index",
         # Kept for compatibility but unused in SQLite mode
         hosts: list[str] | None = None,
+        *,
+        db_path: Path | None = None,
+        readers: int = 4,
+        fts_config: FTSConfig | None = None,
     ):
         self.enabled = enabled
         self.index_name = index_name
 
         # SQLite DB path (per index)
         # Using ~/.config/atlastrinity/data/search/
-        self.db_path = (
+        self.db_path = db_path or (
             Path.home() / ".config" / "atlastrinity" / "data" / "search" / f"{index_name}.db"
         )
+        self.pool = SQLitePool(self.db_path, readers=readers)
+        self.index = FTSIndex(self.pool, index_name, fts_config)
 
         if enabled:
             try:
@@ -43,25 +50,9 @@ class SearchStorage:
             logger.info("SearchStorage disabled")
 
     def _init_db(self):
-        """Initialize SQLite database with FTS5 table."""
+        """Initialize the document table and its FTS5 indexes."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with sqlite3.connect(self.db_path) as conn:
-            # Enable FTS5 extension if it's not builtin (usually it is in Python 3.12+)
-            # Create FTS5 virtual table
-            # We store the raw JSON source in a separate column or in the FTS table (if needed for result)
-            # Here we follow a simple schema: id, title, content, description, source_json
-
-            conn.execute(f"""
-                CREATE VIRTUAL TABLE IF NOT EXISTS {self.index_name} USING fts5(
-                    id, 
-                    title, 
-                    content, 
-                    description, 
-                    source_json UNINDEXED
-                )
-            """)
-            conn.commit()
+        self.index.create()
 
     def index_documents(self, data: dict[str, Any] | list[dict[str, Any]]) -> StorageResult:
         if not self.enabled:
@@ -74,22 +65,7 @@ class SearchStorage:
             if isinstance(data, dict):
                 data = [data]
 
-            doc_count = 0
-            with sqlite3.connect(self.db_path) as conn:
-                for item in data:
-                    doc_id = item.get("id", str(uuid.uuid4()))
-                    title = item.get("title", "")
-                    content = item.get("content", "")
-                    description = item.get("description", "")
-                    source_json = json.dumps(item, ensure_ascii=False)
-
-                    conn.execute(
-                        f"INSERT OR REPLACE INTO {self.index_name} (id, title, content, description, source_json) VALUES (?, ?, ?, ?, ?)",
-                        (doc_id, title, content, description, source_json),
-                    )
-                    doc_count += 1
-                conn.commit()
-
+            doc_count = self.index.add(data)
             logger.info(f"Indexed {doc_count} docs into '{self.index_name}' (SQLite)")
 
             return StorageResult(
@@ -100,42 +76,39 @@ class SearchStorage:
             logger.error(msg)
             return StorageResult(False, "search", error=msg)
 
-    def search(self, query: str, limit: int = 10) -> StorageResult:
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        substring: bool = False,
+        highlight: bool = False,
+    ) -> StorageResult:
+        """BM25-ranked keyword search (higher score = better) with snippets.
+
+        ``substring`` matches inside words via the trigram index when it is enabled.
+        """
         if not self.enabled:
             return StorageResult(False, "search", error="SearchStorage is disabled")
 
         try:
             logger.info(f"Searching '{self.index_name}' for: {query}")
+            results = self.index.search(query, limit, substring=substring, highlight=highlight)
+            return StorageResult(True, "search", data={"results": results, "total": len(results)})
+        except Exception as e:
+            return StorageResult(False, "search", error=f"Search failed: {e}")
 
-            results = []
-            total = 0
-
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-
-                safe_query = query.replace('"', '""')
-                cursor = conn.execute(
-                    f"SELECT id, source_json, rank FROM {self.index_name} WHERE {self.index_name} MATCH ? ORDER BY rank LIMIT ?",
-                    (safe_query, limit),
-                )
-
-                rows = cursor.fetchall()
-                for row in rows:
-                    results.append(
-                        {
-                            "id": row["id"],
-                            "score": row[
-                                "rank"
-                            ],  # FTS5 rank is lower = better usually, but API expects score.
-                            "source": json.loads(row["source_json"]),
-                        }
-                    )
-
-                # Get total count (approximation)
-                # For FTS this can be slow if table is huge
-                total = len(results)
+    def optimize(self) -> StorageResult:
+        """Merge the index into a single segment (run after large loads)."""
+        try:
+            self.index.optimize()
+            return StorageResult(True, "search", data=self.index.stats)
+        except Exception as e:
+            return StorageResult(False, "search", error=f"Optimize failed: {e}")
 
-            return StorageResult(True, "search", data={"results": results, "total": total})
+    def health_check(self) -> dict[str, Any]:
+        if not self.enabled:
+            return {"ok": False, "path": str(self.db_path), "error": "disabled"}
+        return {**self.pool.health_check(), "index": self.index.stats}
 
-        except Exception as e:
-            return StorageResult(False, "search", error=f"Search failed: {e}")
+    def close(self) -> None:
+        self.pool.close()
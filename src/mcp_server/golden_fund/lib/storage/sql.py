@@ -1,17 +1,29 @@
 import logging
-import sqlite3
 from pathlib import Path
 from typing import Any, Literal, cast
 
 import pandas as pd
 
+from .pool import SQLitePool
+from .structured import StructuredIndex
 from .types import StorageResult
 
 logger = logging.getLogger("golden_fund.storage.sql")
 
 
+def _sql_type(series: pd.Series) -> str:
+    """SQLite column type for a series, as pandas' ``to_sql`` would create it."""
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
 class SQLStorage:
-    def __init__(self, db_path: Path | None = None):
+    def __init__(self, db_path: Path | None = None, readers: int = 4):
         if db_path is None:
             # Default location: global config directory
             config_root = Path.home() / ".config" / "atlastrinity"
@@ -22,14 +34,16 @@ class SQLStorage:
             self.db_dir = db_path.parent
 
         self.db_dir.mkdir(parents=True, exist_ok=True)
+        self.pool = SQLitePool(self.db_path, readers=readers)
+        # Column catalog, entity keys and FTS shadow tables for the dataset tables
+        self.index = StructuredIndex(self.pool)
         self._init_db()
 
     def _init_db(self):
         """Initialize the database connection and ensure basic structure."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Enable WAL mode for better concurrency
-                conn.execute("PRAGMA journal_mode=WAL;")
+            # WAL mode is enabled by the pool on every connection
+            with self.pool.writer() as conn:
                 # Create a metadata table to track datasets
                 conn.execute(
                     """
@@ -43,6 +57,11 @@ class SQLStorage:
                     )
                     """
                 )
+                self.index.create(conn)
+                backfilled = self.index.sync(conn)
+            self.index.invalidate()
+            if backfilled:
+                logger.info(f"Indexed {backfilled} pre-existing rows for structured search")
             logger.info(f"Initialized SQL storage at {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
@@ -66,9 +85,17 @@ class SQLStorage:
         table_name = self._sanitize_table_name(dataset_name)
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.writer() as conn:
+                if if_exists == "replace":
+                    self.index.drop_table(conn, table_name)
+                elif if_exists == "append" and self._add_missing_columns(conn, table_name, df):
+                    # The catalog and the contentless FTS rows follow the old column
+                    # set: forget them so index_table re-registers the whole table
+                    self.index.drop_table(conn, table_name)
                 # Store actual data
                 df.to_sql(table_name, conn, if_exists=if_exists, index=False)
+                # Index the appended rows in the same transaction
+                self.index.index_table(conn, table_name)
 
                 # Update metadata
                 conn.execute(
@@ -90,11 +117,39 @@ class SQLStorage:
         except Exception as e:
             logger.error(f"Failed to store dataset {dataset_name}: {e}")
             return StorageResult(success=False, target=table_name, error=str(e))
+        finally:
+            self.index.invalidate()
+
+    @staticmethod
+    def _add_missing_columns(conn: Any, table_name: str, df: pd.DataFrame) -> list[str]:
+        """ALTER TABLE for columns of ``df`` that an existing table lacks.
+
+        Record formats (XML, JSON Lines) do not give every record the same
+        fields, so a later batch may bring columns the first one did not have.
+        """
+        existing = {
+            row[1].casefold()
+            for row in conn.execute(f'PRAGMA table_info("{table_name}")')  # nosec B608
+        }
+        if not existing:
+            return []  # to_sql creates the table
+        added = []
+        for column in df.columns:
+            name = str(column)
+            if name.casefold() in existing:
+                continue
+            quoted = '"{}"'.format(name.replace('"', '""'))
+            conn.execute(f'ALTER TABLE "{table_name}" ADD COLUMN {quoted} {_sql_type(df[column])}')
+            existing.add(name.casefold())
+            added.append(name)
+        if added:
+            logger.info(f"Added columns {added} to {table_name}")
+        return added
 
     def query(self, query: str, params: tuple = ()) -> StorageResult:
         """Execute a raw SQL query."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.pool.reader() as conn:
                 df = pd.read_sql_query(query, cast("Any", conn), params=list(params))
                 return StorageResult(
                     success=True, target="query", data=df.to_dict(orient="records")
@@ -102,6 +157,15 @@ class SQLStorage:
         except Exception as e:
             return StorageResult(success=False, target="query", error=str(e))
 
+    def health_check(self) -> dict[str, Any]:
+        health = self.pool.health_check()
+        if health["ok"]:
+            health["structured_index"] = self.index.health()
+        return health
+
+    def close(self) -> None:
+        self.pool.close()
+
     def _sanitize_table_name(self, name: str) -> str:
         """Sanitize string to be a valid SQL table name."""
         return "".join(c if c.isalnum() else "_" for c in name).lower()
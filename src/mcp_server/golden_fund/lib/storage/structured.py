@@ -0,0 +1,487 @@
+"""
+Structured Index for Golden Fund
+Column catalog, exact-match entity keys and a trigram FTS5 index over the
+SQL dataset tables, maintained at ingest time so lookups never scan the
+datasets themselves.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from .pool import SQLitePool
+
+logger = logging.getLogger("golden_fund.storage.structured")
+
+# Column roles: 'id' and 'name' values get exact-match keys, text columns go to FTS.
+# Identifier names must be whole words ("beginning" is not "inn", "syntax" not "tax");
+# generic "code"/"код" columns only count if their values look like codes.
+ID_COLUMN = re.compile(
+    r"(?:^|[\W_])(?:edrpou|ipn|inn|rnokpp|tax_?id|tax_?number|єдрпоу|єдрпу|іпн|рнокпп)(?:[\W_]|$)",
+    re.IGNORECASE,
+)
+NAME_COLUMN = re.compile(r"name|title|назва|найменування|піб|company|компан", re.IGNORECASE)
+KEY_ROLES = frozenset(("id", "name"))
+# EDRPOU (8 digits) / IPN (10 digits), used to detect unnamed identifier columns
+_CODE_VALUE = re.compile(r"^\d{8}(?:\d{2})?$")
+_SAMPLE_ROWS = 200
+_CODE_SHARE = 0.9
+# Trigram tokens are 3 characters; shorter queries only use exact keys
+MIN_SUBSTRING = 3
+# Full-text rowids pack (table id, row id) so one index serves every dataset
+_ROW_BITS = 32
+# Joins a row's text columns; no query contains it, so matches never span columns
+_SEPARATOR = "\x1f"
+
+
+def normalize_key(value: Any) -> str | None:
+    """Canonical form of an identifier or name for exact matching.
+
+    Case and whitespace are folded, integral floats lose their '.0' and digit
+    codes their leading zeros (EDRPOU 00032106 read as an integer is 32106).
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            value = int(value)
+    text = " ".join(str(value).split()).casefold()
+    if not text:
+        return None
+    if text.isdigit():
+        text = text.lstrip("0") or "0"
+    return text
+
+
+def key_hash(key: str) -> int:
+    """Signed 64-bit hash used as the fixed-width index key."""
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big", signed=True
+    )
+
+
+def _quote(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _is_text(sql_type: str) -> bool:
+    sql_type = sql_type.upper()
+    return not sql_type or any(t in sql_type for t in ("TEXT", "CHAR", "CLOB"))
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    position: int
+    name: str
+    sql_type: str
+    role: str  # id | name | text | other
+
+    @property
+    def text(self) -> bool:
+        return _is_text(self.sql_type)
+
+
+@dataclass(frozen=True)
+class TableInfo:
+    id: int
+    name: str
+    fts: bool
+    columns: tuple[ColumnInfo, ...]
+
+    @property
+    def key_columns(self) -> tuple[ColumnInfo, ...]:
+        return tuple(c for c in self.columns if c.role in KEY_ROLES)
+
+    @property
+    def fts_columns(self) -> tuple[ColumnInfo, ...]:
+        return tuple(c for c in self.columns if c.text)
+
+    def text_expression(self) -> str:
+        """SQL for one row's text columns joined by the separator."""
+        sep = f" || char({ord(_SEPARATOR)}) || "
+        return sep.join(f"coalesce({_quote(c.name)}, '')" for c in self.fts_columns)
+
+
+def _substring_expression(text: str) -> tuple[str, bool]:
+    """FTS5 query for ``text`` as a substring, and whether hits need verifying.
+
+    A multi-word phrase makes FTS5 walk the position lists of trigrams such as
+    ' 10' that occur in most rows; ANDing the words instead lets it skip through
+    the doclists, at the price of checking the (rare) non-adjacent hits.
+    """
+    words = [w for w in text.split() if len(w) >= MIN_SUBSTRING]
+    if not words or words == [text]:
+        return '"{}"'.format(text.replace('"', '""')), False
+    return " AND ".join('"{}"'.format(w.replace('"', '""')) for w in words), True
+
+
+class StructuredIndex:
+    """Ingest-time index over the ``dataset_*`` tables of one SQLite file.
+
+    - ``structured_tables`` / ``structured_columns``: the column catalog with
+      detected roles, cached in memory (see ``catalog``)
+    - ``structured_keys``: (hash of normalized value, table, row, column) for
+      identifier and name columns; a point seek resolves an entity across all
+      datasets
+    - ``structured_fts``: contentless trigram FTS5 over the text columns of
+      every table, the indexed equivalent of ``LIKE '%q%'``. Rowids pack
+      (table id, row id), so one MATCH covers any number of datasets
+
+    Writes take the caller's write connection so the index commits together
+    with the data; call ``invalidate`` once that transaction has committed.
+    """
+
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._catalog: list[TableInfo] | None = None
+        self._trigram: bool | None = None
+        self.stats = {"indexed_rows": 0, "lookups": 0, "searches": 0, "catalog_loads": 0}
+
+    # -- schema -------------------------------------------------------------
+
+    def create(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS structured_tables (
+                id INTEGER PRIMARY KEY,
+                table_name TEXT NOT NULL UNIQUE,
+                fts INTEGER NOT NULL DEFAULT 0,
+                indexed_rowid INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS structured_columns (
+                table_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                sql_type TEXT,
+                role TEXT NOT NULL,
+                PRIMARY KEY (table_id, position)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS structured_keys (
+                key INTEGER NOT NULL,
+                table_id INTEGER NOT NULL,
+                row_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (key, table_id, row_id, position)
+            ) WITHOUT ROWID
+            """
+        )
+        if self._trigram_available(conn):
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS structured_fts "
+                "USING fts5(text, content='', tokenize='trigram')"
+            )
+
+    def sync(self, conn: sqlite3.Connection) -> int:
+        """Index dataset tables (or rows) that predate the index; returns rows indexed."""
+        tables = [
+            r[0]
+            for r in conn.execute(
+                "SELECT m.table_name FROM datasets_metadata m JOIN sqlite_master s "
+                "ON s.name = m.table_name AND s.type = 'table'"
+            )
+        ]
+        return sum(self.index_table(conn, table) for table in tables)
+
+    def _trigram_available(self, conn: sqlite3.Connection) -> bool:
+        if self._trigram is None:
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(x, tokenize='trigram')"
+                )
+                conn.execute("DROP TABLE temp.trigram_probe")
+                self._trigram = True
+            except sqlite3.OperationalError:
+                logger.warning(
+                    "SQLite FTS5 trigram tokenizer unavailable; substring search disabled"
+                )
+                self._trigram = False
+        return self._trigram
+
+    # -- catalog ------------------------------------------------------------
+
+    def _classify(self, conn: sqlite3.Connection, table: str) -> list[ColumnInfo]:
+        columns = []
+        for _, name, sql_type, *_ in conn.execute(f"PRAGMA table_info({_quote(table)})"):
+            sql_type = sql_type or ""
+            if ID_COLUMN.search(name):
+                role = "id"
+            elif NAME_COLUMN.search(name) and _is_text(sql_type):
+                role = "name"
+            elif self._looks_like_codes(conn, table, name):
+                role = "id"
+            else:
+                role = "text" if _is_text(sql_type) else "other"
+            columns.append(ColumnInfo(len(columns), name, sql_type, role))
+        return columns
+
+    @staticmethod
+    def _looks_like_codes(conn: sqlite3.Connection, table: str, column: str) -> bool:
+        values = [
+            r[0]
+            for r in conn.execute(
+                f"SELECT {_quote(column)} FROM {_quote(table)} "
+                f"WHERE {_quote(column)} IS NOT NULL LIMIT {_SAMPLE_ROWS}"
+            )
+        ]
+        codes = sum(
+            1
+            for v in values
+            if _CODE_VALUE.match(str(int(v)) if isinstance(v, float) and v.is_integer() else str(v))
+        )
+        return bool(values) and codes >= _CODE_SHARE * len(values)
+
+    def _register(self, conn: sqlite3.Connection, table: str) -> TableInfo:
+        row = conn.execute(
+            "SELECT id, fts FROM structured_tables WHERE table_name = ?", (table,)
+        ).fetchone()
+        if row is not None:
+            return self._load_table(conn, row[0], table, bool(row[1]))
+
+        columns = self._classify(conn, table)
+        table_id = conn.execute(
+            "INSERT INTO structured_tables (table_name) VALUES (?)", (table,)
+        ).lastrowid
+        assert table_id is not None
+        conn.executemany(
+            "INSERT INTO structured_columns VALUES (?, ?, ?, ?, ?)",
+            [(table_id, c.position, c.name, c.sql_type, c.role) for c in columns],
+        )
+        fts = any(c.text for c in columns) and self._trigram_available(conn)
+        if fts:
+            conn.execute("UPDATE structured_tables SET fts = 1 WHERE id = ?", (table_id,))
+        return TableInfo(table_id, table, fts, tuple(columns))
+
+    @staticmethod
+    def _load_table(conn: sqlite3.Connection, table_id: int, table: str, fts: bool) -> TableInfo:
+        columns = tuple(
+            ColumnInfo(*r)
+            for r in conn.execute(
+                "SELECT position, name, sql_type, role FROM structured_columns "
+                "WHERE table_id = ? ORDER BY position",
+                (table_id,),
+            )
+        )
+        return TableInfo(table_id, table, fts, columns)
+
+    def catalog(self) -> list[TableInfo]:
+        """Indexed tables, most recently ingested first (cached until ``invalidate``)."""
+        with self._lock:
+            if self._catalog is not None:
+                return self._catalog
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                "SELECT t.id, t.table_name, t.fts FROM structured_tables t "
+                "LEFT JOIN datasets_metadata m ON m.table_name = t.table_name "
+                "GROUP BY t.id ORDER BY MAX(m.ingested_at) DESC, t.id DESC"
+            ).fetchall()
+            catalog = [self._load_table(conn, *row) for row in rows]
+        with self._lock:
+            self._catalog = catalog
+            self.stats["catalog_loads"] += 1
+        return catalog
+
+    def columns(self, table: str) -> tuple[ColumnInfo, ...]:
+        for info in self.catalog():
+            if info.name == table:
+                return info.columns
+        return ()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._catalog = None
+
+    # -- writes -------------------------------------------------------------
+
+    def index_table(self, conn: sqlite3.Connection, table: str) -> int:
+        """Index rows appended to ``table`` since the last call; returns rows indexed."""
+        info = self._register(conn, table)
+        start = conn.execute(
+            "SELECT indexed_rowid FROM structured_tables WHERE id = ?", (info.id,)
+        ).fetchone()[0]
+        end = conn.execute(f"SELECT MAX(rowid) FROM {_quote(table)}").fetchone()[0] or 0
+        if end <= start:
+            return 0
+
+        if info.key_columns:
+            cols = ", ".join(_quote(c.name) for c in info.key_columns)
+            rows = conn.execute(
+                f"SELECT rowid, {cols} FROM {_quote(table)} WHERE rowid > ?", (start,)
+            )
+            positions = [c.position for c in info.key_columns]
+            keys = [
+                (key_hash(key), info.id, row[0], position)
+                for row in rows
+                for position, value in zip(positions, row[1:], strict=True)
+                if (key := normalize_key(value)) is not None
+            ]
+            # Sorted inserts walk the key b-tree in order instead of seeking randomly
+            keys.sort()
+            conn.executemany("INSERT OR IGNORE INTO structured_keys VALUES (?, ?, ?, ?)", keys)
+        if info.fts:
+            conn.execute(
+                f"INSERT INTO structured_fts (rowid, text) "
+                f"SELECT ({info.id} << {_ROW_BITS}) | rowid, {info.text_expression()} "
+                f"FROM {_quote(table)} WHERE rowid > ?",
+                (start,),
+            )
+        conn.execute("UPDATE structured_tables SET indexed_rowid = ? WHERE id = ?", (end, info.id))
+        self.stats["indexed_rows"] += end - start
+        return end - start
+
+    def drop_table(self, conn: sqlite3.Connection, table: str) -> None:
+        """Forget ``table`` (before it is replaced or dropped)."""
+        row = conn.execute(
+            "SELECT id FROM structured_tables WHERE table_name = ?", (table,)
+        ).fetchone()
+        if row is None:
+            return
+        info = self._load_table(conn, row[0], table, True)
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if exists and info.fts_columns and self._trigram_available(conn):
+            # Contentless FTS5 deletes need the indexed text; rows of tables that are
+            # already gone stay in the index and are skipped at query time
+            conn.execute(
+                f"INSERT INTO structured_fts (structured_fts, rowid, text) "
+                f"SELECT 'delete', ({info.id} << {_ROW_BITS}) | rowid, {info.text_expression()} "
+                f"FROM {_quote(table)}"
+            )
+        conn.execute("DELETE FROM structured_keys WHERE table_id = ?", row)
+        conn.execute("DELETE FROM structured_columns WHERE table_id = ?", row)
+        conn.execute("DELETE FROM structured_tables WHERE id = ?", row)
+
+    # -- reads --------------------------------------------------------------
+
+    @staticmethod
+    def _rows(cursor: sqlite3.Cursor) -> list[dict[str, Any]]:
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row, strict=True)) for row in cursor]
+
+    def lookup(self, value: Any, limit: int = 20) -> list[dict[str, Any]]:
+        """Rows whose identifier/name column equals ``value`` (normalized), any dataset.
+
+        Each row carries ``_source_table``, ``_rowid``, ``_match`` ('exact') and
+        ``_match_column``.
+        """
+        key = normalize_key(value)
+        if key is None:
+            return []
+        self.stats["lookups"] += 1
+        by_id = {info.id: info for info in self.catalog()}
+        order = {table_id: i for i, table_id in enumerate(by_id)}
+        with self.pool.reader() as conn:
+            hits: dict[int, dict[int, int]] = defaultdict(dict)
+            for table_id, row_id, position in conn.execute(
+                "SELECT table_id, row_id, position FROM structured_keys WHERE key = ?",
+                (key_hash(key),),
+            ):
+                if table_id in by_id:
+                    hits[table_id].setdefault(row_id, position)
+
+            results: list[dict[str, Any]] = []
+            for table_id in sorted(hits, key=order.__getitem__):
+                info, rows = by_id[table_id], hits[table_id]
+                marks = ", ".join("?" * len(rows))
+                cursor = conn.execute(
+                    f"SELECT rowid AS _rowid, * FROM {_quote(info.name)} "
+                    f"WHERE rowid IN ({marks}) ORDER BY rowid",
+                    tuple(rows),
+                )
+                for row in self._rows(cursor):
+                    column = info.columns[rows[row["_rowid"]]].name
+                    if normalize_key(row.get(column)) != key:
+                        continue  # hash collision
+                    row.update(_source_table=info.name, _match="exact", _match_column=column)
+                    results.append(row)
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def search(self, query: str, limit: int = 5, max_results: int = 100) -> list[dict[str, Any]]:
+        """Exact key matches first, then substring matches (up to ``limit`` per table).
+
+        Substring matching is case-insensitive like the ``LIKE '%q%'`` scans it
+        replaces, but needs at least ``MIN_SUBSTRING`` characters.
+        """
+        self.stats["searches"] += 1
+        results = self.lookup(query, limit=max_results)
+        seen = {(r["_source_table"], r["_rowid"]) for r in results}
+        text = query.strip()
+        if len(text) < MIN_SUBSTRING:
+            return results
+
+        by_id = {info.id: info for info in self.catalog() if info.fts}
+        if not by_id:
+            return results
+        expression, verify = _substring_expression(text)
+        needle = text.casefold()
+        with self.pool.reader() as conn:
+            # Newest rows (highest table ids) first; candidates beyond a table's
+            # share are skipped before any row is read
+            candidates: dict[int, list[int]] = defaultdict(list)
+            per_table = limit * 2 if verify else limit
+            budget = (max_results - len(results)) * (2 if verify else 1)
+            cursor = conn.execute(
+                "SELECT rowid FROM structured_fts WHERE structured_fts MATCH ? "
+                "ORDER BY rowid DESC LIMIT ?",
+                (expression, max_results * max(per_table, 1)),
+            )
+            for (packed,) in cursor:
+                table_id, row_id = packed >> _ROW_BITS, packed & ((1 << _ROW_BITS) - 1)
+                rows = candidates[table_id]
+                if table_id in by_id and len(rows) < per_table:
+                    rows.append(row_id)
+                    budget -= 1
+                    if budget <= 0:
+                        break
+
+            for table_id, row_ids in candidates.items():
+                if not row_ids or len(results) >= max_results:
+                    continue
+                info = by_id[table_id]
+                marks = ", ".join("?" * len(row_ids))
+                cursor = conn.execute(
+                    f"SELECT rowid AS _rowid, * FROM {_quote(info.name)} "
+                    f"WHERE rowid IN ({marks}) ORDER BY rowid",
+                    tuple(row_ids),
+                )
+                taken = 0
+                for row in self._rows(cursor):
+                    if taken >= limit or (info.name, row["_rowid"]) in seen:
+                        continue
+                    if verify and not any(
+                        needle in str(row[c.name]).casefold()
+                        for c in info.fts_columns
+                        if row[c.name] is not None
+                    ):
+                        continue
+                    row.update(_source_table=info.name, _match="substring")
+                    results.append(row)
+                    taken += 1
+        return results[:max_results]
+
+    def health(self) -> dict[str, Any]:
+        catalog = self.catalog()
+        return {
+            "tables": len(catalog),
+            "text_indexed_tables": sum(info.fts for info in catalog),
+            **self.stats,
+        }
@@ -7,6 +7,7 @@ Vector Storage Adapter for Golden Fund (ChromaDB)
 import importlib.util
 import json
 import logging
+import threading
 import time
 import uuid
 from datetime import datetime
@@ -42,8 +43,22 @@ class VectorStorage:
         self.enabled = CHROMA_AVAILABLE
         self.client = None
         self.collection = None
+        # Chroma is opened on first store/search, not at construction time
+        self._init_lock = threading.Lock()
+        self._initialized = False
 
-        if self.enabled:
+        if not self.enabled:
+            logger.warning(
+                "ChromaDB not available. VectorStorage disabled or running in simulation mode."
+            )
+
+    def _ensure_collection(self) -> bool:
+        """Initialize Chroma once (thread-safe); returns whether the store is usable."""
+        if self._initialized or not self.enabled:
+            return self.enabled
+        with self._init_lock:
+            if self._initialized:
+                return self.enabled
             try:
                 self._initialize_chroma()
             except Exception as e:
@@ -69,10 +84,8 @@ class VectorStorage:
                         self.enabled = False
                 else:
                     self.enabled = False
-        else:
-            logger.warning(
-                "ChromaDB not available. VectorStorage disabled or running in simulation mode."
-            )
+            self._initialized = True
+        return self.enabled
 
     def _initialize_chroma(self):
         """Internal helper to initialize Chroma client and collection."""
@@ -84,7 +97,7 @@ class VectorStorage:
 
     def store(self, data: dict[str, Any] | list[dict[str, Any]]) -> StorageResult:
         """Store data with generated embeddings."""
-        if not self.enabled:
+        if not self._ensure_collection():
             return StorageResult(
                 False, "vector", error="VectorStorage is disabled (ChromaDB missing)"
             )
@@ -148,7 +161,7 @@ class VectorStorage:
 
     def search(self, query: str, limit: int = 5) -> StorageResult:
         """Search for similar records."""
-        if not self.enabled:
+        if not self._ensure_collection():
             return StorageResult(False, "vector", error="VectorStorage is disabled")
 
         try:
@@ -182,3 +195,25 @@ class VectorStorage:
 
         except Exception as e:
             return StorageResult(False, "vector", error=f"Vector search failed: {e}")
+
+    def health_check(self) -> dict[str, Any]:
+        """Reports availability without forcing Chroma to open."""
+        status: dict[str, Any] = {
+            "ok": self.enabled,
+            "path": str(self.persistence_path),
+            "initialized": self._initialized,
+        }
+        if self.enabled and self.client is not None:
+            try:
+                self.client.heartbeat()
+            except Exception as e:
+                status.update(ok=False, error=str(e))
+        elif not CHROMA_AVAILABLE:
+            status["error"] = "chromadb not installed"
+        return status
+
+    def close(self) -> None:
+        # PersistentClient flushes on write; dropping references releases the handles
+        self.collection = None
+        self.client = None
+        self._initialized = False
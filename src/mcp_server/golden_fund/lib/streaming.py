@@ -0,0 +1,177 @@
+"""
+Streaming Batch Pipeline for Golden Fund
+Fans fixed-size DataFrame batches out to concurrent sinks through bounded queues.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger("golden_fund.streaming")
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+
+    name: str
+    rows: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0  # time spent doing the stage's own work
+    blocked_seconds: float = 0.0  # time spent waiting on a full downstream queue
+    errors: int = 0
+    last_error: str | None = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "rows_per_sec": round(self.rows_per_sec),
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class PipelineReport:
+    rows: int = 0
+    wall_seconds: float = 0.0
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    messages: dict[str, str] = field(default_factory=dict)
+    parse_error: str | None = None
+
+    @property
+    def failed_stages(self) -> list[str]:
+        """Stages that did not process the whole stream (parse errors included)."""
+        return [name for name, stats in self.stages.items() if stats.errors]
+
+    def throughput_summary(self) -> str:
+        parts = [f"{name} {stats.rows_per_sec:,.0f} rows/s" for name, stats in self.stages.items()]
+        return f"Throughput: {', '.join(parts)} (wall {self.wall_seconds:.2f}s)."
+
+
+@dataclass
+class IngestResult:
+    """Outcome of one ingestion run; callers branch on ``success``, users read ``summary``."""
+
+    run_id: str
+    success: bool
+    summary: str
+    rows: int = 0
+    table: str | None = None
+    failed_stages: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    def __str__(self) -> str:
+        return self.summary
+
+
+class BatchSink:
+    """A pipeline consumer. ``write`` and ``close`` run in a worker thread."""
+
+    name = "sink"
+
+    def write(self, batch: pd.DataFrame, offset: int) -> None:
+        raise NotImplementedError
+
+    def done(self) -> bool:
+        """True once the sink needs no further batches (e.g. validation already passed)."""
+        return False
+
+    def close(self) -> str:
+        """Finish the sink and return its summary message."""
+        return ""
+
+
+class StreamingPipeline:
+    """Parses on a worker thread and feeds every sink through its own bounded queue.
+
+    Peak memory is bounded by ``(queue_size + 1) * batch`` per sink since sinks
+    share the same batch objects; a slow sink applies backpressure to parsing.
+    """
+
+    def __init__(self, sinks: list[BatchSink], queue_size: int = 2):
+        self.sinks = sinks
+        self.queue_size = max(1, queue_size)
+
+    async def run(self, batches: Iterator[pd.DataFrame]) -> PipelineReport:
+        report = PipelineReport()
+        parse_stats = report.stages["parse"] = StageStats("parse")
+        queues: list[asyncio.Queue] = []
+        workers = []
+        for sink in self.sinks:
+            stats = report.stages[sink.name] = StageStats(sink.name)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            queues.append(queue)
+            workers.append(asyncio.create_task(self._consume(sink, queue, stats)))
+
+        t0 = time.perf_counter()
+        offset = 0
+        try:
+            while True:
+                t_parse = time.perf_counter()
+                try:
+                    batch = await asyncio.to_thread(next, batches, None)
+                except Exception as e:
+                    parse_stats.errors += 1
+                    parse_stats.last_error = report.parse_error = str(e)
+                    logger.error(f"Streaming parse failed after {offset} rows: {e}")
+                    break
+                parse_stats.busy_seconds += time.perf_counter() - t_parse
+                if batch is None:
+                    break
+                if batch.empty:
+                    continue
+                parse_stats.rows += len(batch)
+                parse_stats.batches += 1
+
+                t_put = time.perf_counter()
+                for queue in queues:
+                    await queue.put((offset, batch))
+                parse_stats.blocked_seconds += time.perf_counter() - t_put
+                offset += len(batch)
+        finally:
+            for queue in queues:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+        for sink in self.sinks:
+            try:
+                report.messages[sink.name] = await asyncio.to_thread(sink.close)
+            except Exception as e:
+                stats = report.stages[sink.name]
+                stats.errors += 1
+                stats.last_error = str(e)
+                report.messages[sink.name] = f"{sink.name} failed: {e}"
+
+        report.rows = offset
+        report.wall_seconds = time.perf_counter() - t0
+        return report
+
+    async def _consume(self, sink: BatchSink, queue: asyncio.Queue, stats: StageStats) -> None:
+        # Keep draining after errors / completion so the producer never blocks on us
+        while (item := await queue.get()) is not None:
+            if stats.errors or sink.done():
+                continue
+            offset, batch = item
+            t0 = time.perf_counter()
+            try:
+                await asyncio.to_thread(sink.write, batch, offset)
+                stats.rows += len(batch)
+                stats.batches += 1
+            except Exception as e:
+                stats.errors += 1
+                stats.last_error = str(e)
+                logger.error(f"Sink '{sink.name}' failed at row {offset}: {e}")
+            stats.busy_seconds += time.perf_counter() - t0
@@ -2,17 +2,32 @@
 Data Validation Module for Golden Fund
 Implements intermediate validation checkpoints in the data pipeline
 to inspect extracted data for completeness.
+Checks run column-wise over DataFrame chunks (vectorized pandas / pyarrow),
+stop as soon as their outcome is decided and collect per-column statistics.
 """
 
 import logging
+from collections.abc import Collection, Sequence
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel, Field
 
 logging.basicConfig(level=logging.INFO, encoding="utf-8")
 logger = logging.getLogger("golden_fund.validation")
 
+# What constitutes a valid employee with a role (first non-empty field wins)
+NAME_FIELDS = ("name", "director", "employee", "person", "full_name")
+ROLE_FIELDS = ("position", "role", "title", "job_title", "occupation")
+
+CHUNK_ROWS = 262_144
+SAMPLE_FAILURES = 5
+CHECK_KINDS = ("completeness", "type", "range", "unique", "referential", "regex")
+TYPE_NAMES = ("number", "integer", "string", "bool", "datetime")
+
 
 class ValidationResult:
     """Result container for validation operations."""
@@ -45,6 +60,288 @@ class CompletenessCheck(BaseModel):
     details: dict[str, Any] = Field(default_factory=dict)
 
 
+@dataclass
+class ColumnCheck:
+    """One vectorized rule over a column.
+
+    kind: completeness (null / empty string), type (``dtype`` in TYPE_NAMES),
+    range (``min`` / ``max``), unique, referential (``values``), regex
+    (``pattern``, full match). Missing values only fail completeness. The
+    check fails once more than ``max_failures`` rows violate it.
+    """
+
+    column: str
+    kind: str
+    dtype: str | None = None
+    min: float | None = None
+    max: float | None = None
+    values: Collection[Any] | None = None
+    pattern: str | None = None
+    max_failures: int = 0
+    name: str = ""
+
+    def __post_init__(self):
+        if self.kind not in CHECK_KINDS:
+            raise ValueError(f"Unknown check kind '{self.kind}', expected one of {CHECK_KINDS}")
+        if self.kind == "type" and self.dtype not in TYPE_NAMES:
+            raise ValueError(f"Unknown type '{self.dtype}', expected one of {TYPE_NAMES}")
+        if self.kind == "referential" and self.values is None:
+            raise ValueError("Referential check needs 'values'")
+        if self.kind == "regex" and not self.pattern:
+            raise ValueError("Regex check needs 'pattern'")
+        self.name = self.name or f"{self.kind}:{self.column}"
+
+
+@dataclass
+class ColumnStats:
+    dtype: str = ""
+    rows: int = 0
+    nulls: int = 0
+    empty: int = 0
+    numeric: int = 0
+    min: float | None = None
+    max: float | None = None
+    sum: float = 0.0
+
+    def update(self, s: pd.Series) -> None:
+        self.dtype = self.dtype or str(s.dtype)
+        self.rows += len(s)
+        missing = s.isna().to_numpy()
+        self.nulls += int(missing.sum())
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            values = s.to_numpy(dtype="float64", na_value=np.nan)[~missing]
+            if len(values):
+                self.numeric += len(values)
+                lo, hi = float(values.min()), float(values.max())
+                self.min = lo if self.min is None else min(self.min, lo)
+                self.max = hi if self.max is None else max(self.max, hi)
+                self.sum += float(values.sum())
+        elif not pd.api.types.is_datetime64_any_dtype(s):
+            self.empty += int((s == "").sum())
+
+    def to_dict(self) -> dict[str, Any]:
+        out = asdict(self)
+        out["mean"] = self.sum / self.numeric if self.numeric else None
+        del out["sum"]
+        return out
+
+
+def truthy(s: pd.Series) -> np.ndarray:
+    """Vectorized ``bool(value)`` per row, with missing values (None / NaN / NA) false."""
+    missing = s.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(s):
+        values = s.to_numpy(dtype=bool, na_value=False)
+    elif pd.api.types.is_numeric_dtype(s):
+        values = s.to_numpy(dtype="float64", na_value=0.0) != 0
+    elif pd.api.types.is_string_dtype(s) and s.dtype != object:
+        values = (s.str.len() > 0).to_numpy(dtype=bool, na_value=False)
+    elif pd.api.types.is_datetime64_any_dtype(s):
+        values = np.ones(len(s), dtype=bool)
+    else:
+        values = s.astype(object).astype(bool).to_numpy()
+    return values & ~missing
+
+
+def _first_present(frame: pd.DataFrame, fields: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """(found, field position) of the first truthy field per row, in ``fields`` order."""
+    found = np.zeros(len(frame), dtype=bool)
+    which = np.full(len(frame), -1, dtype=np.int8)
+    for pos, name in enumerate(fields):
+        if name not in frame.columns:
+            continue
+        hit = truthy(frame[name]) & ~found
+        which[hit] = pos
+        found |= hit
+    return found, which
+
+
+def _fullmatch(s: pd.Series, pattern: str) -> np.ndarray:
+    try:
+        # RE2 via pyarrow compute; falls back to Python's re on unsupported syntax
+        matched = s.astype("string[pyarrow]").str.fullmatch(pattern)
+    except Exception:
+        matched = s.astype(str).str.fullmatch(pattern)
+    return matched.to_numpy(dtype=bool, na_value=False)
+
+
+def _type_failures(s: pd.Series, dtype: str) -> np.ndarray:
+    present = s.notna().to_numpy()
+    if dtype in ("number", "integer"):
+        if pd.api.types.is_integer_dtype(s) or (
+            dtype == "number" and pd.api.types.is_numeric_dtype(s)
+        ):
+            return np.zeros(len(s), dtype=bool)
+        numbers = pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        bad = np.isnan(numbers)
+        if dtype == "integer":
+            with np.errstate(invalid="ignore"):
+                bad |= np.mod(numbers, 1) != 0
+        return present & bad
+    if dtype == "string":
+        if pd.api.types.is_string_dtype(s) and s.dtype != object:
+            return np.zeros(len(s), dtype=bool)
+        try:
+            # .str yields NaN for every non-string object
+            return present & s.str.len().isna().to_numpy()
+        except AttributeError:
+            return present  # no strings at all: .str refuses the column
+    if dtype == "bool":
+        if pd.api.types.is_bool_dtype(s):
+            return np.zeros(len(s), dtype=bool)
+        return present & ~s.isin((True, False)).to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return np.zeros(len(s), dtype=bool)
+    parsed = pd.to_datetime(s, errors="coerce", format="ISO8601")
+    return present & parsed.isna().to_numpy()
+
+
+class ColumnarValidator:
+    """Feeds DataFrame chunks through vectorized column checks.
+
+    Stops early once the outcome is decided: a check exceeded its allowed
+    failures, or ``sample_rows`` rows were validated within tolerance.
+    Uniqueness is tracked across chunks with 64-bit row-value hashes.
+    """
+
+    def __init__(
+        self,
+        checks: Sequence[ColumnCheck],
+        *,
+        sample_rows: int | None = None,
+        chunk_rows: int = CHUNK_ROWS,
+    ):
+        self.checks = list(checks)
+        self.sample_rows = sample_rows
+        self.chunk_rows = max(1, chunk_rows)
+        self.rows = 0
+        self.failures = {c.name: 0 for c in self.checks}
+        self.samples: dict[str, list[dict[str, Any]]] = {c.name: [] for c in self.checks}
+        self.stats: dict[str, ColumnStats] = {}
+        self.stopped: str | None = None  # failed | sampled
+        self._seen: dict[str, np.ndarray] = {}
+        self._references: dict[str, pd.Index] = {}
+
+    @property
+    def done(self) -> bool:
+        return self.stopped is not None
+
+    def feed(self, frame: pd.DataFrame) -> bool:
+        """Validate ``frame``; returns True once no further rows are needed."""
+        start = 0
+        while start < len(frame) and not self.done:
+            step = self.chunk_rows
+            if self.sample_rows is not None:
+                step = min(step, max(1, self.sample_rows - self.rows))
+            self._feed_chunk(frame.iloc[start : start + step])
+            start += step
+        return self.done
+
+    def _feed_chunk(self, chunk: pd.DataFrame) -> None:
+        offset = self.rows
+        for name in chunk.columns:
+            self.stats.setdefault(str(name), ColumnStats()).update(chunk[name])
+        for check in self.checks:
+            if check.column not in chunk.columns:
+                bad = np.ones(len(chunk), dtype=bool)
+                column = None
+            else:
+                column = chunk[check.column]
+                bad = self._failures(check, column)
+            count = int(bad.sum())
+            if not count:
+                continue
+            self.failures[check.name] += count
+            samples = self.samples[check.name]
+            if len(samples) < SAMPLE_FAILURES:
+                for pos in np.flatnonzero(bad)[: SAMPLE_FAILURES - len(samples)]:
+                    value = "<missing column>" if column is None else column.iloc[pos]
+                    samples.append({"row": offset + int(pos), "value": value})
+        self.rows += len(chunk)
+        if any(self.failures[c.name] > c.max_failures for c in self.checks):
+            self.stopped = "failed"
+        elif self.sample_rows is not None and self.rows >= self.sample_rows:
+            self.stopped = "sampled"
+
+    def _failures(self, check: ColumnCheck, s: pd.Series) -> np.ndarray:
+        if check.kind == "completeness":
+            missing = s.isna().to_numpy()
+            if not pd.api.types.is_numeric_dtype(s):
+                missing = missing | (s == "").to_numpy(dtype=bool, na_value=False)
+            return missing
+        present = s.notna().to_numpy()
+        if check.kind == "type":
+            return _type_failures(s, str(check.dtype))
+        if check.kind == "range":
+            numbers = pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            bad = np.zeros(len(s), dtype=bool)
+            with np.errstate(invalid="ignore"):
+                if check.min is not None:
+                    bad |= numbers < check.min
+                if check.max is not None:
+                    bad |= numbers > check.max
+            return bad
+        if check.kind == "referential":
+            reference = self._references.get(check.name)
+            if reference is None:
+                reference = self._references[check.name] = pd.Index(list(check.values or ()))
+            return present & ~s.isin(reference).to_numpy()
+        if check.kind == "regex":
+            return present & ~_fullmatch(s, str(check.pattern))
+        return self._duplicates(check.name, s, present)
+
+    def _duplicates(self, name: str, s: pd.Series, present: np.ndarray) -> np.ndarray:
+        # categorize=False hashes strings directly (factorizing first is ~4x slower here)
+        hashes = pd.util.hash_pandas_object(s[present], index=False, categorize=False).to_numpy()
+        seen = self._seen.get(name, np.empty(0, dtype=np.uint64))
+        dup = pd.Series(hashes).duplicated().to_numpy()
+        if len(seen):
+            pos = np.minimum(np.searchsorted(seen, hashes), len(seen) - 1)
+            dup = dup | (seen[pos] == hashes)
+        fresh = np.sort(hashes[~dup])
+        # timsort merges the two sorted runs in linear time
+        self._seen[name] = np.sort(np.concatenate([seen, fresh]), kind="stable")
+        bad = np.zeros(len(s), dtype=bool)
+        bad[np.flatnonzero(present)[dup]] = True
+        return bad
+
+    def result(self, context: str = "unknown") -> ValidationResult:
+        checks = {
+            c.name: {
+                "kind": c.kind,
+                "column": c.column,
+                "failures": self.failures[c.name],
+                "passed": self.failures[c.name] <= c.max_failures,
+                "samples": self.samples[c.name],
+            }
+            for c in self.checks
+        }
+        failed = [name for name, c in checks.items() if not c["passed"]]
+        metadata = {
+            "context": context,
+            "timestamp": datetime.now().isoformat(),
+            "check_type": "columns",
+            "check_name": "column_rules",
+            "validation_passed": not failed,
+            "rows_validated": self.rows,
+            "short_circuit": self.stopped,
+        }
+        data = {
+            "checks": checks,
+            "column_stats": {name: s.to_dict() for name, s in self.stats.items()},
+            "total_records": self.rows,
+            "validation_type": "column_rules",
+        }
+        if failed:
+            return ValidationResult(
+                False,
+                data=data,
+                error=f"Column checks failed: {', '.join(failed)}",
+                warnings=[f"{name}: {checks[name]['failures']} failing rows" for name in failed],
+                metadata=metadata,
+            )
+        return ValidationResult(True, data=data, metadata=metadata)
+
+
 class DataValidator:
     """
     Main validation class for implementing intermediate validation checkpoints.
@@ -54,14 +351,22 @@ class DataValidator:
         logger.info("DataValidator initialized")
 
     def validate_data_completeness(
-        self, data: dict[str, Any] | list[dict[str, Any]], context: str = "unknown"
+        self,
+        data: dict[str, Any] | list[dict[str, Any]] | pd.DataFrame,
+        context: str = "unknown",
+        *,
+        stop_on_success: bool = False,
+        max_details: int | None = None,
     ) -> ValidationResult:
         """
         Validate that extracted data contains at least one named employee with a role/position.
 
         Args:
-            data: The data to validate (can be dict or list of dicts)
+            data: The data to validate (dict, list of dicts or DataFrame)
             context: Context for validation (e.g., 'company_dataset', 'director_dataset')
+            stop_on_success: Stop at the first chunk with a valid employee; counts and
+                statistics then cover the scanned rows only
+            max_details: Keep at most this many entries in ``valid_employees``
 
         Returns:
             ValidationResult with success status and details
@@ -75,70 +380,62 @@ class DataValidator:
         }
 
         try:
-            # Convert single dict to list for uniform processing
-            if isinstance(data, dict):
-                data_list = [data]
-            elif isinstance(data, list):
-                data_list = data
+            records: list[Any] | None = None
+            if isinstance(data, pd.DataFrame):
+                frame = data
+            elif isinstance(data, dict | list):
+                # Convert single dict to list for uniform processing
+                records = [data] if isinstance(data, dict) else data
+                positions = [i for i, r in enumerate(records) if isinstance(r, dict)]
+                frame = pd.DataFrame.from_records(
+                    [records[i] for i in positions],
+                    columns=list(NAME_FIELDS + ROLE_FIELDS),
+                    index=positions,
+                )
             else:
                 return ValidationResult(
                     False, error=f"Unsupported data type: {type(data)}", metadata=metadata
                 )
+            total = len(records) if records is not None else len(frame)
 
             # Check for empty data
-            if not data_list:
+            if not total:
                 return ValidationResult(
                     False, error="Empty dataset - no records to validate", metadata=metadata
                 )
 
-            # Define what constitutes a valid employee with role
-            employee_fields = {
-                "name_fields": ["name", "director", "employee", "person", "full_name"],
-                "role_fields": ["position", "role", "title", "job_title", "occupation"],
-            }
-
-            found_valid_employee = False
-            employee_details = []
-
-            # Check each record for valid employee with role
-            for i, record in enumerate(data_list):
-                if not isinstance(record, dict):
-                    continue
-
-                # Look for name and role in this record
-                name_found = None
-                role_found = None
-
-                # Check for name fields
-                for name_field in employee_fields["name_fields"]:
-                    if record.get(name_field):
-                        name_found = str(record[name_field])
-                        break
-
-                # Check for role fields
-                for role_field in employee_fields["role_fields"]:
-                    if record.get(role_field):
-                        role_found = str(record[role_field])
-                        break
-
-                # If we found both name and role, this is a valid employee
-                if name_found and role_found:
-                    found_valid_employee = True
-                    employee_details.append(
-                        {
-                            "record_index": i,
-                            "name": name_found,
-                            "role": role_found,
-                            "record": record,
-                        }
+            columns = [c for c in (*NAME_FIELDS, *ROLE_FIELDS) if c in frame.columns]
+            stats = {c: ColumnStats() for c in columns}
+            employee_details: list[dict[str, Any]] = []
+            found = scanned = 0
+            for start in range(0, len(frame), CHUNK_ROWS):
+                chunk = frame.iloc[start : start + CHUNK_ROWS]
+                scanned += len(chunk)
+                for c in columns:
+                    stats[c].update(chunk[c])
+                has_name, name_at = _first_present(chunk, NAME_FIELDS)
+                has_role, role_at = _first_present(chunk, ROLE_FIELDS)
+                hits = np.flatnonzero(has_name & has_role)
+                found += len(hits)
+                room = None if max_details is None else max_details - len(employee_details)
+                if len(hits) and (room is None or room > 0):
+                    employee_details.extend(
+                        self._employee_details(
+                            chunk, hits[:room], name_at, role_at, records=records, offset=start
+                        )
                     )
+                if found and stop_on_success:
+                    break
 
             # Determine validation result
-            if found_valid_employee:
+            metadata["column_stats"] = {c: s.to_dict() for c, s in stats.items()}
+            if scanned < len(frame):
+                metadata.update({"rows_scanned": scanned, "short_circuit": "passed"})
+            if found:
                 metadata.update(
                     {
                         "validation_passed": True,
-                        "valid_employees_found": len(employee_details),
+                        "valid_employees_found": found,
                         "employee_samples": [
                             {"name": emp["name"], "role": emp["role"]}
                             for emp in employee_details[:3]  # Limit to 3 samples
@@ -150,31 +447,80 @@ class DataValidator:
                     True,
                     data={
                         "valid_employees": employee_details,
-                        "total_records": len(data_list),
+                        "total_records": total,
                         "validation_type": "employee_role_completeness",
                     },
                     metadata=metadata,
                 )
             # Validation failed - no valid employees found
-            metadata_fail: dict[str, Any] = {
-                "context": context,
-                "timestamp": datetime.now().isoformat(),
-                "check_type": "completeness",
-                "check_name": "employee_role_completeness",
-                "validation_passed": False,
-                "valid_employees_found": 0,
-            }
+            metadata.update({"validation_passed": False, "valid_employees_found": 0})
 
             return ValidationResult(
                 False,
                 error="Data completeness check failed: No named employees with roles/positions found",
                 warnings=[
                     "Dataset may be incomplete or missing employee information",
-                    f"Checked {len(data_list)} records but found no valid employee-role pairs",
+                    f"Checked {total} records but found no valid employee-role pairs",
                 ],
-                metadata=metadata_fail,
+                metadata=metadata,
+            )
+
+        except Exception as e:
+            return ValidationResult(
+                False,
+                error=f"Validation error: {e!s}",
+                metadata={
+                    "context": context,
+                    "timestamp": datetime.now().isoformat(),
+                    "exception_type": type(e).__name__,
+                },
             )
 
+    @staticmethod
+    def _employee_details(
+        chunk: pd.DataFrame,
+        hits: np.ndarray,
+        name_at: np.ndarray,
+        role_at: np.ndarray,
+        *,
+        records: list[Any] | None,
+        offset: int,
+    ) -> list[dict[str, Any]]:
+        """Materialize rows only for the hits (the scan itself stays columnar)."""
+        if records is None:
+            rows = [
+                {str(k): v for k, v in row.items()}
+                for row in chunk.iloc[hits].to_dict(orient="records")
+            ]
+            indexes = [offset + int(i) for i in hits]
+        else:
+            indexes = [int(i) for i in chunk.index[hits]]
+            rows = [records[i] for i in indexes]
+        details = []
+        for pos, index, row in zip(hits, indexes, rows, strict=True):
+            details.append(
+                {
+                    "record_index": index,
+                    "name": str(row[NAME_FIELDS[name_at[pos]]]),
+                    "role": str(row[ROLE_FIELDS[role_at[pos]]]),
+                    "record": row,
+                }
+            )
+        return details
+
+    def validate_columns(
+        self,
+        data: pd.DataFrame,
+        checks: Sequence[ColumnCheck],
+        context: str = "unknown",
+        *,
+        sample_rows: int | None = None,
+    ) -> ValidationResult:
+        """Run vectorized column checks over ``data`` with per-column statistics."""
+        try:
+            engine = ColumnarValidator(checks, sample_rows=sample_rows)
+            engine.feed(data)
+            return engine.result(context)
         except Exception as e:
             return ValidationResult(
                 False,
@@ -218,9 +564,10 @@ class DataValidator:
 
     def create_validation_checkpoint(
         self,
-        data: dict[str, Any] | list[dict[str, Any]],
+        data: dict[str, Any] | list[dict[str, Any]] | pd.DataFrame,
         checkpoint_name: str = "completeness",
         context: str = "data_pipeline",
+        checks: Sequence[ColumnCheck] | None = None,
     ) -> ValidationResult:
         """
         Create an intermediate validation checkpoint in the data pipeline.
@@ -229,6 +576,7 @@ class DataValidator:
             data: The data to validate
             checkpoint_name: Type of validation checkpoint
             context: Context for the validation
+            checks: Column rules for the 'columns' checkpoint
 
         Returns:
             ValidationResult with checkpoint results
@@ -238,9 +586,12 @@ class DataValidator:
         if checkpoint_name == "completeness":
             return self.validate_data_completeness(data, context)
         if checkpoint_name == "schema":
-            return self.validate_schema_compatibility(data)
+            return self.validate_schema_compatibility(data)  # type: ignore[arg-type]
+        if checkpoint_name == "columns":
+            frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+            return self.validate_columns(frame, checks or [], context)
         return ValidationResult(
             False,
             error=f"Unknown validation checkpoint: {checkpoint_name}",
-            metadata={"available_checkpoints": ["completeness", "schema"]},
+            metadata={"available_checkpoints": ["completeness", "schema", "columns"]},
         )
@@ -6,8 +6,8 @@ from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
-from .lib.storage import SearchStorage, SQLStorage, VectorStorage
-from .lib.storage.blob import BlobStorage
+from .lib.retrieval import HybridRetriever, keyword_backend, structured_backend, vector_backend
+from .lib.storage.runtime import get_runtime
 from .lib.transformer import DataTransformer
 from .tools.chain import recursive_enrichment
 from .tools.ingest import ingest_dataset as ingest_impl
@@ -15,10 +15,11 @@ from .tools.ingest import ingest_dataset as ingest_impl
 logging.basicConfig(level=logging.INFO, encoding="utf-8")
 logger = logging.getLogger("golden_fund")
 
-# Initialize storage
-vector_store = VectorStorage()
-search_store = SearchStorage()
-sql_store = SQLStorage()
+# Shared storage backends (pooled connections, lazy Chroma), closed at exit
+runtime = get_runtime()
+vector_store = runtime.vector
+search_store = runtime.search
+sql_store = runtime.sql
 transformer = DataTransformer()
 
 # Data directories
@@ -30,6 +31,15 @@ ANALYSIS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 # Create FastMCP server
 mcp = FastMCP("golden_fund")
 
+# Keyword, vector and structured lookups fused with reciprocal rank fusion
+retriever = HybridRetriever(
+    {
+        "keyword": keyword_backend(search_store),
+        "vector": vector_backend(vector_store),
+        "structured": structured_backend(lambda q, n: _search_sql_fallback(q, n)),  # noqa: PLW0108 - defined below
+    }
+)
+
 
 @mcp.tool()
 async def search_golden_fund(query: str, mode: str | None = None) -> str:
@@ -38,7 +48,7 @@ async def search_golden_fund(query: str, mode: str | None = None) -> str:
 
     Args:
         query: The search query.
-        mode: Search mode - 'semantic', 'keyword', 'hybrid', or 'recursive'. If None, uses multi-stage fallback.
+        mode: Search mode - 'semantic', 'keyword', 'hybrid', or 'recursive'. If None, uses hybrid.
     """
     logger.info(f"Searching Golden Fund: {query} (mode={mode})")
 
@@ -48,30 +58,15 @@ async def search_golden_fund(query: str, mode: str | None = None) -> str:
     if mode == "keyword":
         result = search_store.search(query)
         return str(result)
-    if mode == "hybrid":
-        vec_res = vector_store.search(query)
-        txt_res = search_store.search(query)
-        return f"Hybrid Results:\nVector: {vec_res}\nText: {txt_res}"
     if mode == "recursive":
         return await recursive_enrichment(query)
 
-    # Default: Try keyword first, then semantic, then SQL fallback
-    logger.info(f"Attempting multi-stage search for: {query}")
-    keyword_res = search_store.search(query)
-    if keyword_res.success and keyword_res.data and keyword_res.data.get("results"):
-        return str(keyword_res)
-
-    vector_res = vector_store.search(query)
-    if vector_res.success and vector_res.data and vector_res.data.get("results"):
-        return str(vector_res)
-
-    # SQL Fallback
-    logger.info("No results in indexes, attempting SQL fallback...")
-    sql_res = _search_sql_fallback(query)
-    return str(sql_res)
+    # Default / hybrid: all sources concurrently, fused into one ranked list
+    response = await retriever.search(query)
+    return json.dumps(response.to_dict(), indent=2, default=str)
 
 
-blob_store = BlobStorage()
+blob_store = runtime.blob
 
 
 @mcp.tool()
@@ -96,7 +91,8 @@ async def ingest_dataset(url: str, type: str, process_pipeline: list[str] | None
         type: Type of data source (e.g., 'api', 'web_page', 'csv_url').
         process_pipeline: List of processing steps.
     """
-    return await ingest_impl(url, type, process_pipeline)
+    result = await ingest_impl(url, type, process_pipeline, runtime=runtime)
+    return result.summary
 
 
 @mcp.tool()
@@ -128,8 +124,13 @@ async def probe_entity(entity_id: str, depth: int = 1) -> str:
 
 
 def _find_entity_results(entity_id: str) -> list[dict[str, Any]]:
-    """Helper to find entity matches using keyword, vector, and SQL fallback."""
-    # Try keyword first (exact matches)
+    """Helper to find entity matches: exact index keys, then keyword, vector and substring."""
+    # Identifier/name keys from the structured index resolve across all datasets
+    rows = sql_store.index.lookup(entity_id)
+    if rows:
+        return [_row_result(r, 1.0) for r in rows]
+
+    # Try keyword next (exact term matches)
     keyword_result = search_store.search(entity_id)
     results = (
         keyword_result.data.get("results", [])
@@ -147,60 +148,31 @@ def _find_entity_results(entity_id: str) -> list[dict[str, Any]]:
         )
 
     if not results:
-        # Try SQL fallback
-        sql_res = _search_sql_fallback(entity_id)
-        if sql_res:
-            results = [{"content": r, "score": 0.5, "metadata": r} for r in sql_res]
+        # Exact keys, then substring matches via the shared trigram index (structured_fts)
+        results = [_row_result(r, 0.5) for r in _search_sql_fallback(entity_id)]
 
     return results
 
 
-def _search_sql_fallback(query: str) -> list[dict[str, Any]]:
-    """Search for relevant tables and query them directly."""
-    try:
-        # 1. Find datasets that might contain the query in their metadata
-        meta_query = "SELECT table_name FROM datasets_metadata WHERE dataset_name LIKE ? OR source_url LIKE ?"
-        meta_res = sql_store.query(meta_query, (f"%{query}%", f"%{query}%"))
+def _row_result(row: dict[str, Any], score: float) -> dict[str, Any]:
+    """Shape a structured-index row like a search result."""
+    record = {k: v for k, v in row.items() if not str(k).startswith("_")}
+    return {
+        "id": f"{row['_source_table']}#{row['_rowid']}",
+        "content": record,
+        "score": score,
+        "metadata": record,
+    }
 
-        tables = []
-        if meta_res.success and meta_res.data:
-            tables = [r["table_name"] for r in meta_res.data]
 
-        # 2. Also just look for the last 3 ingested tables as a broad search
-        recent_res = sql_store.query(
-            "SELECT table_name FROM datasets_metadata ORDER BY ingested_at DESC LIMIT 3"
-        )
-        if recent_res.success and recent_res.data:
-            tables.extend([r["table_name"] for r in recent_res.data])
-
-        tables = list(set(tables))
-        all_results = []
-
-        for table in tables:
-            # Query the table for matching content (broad search across all columns)
-            # Find columns first
-            cols_res = sql_store.query(f"PRAGMA table_info({table})")
-            if not cols_res.success or not cols_res.data:
-                continue
-
-            text_cols = [
-                r["name"]
-                for r in cols_res.data
-                if "TEXT" in str(r["type"]).upper() or "CHAR" in str(r["type"]).upper()
-            ]
-            if not text_cols:
-                continue
-
-            where_clause = " OR ".join([f"{col} LIKE ?" for col in text_cols])
-            search_query = f"SELECT * FROM {table} WHERE {where_clause} LIMIT 5"
-            data_res = sql_store.query(search_query, tuple([f"%{query}%"] * len(text_cols)))
-
-            if data_res.success and data_res.data:
-                for r in data_res.data:
-                    r["_source_table"] = table
-                    all_results.append(r)
-
-        return all_results
+def _search_sql_fallback(query: str, limit: int = 5) -> list[dict[str, Any]]:
+    """Search every ingested table through the structured index (up to ``limit`` rows per table).
+
+    Exact identifier/name matches come first, then case-insensitive substring
+    matches; rows carry ``_source_table``, ``_rowid`` and ``_match``.
+    """
+    try:
+        return sql_store.index.search(query, limit=limit)
     except Exception as e:
         logger.error(f"SQL fallback search failed: {e}")
         return []
@@ -259,17 +231,19 @@ def _explore_deeper(entity_profile: dict[str, Any]) -> None:
     entity_profile["deeper_exploration"] = []
     # Limit recursion to top 3 related entities
     for related in entity_profile["related_entities"][:3]:
-        sub_result = vector_store.search(related["name"], limit=2)
-        if sub_result.success and sub_result.data:
-            sub_matches = sub_result.data.get("results", [])
-            if sub_matches:
-                entity_profile["deeper_exploration"].append(
-                    {
-                        "entity": related["name"],
-                        "relation": related["relation"],
-                        "sub_matches_count": len(sub_matches),
-                    }
-                )
+        sub_matches: list[Any] = sql_store.index.lookup(related["name"], limit=2)
+        if not sub_matches:
+            sub_result = vector_store.search(related["name"], limit=2)
+            if sub_result.success and sub_result.data:
+                sub_matches = sub_result.data.get("results", [])
+        if sub_matches:
+            entity_profile["deeper_exploration"].append(
+                {
+                    "entity": related["name"],
+                    "relation": related["relation"],
+                    "sub_matches_count": len(sub_matches),
+                }
+            )
 
 
 @mcp.tool()
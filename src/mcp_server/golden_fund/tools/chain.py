@@ -1,7 +1,8 @@
 import logging
 
 from ..lib.connectors.ckan_connector import CKANConnector
-from ..lib.storage import VectorStorage
+from ..lib.crawler import EnrichmentCrawler
+from ..lib.storage.runtime import get_runtime
 from .ingest import ingest_dataset
 
 logger = logging.getLogger("golden_fund.tools.chain")
@@ -9,8 +10,10 @@ logger = logging.getLogger("golden_fund.tools.chain")
 
 class RecursiveEnricher:
     def __init__(self):
+        runtime = get_runtime()
         self.ckan = CKANConnector()
-        self.vector_store = VectorStorage()
+        self.vector_store = runtime.vector
+        self.crawler = EnrichmentCrawler(self.ckan, ingest_dataset, runtime=runtime)
         self.max_depth = 2
 
     async def enrich_and_search(self, query: str, depth: int = 0) -> str:
@@ -38,26 +41,11 @@ class RecursiveEnricher:
             f"Local confidence low/miss for '{query}'. Initiating external enrichment (Depth {depth})"
         )
 
-        # 2. External Search (CKAN)
-        packages = self.ckan.search_packages(query, rows=3)
-        if not packages:
+        # 2-3. External discovery (CKAN) and concurrent download / ingestion
+        report = await self.crawler.crawl(query)
+        if not report.discovered and not report.items:
             return f"No local or external data found for '{query}'"
-
-        enrichment_summary = []
-
-        # 3. Ingest and Chain
-        for pkg in packages:
-            resources = self.ckan.find_resources_by_format(pkg, ["CSV", "JSON"])
-            if resources:
-                target_resource = resources[0]  # Take first valid resource
-                url = self.ckan.get_resource_url(target_resource)
-
-                # Ingest
-                logger.info(f"Enriching with: {pkg.get('title')} ({url})")
-                ingest_result = await ingest_dataset(
-                    url, type="api", process_pipeline=["parse"]
-                )  # Assume API/Direct link
-                enrichment_summary.append(f"Ingested '{pkg.get('title')}': {ingest_result}")
+        enrichment_summary = report.summary_lines()
 
         # 4. Re-Search Local
         retry_results = self.vector_store.search(query, limit=5)
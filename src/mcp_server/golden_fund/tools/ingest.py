@@ -2,6 +2,7 @@
 Ingestion Tool for Golden Fund
 """
 
+import asyncio
 import logging
 import uuid
 from datetime import datetime
@@ -10,9 +11,10 @@ from typing import Any
 
 import pandas as pd
 
-from ..lib.parser import DataParser
 from ..lib.scraper import DataScraper
 from ..lib.storage import SearchStorage, SQLStorage, VectorStorage
+from ..lib.storage.runtime import StorageRuntime, get_runtime
+from ..lib.streaming import BatchSink, IngestResult, StreamingPipeline
 from ..lib.validation import DataValidator
 
 logger = logging.getLogger("golden_fund.tools.ingest")
@@ -25,6 +27,11 @@ RAW_DIR = DATA_DIR / "raw"
 RAW_DIR.mkdir(exist_ok=True)
 
 
+_FILE_TYPES = {"csv", "json", "jsonl", "xml", "parquet", "excel", "xlsx", "xls", "file"}
+BATCH_SIZE = 50_000
+QUEUE_SIZE = 2
+
+
 def _get_scrape_result(url: str, type: str, scraper: DataScraper):
     """Helper to handle the first stage of ingestion: scraping."""
     if type == "api":
@@ -34,35 +41,78 @@ def _get_scrape_result(url: str, type: str, scraper: DataScraper):
 
     # Generic file download
     result = scraper.download_file(url)
-    if type in ["csv", "json", "xml", "parquet"]:
-        ext = f".{type}"
-    elif type in ["excel", "xlsx", "xls"]:
-        ext = ".xlsx"
-    else:
-        path = Path(url)
-        ext = path.suffix or ".bin"
-    return result, ext
-
-
-def _parse_raw_data(raw_file: Path, ext: str, type: str, parser: DataParser):
-    """Helper to handle the second stage: parsing."""
+    return result, _file_extension(url, type)
+
+
+def _file_extension(url: str, type: str) -> str:
+    if type in ["csv", "json", "jsonl", "xml", "parquet"]:
+        return f".{type}"
+    if type in ["excel", "xlsx", "xls"]:
+        return ".xlsx"
+    path = Path(url)
+    return path.suffix or ".bin"
+
+
+def _format_hint(ext: str, type: str) -> str:
     format_hint = ext.lstrip(".").lower()
     if format_hint == "bin" and type not in ["file", "web_page", "api"]:
         format_hint = type
+    return format_hint
+
+
+def _fetch_raw(
+    url: str, type: str, run_id: str, scraper: DataScraper
+) -> tuple[Path | None, str, str]:
+    """Retrieve the source into RAW_DIR. Files are streamed to disk, not held in memory."""
+    if type in _FILE_TYPES:
+        ext = _file_extension(url, type)
+        raw_file = RAW_DIR / f"{run_id}_raw{ext}"
+        result = scraper.download_to_file(url, raw_file)
+        if not result.success:
+            return None, ext, f"Ingestion failed during retrieval: {result.error}"
+        if raw_file.stat().st_size == 0:
+            return None, ext, "No data retrieved"
+        return raw_file, ext, ""
 
-    return parser.parse(raw_file, format_hint=format_hint)
+    result, ext = _get_scrape_result(url, type, scraper)
+    if not result.success:
+        return None, ext, f"Ingestion failed during retrieval: {result.error}"
+    if not result.data:
+        return None, ext, "No data retrieved"
+
+    raw_file = RAW_DIR / f"{run_id}_raw{ext}"
+    save_res = scraper.save_data(result.data, raw_file)
+    if not save_res.success:
+        return None, ext, f"Failed to save raw data: {save_res.error}"
+    return raw_file, ext, ""
 
 
 async def ingest_dataset(
-    url: str, type: str = "web_page", process_pipeline: list[str] | None = None
-) -> str:
-    """Ingest a dataset from a URL."""
-    scraper = DataScraper()
-    parser = DataParser()
-    validator = DataValidator()
-    sql_storage = SQLStorage()
-    vector_storage = VectorStorage()
-    search_storage = SearchStorage()
+    url: str,
+    type: str = "web_page",
+    process_pipeline: list[str] | None = None,
+    batch_size: int = BATCH_SIZE,
+    runtime: StorageRuntime | None = None,
+    *,
+    source_url: str | None = None,
+) -> IngestResult:
+    """Ingest a dataset from a URL.
+
+    The raw file is parsed incrementally and each record batch is fanned out
+    to the SQL / vector / keyword / validation sinks concurrently. Backends
+    come from the shared storage runtime rather than being built per call.
+    ``source_url`` is recorded as the provenance when ``url`` is a local copy.
+
+    Raw files go into the content-addressed artifact store under the source's
+    ref, so re-ingesting identical bytes stores nothing new and replays the
+    cached parse instead of parsing again.
+
+    Returns an ``IngestResult``: ``success`` is False when retrieval or parsing
+    failed or a stage did not see the whole stream; ``summary`` is the report.
+    """
+    runtime = runtime or get_runtime()
+    scraper = runtime.scraper
+    parser = runtime.parser
 
     if process_pipeline is None:
         process_pipeline = ["parse", "store_sql", "keyword_index", "vectorize"]
@@ -70,82 +120,207 @@ async def ingest_dataset(
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:6]
     logger.info(f"Starting ingestion run {run_id} for {url} ({type})")
 
-    result, ext = _get_scrape_result(url, type, scraper)
-    if not result.success:
-        msg = f"Ingestion failed during retrieval: {result.error}"
-        logger.error(msg)
-        return msg
-
-    if not result.data:
-        return "No data retrieved"
-
-    raw_file = RAW_DIR / f"{run_id}_raw{ext}"
-    save_res = scraper.save_data(result.data, raw_file)
-    if not save_res.success:
-        return f"Failed to save raw data: {save_res.error}"
-
-    summary_parts = [f"Ingestion {run_id} successful.", f"Raw data: {raw_file.name}."]
-    parsed_df = None
+    raw_file, ext, error = _fetch_raw(url, type, run_id, scraper)
+    if raw_file is None:
+        logger.error(error)
+        return IngestResult(run_id, success=False, summary=error, error=error)
+
+    artifacts = runtime.artifacts
+    artifact = await asyncio.to_thread(
+        artifacts.put_file, raw_file, f"ingest/{source_url or url}", move=True
+    )
+    raw_note = f"Raw data: sha256:{artifact.sha256[:12]}"
+    if artifact.deduplicated:
+        raw_note += " (unchanged content, deduplicated)"
+    summary_parts = [f"Ingestion {run_id} successful.", raw_note + "."]
+    if "parse" not in process_pipeline:
+        return IngestResult(run_id, success=True, summary=" ".join(summary_parts))
+
+    sinks = _build_sinks(process_pipeline, run_id, source_url or url, ext, runtime)
+    try:
+        batches = artifacts.iter_batches(
+            artifact.sha256, parser, _format_hint(ext, type), batch_size=batch_size
+        )
+    except (FileNotFoundError, ValueError) as e:
+        summary_parts[0] = f"Ingestion {run_id} failed."
+        summary_parts.append(f"Parsing failed: {e}")
+        return IngestResult(run_id, success=False, summary=" ".join(summary_parts), error=str(e))
+
+    report = await StreamingPipeline(sinks, queue_size=QUEUE_SIZE).run(batches)
+    try:
+        # unreferenced objects (a ref moved to new content) and stale parse results
+        await asyncio.to_thread(artifacts.maybe_gc)
+    except Exception as e:
+        logger.warning(f"Artifact gc after {run_id} failed: {e}")
+    failed = report.failed_stages
+    if report.parse_error and report.rows == 0:
+        summary_parts[0] = f"Ingestion {run_id} failed."
+        summary_parts.append(f"Parsing failed: {report.parse_error}")
+        return IngestResult(
+            run_id,
+            success=False,
+            summary=" ".join(summary_parts),
+            failed_stages=failed,
+            error=report.parse_error,
+        )
+    if failed:
+        # A stream that stopped early (or a sink that gave up) leaves partial results
+        summary_parts[0] = f"Ingestion {run_id} failed."
+
+    summary_parts.append(f"Parsed {report.rows} records.")
+    if report.parse_error:
+        summary_parts.append(f"Parsing stopped early: {report.parse_error}")
+    summary_parts.extend(report.messages[sink.name] for sink in sinks)
+    if failed:
+        summary_parts.append(f"Incomplete stages: {', '.join(failed)}.")
+    summary_parts.append(report.throughput_summary())
+    logger.info(
+        f"Ingestion {run_id} stages: "
+        + ", ".join(f"{k}={v.to_dict()}" for k, v in report.stages.items())
+    )
+    return IngestResult(
+        run_id,
+        success=not failed,
+        summary=" ".join(part for part in summary_parts if part),
+        rows=report.rows,
+        table=next((s.target for s in sinks if isinstance(s, SQLSink)), None),
+        failed_stages=failed,
+        error=report.parse_error,
+    )
+
+
+def _build_sinks(
+    process_pipeline: list[str], run_id: str, url: str, ext: str, runtime: StorageRuntime
+) -> list[BatchSink]:
+    sinks: list[BatchSink] = []
+    if "store_sql" in process_pipeline:
+        sinks.append(SQLSink(runtime.sql, run_id, url))
+    if "vectorize" in process_pipeline:
+        sinks.append(VectorSink(runtime.vector, run_id, url, ext))
+    if "keyword_index" in process_pipeline:
+        sinks.append(KeywordSink(runtime.search, run_id))
+    if "validate" in process_pipeline:
+        sinks.append(ValidationSink(runtime.validator, run_id))
+    return sinks
+
+
+class SQLSink(BatchSink):
+    """Appends every batch to ``dataset_<run_id>``."""
+
+    name = "store_sql"
+
+    def __init__(self, sql_storage: SQLStorage, run_id: str, url: str):
+        self.sql_storage = sql_storage
+        self.run_id = run_id
+        self.url = url
+        self.target: str | None = None
+        self.error: str | None = None
+
+    def write(self, batch: pd.DataFrame, offset: int) -> None:
+        store_res = self.sql_storage.store_dataset(
+            batch, f"dataset_{self.run_id}", source_url=self.url, if_exists="append"
+        )
+        if not store_res.success:
+            self.error = store_res.error
+            raise RuntimeError(store_res.error)
+        self.target = store_res.target
+
+    def close(self) -> str:
+        if self.error:
+            return f"SQL Storage failed: {self.error}"
+        return f"Stored in SQL table '{self.target}'." if self.target else ""
+
+
+class VectorSink(BatchSink):
+    """Tracks the schema/row count while streaming; stores one dataset record at the end."""
+
+    name = "vectorize"
+
+    def __init__(self, vector_storage: VectorStorage, run_id: str, url: str, ext: str):
+        self.vector_storage = vector_storage
+        self.run_id = run_id
+        self.url = url
+        self.ext = ext
+        self.columns: list[str] = []
+        self.rows = 0
+
+    def write(self, batch: pd.DataFrame, offset: int) -> None:
+        if not self.columns:
+            self.columns = [str(c) for c in batch.columns]
+        self.rows += len(batch)
+
+    def close(self) -> str:
+        if not self.columns:
+            return ""
+        return _perform_vector_storage(
+            self.columns,
+            self.rows,
+            run_id=self.run_id,
+            url=self.url,
+            ext=self.ext,
+            vector_storage=self.vector_storage,
+        )
 
-    if "parse" in process_pipeline:
-        parsed_df, parse_msg = _perform_parsing(raw_file, ext, type, parser)
-        summary_parts.append(parse_msg)
 
-    if "store_sql" in process_pipeline and parsed_df is not None:
-        sql_msg = _perform_sql_storage(parsed_df, run_id, url, sql_storage)
-        summary_parts.append(sql_msg)
+class KeywordSink(BatchSink):
+    name = "keyword_index"
 
-    if "vectorize" in process_pipeline and parsed_df is not None:
-        vec_msg = _perform_vector_storage(parsed_df, run_id, url, ext, vector_storage)
-        summary_parts.append(vec_msg)
+    def __init__(self, search_storage: SearchStorage, run_id: str):
+        self.search_storage = search_storage
+        self.run_id = run_id
+        self.rows = 0
+        self.error: str | None = None
 
-    if "keyword_index" in process_pipeline and parsed_df is not None:
-        search_msg = _perform_keyword_storage(parsed_df, run_id, search_storage)
-        summary_parts.append(search_msg)
+    def write(self, batch: pd.DataFrame, offset: int) -> None:
+        res = _index_keyword_batch(batch, self.run_id, self.search_storage, offset)
+        if not res.success:
+            self.error = res.error
+            raise RuntimeError(res.error)
+        self.rows += len(batch)
 
-    if "validate" in process_pipeline and parsed_df is not None:
-        val_msg = _perform_validation(parsed_df, run_id, validator)
-        summary_parts.append(val_msg)
+    def close(self) -> str:
+        if self.error:
+            return f"Keyword indexing failed: {self.error}"
+        return f"Indexed {self.rows} records for keyword search."
 
-    return " ".join(summary_parts)
 
+class ValidationSink(BatchSink):
+    """Validates batches as they stream; stops consuming once the check has passed."""
 
-def _perform_parsing(
-    raw_file: Path, ext: str, type: str, parser: DataParser
-) -> tuple[pd.DataFrame | None, str]:
-    """Helper to parse raw data into a DataFrame."""
-    parse_res = _parse_raw_data(raw_file, ext, type, parser)
-    if not parse_res.success:
-        return None, f"Parsing failed: {parse_res.error}"
+    name = "validate"
 
-    data = parse_res.data
-    df = None
-    if isinstance(data, pd.DataFrame):
-        df = data
-    elif isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
-        df = pd.DataFrame(data)
-    elif isinstance(data, dict):
-        df = pd.DataFrame([data])
+    def __init__(self, validator: DataValidator, run_id: str):
+        self.validator = validator
+        self.run_id = run_id
+        self.passed = False
+        self.last_error: str | None = None
 
-    count = len(df) if df is not None else 0
-    return df, f"Parsed {count} records."
+    def write(self, batch: pd.DataFrame, offset: int) -> None:
+        res = _validate_batch(batch, self.run_id, self.validator)
+        self.passed = res.success
+        self.last_error = res.error
 
+    def done(self) -> bool:
+        return self.passed
 
-def _perform_sql_storage(df: pd.DataFrame, run_id: str, url: str, sql_storage: SQLStorage) -> str:
-    """Helper to store dataset in SQL database."""
-    table_name = f"dataset_{run_id}"
-    store_res = sql_storage.store_dataset(df, table_name, source_url=url)
-    if store_res.success:
-        return f"Stored in SQL table '{store_res.target}'."
-    return f"SQL Storage failed: {store_res.error}"
+    def close(self) -> str:
+        if self.passed:
+            return "Validation passed."
+        return f"Validation warning: {self.last_error}"
 
 
 def _perform_vector_storage(
-    df: pd.DataFrame, run_id: str, url: str, ext: str, vector_storage: VectorStorage
+    columns: list[str],
+    row_count: int,
+    *,
+    run_id: str,
+    url: str,
+    ext: str,
+    vector_storage: VectorStorage,
 ) -> str:
     """Helper to store dataset metadata in vector database."""
-    cols = ", ".join(df.columns[:10])
-    desc = f"Dataset from {url} ({type}). Columns: {cols}. Rows: {len(df)}."
+    cols = ", ".join(columns[:10])
+    desc = f"Dataset from {url} ({ext.lstrip('.')}). Columns: {cols}. Rows: {row_count}."
     table_name = f"dataset_{run_id}"
     vector_data = {
         "name": table_name,
@@ -161,21 +336,21 @@ def _perform_vector_storage(
     return f"Vector indexing failed: {vec_res.error}"
 
 
-def _perform_validation(df: pd.DataFrame, run_id: str, validator: DataValidator) -> str:
-    """Helper to validate ingested data completeness."""
-    val_data = [{str(k): v for k, v in record.items()} for record in df.to_dict(orient="records")]
-    validation_res = validator.validate_data_completeness(val_data, context=f"ingestion_{run_id}")
-    if validation_res.success:
-        return "Validation passed."
-    return f"Validation warning: {validation_res.error}"
+def _validate_batch(df: pd.DataFrame, run_id: str, validator: DataValidator):
+    # Columnar: the batch is scanned as-is and only a few matching rows are materialized
+    return validator.validate_data_completeness(
+        df, context=f"ingestion_{run_id}", stop_on_success=True, max_details=3
+    )
 
 
-def _perform_keyword_storage(df: pd.DataFrame, run_id: str, search_storage: SearchStorage) -> str:
-    """Helper to index all rows for keyword search."""
+def _index_keyword_batch(
+    df: pd.DataFrame, run_id: str, search_storage: SearchStorage, offset: int = 0
+):
+    """Index one batch of rows for keyword search; ids continue from ``offset``."""
     records = df.to_dict(orient="records")
     # Add some descriptive fields for FTS5
     indexed_records: list[dict[str, Any]] = []
-    for i, rec in enumerate(records):
+    for i, rec in enumerate(records, start=offset):
         str_rec = {str(k): v for k, v in rec.items()}
         indexed_records.append(
             {
@@ -186,8 +361,4 @@ def _perform_keyword_storage(df: pd.DataFrame, run_id: str, search_storage: Sear
                 **str_rec,
             }
         )
-
-    res = search_storage.index_documents(indexed_records)
-    if res.success:
-        return f"Indexed {len(records)} records for keyword search."
-    return f"Keyword indexing failed: {res.error}"
+    return search_storage.index_documents(indexed_records)
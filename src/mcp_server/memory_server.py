@@ -420,14 +420,11 @@ async def delete_entity(name: str, namespace: str | None = None) -> dict[str, An
 
     from sqlalchemy import delete
 
-    session = await db_manager.get_session()
-    try:
+    async with db_manager.write_session() as session:
         # Delete from structured DB (SQLite)
         stmt = delete(KGNode).where(KGNode.id == node_id)
         await session.execute(stmt)
         await session.commit()
-    finally:
-        await session.close()
 
     # Delete from ChromaDB
     if long_term_memory.available:
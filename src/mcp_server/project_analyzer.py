@@ -3,18 +3,39 @@ Universal Project Structure Analyzer for Diagram Generation.
 
 Analyzes any project type (Python, Node.js, etc.) and generates
 appropriate architecture diagrams dynamically.
+
+Tree listings, component membership and import dependencies come from a
+persistent WorkspaceIndex (see workspace_index.py) that is refreshed
+incrementally, so repeated calls only read the files that changed.
 """
 
 import json
 from pathlib import Path
 from typing import Any
 
+from .workspace_index import WorkspaceIndex
+
+# Open workspace indexes by resolved project root, kept for the process lifetime
+_INDEXES: dict[Path, WorkspaceIndex] = {}
+
 
-def analyze_project_structure(project_path: Path) -> dict[str, Any]:
+def get_workspace_index(project_path: Path) -> WorkspaceIndex:
+    """Get or open the persistent workspace index of a project."""
+    root = Path(project_path).resolve()
+    if root not in _INDEXES:
+        _INDEXES[root] = WorkspaceIndex(root)
+    return _INDEXES[root]
+
+
+def analyze_project_structure(
+    project_path: Path, index: WorkspaceIndex | None = None
+) -> dict[str, Any]:
     """Analyze project to determine type, structure, and key components.
 
     Args:
         project_path: Path to project root
+        index: Workspace index to use (default: the project's persistent index);
+            it is refreshed before the analysis
 
     Returns:
         Dictionary with project metadata:
@@ -23,7 +44,10 @@ def analyze_project_structure(project_path: Path) -> dict[str, Any]:
         - structure: directories and key files
         - dependencies: from package managers
         - components: detected logical components
+        - component_dependencies: component -> components it imports from
     """
+    index = index or get_workspace_index(project_path)
+    index.refresh()
     analysis = {
         "project_type": "unknown",
         "entry_points": [],
@@ -41,31 +65,69 @@ def analyze_project_structure(project_path: Path) -> dict[str, Any]:
     # Detect Python project
     if (project_path / "requirements.txt").exists() or (project_path / "pyproject.toml").exists():
         analysis["project_type"] = "python"
-        analysis.update(_analyze_python_project(project_path))
+        analysis.update(_analyze_python_project(project_path, index))
 
     # Detect Node.js project
     elif (project_path / "package.json").exists():
         analysis["project_type"] = "nodejs"
-        analysis.update(_analyze_nodejs_project(project_path))
+        analysis.update(_analyze_nodejs_project(project_path, index))
 
     # Detect Rust project
     elif (project_path / "Cargo.toml").exists():
         analysis["project_type"] = "rust"
-        analysis.update(_analyze_rust_project(project_path))
+        analysis.update(_analyze_rust_project(project_path, index))
 
     # Detect Go project
     elif (project_path / "go.mod").exists():
         analysis["project_type"] = "go"
-        analysis.update(_analyze_go_project(project_path))
+        analysis.update(_analyze_go_project(project_path, index))
 
     # Generic fallback
     else:
-        analysis.update(_analyze_generic_project(project_path))
+        analysis.update(_analyze_generic_project(project_path, index))
 
+    analysis["component_dependencies"] = index.dependencies()
     return analysis
 
 
-def _analyze_python_project(project_path: Path) -> dict[str, Any]:
+def _assign_components(index: WorkspaceIndex, project_type: str, project_path: Path) -> list[str]:
+    """Store each file's component under the rule for ``project_type``; list them."""
+    name = Path(project_path).resolve().name
+    index.assign_components(
+        f"{project_type}:{name}", lambda path: component_for_path(path, project_type, name)
+    )
+    return index.components()
+
+
+def component_for_path(path: str, project_type: str, project_name: str = "") -> str | None:
+    """Component a file (relative path) belongs to, by the rule for the project type.
+
+    - python: every module in src/, app/ or the package dir is a component
+    - nodejs: each directory in src/
+    - rust: each module file in src/ other than main.rs
+    - go: each directory in cmd/, pkg/ and internal/
+    - other: each top-level directory not starting with a dot
+    """
+    parts = path.split("/")
+    if project_type == "python":
+        stem = parts[-1][:-3]
+        if parts[0] in ("src", "app", project_name) and path.endswith(".py") and len(parts) > 1:
+            return None if stem == "__init__" else stem.replace("_", " ").title()
+    elif project_type == "nodejs":
+        if len(parts) > 2 and parts[0] == "src":
+            return parts[1].replace("-", " ").title()
+    elif project_type == "rust":
+        if len(parts) == 2 and parts[0] == "src" and path.endswith(".rs") and parts[1] != "main.rs":
+            return parts[1][:-3].replace("_", " ").title()
+    elif project_type == "go":
+        if len(parts) > 2 and parts[0] in ("cmd", "pkg", "internal"):
+            return parts[1].title()
+    elif len(parts) > 1 and not parts[0].startswith("."):
+        return parts[0].title()
+    return None
+
+
+def _analyze_python_project(project_path: Path, index: WorkspaceIndex) -> dict[str, Any]:
     """Analyze Python project structure."""
     info: dict[str, Any] = {
         "entry_points": [],
@@ -79,16 +141,15 @@ def _analyze_python_project(project_path: Path) -> dict[str, Any]:
         if (project_path / pattern).exists():
             info["entry_points"].append(pattern)
 
-    # Find src/ or package directories
+    # Find src/ or package directories; every module in them is a component
     src_dirs = ["src", "app", project_path.name]
     for src_dir in src_dirs:
         src_path = project_path / src_dir
         if src_path.exists() and src_path.is_dir():
-            info["directories"][src_dir] = list(src_path.glob("*.py"))
-            # Detect components
-            for py_file in src_path.rglob("*.py"):
-                if py_file.stem not in ["__init__", "__pycache__"]:
-                    info["components"].append(py_file.stem.replace("_", " ").title())
+            info["directories"][src_dir] = [
+                project_path / path for path in index.files(src_dir, suffix=".py", recursive=False)
+            ]
+    info["components"] = _assign_components(index, "python", project_path)
 
     # Parse requirements
     req_file = project_path / "requirements.txt"
@@ -104,7 +165,7 @@ def _analyze_python_project(project_path: Path) -> dict[str, Any]:
     return info
 
 
-def _analyze_nodejs_project(project_path: Path) -> dict[str, Any]:
+def _analyze_nodejs_project(project_path: Path, index: WorkspaceIndex) -> dict[str, Any]:
     """Analyze Node.js project structure."""
     info: dict[str, Any] = {
         "entry_points": [],
@@ -137,17 +198,18 @@ def _analyze_nodejs_project(project_path: Path) -> dict[str, Any]:
     # Analyze src/ structure
     src_path = project_path / "src"
     if src_path.exists():
-        info["directories"]["src"] = []
-        for item in src_path.iterdir():
-            if item.is_dir():
-                info["components"].append(item.name.replace("-", " ").title())
-            elif item.suffix in [".js", ".ts", ".tsx"]:
-                info["directories"]["src"].append(item.name)
+        info["directories"]["src"] = [
+            path.rpartition("/")[2]
+            for path in index.files("src", recursive=False)
+            if Path(path).suffix in [".js", ".ts", ".tsx"]
+        ]
+        info["components"] = [name.replace("-", " ").title() for name in index.subdirs("src")]
+        _assign_components(index, "nodejs", project_path)
 
     return info
 
 
-def _analyze_rust_project(project_path: Path) -> dict[str, Any]:
+def _analyze_rust_project(project_path: Path, index: WorkspaceIndex) -> dict[str, Any]:
     """Analyze Rust project structure."""
     info: dict[str, Any] = {
         "entry_points": ["src/main.rs"],
@@ -165,35 +227,27 @@ def _analyze_rust_project(project_path: Path) -> dict[str, Any]:
             info["dependencies"] = {}  # type: ignore[typeddict-item]  # Would parse here
 
     # Analyze src/
-    src_path = project_path / "src"
-    if src_path.exists():
-        for rs_file in src_path.glob("*.rs"):
-            if rs_file.stem != "main":
-                info["components"].append(rs_file.stem.replace("_", " ").title())
+    info["components"] = _assign_components(index, "rust", project_path)
 
     return info
 
 
-def _analyze_go_project(project_path: Path) -> dict[str, Any]:
+def _analyze_go_project(project_path: Path, index: WorkspaceIndex) -> dict[str, Any]:
     """Analyze Go project structure."""
-    info = {"entry_points": [], "key_files": ["go.mod"], "components": []}
+    info: dict[str, Any] = {"entry_points": [], "key_files": ["go.mod"], "components": []}
 
     # Find main.go
-    for main_file in project_path.rglob("main.go"):
-        info["entry_points"].append(str(main_file.relative_to(project_path)))
+    info["entry_points"] = index.files(name="main.go")
 
     # Analyze cmd/ and pkg/ structure
     for dir_name in ["cmd", "pkg", "internal"]:
-        dir_path = project_path / dir_name
-        if dir_path.exists():
-            for item in dir_path.iterdir():
-                if item.is_dir():
-                    info["components"].append(item.name.title())
+        info["components"].extend(name.title() for name in index.subdirs(dir_name))
+    _assign_components(index, "go", project_path)
 
     return info
 
 
-def _analyze_generic_project(project_path: Path) -> dict[str, Any]:
+def _analyze_generic_project(project_path: Path, index: WorkspaceIndex) -> dict[str, Any]:
     """Analyze unknown project type."""
     info: dict[str, Any] = {"entry_points": [], "key_files": [], "components": []}
 
@@ -209,15 +263,17 @@ def _analyze_generic_project(project_path: Path) -> dict[str, Any]:
             info["key_files"].append(pattern)
 
     # List top-level directories
-    for item in project_path.iterdir():
-        if item.is_dir() and not item.name.startswith("."):
-            info["components"].append(item.name.title())
+    info["components"] = [name.title() for name in index.subdirs() if not name.startswith(".")]
+    _assign_components(index, "unknown", project_path)
 
     return info
 
 
 def detect_changed_components(
-    project_analysis: dict[str, Any], git_diff: str, modified_files: list[str]
+    project_analysis: dict[str, Any],
+    git_diff: str,
+    modified_files: list[str],
+    index: WorkspaceIndex | None = None,
 ) -> list[str]:
     """Detect which components were affected by changes.
 
@@ -226,12 +282,20 @@ def detect_changed_components(
     Args:
         project_analysis: Result from analyze_project_structure
         git_diff: Git diff output
-        modified_files: List of modified file paths
+        modified_files: List of modified file paths (relative to the project root)
+        index: Workspace index the analysis came from; modified files are then
+            re-indexed and mapped to their components directly
 
     Returns:
         List of affected component names
     """
     affected = set()
+    owners: dict[str, str] = {}
+    if index is not None:
+        index.refresh(paths=modified_files)
+        _assign_components(index, project_analysis.get("project_type", "unknown"), index.root)
+        owners = index.component_of(modified_files)
+        affected.update(owners.values())
 
     # Map files to components dynamically
     for file_path in modified_files:
@@ -245,7 +309,9 @@ def detect_changed_components(
             if dir_name in file_path:
                 affected.add(f"{dir_name.title()} Module")
 
-        # Check components
+        # Check components (by name, for files the index does not assign)
+        if Path(file_path).as_posix().strip("/") in owners:
+            continue
         for component in project_analysis.get("components", []):
             component_slug = component.lower().replace(" ", "_")
             if component_slug in file_path.lower():
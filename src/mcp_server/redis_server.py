@@ -11,10 +11,14 @@ root = os.path.join(current_dir, "..", "..")
 sys.path.insert(0, os.path.abspath(root))
 
 from src.brain.config.config_loader import config
+from src.brain.core.services.session_checkpoints import SessionCheckpointer
 from src.brain.monitoring.logger import logger
 
 server = FastMCP("redis")
 
+# Key prefix used by the brain's StateManager
+STATE_PREFIX = "atlastrinity"
+
 # Global Redis Client
 _redis_client: redis.Redis | None = None
 
@@ -68,6 +72,42 @@ async def redis_get(key: str) -> dict[str, Any]:
         return {"success": False, "error": str(e)}
 
 
+@server.tool()
+async def redis_session_state(
+    session_id: str = "", fields: list[str] | None = None, tail: int = 20
+) -> dict[str, Any]:
+    """Get a session's current state (compacted snapshot + replayed delta log).
+
+    Prefer this over ``redis_get`` on ``atlastrinity:session:<id>``: that key only
+    holds the last snapshot (often zstd-compressed) without the newer deltas.
+
+    Args:
+        session_id: Session ID (default: the last saved session)
+        fields: Top-level state keys to return (default: all)
+        tail: Keep only the last N items of list values such as logs (0 = all)
+
+    """
+    try:
+        r = get_redis_client()
+        if not session_id:
+            session_id = await r.get(f"{STATE_PREFIX}:last_session") or ""
+            if not session_id:
+                return {"success": True, "session_id": None, "state": None, "found": False}
+
+        checkpointer = SessionCheckpointer(r, lambda name: f"{STATE_PREFIX}:{name}")
+        state = await checkpointer.restore(session_id)
+        if state is None:
+            return {"success": True, "session_id": session_id, "state": None, "found": False}
+
+        if fields:
+            state = {k: v for k, v in state.items() if k in fields}
+        if tail > 0:
+            state = {k: v[-tail:] if isinstance(v, list) else v for k, v in state.items()}
+        return {"success": True, "session_id": session_id, "state": state, "found": True}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 @server.tool()
 async def redis_set(key: str, value: Any, ex_seconds: int | None = None) -> dict[str, Any]:
     """Set the value of a key in Redis.
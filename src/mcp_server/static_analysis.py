@@ -0,0 +1,714 @@
+"""Static Analysis Engine - parallel, cached runs of the Python analyzers.
+
+The devtools lint, type-check, dead-code and complexity tools each start one
+analyzer over the whole tree and wait for it. The engine runs them together:
+- every analyzer invocation is a subprocess; at most ``workers`` run at once
+  (the CPUs this process may use by default)
+- analyzers whose findings for a file depend only on that file (ruff, bandit,
+  radon) get their pending files split into shards, one subprocess each
+- results are cached per file in SQLite, keyed by the file's content hash and
+  the analyzer's key (resolved command, ``--version`` output, arguments and
+  config files). Whole-program analyzers (pyright, vulture) also key every
+  file on a digest of all analyzed files, so any change re-runs them
+- diagnostics of all analyzers are merged into one list; findings that two
+  analyzers report for the same line and rule (ruff S101 and bandit B101,
+  ruff F401 and vulture's unused import) are kept once, with both tool names
+- ``stream()`` yields an event as each cached batch or shard completes, so
+  callers can report partial results before the slowest analyzer finishes
+
+Author: AtlasTrinity Team
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .workspace_index import IgnoreRules
+
+SCHEMA_VERSION = 1
+MIN_SHARD = 25  # fewer files per subprocess costs more in start-up than it saves
+SHARD_TIMEOUT_S = 300.0
+VERSION_TIMEOUT_S = 30.0
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+_SEARCH_PATH = os.pathsep.join(
+    [
+        str(_PROJECT_ROOT / ".venv" / "bin"),
+        str(Path(sys.executable).parent),
+        os.environ.get("PATH", ""),
+    ]
+)
+
+_SEVERITY_RANK = {"error": 0, "warning": 1, "info": 2}
+
+# (tool, code) -> the ruff code reporting the same finding
+_EQUIVALENT_RULES = {
+    ("vulture", "unused-import"): "F401",
+    ("vulture", "unused-variable"): "F841",
+    ("radon", "complexity"): "C901",
+}
+
+
+class AnalyzerError(RuntimeError):
+    """Raised when an analyzer fails instead of reporting findings."""
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    """One finding, with the path relative to the analyzed root."""
+
+    path: str
+    line: int
+    column: int
+    code: str
+    severity: str
+    message: str
+    tool: str
+
+    def rule(self) -> str:
+        """The code shared by every analyzer that reports this kind of finding."""
+        if self.tool == "bandit":
+            return "S" + self.code[1:]  # bandit B101 is ruff S101
+        return _EQUIVALENT_RULES.get((self.tool, self.code), self.code)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "line": self.line,
+            "column": self.column,
+            "code": self.code,
+            "severity": self.severity,
+            "message": self.message,
+            "tool": self.tool,
+        }
+
+    def row(self) -> tuple[Any, ...]:
+        return (self.line, self.column, self.code, self.severity, self.message)
+
+
+def merge_diagnostics(diagnostics: Iterable[Diagnostic]) -> list[dict[str, Any]]:
+    """Deduplicate findings by (path, line, rule), most severe first, sorted by location."""
+    merged: dict[tuple[str, int, str], dict[str, Any]] = {}
+    for diag in diagnostics:
+        key = (diag.path, diag.line, diag.rule())
+        entry = merged.get(key)
+        if entry is None:
+            merged[key] = entry = diag.to_dict() | {"rule": key[2], "tools": []}
+            del entry["tool"]
+        elif _SEVERITY_RANK.get(diag.severity, 3) < _SEVERITY_RANK.get(entry["severity"], 3):
+            entry.update(severity=diag.severity, message=diag.message, code=diag.code)
+        if diag.tool not in entry["tools"]:
+            entry["tools"].append(diag.tool)
+    return sorted(merged.values(), key=lambda d: (d["path"], d["line"], d["column"], d["rule"]))
+
+
+# --- output parsers: (stdout, stderr, returncode, root) -> diagnostics ------------
+
+
+@functools.lru_cache(maxsize=4096)
+def _relative(path: str, root: Path) -> str:
+    if os.path.isabs(path):
+        path = os.path.relpath(path, root)
+    return path.replace(os.sep, "/").removeprefix("./")
+
+
+def _json_output(tool: str, stdout: str, stderr: str, returncode: int, ok: Iterable[int]) -> Any:
+    if returncode not in ok or (returncode and not stdout.strip()):
+        raise AnalyzerError(f"{tool} exited with {returncode}: {(stderr or stdout).strip()[:500]}")
+    try:
+        return json.loads(stdout) if stdout.strip() else None
+    except json.JSONDecodeError as e:
+        raise AnalyzerError(f"{tool} printed invalid JSON: {e}") from e
+
+
+def parse_ruff(stdout: str, stderr: str, returncode: int, root: Path) -> list[Diagnostic]:
+    items = _json_output("ruff", stdout, stderr, returncode, (0, 1)) or []
+    return [
+        Diagnostic(
+            path=_relative(item["filename"], root),
+            line=(item.get("location") or {}).get("row") or 1,
+            column=(item.get("location") or {}).get("column") or 1,
+            code=item.get("code") or "syntax-error",
+            severity="warning" if item.get("code") else "error",
+            message=item.get("message", ""),
+            tool="ruff",
+        )
+        for item in items
+    ]
+
+
+def parse_bandit(stdout: str, stderr: str, returncode: int, root: Path) -> list[Diagnostic]:
+    data = _json_output("bandit", stdout, stderr, returncode, (0, 1)) or {}
+    severities = {"HIGH": "error", "MEDIUM": "warning", "LOW": "info"}
+    return [
+        Diagnostic(
+            path=_relative(item["filename"], root),
+            line=item.get("line_number") or 1,
+            column=(item.get("col_offset") or 0) + 1,
+            code=item.get("test_id", "B000"),
+            severity=severities.get(item.get("issue_severity", ""), "warning"),
+            message=item.get("issue_text", ""),
+            tool="bandit",
+        )
+        for item in data.get("results", [])
+    ]
+
+
+def parse_radon(stdout: str, stderr: str, returncode: int, root: Path) -> list[Diagnostic]:
+    data = _json_output("radon", stdout, stderr, returncode, (0,)) or {}
+    found = []
+    for path, blocks in data.items():
+        if not isinstance(blocks, list):  # {"error": "..."} for files radon cannot parse
+            continue
+        for block in blocks:
+            found.append(
+                Diagnostic(
+                    path=_relative(path, root),
+                    line=block.get("lineno") or 1,
+                    column=(block.get("col_offset") or 0) + 1,
+                    code="complexity",
+                    severity="error" if block.get("rank") in ("D", "E", "F") else "warning",
+                    message=(
+                        f"{block.get('type', 'block')} {block.get('name')} has cyclomatic"
+                        f" complexity {block.get('complexity')} (rank {block.get('rank')})"
+                    ),
+                    tool="radon",
+                )
+            )
+    return found
+
+
+def parse_pyright(stdout: str, stderr: str, returncode: int, root: Path) -> list[Diagnostic]:
+    data = _json_output("pyright", stdout, stderr, returncode, (0, 1)) or {}
+    found = []
+    for item in data.get("generalDiagnostics", []):
+        start = (item.get("range") or {}).get("start") or {}
+        severity = item.get("severity", "error")
+        found.append(
+            Diagnostic(
+                path=_relative(item.get("file", ""), root),
+                line=start.get("line", 0) + 1,
+                column=start.get("character", 0) + 1,
+                code=item.get("rule") or "pyright",
+                severity="info" if severity == "information" else severity,
+                message=item.get("message", ""),
+                tool="pyright",
+            )
+        )
+    return found
+
+
+_VULTURE_LINE = re.compile(
+    r"^(?P<path>.+?):(?P<line>\d+): (?P<message>.+?)(?: \(\d+% confidence\))?$"
+)
+
+
+def parse_vulture(stdout: str, stderr: str, returncode: int, root: Path) -> list[Diagnostic]:
+    if returncode not in (0, 1, 3):  # 3: dead code found
+        raise AnalyzerError(f"vulture exited with {returncode}: {stderr.strip()[:500]}")
+    found = []
+    for line in stdout.splitlines():
+        match = _VULTURE_LINE.match(line.strip())
+        if not match:
+            continue
+        message = match["message"]
+        found.append(
+            Diagnostic(
+                path=_relative(match["path"], root),
+                line=int(match["line"]),
+                column=1,
+                code="-".join(message.split("'")[0].split()[:2]),  # "unused import 'x'"
+                severity="warning",
+                message=message,
+                tool="vulture",
+            )
+        )
+    return found
+
+
+# --- analyzers ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Analyzer:
+    """How to run one analyzer on a list of files and read its findings.
+
+    ``commands`` are alternative command prefixes, the first one whose
+    executable is found is used. ``per_file`` analyzers report findings for a
+    file from that file alone: their cache entries depend on the file only and
+    their files may be split into shards. ``config_files`` (relative to the
+    root) are part of the cache key, as are the ``--version`` output and args.
+    """
+
+    name: str
+    kind: str
+    commands: tuple[tuple[str, ...], ...]
+    args: tuple[str, ...]
+    parse: Callable[[str, str, int, Path], list[Diagnostic]]
+    per_file: bool = True
+    config_files: tuple[str, ...] = ("pyproject.toml",)
+    extra_files: tuple[str, ...] = ()  # passed after the analyzed files if present
+    version_args: tuple[str, ...] = ("--version",)
+    suffixes: tuple[str, ...] = (".py",)
+
+    def resolve(self) -> tuple[str, ...] | None:
+        for prefix in self.commands:
+            executable = shutil.which(prefix[0], path=_SEARCH_PATH)
+            if executable:
+                return (executable, *prefix[1:])
+        return None
+
+
+ANALYZERS: dict[str, Analyzer] = {
+    analyzer.name: analyzer
+    for analyzer in (
+        Analyzer(
+            name="ruff",
+            kind="lint",
+            commands=(("ruff",),),
+            args=("check", "--output-format=json", "--force-exclude", "--no-cache", "--quiet"),
+            parse=parse_ruff,
+            config_files=("pyproject.toml", "ruff.toml", ".ruff.toml"),
+        ),
+        Analyzer(
+            name="pyright",
+            kind="types",
+            commands=(("pyright",), ("npx", "--no-install", "pyright")),
+            args=("--outputjson",),
+            parse=parse_pyright,
+            per_file=False,
+            config_files=("pyrightconfig.json", "pyproject.toml"),
+        ),
+        Analyzer(
+            name="vulture",
+            kind="dead_code",
+            commands=(("vulture",),),
+            args=("--min-confidence", "80"),
+            parse=parse_vulture,
+            per_file=False,
+            config_files=("pyproject.toml", "vulture_whitelist.py"),
+            extra_files=("vulture_whitelist.py",),
+        ),
+        Analyzer(
+            name="radon",
+            kind="complexity",
+            commands=(("radon",),),
+            args=("cc", "--json", "--min", "C"),  # the blocks xenon --max-absolute B rejects
+            parse=parse_radon,
+            config_files=("radon.cfg", "setup.cfg"),
+        ),
+        Analyzer(
+            name="bandit",
+            kind="security",
+            commands=(("bandit",),),
+            args=("-q", "-ll", "-f", "json"),
+            parse=parse_bandit,
+            config_files=("pyproject.toml", ".bandit"),
+        ),
+    )
+}
+
+
+def default_workers() -> int:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def default_cache_path() -> Path:
+    return Path.home() / ".config" / "atlastrinity" / "data" / "static_analysis.db"
+
+
+def shard(files: list[str], workers: int, min_size: int = MIN_SHARD) -> list[list[str]]:
+    """Split ``files`` into at most ``workers`` shards of at least ``min_size`` files."""
+    count = max(1, min(workers, len(files) // min_size))
+    size, extra = divmod(len(files), count)
+    shards, start = [], 0
+    for i in range(count):
+        end = start + size + (i < extra)
+        shards.append(files[start:end])
+        start = end
+    return [s for s in shards if s]
+
+
+class AnalysisEngine:
+    """Runs analyzers over files below one root, sharing a result cache."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        cache_path: str | Path | None = None,
+        *,
+        workers: int | None = None,
+        analyzers: dict[str, Analyzer] | None = None,
+    ):
+        self.root = Path(root).resolve()
+        self._prefix = os.path.join(str(self.root), "")  # cache rows use absolute paths
+        self.workers = workers or default_workers()
+        self.analyzers = analyzers if analyzers is not None else ANALYZERS
+        self.ignore = IgnoreRules(self.root)
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript(
+                "DROP TABLE IF EXISTS hashes; DROP TABLE IF EXISTS results;"
+                f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS hashes (
+                path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                analyzer TEXT, path TEXT, key TEXT, diagnostics TEXT,
+                PRIMARY KEY (analyzer, path)
+            );
+            """
+        )
+        self._tool_keys: dict[tuple[str, ...], str] = {}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "AnalysisEngine":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ running
+
+    async def run(
+        self, paths: Iterable[str] = ("src",), analyzers: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        """Run to completion; the report of the final ``done`` event."""
+        report: dict[str, Any] = {}
+        async for event in self.stream(paths, analyzers):
+            if event["event"] == "done":
+                report = event["report"]
+        return report
+
+    async def stream(
+        self, paths: Iterable[str] = ("src",), analyzers: Iterable[str] | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield ``cached``, ``shard`` and ``error`` events, then ``done`` with the report.
+
+        ``paths`` are files or directories relative to the root. Every event
+        carries the analyzer name, the files it covers and their diagnostics.
+        """
+        t0 = time.perf_counter()
+        names = list(analyzers) if analyzers is not None else list(self.analyzers)
+        unknown = [name for name in names if name not in self.analyzers]
+        if unknown:
+            raise ValueError(f"Unknown analyzers: {', '.join(unknown)}")
+        selected = [self.analyzers[name] for name in names]
+        files = await asyncio.to_thread(self._collect, paths, selected)
+        hashes = await asyncio.to_thread(self._hashes, files)
+
+        stats: dict[str, dict[str, Any]] = {}
+        diagnostics: list[Diagnostic] = []
+        jobs: list[tuple[Analyzer, tuple[str, ...], list[str], dict[str, str]]] = []
+        for analyzer in selected:
+            targets = [f for f in files if f.endswith(analyzer.suffixes) and hashes.get(f)]
+            stat = stats[analyzer.name] = {
+                "kind": analyzer.kind,
+                "files": len(targets),
+                "cached": 0,
+                "analyzed": 0,
+                "shards": 0,
+                "diagnostics": 0,
+            }
+            command = analyzer.resolve()
+            if command is None:
+                stat["error"] = f"{analyzer.name} is not installed"
+                yield {"event": "error", "analyzer": analyzer.name, "error": stat["error"]}
+                continue
+            if not targets:
+                continue
+            keys = self._keys(analyzer, await self._tool_key(analyzer, command), targets, hashes)
+            cached, pending = self._lookup(analyzer.name, keys)
+            if cached:
+                found = [d for diags in cached.values() for d in diags]
+                stat["cached"] = len(cached)
+                stat["diagnostics"] += len(found)
+                diagnostics += found
+                yield {
+                    "event": "cached",
+                    "analyzer": analyzer.name,
+                    "files": len(cached),
+                    "diagnostics": [d.to_dict() for d in found],
+                }
+            if pending:
+                shards = shard(pending, self.workers) if analyzer.per_file else [pending]
+                stat["shards"] = len(shards)
+                jobs += [(analyzer, command, s, keys) for s in shards]
+
+        # whole-program analyzers are the long poles: start them first
+        jobs.sort(key=lambda job: job[0].per_file)
+        limit = asyncio.Semaphore(self.workers)
+
+        async def run_job(job):
+            analyzer, command, files_, keys = job
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    found = await self._execute(analyzer, command, files_)
+                except (AnalyzerError, OSError, TimeoutError) as e:
+                    return job, None, str(e), time.perf_counter() - started
+                return job, found, None, time.perf_counter() - started
+
+        tasks = [asyncio.create_task(run_job(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                (analyzer, _, files_, keys), found, error, elapsed = await next_done
+                stat = stats[analyzer.name]
+                if found is None:
+                    stat["error"] = error
+                    yield {
+                        "event": "error",
+                        "analyzer": analyzer.name,
+                        "files": len(files_),
+                        "error": error,
+                    }
+                    continue
+                self._store(analyzer.name, files_, keys, found)
+                stat["analyzed"] += len(files_)
+                stat["diagnostics"] += len(found)
+                diagnostics += found
+                yield {
+                    "event": "shard",
+                    "analyzer": analyzer.name,
+                    "files": len(files_),
+                    "elapsed_s": round(elapsed, 3),
+                    "diagnostics": [d.to_dict() for d in found],
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        merged = merge_diagnostics(diagnostics)
+        yield {
+            "event": "done",
+            "report": {
+                "success": not merged and not any("error" in s for s in stats.values()),
+                "files": len(files),
+                "workers": self.workers,
+                "analyzers": stats,
+                "diagnostic_count": len(merged),
+                "by_severity": {
+                    level: sum(d["severity"] == level for d in merged) for level in _SEVERITY_RANK
+                },
+                "diagnostics": merged,
+                "elapsed_s": round(time.perf_counter() - t0, 3),
+            },
+        }
+
+    async def _execute(
+        self, analyzer: Analyzer, command: tuple[str, ...], files: list[str]
+    ) -> list[Diagnostic]:
+        extra = [f for f in analyzer.extra_files if (self.root / f).is_file()]
+        returncode, stdout, stderr = await _communicate(
+            [*command, *analyzer.args, *files, *extra], self.root, SHARD_TIMEOUT_S
+        )
+        found = analyzer.parse(stdout, stderr, returncode, self.root)
+        wanted = set(files)  # drops findings in the whitelist and in imported files
+        return [d for d in found if d.path in wanted]
+
+    # ------------------------------------------------------------ files and keys
+
+    def _collect(self, paths: Iterable[str], analyzers: list[Analyzer]) -> list[str]:
+        """Files below ``paths`` (relative to the root) that any analyzer handles."""
+        suffixes = tuple({s for a in analyzers for s in a.suffixes})
+        found: set[str] = set()
+        for path in paths:
+            rel = Path(path).as_posix().strip("/")
+            rel = "" if rel == "." else rel
+            target = self.root / rel
+            if target.is_file():
+                if rel.endswith(suffixes):
+                    found.add(rel)
+                continue
+            stack = [rel] if target.is_dir() else []
+            while stack:
+                rel_dir = stack.pop()
+                try:
+                    entries = os.scandir(self.root / rel_dir if rel_dir else self.root)
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
+                        child = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.ignore.ignored(child, entry.name, True):
+                                stack.append(child)
+                        elif entry.name.endswith(suffixes) and not self.ignore.ignored(
+                            child, entry.name, False
+                        ):
+                            found.add(child)
+        return sorted(found)
+
+    def _hashes(self, files: list[str]) -> dict[str, str]:
+        """Content hash per file; files whose (mtime, size) are unchanged are not read."""
+        known = {}
+        for i in range(0, len(files), 500):
+            chunk = [self._prefix + f for f in files[i : i + 500]]
+            known.update(
+                (row[0], row[1:])
+                for row in self.conn.execute(
+                    "SELECT path, mtime_ns, size, hash FROM hashes"
+                    f" WHERE path IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        hashes, updates = {}, []
+        for rel in files:
+            path = self._prefix + rel
+            try:
+                st = os.stat(path)
+                old = known.get(path)
+                if old and old[:2] == (st.st_mtime_ns, st.st_size):
+                    hashes[rel] = old[2]
+                    continue
+                with open(path, "rb") as f:
+                    digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+            except OSError:
+                continue
+            hashes[rel] = digest
+            updates.append((path, st.st_mtime_ns, st.st_size, digest))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?)", updates)
+        return hashes
+
+    async def _tool_key(self, analyzer: Analyzer, command: tuple[str, ...]) -> str:
+        """Digest of what decides an analyzer's output besides the files themselves."""
+        if command not in self._tool_keys:
+            version = ""
+            if analyzer.version_args:
+                try:
+                    _, out, err = await _communicate(
+                        [*command, *analyzer.version_args], self.root, VERSION_TIMEOUT_S
+                    )
+                    version = (out or err).strip()
+                except (OSError, TimeoutError):
+                    version = "unknown"
+            self._tool_keys[command] = f"{' '.join(command)}|{version}"
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self._tool_keys[command].encode())
+        try:  # an upgrade in place changes the executable
+            stat = os.stat(command[0])
+            h.update(f"{stat.st_mtime_ns}|{stat.st_size}".encode())
+        except OSError:
+            pass
+        h.update("\0".join(analyzer.args).encode())
+        for name in analyzer.config_files:
+            try:
+                h.update(name.encode() + (self.root / name).read_bytes())
+            except OSError:
+                continue
+        return h.hexdigest()
+
+    @staticmethod
+    def _keys(
+        analyzer: Analyzer, tool_key: str, files: list[str], hashes: dict[str, str]
+    ) -> dict[str, str]:
+        """Cache key per file: tool key and file hash (plus every file's hash if whole-program)."""
+        scope = tool_key
+        if not analyzer.per_file:
+            h = hashlib.blake2b(tool_key.encode(), digest_size=16)
+            for path in files:
+                h.update(f"{path}\0{hashes[path]}\0".encode())
+            scope = h.hexdigest()
+        return {path: f"{scope}:{hashes[path]}" for path in files}
+
+    # -------------------------------------------------------------------- cache
+
+    def _lookup(
+        self, analyzer: str, keys: dict[str, str]
+    ) -> tuple[dict[str, list[Diagnostic]], list[str]]:
+        paths = [self._prefix + path for path in keys]
+        stored: dict[str, tuple[str, str]] = {}
+        for i in range(0, len(paths), 500):
+            chunk = paths[i : i + 500]
+            for path, key, diagnostics in self.conn.execute(
+                "SELECT path, key, diagnostics FROM results WHERE analyzer = ?"
+                f" AND path IN ({', '.join('?' * len(chunk))})",
+                [analyzer, *chunk],
+            ):
+                stored[path] = (key, diagnostics)
+        cached, pending = {}, []
+        for rel, key in keys.items():
+            hit = stored.get(self._prefix + rel)
+            if hit and hit[0] == key:
+                cached[rel] = [Diagnostic(rel, *row, analyzer) for row in json.loads(hit[1])]
+            else:
+                pending.append(rel)
+        return cached, pending
+
+    def _store(
+        self, analyzer: str, files: list[str], keys: dict[str, str], found: list[Diagnostic]
+    ) -> None:
+        by_file: dict[str, list[tuple[Any, ...]]] = {path: [] for path in files}
+        for diag in found:
+            if diag.path in by_file:
+                by_file[diag.path].append(diag.row())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                [
+                    (analyzer, self._prefix + path, keys[path], json.dumps(diags))
+                    for path, diags in by_file.items()
+                ],
+            )
+
+    def clear(self) -> None:
+        """Forget every cached result and hash."""
+        with self.conn:
+            self.conn.execute("DELETE FROM results")
+            self.conn.execute("DELETE FROM hashes")
+
+
+async def _communicate(argv: list[str], cwd: Path, timeout: float) -> tuple[int, str, str]:
+    """Run ``argv`` to completion: (returncode, stdout, stderr); killed on timeout or cancel."""
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        cwd=str(cwd),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except (TimeoutError, asyncio.CancelledError):
+        proc.kill()
+        await proc.wait()
+        raise
+    return (
+        proc.returncode or 0,
+        stdout.decode("utf-8", "replace"),
+        stderr.decode("utf-8", "replace"),
+    )
+
+
+_ENGINES: dict[Path, AnalysisEngine] = {}
+
+
+def get_analysis_engine(root: str | Path) -> AnalysisEngine:
+    """The engine for ``root``, created on first use and then reused."""
+    root = Path(root).resolve()
+    if root not in _ENGINES:
+        _ENGINES[root] = AnalysisEngine(root)
+    return _ENGINES[root]
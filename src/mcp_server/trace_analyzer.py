@@ -5,13 +5,39 @@ Analyzes MCP tool execution logs to detect logic issues like:
 - Infinite loops (repeated calls with same args)
 - Hallucinated tools (calls to non-existent tools)
 - Access denied or repeated failures
+- Retry storms, latency outliers and the critical path of each task
+
+``analyze_log_file`` ingests brain.log incrementally: the file is memory-mapped
+from the byte offset checkpointed in the trace store, only lines carrying a
+trace marker are parsed, and the span model (session -> task -> step attempt ->
+tool call) plus the streaming analyses are committed per window. Re-running on
+a grown log costs only the new bytes.
 """
 
+import hashlib
+import mmap
+import os
 import re
+import time
 from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
 from typing import Any, TypedDict
 
+from .trace_store import Checkpoint, Span, ToolStats, TraceBatch, TraceStore
+
+# Bytes ingested per transaction
+WINDOW_BYTES = 64 * 1024 * 1024
+
+# Analysis thresholds
+LOOP_THRESHOLD = 3  # identical calls (tool + args) within one task
+STREAK_THRESHOLD = 4  # back-to-back calls of one tool
+RETRY_ATTEMPTS = 3  # step attempts
+STORM_ERRORS = 5  # failed calls of one tool ...
+STORM_WINDOW = 60.0  # ... within this many seconds
+OUTLIER_MIN_SAMPLES = 30
+OUTLIER_SIGMA = 4.0
+
 
 class TraceIssue(TypedDict):
     """Represents a detected issue in the execution trace."""
@@ -124,18 +150,544 @@ def analyze_trace_issues(entries: list[LogEntry]) -> list[TraceIssue]:
     return issues
 
 
-def analyze_log_file(log_path: str) -> dict[str, Any]:
+# Literal markers located with mmap.find; only lines containing one are parsed
+_MARKERS = (
+    b"[DISPATCHER] ",
+    b"[ORCHESTRATOR] Step ",
+    b"[ORCHESTRATOR] Task ",
+    b"[SYSTEM] ",
+    b"Error calling tool ",
+    b"Calling tool:",
+)
+
+# "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_LINE_RE = re.compile(r"(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(\d{3}) - \S+ - ([A-Z]+) - (.*)")
+_SESSION_RE = re.compile(
+    r"\[SYSTEM\] (?:Нова сесія розпочата \((?P<new>[^)]+)\)|Сесія (?P<resumed>\S+) відновлена)"
+)
+_TASK_START_RE = re.compile(r"\[ORCHESTRATOR\] Task started: (?P<steps>\d+) steps: (?P<goal>.*)")
+_TASK_END_RE = re.compile(r"\[ORCHESTRATOR\] Task finished: (?P<status>\w+)")
+_STEP_START_RE = re.compile(
+    r"\[ORCHESTRATOR\] Step (?P<step>\S+), Attempt (?P<attempt>\d+): (?P<action>.*)"
+)
+_STEP_OK_RE = re.compile(r"\[ORCHESTRATOR\] Step (?P<step>\S+) completed successfully")
+_STEP_FAIL_RE = re.compile(
+    r"\[ORCHESTRATOR\] Step (?P<step>\S+) (?P<how>failed|timed out)(?:\. Error: (?P<error>.*))?"
+)
+_CALL_RE = re.compile(r"\[DISPATCHER\] Calling (?P<tool>\S+)$")
+_FINISHED_RE = re.compile(
+    r"\[DISPATCHER\] Finished (?P<tool>\S+) status=(?P<status>\w+) "
+    r"duration_ms=(?P<ms>[\d.]+) args=(?P<args>\w+)"
+)
+_UNKNOWN_RE = re.compile(r"\[DISPATCHER\] Unknown tool: '(?P<tool>[^']*)'")
+_CALL_ERROR_RE = re.compile(r"Error calling tool (?P<tool>\S+): (?P<error>.*)")
+_LEGACY_CALL_RE = re.compile(r"Calling tool:\s*(\w+)\s*args:\s*(\{.*\})", re.IGNORECASE)
+
+
+class TraceAnalyzer:
+    """Builds spans from log lines and runs the streaming analyses.
+
+    All state that must survive between runs (open spans, the current task's
+    step summaries, streaks, error windows) round-trips through ``state()``
+    into the checkpoint; closed spans and analysis results accumulate in a
+    ``TraceBatch`` that the caller commits.
+
+    A task started while a step is open is a subtask (a subtask node runs the
+    orchestrator recursively): the enclosing task's frame is pushed onto
+    ``parents`` and restored when the subtask finishes.
+    """
+
+    def __init__(
+        self,
+        state: dict[str, Any] | None = None,
+        tool_stats: dict[str, ToolStats] | None = None,
+        next_id: int = 1,
+    ):
+        state = state or {}
+        self.next_id = max(next_id, state.get("next_id", 1))
+        self.session = _load_span(state.get("session"))
+        self.parents: list[dict[str, Any]] = state.get("parents", [])
+        self._load_frame(state)
+        self.error_times: dict[str, list[float]] = state.get("error_times", {})
+        self.stats: dict[str, ToolStats] = tool_stats or {}
+        self.batch = TraceBatch()
+        self.lines = 0
+
+    def state(self) -> dict[str, Any]:
+        return {
+            "next_id": self.next_id,
+            "session": self.session.to_dict() if self.session else None,
+            **self._frame(),
+            "parents": self.parents,
+            "error_times": {n: ts for n, ts in self.error_times.items() if ts},
+        }
+
+    def _frame(self) -> dict[str, Any]:
+        """The open task with its step, in-flight calls, step summaries and streak."""
+        return {
+            "task": self.task.to_dict() if self.task else None,
+            "step": self.step.to_dict() if self.step else None,
+            "calls": {n: [s.to_dict() for s in spans] for n, spans in self.calls.items() if spans},
+            "task_steps": self.task_steps,
+            "streak": self.streak,
+        }
+
+    def _load_frame(self, frame: dict[str, Any]) -> None:
+        self.task = _load_span(frame.get("task"))
+        self.step = _load_span(frame.get("step"))
+        self.calls: dict[str, list[Span]] = {
+            name: [Span.from_dict(s) for s in spans]
+            for name, spans in frame.get("calls", {}).items()
+        }
+        self.task_steps: list[dict[str, Any]] = frame.get("task_steps", [])
+        self.streak: list[Any] = frame.get("streak", ["", 0])
+
+    def take_batch(self) -> TraceBatch:
+        batch, self.batch = self.batch, TraceBatch()
+        return batch
+
+    # ---------------------------------------------------------------- parsing
+
+    def feed(self, ts: float, message: str) -> None:
+        """Apply one marker line (message part) logged at ``ts``."""
+        self.lines += 1
+        if message.startswith("[DISPATCHER] "):
+            if m := _FINISHED_RE.match(message):
+                self._finish_call(ts, m["tool"], m["status"], float(m["ms"]), m["args"])
+            elif m := _CALL_RE.match(message):
+                self._open_call(ts, m["tool"])
+            elif m := _UNKNOWN_RE.match(message):
+                self._issue("error", "high", f"Unknown tool '{m['tool']}' (hallucinated?)", ts)
+        elif message.startswith("[ORCHESTRATOR] Step "):
+            if m := _STEP_START_RE.match(message):
+                self._open_step(ts, m["step"], int(m["attempt"]), m["action"])
+            elif m := _STEP_OK_RE.match(message):
+                self._close_step(ts, m["step"], "ok")
+            elif m := _STEP_FAIL_RE.match(message):
+                status = "timeout" if m["how"] == "timed out" else "error"
+                self._close_step(ts, m["step"], status, m["error"])
+        elif message.startswith("[ORCHESTRATOR] Task "):
+            if m := _TASK_START_RE.match(message):
+                self._open_task(ts, m["goal"], int(m["steps"]))
+            elif m := _TASK_END_RE.match(message):
+                self._close_task(ts, "ok" if m["status"] == "ok" else "error")
+        elif message.startswith("[SYSTEM] "):
+            if m := _SESSION_RE.match(message):
+                self._open_session(ts, m["new"] or m["resumed"], resumed=bool(m["resumed"]))
+        elif m := _CALL_ERROR_RE.match(message):
+            calls = self.calls.get(m["tool"])
+            if calls:
+                calls[0].attrs["error"] = m["error"][:500]
+        elif m := _LEGACY_CALL_RE.search(message):
+            span = self._new_span("tool", m.group(1), ts)
+            span.end, span.status = ts, "attempt"
+            self.batch.spans.append(span)
+            digest = hashlib.blake2b(m.group(2).encode(), digest_size=6).hexdigest()
+            self._record_call(span, digest)
+
+    # ------------------------------------------------------------------ spans
+
+    def _new_span(self, kind: str, name: str, ts: float) -> Span:
+        parent = self.step or self.task or self.session
+        span = Span(
+            id=self.next_id,
+            kind=kind,
+            name=name,
+            start=ts,
+            parent_id=parent.id if parent else None,
+            session_id=self.session.id if self.session else None,
+        )
+        self.next_id += 1
+        return span
+
+    def _close(self, span: Span, ts: float, status: str) -> Span:
+        span.end, span.status = ts, status
+        self.batch.spans.append(span)
+        return span
+
+    def _open_session(self, ts: float, session_id: str, resumed: bool) -> None:
+        if self.session:
+            self._close_task(ts, "abandoned")
+            while self.parents:
+                self._close_task(ts, "abandoned")
+            self._close(self.session, ts, "ok")
+        self.session = None
+        self.session = self._new_span("session", session_id, ts)
+        if resumed:
+            self.session.attrs["resumed"] = True
+
+    def _open_task(self, ts: float, goal: str, steps: int) -> None:
+        if self.task is not None and self.step is not None:
+            # Subtask of the open step: its parent is that step (see _new_span)
+            task = self._new_span("task", goal, ts)
+            self.parents.append(self._frame())
+            self._load_frame({})
+        else:
+            self._close_task(ts, "abandoned")
+            task = self._new_span("task", goal, ts)
+        self.task = task
+        self.task.attrs["planned_steps"] = steps
+
+    def _close_task(self, ts: float, status: str) -> None:
+        self._close_step(ts, None, "abandoned")
+        if self.task is None:
+            return
+        task = self._close(self.task, ts, status)
+        self.task = None
+        self._end_streak(ts)
+        self.streak = ["", 0]
+        if self.task_steps:
+            self.batch.critical_paths.append(_critical_path(task, self.task_steps))
+        self.task_steps = []
+        if self.parents:
+            self._load_frame(self.parents.pop())
+
+    def _open_step(self, ts: float, name: str, attempt: int, action: str) -> None:
+        self._close_step(ts, None, "abandoned")
+        self.step = self._new_span("step", name, ts)
+        self.step.attrs.update(attempt=attempt, action=action[:200], tool_ms=0.0)
+
+    def _close_step(
+        self, ts: float, name: str | None, status: str, error: str | None = None
+    ) -> None:
+        step = self.step
+        if step is None or (name is not None and step.name != name):
+            return
+        for spans in self.calls.values():
+            for span in spans:
+                self._close(span, ts, "abandoned")
+        self.calls.clear()
+        if error:
+            step.attrs["error"] = error[:500]
+        self._close(step, ts, status)
+        self.step = None
+        attempt = step.attrs.get("attempt", 1)
+        if attempt >= RETRY_ATTEMPTS:
+            self._issue(
+                "retry_storm",
+                "high" if status != "ok" else "medium",
+                f"Step {step.name} needed {attempt} attempts ({step.attrs.get('action', '')[:60]})",
+                ts,
+                span_id=step.id,
+            )
+        self.task_steps.append(
+            {
+                "id": step.id,
+                "step": step.name,
+                "attempt": attempt,
+                "status": status,
+                "start": step.start,
+                "end": ts,
+                "tool_ms": step.attrs.get("tool_ms", 0.0),
+                "slowest": step.attrs.get("slowest"),
+            }
+        )
+
+    def _open_call(self, ts: float, name: str) -> None:
+        self.calls.setdefault(name, []).append(self._new_span("tool", name, ts))
+
+    def _finish_call(self, ts: float, name: str, status: str, ms: float, args: str) -> None:
+        calls = self.calls.get(name)
+        if calls:
+            span = calls.pop(0)
+        else:
+            # Calling line before the checkpoint window or not logged
+            span = self._new_span("tool", name, ts - ms / 1000)
+        span.attrs["args"] = args
+        span.end = span.start + ms / 1000
+        span.status = "error" if status == "error" else "ok"
+        self.batch.spans.append(span)
+        self._record_call(span, args, ms)
+
+    def _record_call(self, span: Span, args: str, ms: float | None = None) -> None:
+        name = span.name
+        scope = self.task or self.session
+        key = (scope.id if scope else 0, name, args)
+        self.batch.signatures[key] = self.batch.signatures.get(key, 0) + 1
+
+        # Sequential repetition (back-to-back same tool)
+        if self.streak[0] == name:
+            self.streak[1] += 1
+        else:
+            self._end_streak(span.start)
+            self.streak = [name, 1]
+
+        if ms is None:
+            return
+        if self.step is not None:
+            self.step.attrs["tool_ms"] += ms
+            slowest = self.step.attrs.get("slowest")
+            if slowest is None or ms > slowest[1]:
+                self.step.attrs["slowest"] = [name, ms]
+
+        stats = self.stats.setdefault(name, ToolStats())
+        if (
+            stats.count >= OUTLIER_MIN_SAMPLES
+            and ms > 2 * stats.mean
+            and ms > stats.mean + OUTLIER_SIGMA * stats.std
+        ):
+            self._issue(
+                "latency",
+                "medium",
+                f"Tool '{name}' took over {OUTLIER_SIGMA:g} standard deviations "
+                "above its mean latency",
+                span.start,
+                span_id=span.id,
+            )
+        stats.add(ms)
+        delta = self.batch.tool_stats.setdefault(name, ToolStats())
+        delta.add(ms)
+
+        if span.status == "error":
+            stats.errors += 1
+            delta.errors += 1
+            window = [t for t in self.error_times.get(name, []) if t > span.start - STORM_WINDOW]
+            window.append(span.start)
+            if len(window) >= STORM_ERRORS:
+                self._issue(
+                    "retry_storm",
+                    "high",
+                    f"Tool '{name}' failed {STORM_ERRORS}+ times within {STORM_WINDOW:g}s",
+                    span.start,
+                    span_id=span.id,
+                )
+                window = []
+            self.error_times[name] = window
+
+    def _end_streak(self, ts: float) -> None:
+        tool, count = self.streak
+        if count >= STREAK_THRESHOLD:
+            self._issue(
+                "inefficiency",
+                "low",
+                f"Tool '{tool}' called {count} times sequentially (scan pattern?).",
+                ts,
+                count=count,
+            )
+
+    def _issue(
+        self,
+        kind: str,
+        severity: str,
+        description: str,
+        ts: float,
+        *,
+        span_id: int | None = None,
+        count: int = 1,
+    ) -> None:
+        self.batch.issues.append(
+            {
+                "type": kind,
+                "severity": severity,
+                "description": description,
+                "count": count,
+                "span_id": span_id,
+                "ts": ts,
+            }
+        )
+
+
+def _load_span(data: dict[str, Any] | None) -> Span | None:
+    return Span.from_dict(data) if data else None
+
+
+def _critical_path(task: Span, steps: list[dict[str, Any]]) -> dict[str, Any]:
+    """Longest chain of non-overlapping steps (sequential steps form one chain)."""
+    steps = sorted(steps, key=lambda s: (s["start"], s["end"]))
+    best: list[float] = []
+    prev: list[int] = []
+    for i, step in enumerate(steps):
+        length = step["end"] - step["start"]
+        best.append(length)
+        prev.append(-1)
+        for j in range(i):
+            if steps[j]["end"] <= step["start"] and best[j] + length > best[i]:
+                best[i], prev[i] = best[j] + length, j
+    i = max(range(len(steps)), key=best.__getitem__)
+    chain = []
+    while i != -1:
+        chain.append(steps[i])
+        i = prev[i]
+    chain.reverse()
+    duration = task.duration or 0.0
+    return {
+        "task_id": task.id,
+        "name": task.name[:200],
+        "duration": duration,
+        "tool_time": sum(s["tool_ms"] for s in steps) / 1000,
+        "path": [
+            {
+                "step": s["step"],
+                "attempt": s["attempt"],
+                "status": s["status"],
+                "duration_s": round(s["end"] - s["start"], 3),
+                "share": round((s["end"] - s["start"]) / duration, 3) if duration else None,
+                "tool_time_s": round(s["tool_ms"] / 1000, 3),
+                "slowest_tool": s["slowest"][0] if s["slowest"] else None,
+                "slowest_tool_ms": round(s["slowest"][1], 1) if s["slowest"] else None,
+            }
+            for s in chain
+        ],
+    }
+
+
+class _Clock:
+    """Log timestamp -> epoch seconds, converting each distinct second once."""
+
+    def __init__(self):
+        self._seconds: dict[str, float] = {}
+
+    def __call__(self, second: str, millis: str) -> float:
+        base = self._seconds.get(second)
+        if base is None:
+            if len(self._seconds) > 4096:
+                self._seconds.clear()
+            base = self._seconds[second] = datetime.fromisoformat(second).timestamp()
+        return base + int(millis) / 1000
+
+
+def _marker_lines(mm: mmap.mmap, start: int, end: int) -> list[tuple[int, int]]:
+    """(start, end) offsets of the lines in [start, end) that contain a trace marker."""
+    found: dict[int, int] = {}
+    for marker in _MARKERS:
+        i = mm.find(marker, start, end)
+        while i != -1:
+            line_end = mm.find(b"\n", i, end)
+            found[mm.rfind(b"\n", start, i) + 1 or start] = line_end
+            i = mm.find(marker, line_end, end)
+    return sorted(found.items())
+
+
+def _ingest_file(
+    path: Path,
+    analyzer: TraceAnalyzer,
+    store: TraceStore,
+    source: str,
+    checkpoint: Checkpoint,
+    *,
+    window: int,
+) -> int:
+    """Parse ``path`` from the checkpoint offset up to its last complete line."""
+    size = path.stat().st_size
+    if size <= checkpoint.offset:
+        return 0
+    clock = _Clock()
+    read = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = min(size, len(mm))
+        pos = checkpoint.offset
+        while pos < size:
+            # windows end on a line boundary; a partial last line waits for the next run
+            end = mm.rfind(b"\n", pos, min(pos + window, size)) + 1
+            if end <= pos:
+                end = mm.find(b"\n", pos + window, size) + 1
+                if end <= 0:
+                    break
+            for line_start, line_end in _marker_lines(mm, pos, end):
+                line = mm[line_start:line_end].decode("utf-8", errors="replace")
+                m = _LINE_RE.match(line)
+                if m:
+                    analyzer.feed(clock(m.group(1), m.group(2)), m.group(4))
+            read += end - pos
+            pos = checkpoint.offset = end
+            checkpoint.state = analyzer.state()
+            store.commit(source, checkpoint, analyzer.take_batch())
+    return read
+
+
+def ingest_log(
+    log_path: str | Path, store: TraceStore, *, window: int = WINDOW_BYTES
+) -> dict[str, Any]:
+    """Bring the store up to date with ``log_path`` (incremental, resumable).
+
+    A rotated log (new inode) is first finished from its ``.1`` backup, then
+    the new file is read from the start.
+    """
+    path = Path(log_path)
+    source = str(path.resolve())
+    started = time.perf_counter()
+    checkpoint = store.load_checkpoint(source)
+    analyzer = TraceAnalyzer(checkpoint.state, store.tool_stats(), store.next_span_id())
+    inode = path.stat().st_ino
+    read = 0
+    if checkpoint.inode and checkpoint.inode != inode:
+        rotated = path.with_name(path.name + ".1")
+        if rotated.exists() and rotated.stat().st_ino == checkpoint.inode:
+            read += _ingest_file(rotated, analyzer, store, source, checkpoint, window=window)
+        checkpoint = Checkpoint(inode=inode, state=analyzer.state())
+    elif checkpoint.offset > path.stat().st_size:
+        # truncated in place
+        checkpoint = Checkpoint(inode=inode, state=analyzer.state())
+    checkpoint.inode = inode
+    read += _ingest_file(path, analyzer, store, source, checkpoint, window=window)
+    return {
+        "bytes_read": read,
+        "marker_lines": analyzer.lines,
+        "offset": checkpoint.offset,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def trace_report(store: TraceStore, limit: int = 50) -> dict[str, Any]:
+    """Issues, per-tool latency and the slowest tasks' critical paths."""
+    issues: list[TraceIssue] = [
+        {
+            "type": "loop",
+            "severity": "high" if loop["count"] > 5 else "medium",
+            "description": (
+                f"Tool '{loop['tool']}' called {loop['count']} times with identical arguments."
+            ),
+            "count": loop["count"],
+        }
+        for loop in store.loops(LOOP_THRESHOLD, limit)
+    ]
+    issues += [
+        {k: issue[k] for k in ("type", "severity", "description", "count")}  # type: ignore[misc]
+        for issue in store.issues(limit)
+    ]
+    stats = store.tool_stats()
+    tools = {
+        name: {
+            "calls": s.count,
+            "error_rate": round(s.errors / s.count, 3) if s.count else 0.0,
+            "mean_ms": round(s.mean, 1),
+            "std_ms": round(s.std, 1),
+            "max_ms": round(s.max, 1),
+            "total_s": round(s.mean * s.count / 1000, 2),
+        }
+        for name, s in sorted(stats.items(), key=lambda kv: -kv[1].mean * kv[1].count)[:limit]
+    }
+    return {
+        "spans": store.span_counts(),
+        "issues": issues,
+        "tools": tools,
+        "critical_paths": store.critical_paths(),
+    }
+
+
+def default_store_path(log_path: str | Path) -> Path:
+    """The trace store kept next to a log: brain.log -> brain.trace.db"""
+    path = Path(log_path)
+    return path.with_name(f"{path.stem}.trace.db")
+
+
+def analyze_log_file(log_path: str, store_path: str | None = None) -> dict[str, Any]:
     """Main entry point to analyze a log file."""
     try:
-        entries = parse_brain_log(log_path)
-        issues = analyze_trace_issues(entries)
+        if not os.path.exists(log_path):
+            return {"success": False, "error": f"Log file not found: {log_path}"}
+        with TraceStore(store_path or default_store_path(log_path)) as store:
+            ingest = ingest_log(log_path, store)
+            report = trace_report(store)
+        tool_spans = report["spans"].get("tool", {})
 
         return {
             "success": True,
             "log_path": log_path,
-            "parsed_entries": len(entries),
-            "issue_count": len(issues),
-            "issues": issues,
+            "parsed_entries": sum(tool_spans.values()),
+            "issue_count": len(report["issues"]),
+            **report,
+            "ingest": ingest,
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
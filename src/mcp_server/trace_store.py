@@ -0,0 +1,342 @@
+"""Trace Store - indexed SQLite storage for execution spans
+
+Spans reconstructed from brain.log (session -> task -> step attempt -> tool
+call) are written here by the trace analyzer together with the streaming
+analysis state, in one transaction per ingested window:
+- ``spans``: closed spans with timings, status and attributes (``span_totals``
+  keeps their counts by kind and status)
+- ``tool_stats``: running latency moments per tool (Welford, mergeable)
+- ``call_signatures``: identical-call counts per task (loop detection)
+- ``issues``: loops, retry storms, latency outliers, failures
+- ``critical_paths``: per finished task, the steps that made up its duration
+- ``checkpoints``: byte offset reached per log file plus the open-span state
+
+Author: AtlasTrinity Team
+"""
+
+import json
+import math
+import sqlite3
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spans (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER,
+    session_id INTEGER,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL,
+    duration REAL,
+    status TEXT NOT NULL,
+    attrs TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_spans_kind_name ON spans (kind, name);
+CREATE INDEX IF NOT EXISTS idx_spans_parent ON spans (parent_id);
+CREATE INDEX IF NOT EXISTS idx_spans_session ON spans (session_id, start);
+CREATE TABLE IF NOT EXISTS span_totals (
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, status)
+);
+CREATE TABLE IF NOT EXISTS tool_stats (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    max REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS call_signatures (
+    task_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (task_id, name, args)
+);
+CREATE INDEX IF NOT EXISTS idx_call_signatures_count ON call_signatures (count);
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    description TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    span_id INTEGER,
+    ts REAL
+);
+CREATE INDEX IF NOT EXISTS idx_issues_type ON issues (type, ts);
+CREATE TABLE IF NOT EXISTS critical_paths (
+    task_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    duration REAL NOT NULL,
+    tool_time REAL NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_critical_paths_duration ON critical_paths (duration);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    source TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+_ADD_SPAN_TOTAL = """
+    INSERT INTO span_totals (kind, status, count) VALUES (?, ?, ?)
+    ON CONFLICT (kind, status) DO UPDATE SET count = count + excluded.count
+"""
+
+_MERGE_SIGNATURE = """
+    INSERT INTO call_signatures (task_id, name, args, count) VALUES (?, ?, ?, ?)
+    ON CONFLICT (task_id, name, args) DO UPDATE SET count = count + excluded.count
+"""
+
+
+@dataclass(slots=True)
+class Span:
+    """One node of the trace: a session, task, step attempt or tool call."""
+
+    id: int
+    kind: str  # 'session', 'task', 'step', 'tool'
+    name: str
+    start: float
+    parent_id: int | None = None
+    session_id: int | None = None
+    end: float | None = None
+    status: str = "open"  # 'open', 'ok', 'error', 'timeout', 'abandoned'
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else max(0.0, self.end - self.start)
+
+    def row(self) -> tuple[Any, ...]:
+        return (
+            self.id,
+            self.parent_id,
+            self.session_id,
+            self.kind,
+            self.name,
+            self.start,
+            self.end,
+            self.duration,
+            self.status,
+            json.dumps(self.attrs, ensure_ascii=False) if self.attrs else None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Span":
+        return cls(**data)
+
+
+@dataclass(slots=True)
+class ToolStats:
+    """Running count/mean/variance/max of one tool's call durations (ms)."""
+
+    count: int = 0
+    errors: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "ToolStats") -> None:
+        """Chan et al. parallel combination of two sets of moments."""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.errors += other.errors
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+@dataclass
+class Checkpoint:
+    """How far a log file has been ingested, and the spans still open there."""
+
+    inode: int = 0
+    offset: int = 0
+    state: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class TraceBatch:
+    """Everything one ingested window adds to the store."""
+
+    spans: list[Span] = field(default_factory=list)
+    tool_stats: dict[str, ToolStats] = field(default_factory=dict)
+    signatures: dict[tuple[int, str, str], int] = field(default_factory=dict)
+    issues: list[dict[str, Any]] = field(default_factory=list)
+    critical_paths: list[dict[str, Any]] = field(default_factory=list)
+
+
+class TraceStore:
+    """SQLite store for spans and analysis results (one file, WAL mode)."""
+
+    def __init__(self, db_path: Path | str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "TraceStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ ingest
+
+    def load_checkpoint(self, source: str) -> Checkpoint:
+        row = self.conn.execute(
+            "SELECT inode, offset, state FROM checkpoints WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return Checkpoint()
+        return Checkpoint(inode=row[0], offset=row[1], state=json.loads(row[2]))
+
+    def next_span_id(self) -> int:
+        """First unused span id, counting spans still open in any checkpoint."""
+        stored = self.conn.execute("SELECT MAX(id) FROM spans").fetchone()[0] or 0
+        pending = self.conn.execute(
+            "SELECT MAX(json_extract(state, '$.next_id')) FROM checkpoints"
+        ).fetchone()[0]
+        return max(stored + 1, pending or 0)
+
+    def commit(self, source: str, checkpoint: Checkpoint, batch: TraceBatch) -> None:
+        """Write a window's results and advance the checkpoint atomically."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [span.row() for span in batch.spans],
+            )
+            totals = Counter((span.kind, span.status) for span in batch.spans)
+            self.conn.executemany(_ADD_SPAN_TOTAL, [(*key, n) for key, n in totals.items()])
+            for name, stats in batch.tool_stats.items():
+                stored = self._tool_stats(name)
+                stored.merge(stats)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO tool_stats VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, stored.count, stored.errors, stored.mean, stored.m2, stored.max),
+                )
+            self.conn.executemany(
+                _MERGE_SIGNATURE, [(*key, count) for key, count in batch.signatures.items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO issues (type, severity, description, count, span_id, ts) "
+                "VALUES (:type, :severity, :description, :count, :span_id, :ts)",
+                batch.issues,
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO critical_paths VALUES "
+                "(:task_id, :name, :duration, :tool_time, :path)",
+                [
+                    {**p, "path": json.dumps(p["path"], ensure_ascii=False)}
+                    for p in batch.critical_paths
+                ],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                (source, checkpoint.inode, checkpoint.offset, json.dumps(checkpoint.state)),
+            )
+
+    def _tool_stats(self, name: str) -> ToolStats:
+        row = self.conn.execute(
+            "SELECT count, errors, mean, m2, max FROM tool_stats WHERE name = ?", (name,)
+        ).fetchone()
+        return ToolStats(*row) if row else ToolStats()
+
+    def tool_stats(self) -> dict[str, ToolStats]:
+        rows = self.conn.execute("SELECT name, count, errors, mean, m2, max FROM tool_stats")
+        return {row[0]: ToolStats(*row[1:]) for row in rows}
+
+    # ----------------------------------------------------------------- queries
+
+    def span_counts(self) -> dict[str, dict[str, int]]:
+        counts: dict[str, dict[str, int]] = {}
+        for kind, status, n in self.conn.execute("SELECT kind, status, count FROM span_totals"):
+            counts.setdefault(kind, {})[status] = n
+        return counts
+
+    def children(self, parent_id: int) -> list[Span]:
+        rows = self.conn.execute(
+            "SELECT id, kind, name, start, parent_id, session_id, end, status, attrs "
+            "FROM spans WHERE parent_id = ? ORDER BY start, id",
+            (parent_id,),
+        ).fetchall()
+        return [
+            Span(*row[:8], attrs=json.loads(row[8]) if row[8] else {})  # type: ignore[misc]
+            for row in rows
+        ]
+
+    def issues(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Issues grouped by description, most frequent and most severe first."""
+        rows = self.conn.execute(
+            """
+            SELECT type, severity, description, SUM(count) AS total, MAX(ts) AS last_seen
+            FROM issues
+            GROUP BY type, severity, description
+            ORDER BY CASE severity WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END,
+                     total DESC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        return [
+            {"type": t, "severity": s, "description": d, "count": c, "last_seen": ts}
+            for t, s, d, c, ts in rows
+        ]
+
+    def loops(self, threshold: int = 3, limit: int = 20) -> list[dict[str, Any]]:
+        rows = self.conn.execute(
+            """
+            SELECT task_id, name, args, count FROM call_signatures
+            WHERE count >= ? ORDER BY count DESC LIMIT ?
+            """,
+            (threshold, limit),
+        )
+        return [{"task_id": t, "tool": n, "args": a, "count": c} for t, n, a, c in rows]
+
+    def critical_paths(self, limit: int = 5) -> list[dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT task_id, name, duration, tool_time, path FROM critical_paths "
+            "ORDER BY duration DESC LIMIT ?",
+            (limit,),
+        )
+        return [
+            {
+                "task_id": task_id,
+                "task": name,
+                "duration_s": round(duration, 3),
+                "tool_time_s": round(tool_time, 3),
+                "path": json.loads(path),
+            }
+            for task_id, name, duration, tool_time, path in rows
+        ]
@@ -0,0 +1,257 @@
+"""Vibe worker pool: bounded concurrency, workspace locks and reusable temp homes.
+
+Vibe CLI runs used to be serialized behind one module-wide lock. The pool lets up
+to ``max_workers`` runs proceed at once and keeps edits to a workspace exclusive:
+
+- every run holds one worker slot;
+- a run that may write files needs its workspace to itself: no other run in the
+  same tree, nested trees included;
+- read-only runs (the ``plan`` agent, status subcommands) share a workspace.
+
+Waiting runs form one FIFO queue. A run starts once a slot is free and it
+conflicts neither with a running job nor with an earlier waiting one, so it only
+overtakes runs it does not conflict with and writers are not starved by readers.
+
+TempHomePool keeps finished temp VIBE_HOME directories keyed by their generated
+config, so the next run with the same model and config skips rebuilding one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import shutil
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# Agent profiles and subcommands that never modify the workspace
+READ_ONLY_AGENTS = {"plan"}
+READ_ONLY_SUBCOMMANDS = {"list-editors", "list-modules", "vibe-status", "vibe-help"}
+
+
+class VibeQueueTimeoutError(TimeoutError):
+    """Raised when a run waited longer than its queue timeout for a worker."""
+
+
+def is_read_only_invocation(argv: list[str]) -> bool:
+    """Whether a Vibe CLI invocation cannot modify its working directory."""
+    if len(argv) > 1 and argv[1] in READ_ONLY_SUBCOMMANDS:
+        return True
+    try:
+        return argv[argv.index("--agent") + 1] in READ_ONLY_AGENTS
+    except (ValueError, IndexError):
+        return False
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """Whether two resolved paths are the same tree or one contains the other."""
+    try:
+        return os.path.commonpath([a, b]) in (a, b)
+    except ValueError:  # different drives
+        return False
+
+
+@dataclass(eq=False)
+class VibeJob:
+    """A run waiting for, or holding, a worker slot."""
+
+    id: int
+    workspace: str
+    write: bool
+    label: str = ""
+    enqueued: float = field(default_factory=time.monotonic)
+    started: float | None = None
+    granted: bool = False
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def conflicts(self, other: VibeJob) -> bool:
+        return (self.write or other.write) and _overlaps(self.workspace, other.workspace)
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "workspace": self.workspace,
+            "mode": "write" if self.write else "read",
+            "label": self.label,
+            "waited_s": round((self.started or now) - self.enqueued, 3),
+        }
+
+
+class VibePool:
+    """Fair FIFO scheduler for concurrent Vibe runs (single event loop)."""
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max(1, int(max_workers))
+        self._queue: list[VibeJob] = []
+        self._running: list[VibeJob] = []
+        self._ids = itertools.count(1)
+        self.completed = 0
+        self.timed_out = 0
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._queue)
+
+    def resize(self, max_workers: int) -> None:
+        """Change the number of worker slots; running jobs are not interrupted."""
+        self.max_workers = max(1, int(max_workers))
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        workspace: str,
+        *,
+        write: bool = True,
+        timeout: float | None = None,
+        on_wait: Callable[[int, VibeJob], Awaitable[None]] | None = None,
+        label: str = "",
+    ) -> AsyncIterator[VibeJob]:
+        """Hold a worker slot (and the workspace, for writes) for the block.
+
+        ``on_wait(position, job)`` is awaited when the run has to queue and each
+        time its 1-based queue position changes. Raises VibeQueueTimeoutError if no
+        slot was granted within ``timeout`` seconds.
+        """
+        job = VibeJob(next(self._ids), os.path.realpath(workspace), write, label)
+        self._queue.append(job)
+        self._dispatch()
+        try:
+            await self._wait(job, timeout, on_wait)
+        except BaseException:
+            self._leave(job)
+            raise
+        try:
+            yield job
+        finally:
+            self.completed += 1
+            self._leave(job)
+
+    def status(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "max_workers": self.max_workers,
+            "running": [
+                {**job.to_dict(now), "elapsed_s": round(now - (job.started or now), 3)}
+                for job in self._running
+            ],
+            "queued": [
+                {**job.to_dict(now), "position": position}
+                for position, job in enumerate(self._queue, 1)
+            ],
+            "completed": self.completed,
+            "timed_out": self.timed_out,
+        }
+
+    async def _wait(
+        self,
+        job: VibeJob,
+        timeout: float | None,
+        on_wait: Callable[[int, VibeJob], Awaitable[None]] | None,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        reported = 0
+        while not job.granted:
+            position = self._queue.index(job) + 1
+            if on_wait and position != reported:
+                reported = position
+                await on_wait(position, job)
+                continue  # the queue may have moved during the callback
+            job.changed.clear()
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError
+                await asyncio.wait_for(job.changed.wait(), remaining)
+            except TimeoutError:
+                if job.granted:
+                    return
+                self.timed_out += 1
+                raise VibeQueueTimeoutError(
+                    f"no worker free for {job.workspace} within {timeout}s "
+                    f"(position {position}, {self.running} running)"
+                ) from None
+
+    def _leave(self, job: VibeJob) -> None:
+        if job in self._queue:
+            self._queue.remove(job)
+        elif job in self._running:
+            self._running.remove(job)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        ahead: list[VibeJob] = []
+        for job in list(self._queue):
+            if len(self._running) >= self.max_workers:
+                break
+            if any(job.conflicts(other) for other in (*self._running, *ahead)):
+                ahead.append(job)
+                continue
+            self._queue.remove(job)
+            self._running.append(job)
+            job.granted = True
+            job.started = time.monotonic()
+            job.changed.set()
+        for job in self._queue:
+            job.changed.set()  # positions may have shifted
+
+
+class TempHomePool:
+    """Idle temp VIBE_HOME directories, reused by runs with the same config key.
+
+    Homes older than ``max_age_s`` are rebuilt so their links to the real
+    VIBE_HOME (sessions, prompts, agents) stay reasonably fresh; at most
+    ``max_idle`` homes are kept, oldest dropped first.
+    """
+
+    def __init__(self, max_idle: int = 4, max_age_s: float = 300.0):
+        self.max_idle = max(0, int(max_idle))
+        self.max_age_s = max_age_s
+        self._idle: list[tuple[str, str, float]] = []  # (key, path, built_at)
+        self._out: dict[str, tuple[str, float]] = {}  # checked-out path -> (key, built_at)
+        self.built = 0
+        self.reused = 0
+
+    def checkout(self, key: str, build: Callable[[], str]) -> str:
+        """Return an idle home for ``key`` or build one; "" if the build failed."""
+        now = time.monotonic()
+        for i in range(len(self._idle) - 1, -1, -1):
+            idle_key, path, built_at = self._idle[i]
+            if idle_key != key:
+                continue
+            del self._idle[i]
+            if now - built_at <= self.max_age_s and os.path.isdir(path):
+                self._out[path] = (key, built_at)
+                self.reused += 1
+                return path
+            shutil.rmtree(path, ignore_errors=True)
+        path = build()
+        if path:
+            self._out[path] = (key, now)
+            self.built += 1
+        return path
+
+    def checkin(self, path: str) -> bool:
+        """Return a home after its run; False if the pool does not know the path."""
+        entry = self._out.pop(path, None)
+        if entry is None:
+            return any(idle_path == path for _, idle_path, _ in self._idle)
+        self._idle.append((entry[0], path, entry[1]))
+        while len(self._idle) > self.max_idle:
+            shutil.rmtree(self._idle.pop(0)[1], ignore_errors=True)
+        return True
+
+    def clear(self) -> None:
+        """Remove all idle homes; checked-out ones are kept until their checkin."""
+        for _, path, _ in self._idle:
+            shutil.rmtree(path, ignore_errors=True)
+        self._idle.clear()
@@ -23,6 +23,7 @@ from __future__ import annotations
 
 import asyncio
 import atexit
+import hashlib
 import json
 import logging
 import os
@@ -34,7 +35,6 @@ import tempfile
 import uuid
 from datetime import datetime
 from pathlib import Path
-from re import Pattern
 from typing import Any, Literal, cast
 from unittest.mock import MagicMock
 
@@ -51,6 +51,15 @@ from .vibe_config import (
     ProviderConfig,
     VibeConfig,
 )
+from .vibe_pool import (
+    TempHomePool,
+    VibeJob,
+    VibePool,
+    VibeQueueTimeoutError,
+    is_read_only_invocation,
+)
+from .vibe_sessions import SessionCatalog
+from .vibe_stream import OutputBuffer, ProgressEmitter, VibeStreamReader, read_vibe_stream
 
 # Import CopilotLLM for token exchange (from project root)
 sys.path.append(str(Path(__file__).parent.parent.parent))  # Add project root to path
@@ -63,43 +72,9 @@ except ImportError:
 # SETUP: Logging, Configuration, Constants
 # =============================================================================
 
-# ANSI escape code pattern for stripping colors
-ANSI_ESCAPE: Pattern = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-
 # Default config root (fallback if config_loader fails)
 DEFAULT_CONFIG_ROOT = Path.home() / ".config" / "atlastrinity"
 
-# TUI artifacts to filter out from logs
-SPAM_TRIGGERS = [
-    "Welcome to",
-    "│",
-    "╭",
-    "╮",
-    "╰",
-    "─",
-    "──",
-    "[2K",
-    "[1A",
-    "Press Enter",
-    "↵",
-    "ListToolsRequest",
-    "Processing request of type",
-    "Secure MCP Filesystem Server",
-    "Client does not support MCP Roots",
-    "Resolving dependencies",
-    "Resolved, downloaded and extracted",
-    "Saved lockfile",
-    "Sequential Thinking MCP Server",
-    "Starting Context7 MCP Server",
-    "Context7 MCP Server connected via stdio",
-    "Redis connected via URL",
-    "Lessons:",
-    "Strategies:",
-    "Discoveries:",
-    "brain - INFO - [MEMORY]",
-    "brain - INFO - [STATE]",
-]
-
 logger = logging.getLogger("vibe_mcp")
 logger.setLevel(logging.DEBUG)
 
@@ -137,6 +112,10 @@ try:
     VIBE_WORKSPACE = get_config_value("mcp.vibe", "workspace", str(CONFIG_ROOT / "vibe_workspace"))
     VIBE_CONFIG_FILE = get_config_value("mcp.vibe", "config_file", None)
     AGENT_MODEL_OVERRIDE = get_config_value("agents.tetyana", "model", None)
+    # Worker pool: parallel runs, queue wait limit (None = 2x the run timeout), idle temp homes
+    VIBE_MAX_CONCURRENCY: int = int(get_config_value("mcp.vibe", "max_concurrency", 2))
+    VIBE_QUEUE_TIMEOUT_S: float | None = get_config_value("mcp.vibe", "queue_timeout_s", None)
+    VIBE_IDLE_HOMES: int = int(get_config_value("mcp.vibe", "idle_homes", 4))
 
     if not AGENT_MODEL_OVERRIDE:
         logger.warning(
@@ -155,6 +134,9 @@ except Exception:
     PROJECT_ROOT = Path(__file__).parent.parent.parent
     VIBE_WORKSPACE = str(CONFIG_ROOT / "vibe_workspace")
     VIBE_CONFIG_FILE = None
+    VIBE_MAX_CONCURRENCY = 2
+    VIBE_QUEUE_TIMEOUT_S = None
+    VIBE_IDLE_HOMES = 4
 
 # Derived paths
 SYSTEM_ROOT = str(PROJECT_ROOT)
@@ -236,26 +218,42 @@ _current_model: str | None = None
 _proxy_process: subprocess.Popen | None = None
 
 # Concurrency Control (Queueing)
-# Vibe is heavy on tokens and resources. We serialize calls to avoid Rate Limit collisions.
-VIBE_LOCK = asyncio.Lock()
-VIBE_QUEUE_SIZE = 0
-
+# Vibe is heavy on tokens and resources. Runs share a bounded worker pool: edits to one
+# workspace stay serialized, read-only runs proceed in parallel (see vibe_pool).
+VIBE_POOL = VibePool(VIBE_MAX_CONCURRENCY)
+# Finished temp VIBE_HOMEs, reused by the next run with the same generated config
+VIBE_HOMES = TempHomePool(VIBE_IDLE_HOMES)
+# SQLite index of VIBE_SESSION_DIR, opened on first use (see vibe_sessions)
+_session_catalog: SessionCatalog | None = None
+
+
+def get_session_catalog() -> SessionCatalog:
+    """Get or open the Vibe session catalog."""
+    global _session_catalog
+    if _session_catalog is None:
+        _session_catalog = SessionCatalog(
+            VIBE_SESSION_DIR, CONFIG_ROOT / "data" / "vibe_sessions.db"
+        )
+    return _session_catalog
 
-async def _emergency_cleanup() -> None:
-    """Forcefully terminate lingering vibe and proxy processes to unblock the queue."""
-    logger.warning("[VIBE] Emergency cleanup triggered. Terminating lingering processes...")
-    try:
-        # 1. Kill any active proxy
-        _cleanup_provider_proxy()
 
-        # 2. Kill any actual 'vibe' CLI processes that might be hanging
-        # We use pgrep/pkill for platform-agnostic (ish) cleanup on Unix
+async def _refreshed_session_catalog() -> SessionCatalog:
+    """The session catalog, brought up to date off the event loop."""
+    catalog = get_session_catalog()
+    counts = await asyncio.to_thread(catalog.refresh)
+    if any(counts.values()):
+        logger.debug(f"[VIBE] Session catalog refreshed: {counts}")
+    return catalog
 
-        # Use -f to match the command line (more robust than exact name)
-        subprocess.run(["pkill", "-9", "-f", "vibe"], capture_output=True, check=False)
 
-    except Exception as e:
-        logger.error(f"[VIBE] Emergency cleanup failed: {e}")
+async def _resolve_vibe_session(id_or_file: str) -> Path | None:
+    """Session file for an ID or file name; rescans once if a new session is not indexed yet."""
+    catalog = await _refreshed_session_catalog()
+    path = catalog.resolve(id_or_file)
+    if path is None:
+        await asyncio.to_thread(catalog.refresh, force=True)
+        path = catalog.resolve(id_or_file)
+    return path
 
 
 def get_vibe_config() -> VibeConfig:
@@ -439,13 +437,6 @@ atexit.register(_cleanup_provider_proxy)
 # =============================================================================
 
 
-def strip_ansi(text: str) -> str:
-    """Remove ANSI escape codes from text."""
-    if not isinstance(text, str):
-        return str(text)
-    return ANSI_ESCAPE.sub("", text)
-
-
 async def is_network_available(
     host: str = "api.mistral.ai",
     port: int = 443,
@@ -460,15 +451,6 @@ async def is_network_available(
         return False
 
 
-def truncate_output(text: str, max_chars: int = MAX_OUTPUT_CHARS) -> str:
-    """Truncate text with indicator if exceeded."""
-    if not isinstance(text, str):
-        text = str(text)
-    if len(text) <= max_chars:
-        return text
-    return text[:max_chars] + f"\n...[TRUNCATED: Output exceeded {max_chars} chars]..."
-
-
 def resolve_vibe_binary() -> str | None:
     """Resolve the path to the Vibe CLI binary."""
     # Try ~/.local/bin first (common location)
@@ -489,7 +471,120 @@ def resolve_vibe_binary() -> str | None:
     return None
 
 
-def _prepare_temp_vibe_home(model_alias: str) -> str:
+def _render_temp_vibe_config(model_alias: str) -> str:
+    """Render the config.toml of a temp VIBE_HOME for model switching."""
+    config = get_vibe_config()
+
+    # We generate a fresh TOML matching the VibeConfig object
+    # This ensures all provider overrides and MCP servers are propagated
+    def get_val(obj, key, default):
+        """Safely get value from object, handling MagicMocks."""
+        val = getattr(obj, key, default)
+        # If it's a MagicMock, it won't be in the expected type
+        from unittest.mock import MagicMock
+
+        if isinstance(val, MagicMock):
+            return default
+        return val
+
+    toml_lines = [
+        "# Generated Vibe Configuration for Temp Session",
+        f'active_model = "{model_alias}"',
+        f"fallback_chain = {json.dumps(get_val(config, 'fallback_chain', []))}",
+        f'system_prompt_id = "{get_val(config, "system_prompt_id", "cli")!s}"',
+        f'default_mode = "{get_val(config, "default_mode", "auto-approve")!s}"',
+        "enable_auto_update = false",
+        f"max_turns = {int(get_val(config, 'max_turns', 100))}",
+        f"disable_welcome_banner_animation = {str(get_val(config, 'disable_welcome_banner_animation', True)).lower()}",
+        f"vim_keybindings = {str(get_val(config, 'vim_keybindings', False)).lower()}",
+        f"timeout_s = {float(get_val(config, 'timeout_s', 600.0))}",
+        "",
+    ]
+
+    # Add providers
+    for provider in config.providers:
+        # Skip if it's the default placeholder or redundant
+        if not provider.name or not provider.api_base:
+            continue
+
+        # Standardize localhost to 127.0.0.1 to avoid DNS/Hang issues
+        api_base = str(provider.api_base)
+        if "localhost" in api_base:
+            api_base = api_base.replace("localhost", "127.0.0.1")
+
+        toml_lines.extend(
+            [
+                "[[providers]]",
+                f'name = "{provider.name}"',
+                f'api_base = "{api_base}"',
+                f'api_key_env_var = "{provider.api_key_env_var}"',
+                f'api_style = "{provider.api_style}"',
+                f'backend = "{provider.backend}"',
+                "",
+            ]
+        )
+
+    # Add models
+    for model in config.models:
+        # Handle potential mocks or non-string types safely
+        m_name = str(model.name)
+        m_provider = str(model.provider)
+        m_alias = str(model.alias)
+        m_temp = float(model.temperature)
+        m_in_p = float(model.input_price)
+        m_out_p = float(model.output_price)
+
+        toml_lines.extend(
+            [
+                "[[models]]",
+                f'name = "{m_name}"',
+                f'provider = "{m_provider}"',
+                f'alias = "{m_alias}"',
+                f"temperature = {m_temp}",
+                f"input_price = {m_in_p}",
+                f"output_price = {m_out_p}",
+                "",
+            ]
+        )
+
+    # Add MCP servers (Documentation: supported transports and fields)
+    for mcp in config.mcp_servers:
+        toml_lines.extend(
+            [
+                "[[mcp_servers]]",
+                f'name = "{mcp.name}"',
+                f'transport = "{mcp.transport}"',
+            ]
+        )
+        if mcp.url:
+            toml_lines.append(f'url = "{mcp.url}"')
+        if mcp.command:
+            toml_lines.append(f'command = "{mcp.command}"')
+        if mcp.args:
+            toml_lines.append(f"args = {json.dumps(list(mcp.args))}")
+        if mcp.env:
+            env_dict = {k: str(v) for k, v in dict(mcp.env).items()}
+            env_parts = [f"{k} = {json.dumps(v)}" for k, v in env_dict.items()]
+            toml_lines.append(f"env = {{ {', '.join(env_parts)} }}")
+        if mcp.startup_timeout_sec:
+            toml_lines.append(f"startup_timeout_sec = {mcp.startup_timeout_sec}")
+        if mcp.tool_timeout_sec:
+            toml_lines.append(f"tool_timeout_sec = {mcp.tool_timeout_sec}")
+        toml_lines.append("")
+
+    # Add tool patterns and permissions
+    if config.enabled_tools:
+        toml_lines.append(f"enabled_tools = {list(config.enabled_tools)}")
+    if config.disabled_tools:
+        toml_lines.append(f"disabled_tools = {list(config.disabled_tools)}")
+
+    for tool_name, tool_conf in config.tools.items():
+        toml_lines.extend([f"[tools.{tool_name}]", f'permission = "{tool_conf.permission}"'])
+
+    return "\n".join(toml_lines)
+
+
+def _prepare_temp_vibe_home(model_alias: str, config_text: str | None = None) -> str:
     """Prepare a temporary VIBE_HOME with a custom config.toml for model switching."""
     temp_dir = tempfile.mkdtemp(prefix="vibe_home_")
     temp_path = Path(temp_dir)
@@ -538,114 +633,9 @@ def _prepare_temp_vibe_home(model_alias: str) -> str:
                     except OSError:
                         pass
 
-        # 3. Generate custom config.toml
-        # We generate a fresh TOML matching the VibeConfig object
-        # This ensures all provider overrides and MCP servers are propagated
-        def get_val(obj, key, default):
-            """Safely get value from object, handling MagicMocks."""
-            val = getattr(obj, key, default)
-            # If it's a MagicMock, it won't be in the expected type
-            from unittest.mock import MagicMock
-
-            if isinstance(val, MagicMock):
-                return default
-            return val
-
-        toml_lines = [
-            "# Generated Vibe Configuration for Temp Session",
-            f'active_model = "{model_alias}"',
-            f"fallback_chain = {json.dumps(get_val(config, 'fallback_chain', []))}",
-            f'system_prompt_id = "{get_val(config, "system_prompt_id", "cli")!s}"',
-            f'default_mode = "{get_val(config, "default_mode", "auto-approve")!s}"',
-            "enable_auto_update = false",
-            f"max_turns = {int(get_val(config, 'max_turns', 100))}",
-            f"disable_welcome_banner_animation = {str(get_val(config, 'disable_welcome_banner_animation', True)).lower()}",
-            f"vim_keybindings = {str(get_val(config, 'vim_keybindings', False)).lower()}",
-            f"timeout_s = {float(get_val(config, 'timeout_s', 600.0))}",
-            "",
-        ]
-
-        # Add providers
-        for provider in config.providers:
-            # Skip if it's the default placeholder or redundant
-            if not provider.name or not provider.api_base:
-                continue
-
-            # Standardize localhost to 127.0.0.1 to avoid DNS/Hang issues
-            api_base = str(provider.api_base)
-            if "localhost" in api_base:
-                api_base = api_base.replace("localhost", "127.0.0.1")
-
-            toml_lines.extend(
-                [
-                    "[[providers]]",
-                    f'name = "{provider.name}"',
-                    f'api_base = "{api_base}"',
-                    f'api_key_env_var = "{provider.api_key_env_var}"',
-                    f'api_style = "{provider.api_style}"',
-                    f'backend = "{provider.backend}"',
-                    "",
-                ]
-            )
-
-        # Add models
-        for model in config.models:
-            # Handle potential mocks or non-string types safely
-            m_name = str(model.name)
-            m_provider = str(model.provider)
-            m_alias = str(model.alias)
-            m_temp = float(model.temperature)
-            m_in_p = float(model.input_price)
-            m_out_p = float(model.output_price)
-
-            toml_lines.extend(
-                [
-                    "[[models]]",
-                    f'name = "{m_name}"',
-                    f'provider = "{m_provider}"',
-                    f'alias = "{m_alias}"',
-                    f"temperature = {m_temp}",
-                    f"input_price = {m_in_p}",
-                    f"output_price = {m_out_p}",
-                    "",
-                ]
-            )
-
-        # Add MCP servers (Documentation: supported transports and fields)
-        for mcp in config.mcp_servers:
-            toml_lines.extend(
-                [
-                    "[[mcp_servers]]",
-                    f'name = "{mcp.name}"',
-                    f'transport = "{mcp.transport}"',
-                ]
-            )
-            if mcp.url:
-                toml_lines.append(f'url = "{mcp.url}"')
-            if mcp.command:
-                toml_lines.append(f'command = "{mcp.command}"')
-            if mcp.args:
-                toml_lines.append(f"args = {json.dumps(list(mcp.args))}")
-            if mcp.env:
-                env_dict = {k: str(v) for k, v in dict(mcp.env).items()}
-                env_parts = [f"{k} = {json.dumps(v)}" for k, v in env_dict.items()]
-                toml_lines.append(f"env = {{ {', '.join(env_parts)} }}")
-            if mcp.startup_timeout_sec:
-                toml_lines.append(f"startup_timeout_sec = {mcp.startup_timeout_sec}")
-            if mcp.tool_timeout_sec:
-                toml_lines.append(f"tool_timeout_sec = {mcp.tool_timeout_sec}")
-            toml_lines.append("")
-
-        # Add tool patterns and permissions
-        if config.enabled_tools:
-            toml_lines.append(f"enabled_tools = {list(config.enabled_tools)}")
-        if config.disabled_tools:
-            toml_lines.append(f"disabled_tools = {list(config.disabled_tools)}")
-
-        for tool_name, tool_conf in config.tools.items():
-            toml_lines.extend([f"[tools.{tool_name}]", f'permission = "{tool_conf.permission}"'])
-
-        config_text = "\n".join(toml_lines)
+        # 3. Write the generated config.toml
+        if config_text is None:
+            config_text = _render_temp_vibe_config(model_alias)
         (temp_path / "config.toml").write_text(config_text, encoding="utf-8")
         logger.debug(f"[VIBE] Prepared temp VIBE_HOME at {temp_dir} with model={model_alias}")
         logger.debug(f"[VIBE] Generated TOML:\n{config_text}")
@@ -658,6 +648,31 @@ def _prepare_temp_vibe_home(model_alias: str) -> str:
         return ""
 
 
+def _checkout_vibe_home(model_alias: str) -> str:
+    """Get a temp VIBE_HOME for model_alias, reusing an idle one with the same config."""
+    try:
+        config_text = _render_temp_vibe_config(model_alias)
+    except Exception as e:
+        logger.error(f"[VIBE] Failed to render temp VIBE_HOME config: {e}")
+        return ""
+    key = hashlib.sha256(config_text.encode()).hexdigest()
+    return VIBE_HOMES.checkout(key, lambda: _prepare_temp_vibe_home(model_alias, config_text))
+
+
+def _release_vibe_home(path: str | None) -> None:
+    """Return a pooled temp VIBE_HOME after a run, or remove an unpooled temp one."""
+    if not path or VIBE_HOMES.checkin(path):
+        return
+    temp = Path(path)
+    if temp.parent != Path(tempfile.gettempdir()) or not temp.name.startswith("vibe_home_"):
+        return  # a configured VIBE_HOME, never removed
+    shutil.rmtree(path, ignore_errors=True)
+    logger.debug(f"[VIBE] Cleaned up temp VIBE_HOME: {path}")
+
+
+atexit.register(VIBE_HOMES.clear)
+
+
 def prepare_workspace_and_instructions() -> None:
     """Ensure necessary directories exist."""
     try:
@@ -745,9 +760,13 @@ async def run_vibe_subprocess(
     ctx: Context | None = None,
     prompt_preview: str | None = None,
     vibe_home_override: str | None = None,
+    read_only: bool | None = None,
 ) -> dict[str, Any]:
-    """Execute Vibe CLI subprocess with streaming output and global queueing."""
-    global VIBE_QUEUE_SIZE
+    """Execute Vibe CLI subprocess with streaming output, queued in the worker pool.
+
+    Runs that may edit files hold their workspace exclusively; read-only runs (plan
+    agent, status subcommands) share it. ``read_only`` overrides the argv detection.
+    """
     process_env = _prepare_vibe_env(env)
 
     # Apply VIBE_HOME override if provided
@@ -757,65 +776,53 @@ async def run_vibe_subprocess(
     else:
         logger.debug(f"[VIBE] Using default VIBE_HOME: {process_env.get('VIBE_HOME', 'Not Set')}")
 
-    # Queue Management
-    VIBE_QUEUE_SIZE += 1
-    if VIBE_LOCK.locked():
-        msg = f"⏳ [VIBE-QUEUE] Task queued (Position: {VIBE_QUEUE_SIZE - 1}). Waiting for active task to complete..."
+    if read_only is None:
+        read_only = is_read_only_invocation(argv)
+
+    # Use a timeout for the queue wait to avoid indefinite hangs
+    # By default we wait up to timeout*2: one full run of the job ahead plus some buffer
+    queue_timeout = VIBE_QUEUE_TIMEOUT_S or (timeout_s or DEFAULT_TIMEOUT_S) * 2
+
+    async def report_position(position: int, job: VibeJob) -> None:
+        msg = (
+            f"⏳ [VIBE-QUEUE] Task queued (Position: {position}, "
+            f"running: {VIBE_POOL.running}/{VIBE_POOL.max_workers}). "
+            "Waiting for a free worker..."
+        )
         logger.info(msg)
         await _emit_vibe_log(ctx, "info", msg)
 
-    # Use a timeout for lock acquisition to avoid indefinite queue hangs
-    # We wait up to timeout*2 to allow for one full task completion + some buffer
-    lock_timeout = (timeout_s or DEFAULT_TIMEOUT_S) * 2
     try:
-        await asyncio.wait_for(VIBE_LOCK.acquire(), timeout=lock_timeout)
-    except TimeoutError:
-        VIBE_QUEUE_SIZE -= 1
-        error_msg = f"Queue timeout: Lock held for over {lock_timeout}s. Forcing emergency reset."
+        async with VIBE_POOL.slot(
+            cwd or VIBE_WORKSPACE,
+            write=not read_only,
+            timeout=queue_timeout,
+            on_wait=report_position,
+            label=(prompt_preview or " ".join(argv[1:2]))[:80],
+        ):
+            logger.debug(mask_sensitive_data(f"[VIBE] Executing: {' '.join(argv)}"))
+            logger.debug(mask_sensitive_data(f"[VIBE] Full argv: {argv}"))
+
+            if prompt_preview:
+                await _emit_vibe_log(
+                    ctx, "info", f"🚀 [VIBE-LIVE] Запуск Vibe: {prompt_preview[:80]}..."
+                )
+
+            return await _execute_vibe_with_retries(argv, cwd, timeout_s, process_env, ctx)
+
+    except VibeQueueTimeoutError as e:
+        error_msg = f"Queue timeout: {e}"
         logger.error(f"[VIBE] {error_msg}")
         await _emit_vibe_log(ctx, "error", f"🚨 [VIBE-QUEUE] {error_msg}")
-        await _emergency_cleanup()
         return {"success": False, "error": error_msg, "command": argv}
-
-    try:
-        VIBE_QUEUE_SIZE -= 1
-        logger.debug(mask_sensitive_data(f"[VIBE] Executing: {' '.join(argv)}"))
-        logger.debug(mask_sensitive_data(f"[VIBE] Full argv: {argv}"))
-
-        if prompt_preview:
-            await _emit_vibe_log(
-                ctx, "info", f"🚀 [VIBE-LIVE] Запуск Vibe: {prompt_preview[:80]}..."
-            )
-
-        result = await _execute_vibe_with_retries(argv, cwd, timeout_s, process_env, ctx)
-        return result
-
     except Exception as outer_e:
         error_msg = f"Outer subprocess error: {outer_e}"
         logger.error(f"[VIBE] {error_msg}")
         return {"success": False, "error": error_msg, "command": argv}
     finally:
-        # 1. Release Lock correctly
-        if VIBE_LOCK.locked():
-            try:
-                VIBE_LOCK.release()
-            except RuntimeError:
-                # Already released or not held by this task
-                pass
-
-        # 2. Clean up temp VIBE_HOME if it was an override
-        if vibe_home_override and "vibe_home_" in vibe_home_override:
-            try:
-                # We give a small delay to ensure file handles are closed
-                await asyncio.sleep(0.5)
-                shutil.rmtree(vibe_home_override, ignore_errors=True)
-                logger.debug(f"[VIBE] Cleaned up temp VIBE_HOME: {vibe_home_override}")
-            except Exception as e:
-                logger.warning(
-                    mask_sensitive_data(
-                        f"[VIBE] Failed to cleanup temp home {vibe_home_override}: {e}"
-                    )
-                )
+        # Hand the temp VIBE_HOME back to the pool (a rate-limit fallback may have swapped it;
+        # the replaced one was released at the swap)
+        _release_vibe_home(process_env.get("VIBE_HOME"))
 
 
 def _prepare_vibe_env(env: dict[str, str] | None) -> dict[str, str]:
@@ -899,99 +906,6 @@ async def _emit_vibe_log(ctx: Context | None, level: str, message: str) -> None:
         logger.debug(f"[VIBE] Failed to send log to client: {e}")
 
 
-async def _handle_vibe_line(line: str, stream_name: str, ctx: Context | None) -> None:
-    """Process and log a single line of output from Vibe."""
-    line = mask_sensitive_data(_clean_vibe_line(line))
-    if not line:
-        return
-
-    # Try structured logging first
-    if await _try_parse_structured_vibe_log(line, ctx):
-        return
-
-    # Fallback to standard streaming log
-    await _format_and_emit_vibe_log(line, stream_name, ctx)
-
-
-def _clean_vibe_line(line: str) -> str:
-    """Filter out terminal control characters and TUI artifacts."""
-    if not line:
-        return ""
-    if any(c < "\x20" for c in line if c not in "\t\n\r"):
-        line = "".join(c for c in line if c >= "\x20" or c in "\t\n\r")
-    return line.strip()
-
-
-async def _try_parse_structured_vibe_log(line: str, ctx: Context | None) -> bool:
-    """Try to parse as JSON for structured logging."""
-    try:
-        obj = json.loads(line)
-        if not isinstance(obj, dict) or not obj.get("role") or not obj.get("content"):
-            return False
-
-        role_map = {
-            "assistant": "🧠 [VIBE-THOUGHT]",
-            "tool": "🔧 [VIBE-ACTION]",
-        }
-        prefix = role_map.get(obj["role"], "💬 [VIBE-GEN]")
-        message = f"{prefix} {str(obj['content'])[:200]}"
-
-        logger.info(message)
-        await _emit_vibe_log(ctx, "info", message)
-        return True
-    except (json.JSONDecodeError, ValueError):
-        return False
-
-
-async def _format_and_emit_vibe_log(line: str, stream_name: str, ctx: Context | None) -> None:
-    """Format and emit a standard log line."""
-    if any(t in line for t in SPAM_TRIGGERS):
-        return
-
-    if len(line) >= 1000:
-        return
-
-    if "Thinking" in line or "Planning" in line:
-        formatted = f"🧠 [VIBE-THOUGHT] {line}"
-    elif "Running" in line or "Executing" in line:
-        formatted = f"🔧 [VIBE-ACTION] {line}"
-    else:
-        formatted = f"⚡ [VIBE-LIVE] {line}"
-
-    logger.debug(mask_sensitive_data(f"[VIBE_{stream_name}] {line}"))
-    level = "warning" if stream_name == "ERR" else "info"
-    await _emit_vibe_log(ctx, level, formatted)
-
-
-async def _read_vibe_stream(
-    stream: asyncio.StreamReader,
-    chunks: list[bytes],
-    stream_name: str,
-    timeout_s: float,
-    ctx: Context | None,
-) -> None:
-    """Read stream in chunks to handle TUI artifacts and provide real-time logging."""
-    try:
-        while True:
-            # Use read() instead of readline() to handle status lines without newlines
-            # Apply a timeout to avoid hangs if the process stops writing but won't exit
-            data = await asyncio.wait_for(stream.read(1024), timeout=timeout_s)
-            if not data:
-                break
-
-            chunks.append(data)
-
-            # For logging, we still try to process lines if they exist in the chunk
-            text = data.decode(errors="replace")
-            for line in text.split("\n"):
-                if line.strip():
-                    await _handle_vibe_line(line, stream_name, ctx)
-    except TimeoutError:
-        logger.warning(f"[VIBE] Read timeout on {stream_name} after {timeout_s}s")
-    except Exception as e:
-        logger.debug(f"[VIBE] Error reading {stream_name} stream: {e}")
-
-
 async def _execute_vibe_with_retries(
     argv: list[str],
     cwd: str | None,
@@ -1017,19 +931,21 @@ async def _execute_vibe_with_retries(
                 stdin=asyncio.subprocess.DEVNULL,
             )
 
-            stdout_chunks: list[bytes] = []
-            stderr_chunks: list[bytes] = []
+            # Bounded head/tail buffers; progress goes to the client in rate-limited batches
+            stdout_buf = OutputBuffer(MAX_OUTPUT_CHARS)
+            stderr_buf = OutputBuffer(MAX_OUTPUT_CHARS)
+            progress = ProgressEmitter(
+                (lambda level, message: _emit_vibe_log(ctx, level, message)) if ctx else None
+            )
 
             try:
                 streams_to_read = []
                 if process.stdout:
-                    streams_to_read.append(
-                        _read_vibe_stream(process.stdout, stdout_chunks, "OUT", timeout_s, ctx)
-                    )
+                    reader = VibeStreamReader("OUT", stdout_buf, progress)
+                    streams_to_read.append(read_vibe_stream(process.stdout, reader, timeout_s))
                 if process.stderr:
-                    streams_to_read.append(
-                        _read_vibe_stream(process.stderr, stderr_chunks, "ERR", timeout_s, ctx)
-                    )
+                    reader = VibeStreamReader("ERR", stderr_buf, progress)
+                    streams_to_read.append(read_vibe_stream(process.stderr, reader, timeout_s))
 
                 if streams_to_read:
                     # Apply an outer timeout to the gather as well
@@ -1037,7 +953,7 @@ async def _execute_vibe_with_retries(
                     gather_task = asyncio.ensure_future(asyncio.gather(*streams_to_read))
                     await asyncio.wait_for(gather_task, timeout=timeout_s + 10)
             finally:
-                pass
+                await progress.flush()
 
             try:
                 # Wait for the process to finish, with a timeout
@@ -1046,11 +962,11 @@ async def _execute_vibe_with_retries(
                 await _emit_vibe_log(ctx, "info", "✅ [VIBE-LIVE] Vibe завершив роботу успішно")
             except TimeoutError:
                 return await _handle_vibe_timeout(
-                    process, argv, timeout_s, stdout_chunks, stderr_chunks, ctx
+                    process, argv, timeout_s, stdout_buf, stderr_buf, ctx
                 )
 
-            stdout = strip_ansi(b"".join(stdout_chunks).decode(errors="replace"))
-            stderr = strip_ansi(b"".join(stderr_chunks).decode(errors="replace"))
+            stdout = stdout_buf.text()
+            stderr = stderr_buf.text()
 
             if process.returncode != 0:
                 # Check for API rate limits and other fallback triggers
@@ -1074,6 +990,7 @@ async def _execute_vibe_with_retries(
                         # Model switched, update VIBE_HOME for next attempt
                         new_home = res[1]
                         if new_home:
+                            _release_vibe_home(process_env.get("VIBE_HOME"))
                             process_env["VIBE_HOME"] = new_home
                         continue
                     if isinstance(res, bool) and res is True:
@@ -1118,8 +1035,8 @@ async def _execute_vibe_with_retries(
             return {
                 "success": process.returncode == 0,
                 "returncode": process.returncode,
-                "stdout": truncate_output(stdout),
-                "stderr": truncate_output(stderr),
+                "stdout": stdout,
+                "stderr": stderr,
                 "command": argv,
             }
         except FileNotFoundError:
@@ -1138,8 +1055,8 @@ async def _handle_vibe_timeout(
     process: asyncio.subprocess.Process,
     argv: list[str],
     timeout_s: float,
-    stdout_chunks: list[bytes],
-    stderr_chunks: list[bytes],
+    stdout_buf: OutputBuffer,
+    stderr_buf: OutputBuffer,
     ctx: Context | None,
 ) -> dict[str, Any]:
     """Handle process timeout by terminating/killing and returning partial output."""
@@ -1153,15 +1070,12 @@ async def _handle_vibe_timeout(
         process.kill()
         await process.wait()
 
-    stdout_str = strip_ansi(b"".join(stdout_chunks).decode(errors="replace"))
-    stderr_str = strip_ansi(b"".join(stderr_chunks).decode(errors="replace"))
-
     return {
         "success": False,
         "error": f"Vibe execution timed out after {timeout_s}s",
         "returncode": -1,
-        "stdout": truncate_output(stdout_str),
-        "stderr": truncate_output(stderr_str),
+        "stdout": stdout_buf.text(),
+        "stderr": stderr_buf.text(),
         "command": argv,
     }
 
@@ -1212,7 +1126,7 @@ async def _handle_vibe_rate_limit(
                     _ensure_provider_proxy(p_conf)
 
                 _current_model = next_model_alias
-                new_home = _prepare_temp_vibe_home(next_model_alias)
+                new_home = _checkout_vibe_home(next_model_alias)
                 return True, new_home
             logger.debug(f"[VIBE] Skipping {next_model_alias}: provider not available.")
     except ValueError:
@@ -1318,7 +1232,7 @@ async def vibe_which(ctx: Context) -> dict[str, Any]:
     """Locate the Vibe CLI binary and report its version and configuration.
 
     Returns:
-        Dict with 'binary' path, 'version', current 'model', and 'mode'
+        Dict with 'binary' path, 'version', current 'model', 'mode' and worker pool 'workers'
 
     """
     vibe_path = resolve_vibe_binary()
@@ -1353,6 +1267,7 @@ async def vibe_which(ctx: Context) -> dict[str, Any]:
         "active_model": _current_model or config.active_model,
         "mode": _current_mode.value,
         "available_models": [m.alias for m in config.get_available_models()],
+        "workers": VIBE_POOL.status(),
     }
 
 
@@ -1456,7 +1371,7 @@ async def vibe_prompt(
                 if p_conf and p_conf.requires_proxy:
                     _ensure_provider_proxy(p_conf)
 
-            vibe_home_override = _prepare_temp_vibe_home(target_model)
+            vibe_home_override = _checkout_vibe_home(target_model)
 
         # Build command using config (Model switching is handled via VIBE_HOME override)
         argv = [
@@ -2279,14 +2194,10 @@ async def vibe_session_resume(
         Result of the resumed session
 
     """
-    # Verify session exists
+    # Verify session exists (newest match in the session catalog)
     target_path = None
-
-    # Search in session directory
     if VIBE_SESSION_DIR.exists():
-        files = list(VIBE_SESSION_DIR.glob(f"*{session_id}*.json"))
-        if files:
-            target_path = files[0]
+        target_path = await _resolve_vibe_session(session_id)
 
     if not target_path:
         return {
@@ -2422,13 +2333,27 @@ async def vibe_execute_subcommand(
 
 
 @server.tool()
-async def vibe_list_sessions(ctx: Context, limit: int = 10) -> dict[str, Any]:
+async def vibe_list_sessions(
+    ctx: Context,
+    limit: int = 10,
+    *,
+    offset: int = 0,
+    query: str | None = None,
+    status: str | None = None,
+    since: str | None = None,
+) -> dict[str, Any]:
     """List recent Vibe session logs with metrics.
 
     Useful for tracking costs, context size, and session IDs for resuming.
+    Served from the session catalog index, so paging and filtering do not
+    read the session files themselves.
 
     Args:
         limit: Number of sessions to return (default: 10)
+        offset: Number of newer sessions to skip, for paging (default: 0)
+        query: Only sessions whose ID, file name or first prompt contains this text
+        status: Only sessions with this status: active, ended or unreadable
+        since: Only sessions started at or after this ISO timestamp
 
     Returns:
         List of recent sessions with metadata
@@ -2441,37 +2366,32 @@ async def vibe_list_sessions(ctx: Context, limit: int = 10) -> dict[str, Any]:
         }
 
     try:
-        files = sorted(
-            VIBE_SESSION_DIR.glob("session_*.json"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True,
-        )[:limit]
-
-        sessions = []
-        for f in files:
-            try:
-                with open(f, encoding="utf-8") as jf:
-                    data = json.load(jf)
-                    meta = data.get("metadata", {})
-                    stats = meta.get("stats", {})
-
-                    sessions.append(
-                        {
-                            "session_id": meta.get("session_id"),
-                            "timestamp": meta.get("start_time"),
-                            "steps": stats.get("steps", 0),
-                            "prompt_tokens": stats.get("session_prompt_tokens", 0),
-                            "completion_tokens": stats.get("session_completion_tokens", 0),
-                            "file": f.name,
-                        },
-                    )
-            except Exception as e:
-                logger.debug(f"Failed to parse session {f.name}: {e}")
-
+        catalog = await _refreshed_session_catalog()
+        rows, total = catalog.list(
+            limit=limit, offset=offset, query=query, status=status, since=since
+        )
+        sessions = [
+            {
+                "session_id": row["session_id"],
+                "timestamp": row["start_time"],
+                "end_time": row["end_time"],
+                "status": row["status"],
+                "summary": row["summary"],
+                "steps": row["steps"],
+                "prompt_tokens": row["prompt_tokens"],
+                "completion_tokens": row["completion_tokens"],
+                "size": row["size"],
+                "file": row["file"],
+            }
+            for row in rows
+        ]
         return {
             "success": True,
             "sessions": sessions,
             "count": len(sessions),
+            "total": total,
+            "offset": offset,
+            "has_more": offset + len(sessions) < total,
         }
 
     except Exception as e:
@@ -2499,15 +2419,9 @@ async def vibe_session_details(ctx: Context, session_id_or_file: str) -> dict[st
     if os.path.isabs(session_id_or_file) and os.path.exists(session_id_or_file):
         target_path = Path(session_id_or_file)
 
-    # Check in session directory
-    elif (VIBE_SESSION_DIR / session_id_or_file).exists():
-        target_path = VIBE_SESSION_DIR / session_id_or_file
-
-    # Search by pattern
-    else:
-        files = list(VIBE_SESSION_DIR.glob(f"*{session_id_or_file}*.json"))
-        if files:
-            target_path = files[0]
+    # Look up by file name or (partial) session ID, newest match first
+    elif VIBE_SESSION_DIR.exists():
+        target_path = await _resolve_vibe_session(session_id_or_file)
 
     if not target_path:
         return {
@@ -2516,6 +2430,7 @@ async def vibe_session_details(ctx: Context, session_id_or_file: str) -> dict[st
         }
 
     try:
+        # The body is only read here, on demand
         with open(target_path, encoding="utf-8") as f:
             data = json.load(f)
             return {
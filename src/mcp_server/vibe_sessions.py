@@ -0,0 +1,365 @@
+"""Vibe session catalog: an SQLite index over ~/.vibe/logs/session.
+
+Every Vibe run leaves a ``session_*.json`` file holding its metadata, token
+stats and the full message history. Listing sessions used to glob, stat and
+json-load those files on every call, so every page of ten paid for a stat of
+every session and a text filter for reading all of them. The catalog keeps one
+row per file instead:
+
+- id, start/end time, the first user prompt (truncated), status, step and token
+  counts, file size and mtime;
+- a refresh compares the directory mtime with the stored one: when it changed,
+  one scandir pass is diffed against the stored (mtime, size) pairs and only new
+  or changed files are parsed, deleted ones are dropped; when it did not, only
+  the hot set (the newest active or recently written sessions) is re-statted,
+  since Vibe rewrites a session file in place while it runs;
+- refreshes are polled at most once per ``poll_interval`` seconds, and a full
+  scan still runs every ``full_scan_interval`` seconds as a safety net;
+- listing pages and filters on the index only, session bodies are read from
+  disk on demand by ``load``.
+
+The index is a cache: it is rebuilt when its schema version changes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+SCHEMA_VERSION = 1
+SUMMARY_CHARS = 200
+# Sessions not ended or written this recently are re-statted on every refresh,
+# newest first and at most HOT_LIMIT of them
+HOT_WINDOW_S = 600.0
+HOT_LIMIT = 64
+# A directory mtime this close to the scan may still change within the same
+# timestamp tick (coarse filesystem clocks), so it is not trusted until later
+RACY_WINDOW_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    file TEXT PRIMARY KEY,
+    session_id TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    steps INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    summary TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_mtime ON sessions (mtime_ns);
+CREATE INDEX IF NOT EXISTS idx_sessions_session_id ON sessions (session_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions (status, mtime_ns);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "file",
+    "session_id",
+    "start_time",
+    "end_time",
+    "mtime_ns",
+    "size",
+    "status",
+    "steps",
+    "prompt_tokens",
+    "completion_tokens",
+    "summary",
+)
+_DEFAULTS: dict[str, Any] = {
+    "start_time": None,
+    "end_time": None,
+    "steps": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "summary": "",
+}
+_UPSERT = f"INSERT OR REPLACE INTO sessions VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+def _like(text: str) -> str:
+    """LIKE pattern matching ``text`` anywhere, wildcards escaped with a backslash."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _prompt_summary(messages: Any) -> str:
+    """The first user message, on one line and cut to SUMMARY_CHARS."""
+    if not isinstance(messages, list):
+        return ""
+    for message in messages:
+        if not isinstance(message, dict) or message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, list):  # content parts
+            content = " ".join(
+                str(part.get("text", "")) if isinstance(part, dict) else str(part)
+                for part in content
+            )
+        text = " ".join(str(content or "").split())
+        if text:
+            return text[: SUMMARY_CHARS - 1] + "…" if len(text) > SUMMARY_CHARS else text
+    return ""
+
+
+def parse_session_file(path: Path | str) -> dict[str, Any]:
+    """Index fields of one session file; status "unreadable" if it is not valid JSON.
+
+    A file caught halfway through a rewrite reads as unreadable and is parsed
+    again once its mtime or size changes.
+    """
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        meta = data.get("metadata") or {}
+        stats = meta.get("stats") or {}
+    except (OSError, ValueError, AttributeError):
+        return {"session_id": path.stem.removeprefix("session_"), "status": "unreadable"}
+    return {
+        "session_id": meta.get("session_id") or path.stem.removeprefix("session_"),
+        "start_time": meta.get("start_time"),
+        "end_time": meta.get("end_time"),
+        "status": "ended" if meta.get("end_time") else "active",
+        "steps": int(stats.get("steps") or 0),
+        "prompt_tokens": int(stats.get("session_prompt_tokens") or 0),
+        "completion_tokens": int(stats.get("session_completion_tokens") or 0),
+        "summary": _prompt_summary(data.get("messages")),
+    }
+
+
+class SessionCatalog:
+    """Incrementally refreshed index of Vibe session files (thread-safe)."""
+
+    def __init__(
+        self,
+        session_dir: Path | str,
+        db_path: Path | str,
+        *,
+        poll_interval: float = 2.0,
+        full_scan_interval: float = 300.0,
+        pattern: str = "session_*.json",
+    ):
+        self.session_dir = Path(session_dir)
+        self.db_path = Path(db_path)
+        self.poll_interval = poll_interval
+        self.full_scan_interval = full_scan_interval
+        self.prefix, _, self.suffix = pattern.partition("*")
+        self._lock = threading.RLock()
+        self._last_poll = 0.0
+        self.parsed = 0  # files parsed since startup, for diagnostics
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript(
+                "DROP TABLE IF EXISTS sessions; DROP TABLE IF EXISTS state;"
+                f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self) -> SessionCatalog:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ----------------------------------------------------------------- refresh
+
+    def refresh(self, *, force: bool = False) -> dict[str, int]:
+        """Bring the index up to date with the directory.
+
+        Within ``poll_interval`` of the previous refresh nothing is checked
+        unless ``force`` is set. Returns counts of added, updated and removed rows.
+        """
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_poll < self.poll_interval:
+                return {"added": 0, "updated": 0, "removed": 0}
+            self._last_poll = now
+            try:
+                dir_mtime = self.session_dir.stat().st_mtime_ns
+            except OSError:
+                dir_mtime = -1
+            full = (
+                force
+                or dir_mtime != self._state("dir_mtime_ns")
+                or now - (self._state("full_scan_at") or 0) >= self.full_scan_interval
+            )
+            if full:
+                counts = self._scan_all()
+                if time.time_ns() - dir_mtime < RACY_WINDOW_NS:
+                    dir_mtime = -1
+                self._set_state(dir_mtime_ns=dir_mtime, full_scan_at=now)
+            else:
+                counts = self._scan_hot(now)
+            return counts
+
+    def _state(self, key: str) -> float | None:
+        row = self.conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, **values: float) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", values.items()
+            )
+
+    def _scan_all(self) -> dict[str, int]:
+        on_disk: dict[str, tuple[int, int]] = {}
+        try:
+            with os.scandir(self.session_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith(self.prefix) and name.endswith(self.suffix)):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if entry.is_file():
+                        on_disk[name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self.conn.execute("SELECT file, mtime_ns, size FROM sessions")
+        }
+        changed = [name for name, sig in on_disk.items() if known.get(name) != sig]
+        removed = [name for name in known if name not in on_disk]
+        self._store(changed, on_disk, removed)
+        added = sum(1 for name in changed if name not in known)
+        return {"added": added, "updated": len(changed) - added, "removed": len(removed)}
+
+    def _scan_hot(self, now: float) -> dict[str, int]:
+        since = int((now - HOT_WINDOW_S) * 1e9)
+        hot = self.conn.execute(
+            "SELECT file, mtime_ns, size FROM sessions WHERE status != 'ended' OR mtime_ns >= ? "
+            "ORDER BY mtime_ns DESC LIMIT ?",
+            (since, HOT_LIMIT),
+        ).fetchall()
+        stats: dict[str, tuple[int, int]] = {}
+        changed, removed = [], []
+        for name, mtime_ns, size in hot:
+            try:
+                st = os.stat(self.session_dir / name)
+            except OSError:
+                removed.append(name)
+                continue
+            stats[name] = (st.st_mtime_ns, st.st_size)
+            if stats[name] != (mtime_ns, size):
+                changed.append(name)
+        self._store(changed, stats, removed)
+        return {"added": 0, "updated": len(changed), "removed": len(removed)}
+
+    def _store(
+        self,
+        changed: list[str],
+        stats: dict[str, tuple[int, int]],
+        removed: list[str],
+    ) -> None:
+        rows = []
+        for name in changed:
+            mtime_ns, size = stats[name]
+            fields = parse_session_file(self.session_dir / name)
+            row = {**_DEFAULTS, **fields, "file": name, "mtime_ns": mtime_ns, "size": size}
+            rows.append(tuple(row[column] for column in _COLUMNS))
+        self.parsed += len(rows)
+        with self.conn:
+            self.conn.executemany(_UPSERT, rows)
+            self.conn.executemany("DELETE FROM sessions WHERE file = ?", [(n,) for n in removed])
+
+    # ------------------------------------------------------------------- query
+
+    def list(
+        self,
+        *,
+        limit: int = 10,
+        offset: int = 0,
+        query: str | None = None,
+        status: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """One page of sessions, newest first, and the number matching the filters.
+
+        ``query`` matches a substring of the session id, file name or prompt
+        summary (case-insensitive); ``since``/``until`` bound the ISO start time.
+        """
+        where, params = [], []
+        if query:
+            where.append(
+                "(session_id LIKE ? ESCAPE '\\' OR file LIKE ? ESCAPE '\\' "
+                "OR summary LIKE ? ESCAPE '\\')"
+            )
+            params += [_like(query)] * 3
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if since:
+            where.append("start_time >= ?")
+            params.append(since)
+        if until:
+            where.append("start_time < ?")
+            params.append(until)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        with self._lock:
+            (total,) = self.conn.execute(
+                f"SELECT COUNT(*) FROM sessions{clause}", params
+            ).fetchone()
+            cursor = self.conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM sessions{clause} "
+                "ORDER BY mtime_ns DESC, file DESC LIMIT ? OFFSET ?",
+                [*params, max(0, limit), max(0, offset)],
+            )
+            rows = [dict(zip(_COLUMNS, row, strict=True)) for row in cursor]
+        return rows, total
+
+    def resolve(self, id_or_file: str) -> Path | None:
+        """Path of the newest session whose file name or id matches ``id_or_file``.
+
+        Exact file names and ids win over substring matches.
+        """
+        if not id_or_file:
+            return None
+        like = _like(id_or_file)
+        with self._lock:
+            row = (
+                self.conn.execute(
+                    "SELECT file FROM sessions WHERE file = ? OR session_id = ? "
+                    "ORDER BY mtime_ns DESC LIMIT 1",
+                    (id_or_file, id_or_file),
+                ).fetchone()
+                or self.conn.execute(
+                    "SELECT file FROM sessions WHERE file LIKE ? ESCAPE '\\' "
+                    "OR session_id LIKE ? ESCAPE '\\' ORDER BY mtime_ns DESC LIMIT 1",
+                    (like, like),
+                ).fetchone()
+            )
+        return self.session_dir / row[0] if row else None
+
+    def load(self, id_or_file: str) -> dict[str, Any] | None:
+        """Full contents of a session file, read from disk; None if it is unknown."""
+        path = self.resolve(id_or_file)
+        if path is None:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
@@ -0,0 +1,318 @@
+"""Line-framed reader for Vibe CLI output streams.
+
+Vibe prints a mix of TUI status lines (redrawn in place with carriage returns and
+ANSI codes), structured JSON log lines and plain text. VibeStreamReader turns the
+raw pipe bytes into what a terminal would end up showing:
+
+- bytes are decoded incrementally, so a multi-byte UTF-8 character split across
+  two reads stays intact;
+- lines are framed on "\\n"; within a line only the text after the last "\\r" is
+  kept (the status line as last drawn), and a status line that keeps being
+  redrawn without a newline is reported each time it changes;
+- an unterminated line past MAX_LINE_CHARS (a one-line ``--output json``
+  answer) goes to the buffer in pieces, joined exactly as written;
+- ANSI escapes and stray control characters are removed in one regex pass over
+  each block of complete lines;
+- the cleaned text goes to an OutputBuffer, which keeps the first and the last
+  characters of the stream up to a limit;
+- the newest lines worth showing are queued on a ProgressEmitter, which formats
+  them (thought / action / live, TUI spam dropped) and sends them to the client
+  in batches, at most once per ``interval`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import json
+import logging
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from src.brain.monitoring.utils.security import mask_sensitive_data
+
+logger = logging.getLogger("vibe_mcp")
+
+# ANSI escape code pattern for stripping colors
+ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+# ANSI escapes plus C0 control characters other than \t, \n and \r, in one pass
+_CONTROL = re.compile(ANSI_ESCAPE.pattern + r"|[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+# TUI artifacts to filter out from logs
+SPAM_TRIGGERS = [
+    "Welcome to",
+    "│",
+    "╭",
+    "╮",
+    "╰",
+    "─",
+    "──",
+    "[2K",
+    "[1A",
+    "Press Enter",
+    "↵",
+    "ListToolsRequest",
+    "Processing request of type",
+    "Secure MCP Filesystem Server",
+    "Client does not support MCP Roots",
+    "Resolving dependencies",
+    "Resolved, downloaded and extracted",
+    "Saved lockfile",
+    "Sequential Thinking MCP Server",
+    "Starting Context7 MCP Server",
+    "Context7 MCP Server connected via stdio",
+    "Redis connected via URL",
+    "Lessons:",
+    "Strategies:",
+    "Discoveries:",
+    "brain - INFO - [MEMORY]",
+    "brain - INFO - [STATE]",
+]
+_SPAM = re.compile("|".join(map(re.escape, SPAM_TRIGGERS)))
+
+READ_SIZE = 64 * 1024
+MAX_LINE_CHARS = 64 * 1024  # an unterminated line longer than this is stored in pieces
+_MAX_ESCAPE = 32  # a trailing ESC this close to a piece's end may start a split sequence
+MAX_PROGRESS_LINE = 1000  # longer plain lines are not shown as progress
+
+ROLE_PREFIXES = {"assistant": "🧠 [VIBE-THOUGHT]", "tool": "🔧 [VIBE-ACTION]"}
+
+
+def format_vibe_line(line: str, stream_name: str) -> tuple[str, str] | None:
+    """Classify a cleaned output line as (level, message), or None to skip it."""
+    if line.startswith("{"):
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict) and obj.get("role") and obj.get("content"):
+            prefix = ROLE_PREFIXES.get(obj["role"], "💬 [VIBE-GEN]")
+            return "info", f"{prefix} {str(obj['content'])[:200]}"
+
+    if len(line) >= MAX_PROGRESS_LINE or _SPAM.search(line):
+        return None
+    if "Thinking" in line or "Planning" in line:
+        formatted = f"🧠 [VIBE-THOUGHT] {line}"
+    elif "Running" in line or "Executing" in line:
+        formatted = f"🔧 [VIBE-ACTION] {line}"
+    else:
+        formatted = f"⚡ [VIBE-LIVE] {line}"
+    return ("warning" if stream_name == "ERR" else "info"), formatted
+
+
+class OutputBuffer:
+    """Keeps the head and the tail of a stream, at most ``max_chars`` in total.
+
+    The head holds the startup output, the tail the final answer and any error;
+    the middle of an oversized stream is replaced by a truncation marker.
+    """
+
+    def __init__(self, max_chars: int, head_chars: int | None = None):
+        self.max_chars = max(0, max_chars)
+        self.head_limit = self.max_chars // 4 if head_chars is None else head_chars
+        self.head_limit = min(self.head_limit, self.max_chars)
+        self.tail_limit = self.max_chars - self.head_limit
+        self._head: list[str] = []
+        self._head_len = 0
+        self._tail: deque[str] = deque()
+        self._tail_len = 0
+        self.total = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.total - self._head_len - self._tail_len
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self.total += len(text)
+        room = self.head_limit - self._head_len
+        if room > 0:
+            self._head.append(text[:room])
+            self._head_len += min(room, len(text))
+            text = text[room:]
+            if not text:
+                return
+        self._tail.append(text)
+        self._tail_len += len(text)
+        while self._tail_len > self.tail_limit:
+            excess = self._tail_len - self.tail_limit
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_len -= len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_len -= excess
+
+    def text(self) -> str:
+        head, tail = "".join(self._head), "".join(self._tail)
+        if not self.dropped:
+            return head + tail
+        return f"{head}\n...[TRUNCATED: {self.dropped} chars omitted from the middle]...\n{tail}"
+
+
+class ProgressEmitter:
+    """Batched, rate-limited progress messages for the MCP client.
+
+    Only the newest ``max_lines`` showable lines are kept between flushes, and a
+    flush happens at most every ``interval`` seconds: one ``sink(level, text)``
+    call per level, lines joined with newlines.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[str, str], Awaitable[None]] | None,
+        *,
+        interval: float = 0.5,
+        max_lines: int = 20,
+    ):
+        self.sink = sink
+        self.interval = interval
+        self._pending: deque[tuple[str, str]] = deque(maxlen=max_lines)
+        self._received = 0
+        self._last_flush = 0.0
+        self.flushes = 0
+
+    def add(self, stream_name: str, text: str) -> None:
+        """Queue the newest showable lines of ``text`` (one or more lines)."""
+        self._received += text.count("\n") + 1
+        maxlen = self._pending.maxlen or 0
+        taken = []
+        end = len(text)
+        while len(taken) < maxlen:
+            start = text.rfind("\n", 0, end) + 1
+            line = text[start:end].strip()
+            if line and (
+                line[0] == "{" or (len(line) < MAX_PROGRESS_LINE and not _SPAM.search(line))
+            ):
+                taken.append((stream_name, line))
+            if start == 0:
+                break
+            end = start - 1
+        self._pending.extend(reversed(taken))
+
+    async def maybe_flush(self) -> None:
+        if self._pending and time.monotonic() - self._last_flush >= self.interval:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        self._last_flush = time.monotonic()
+        batch = list(self._pending)
+        skipped = self._received - len(batch)
+        self._pending.clear()
+        self._received = 0
+
+        by_level: dict[str, list[str]] = {}
+        for stream_name, line in batch:
+            formatted = format_vibe_line(line, stream_name)
+            if formatted:
+                by_level.setdefault(formatted[0], []).append(formatted[1])
+        if not by_level:
+            return
+        if skipped > 0:
+            first = next(iter(by_level.values()))
+            first.insert(0, f"… (+{skipped} more output lines)")
+        self.flushes += 1
+        for level, messages in by_level.items():
+            text = mask_sensitive_data("\n".join(messages))
+            logger.debug(f"[VIBE_PROGRESS] {text}")
+            if self.sink:
+                await self.sink(level, text)
+
+
+class VibeStreamReader:
+    """Incremental decoder and line framer for one output stream of a Vibe run."""
+
+    def __init__(
+        self,
+        stream_name: str,
+        buffer: OutputBuffer,
+        progress: ProgressEmitter | None = None,
+    ):
+        self.stream_name = stream_name
+        self.buffer = buffer
+        self.progress = progress
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+        self._status = ""
+        self._continued = False  # the start of the current line is already stored
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        pending = self._pending + self._decoder.decode(data, final)
+        cut = pending.rfind("\n")
+        if cut >= 0:
+            self._pending = pending[cut + 1 :]
+            self._emit(pending[:cut])
+        else:
+            self._pending = pending
+        if final:
+            if self._pending:
+                self._emit(self._pending)
+                self._pending = ""
+        elif "\r" in self._pending:
+            self._redraw()
+        elif len(self._pending) > MAX_LINE_CHARS:
+            self._spill()
+
+    def _emit(self, block: str) -> None:
+        """Store and report a block of complete lines (without the last newline)."""
+        block = _CONTROL.sub("", block)
+        if "\r" in block:
+            block = "\n".join(line.rstrip("\r").rpartition("\r")[2] for line in block.split("\n"))
+        self.buffer.append(block + "\n")
+        self._status = ""
+        if self._continued:
+            # the first line ends a line stored in pieces: too long to show as progress
+            block = block.partition("\n")[2]
+            self._continued = False
+        if self.progress and block:
+            self.progress.add(self.stream_name, block)
+
+    def _spill(self) -> None:
+        """Store the start of an overlong unterminated line, without a line break."""
+        cut = self._pending.find("\x1b", len(self._pending) - _MAX_ESCAPE)
+        if cut < 0:
+            cut = len(self._pending)
+        self.buffer.append(_CONTROL.sub("", self._pending[:cut]))
+        self._pending = self._pending[cut:]
+        self._continued = True
+
+    def _redraw(self) -> None:
+        """Collapse a status line redrawn with "\\r" to its latest complete drawing."""
+        head, _, rest = self._pending.rpartition("\r")
+        drawn = head.rpartition("\r")[2]
+        # a trailing "\r" may be the first half of a "\r\n": keep it with its line
+        self._pending = rest or drawn + "\r"
+        status = _CONTROL.sub("", drawn).strip()
+        if status and status != self._status:
+            self._status = status
+            if self.progress:
+                self.progress.add(self.stream_name, status)
+
+
+async def read_vibe_stream(
+    stream: asyncio.StreamReader,
+    reader: VibeStreamReader,
+    timeout_s: float,
+) -> None:
+    """Feed a subprocess stream into ``reader`` until EOF or ``timeout_s`` of silence."""
+    try:
+        while True:
+            # Apply a timeout to avoid hangs if the process stops writing but won't exit
+            data = await asyncio.wait_for(stream.read(READ_SIZE), timeout=timeout_s)
+            if not data:
+                break
+            reader.feed(data)
+            if reader.progress:
+                await reader.progress.maybe_flush()
+    except TimeoutError:
+        logger.warning(f"[VIBE] Read timeout on {reader.stream_name} after {timeout_s}s")
+    except Exception as e:
+        logger.debug(f"[VIBE] Error reading {reader.stream_name} stream: {e}")
+    finally:
+        reader.feed(b"", final=True)
@@ -0,0 +1,620 @@
+"""Workspace Index - persistent, incrementally refreshed facts about a project tree.
+
+The project analyzer and the diagram tools used to rglob the whole tree and
+re-read files on every call. The index keeps, per file, what those queries
+need, in one SQLite file per project root:
+- ``files``: mtime, size and content hash, the language, the imports and
+  top-level symbols found in source files, and the component the file
+  belongs to (assigned by the analyzer's rule for the project type)
+- ``dirs``: the directories seen by the walk
+- ``edges``: internal imports resolved to the file they import
+
+A refresh walks the tree once with ignore rules applied during the walk (an
+ignored directory is never entered), compares (mtime, size) with the stored
+values and reads only files that changed; a changed file whose content hash is
+unchanged is not parsed again. ``refresh(paths=...)`` updates just the given
+paths, e.g. the files a git diff reports. Import edges are resolved again for
+changed files, and for every file when files were added or removed.
+
+Author: AtlasTrinity Team
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections.abc import Callable, Collection, Iterable
+from pathlib import Path
+from typing import Any
+
+SCHEMA_VERSION = 1
+MAX_READ_BYTES = 1024 * 1024  # larger files are indexed by size and mtime only
+MAX_SYMBOLS = 200
+
+# Never entered by the walk, in addition to the root .gitignore
+DEFAULT_IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    "__pycache__",
+    "node_modules",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".tox",
+    ".idea",
+    ".vscode",
+    "dist",
+    "build",
+    "target",
+    ".next",
+    "coverage",
+}
+
+LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".rs": "rust",
+    ".go": "go",
+}
+
+_IMPORTS = {
+    "python": re.compile(
+        r"^[ \t]*(?:from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+\(?([\w, \t]*)"
+        r"|import[ \t]+([\w.]+(?:[ \t]*,[ \t]*[\w.]+)*))",
+        re.MULTILINE,
+    ),
+    "javascript": re.compile(
+        r"""(?:^[ \t]*import\b[^'"`;]*?['"]([^'"]+)['"]"""
+        r"""|\brequire\([ \t]*['"]([^'"]+)['"]\)"""
+        r"""|^[ \t]*export\b[^'"`;]*?\bfrom[ \t]*['"]([^'"]+)['"])""",
+        re.MULTILINE,
+    ),
+    "rust": re.compile(
+        r"^[ \t]*(?:pub[ \t]+)?(?:use[ \t]+([\w:]+)|mod[ \t]+(\w+)[ \t]*;)", re.MULTILINE
+    ),
+    "go": re.compile(r'^[ \t]*(?:import[ \t]+)?(?:\w+[ \t]+)?"([\w./-]+)"[ \t]*$', re.MULTILINE),
+}
+_IMPORTS["typescript"] = _IMPORTS["javascript"]
+
+_SYMBOLS = {
+    "python": re.compile(r"^(?:async[ \t]+)?(?:def|class)[ \t]+(\w+)", re.MULTILINE),
+    "javascript": re.compile(
+        r"^export[ \t]+(?:default[ \t]+)?(?:async[ \t]+)?"
+        r"(?:function\*?|class|const|let|var|interface|type|enum)[ \t]+(\w+)",
+        re.MULTILINE,
+    ),
+    "rust": re.compile(r"^pub[ \t]+(?:fn|struct|enum|trait|mod|type)[ \t]+(\w+)", re.MULTILINE),
+    "go": re.compile(r"^(?:func|type)[ \t]+(?:\([^)]*\)[ \t]*)?([A-Z]\w*)", re.MULTILINE),
+}
+_SYMBOLS["typescript"] = _SYMBOLS["javascript"]
+
+_JS_EXTENSIONS = ("", ".ts", ".tsx", ".js", ".jsx", ".mjs", "/index.ts", "/index.tsx", "/index.js")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT,
+    lang TEXT,
+    imports TEXT,
+    symbols TEXT,
+    component TEXT,
+    component_rule TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS idx_files_name ON files (name);
+CREATE INDEX IF NOT EXISTS idx_files_component ON files (component, path);
+CREATE INDEX IF NOT EXISTS idx_files_path_component ON files (path, component);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS edges (
+    src TEXT NOT NULL,
+    dst TEXT NOT NULL,
+    PRIMARY KEY (src, dst)
+);
+CREATE INDEX IF NOT EXISTS idx_edges_dst ON edges (dst);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+
+def default_index_path(root: str | Path) -> Path:
+    """Per-project index file under ~/.config/atlastrinity/data/workspace_index"""
+    root = Path(root).resolve()
+    digest = hashlib.sha1(str(root).encode()).hexdigest()[:12]
+    base = Path.home() / ".config" / "atlastrinity" / "data" / "workspace_index"
+    return base / f"{root.name or 'root'}-{digest}.db"
+
+
+def extract_facts(text: str, lang: str) -> tuple[list[str], list[str]]:
+    """Imports and top-level symbols of a source file.
+
+    Python from-imports are kept as ``module:name1,name2`` so a name can later
+    be resolved to a submodule; everything else is the imported specifier.
+    """
+    imports: list[str] = []
+    pattern = _IMPORTS.get(lang)
+    if pattern:
+        for match in pattern.finditer(text):
+            if lang == "python":
+                module, names, plain = match.groups()
+                if plain:
+                    imports.extend(m.strip() for m in plain.split(","))
+                elif module is not None:
+                    names = ",".join(n.split()[0] for n in names.split(",") if n.split())
+                    imports.append(f"{module}:{names}")
+            else:
+                imports.append(next(g for g in match.groups() if g))
+    symbols_pattern = _SYMBOLS.get(lang)
+    symbols = symbols_pattern.findall(text)[:MAX_SYMBOLS] if symbols_pattern else []
+    return list(dict.fromkeys(imports)), symbols
+
+
+class IgnoreRules:
+    """Directory names that are never entered plus the root .gitignore patterns.
+
+    Supported .gitignore syntax: blank lines and comments, ``name`` (any
+    level), ``dir/`` (directories only), ``/anchored`` and ``a/b`` paths, and
+    shell wildcards. Negation (``!``) is not supported and is skipped. The
+    patterns are compiled into one regex per kind, so a check costs at most
+    four matches whatever the size of the .gitignore.
+    """
+
+    def __init__(self, root: Path, extra_dirs: Iterable[str] = ()):
+        self.dir_names = DEFAULT_IGNORED_DIRS | set(extra_dirs)
+        patterns: dict[tuple[bool, bool], list[str]] = {}  # (path pattern, dirs only)
+        try:
+            lines = (root / ".gitignore").read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError):
+            lines = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith(("#", "!")):
+                continue
+            dirs_only = line.endswith("/")
+            anchored = line.startswith("/") or "/" in line.strip("/")
+            line = line.strip("/")
+            if line:
+                patterns.setdefault((anchored, dirs_only), []).append(fnmatch.translate(line))
+        self._rules = {
+            kind: re.compile("|".join(parts)) for kind, parts in patterns.items() if parts
+        }
+
+    def ignored(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if is_dir and name in self.dir_names:
+            return True
+        for (anchored, dirs_only), rule in self._rules.items():
+            if (is_dir or not dirs_only) and rule.match(rel_path if anchored else name):
+                return True
+        return False
+
+
+class WorkspaceIndex:
+    """SQLite index of one project tree (one file, WAL mode)."""
+
+    def __init__(self, root: str | Path, db_path: str | Path | None = None):
+        self.root = Path(root).resolve()
+        self.db_path = Path(db_path) if db_path else default_index_path(self.root)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript(
+                "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS dirs;"
+                "DROP TABLE IF EXISTS edges; DROP TABLE IF EXISTS state;"
+                f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+        self.ignore = IgnoreRules(self.root)
+        # This object is the only writer while it is open: file signatures are
+        # kept in memory, and query results are cached until the next change
+        self._sigs: dict[str, tuple[int, int, str | None]] | None = None
+        self._cache: dict[str, tuple[int, Any]] = {}
+        self._modules: dict[str, str] | None = None
+        self.generation = 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "WorkspaceIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ----------------------------------------------------------------- refresh
+
+    def refresh(self, paths: Iterable[str] | None = None) -> dict[str, Any]:
+        """Bring the index up to date; only ``paths`` (relative to the root) if given.
+
+        Returns counts: files seen, added, updated (re-parsed), touched (mtime
+        changed, same content), removed, and the elapsed seconds.
+        """
+        t0 = time.perf_counter()
+        known = self._signatures()
+        if paths is None:
+            seen, dirs = self._walk()
+            removed = [path for path in known if path not in seen]
+        else:
+            seen, dirs, missing = self._stat_paths(paths)
+            removed = [path for path in missing if path in known]
+
+        upserts, touched = [], []
+        added = 0
+        for path, (mtime_ns, size) in seen.items():
+            old = known.get(path)
+            if old is not None and old[:2] == (mtime_ns, size):
+                continue
+            content = self._read(path, size)
+            digest = hashlib.blake2b(content, digest_size=16).hexdigest() if content else None
+            known[path] = (mtime_ns, size, digest)
+            if old is not None and digest is not None and digest == old[2]:
+                touched.append((mtime_ns, size, path))
+                continue
+            added += old is None
+            upserts.append(self._row(path, mtime_ns, size, digest, content))
+        for path in removed:
+            del known[path]
+
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL)",
+                    upserts,
+                )
+                self.conn.executemany(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", touched
+                )
+                self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+                self.conn.executemany("DELETE FROM edges WHERE src = ?", [(p,) for p in removed])
+                dirs_changed = self._store_dirs(dirs, full=paths is None)
+                if added or removed:
+                    self._modules = None
+                    self._resolve_edges(None)
+                elif upserts:
+                    self._resolve_edges([row[0] for row in upserts])
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES ('refreshed_at', ?)",
+                    (time.time(),),
+                )
+        except BaseException:
+            self._sigs = self._modules = None  # reload from the database next time
+            raise
+        if upserts or removed or dirs_changed:
+            self.generation += 1
+        return {
+            "files": len(known),
+            "added": added,
+            "updated": len(upserts) - added,
+            "touched": len(touched),
+            "removed": len(removed),
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+        }
+
+    def _signatures(self) -> dict[str, tuple[int, int, str | None]]:
+        """(mtime, size, hash) per indexed path, loaded once and kept up to date."""
+        if self._sigs is None:
+            self._sigs = {
+                row[0]: (row[1], row[2], row[3])
+                for row in self.conn.execute("SELECT path, mtime_ns, size, hash FROM files")
+            }
+        return self._sigs
+
+    def _walk(self) -> tuple[dict[str, tuple[int, int]], set[str]]:
+        """One scandir pass over the tree; ignored directories are not entered."""
+        seen: dict[str, tuple[int, int]] = {}
+        dirs: set[str] = set()
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                entries = os.scandir(self.root / rel_dir if rel_dir else self.root)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.ignore.ignored(rel, entry.name, True):
+                                dirs.add(rel)
+                                stack.append(rel)
+                        elif entry.is_file(follow_symlinks=False):
+                            if not self.ignore.ignored(rel, entry.name, False):
+                                st = entry.stat(follow_symlinks=False)
+                                seen[rel] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        return seen, dirs
+
+    def _stat_paths(
+        self, paths: Iterable[str]
+    ) -> tuple[dict[str, tuple[int, int]], set[str], list[str]]:
+        seen: dict[str, tuple[int, int]] = {}
+        dirs: set[str] = set()
+        removed = []
+        for path in paths:
+            rel = Path(path).as_posix().strip("/")
+            parts = rel.split("/")
+            if any(
+                self.ignore.ignored("/".join(parts[: i + 1]), part, True)
+                for i, part in enumerate(parts[:-1])
+            ) or self.ignore.ignored(rel, parts[-1], False):
+                continue
+            try:
+                st = os.stat(self.root / rel)
+            except OSError:
+                removed.append(rel)
+                continue
+            seen[rel] = (st.st_mtime_ns, st.st_size)
+            dirs.update("/".join(parts[:i]) for i in range(1, len(parts)))
+        return seen, dirs, removed
+
+    def _read(self, path: str, size: int) -> bytes:
+        if size > MAX_READ_BYTES:
+            return b""
+        try:
+            return (self.root / path).read_bytes()
+        except OSError:
+            return b""
+
+    def _row(
+        self, path: str, mtime_ns: int, size: int, digest: str | None, content: bytes
+    ) -> tuple[Any, ...]:
+        directory, _, name = path.rpartition("/")
+        suffix = os.path.splitext(name)[1].lower()
+        lang = LANGUAGES.get(suffix)
+        imports = symbols = None
+        if lang and content:
+            found_imports, found_symbols = extract_facts(content.decode("utf-8", "replace"), lang)
+            imports, symbols = json.dumps(found_imports), json.dumps(found_symbols)
+        return (path, directory, name, suffix, mtime_ns, size, digest, lang, imports, symbols)
+
+    def _store_dirs(self, dirs: set[str], *, full: bool) -> bool:
+        known = {row[0] for row in self.conn.execute("SELECT path FROM dirs")}
+        new, gone = dirs - known, (known - dirs if full else set())
+        self.conn.executemany(
+            "INSERT INTO dirs (path, parent) VALUES (?, ?)",
+            [(d, d.rpartition("/")[0]) for d in new],
+        )
+        self.conn.executemany("DELETE FROM dirs WHERE path = ?", [(d,) for d in gone])
+        return bool(new or gone)
+
+    # ----------------------------------------------------------- import edges
+
+    def _module_map(self) -> dict[str, str]:
+        """Python module name -> file, with and without a leading ``src.``
+
+        Built from the in-memory signatures and kept until files are added or removed.
+        """
+        if self._modules is not None:
+            return self._modules
+        modules: dict[str, str] = {}
+        for path in sorted(self._signatures()):
+            if not path.endswith(".py"):
+                continue
+            module = path[:-3].replace("/", ".")
+            module = module.removesuffix(".__init__")
+            modules.setdefault(module, path)
+            if module.startswith("src."):
+                modules.setdefault(module[4:], path)
+        self._modules = modules
+        return modules
+
+    def _resolve_edges(self, paths: list[str] | None) -> None:
+        """Recompute the import edges of ``paths`` (all source files if None)."""
+        query = "SELECT path, lang, imports FROM files WHERE imports IS NOT NULL"
+        if paths is None:
+            self.conn.execute("DELETE FROM edges")
+            rows = self.conn.execute(query).fetchall()
+        else:
+            self.conn.executemany("DELETE FROM edges WHERE src = ?", [(p,) for p in paths])
+            rows = []
+            for i in range(0, len(paths), 500):
+                chunk = paths[i : i + 500]
+                rows += self.conn.execute(
+                    f"{query} AND path IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+        modules = self._module_map()
+        files = self._signatures().keys()
+        edges = []
+        for path, lang, imports in rows:
+            for spec in json.loads(imports):
+                if lang == "python":
+                    targets = _resolve_python(spec, path, modules)
+                elif lang in ("javascript", "typescript"):
+                    targets = _resolve_js(spec, path, files)
+                else:
+                    targets = []
+                edges.extend((path, target) for target in targets if target != path)
+        self.conn.executemany("INSERT OR IGNORE INTO edges (src, dst) VALUES (?, ?)", edges)
+
+    # ------------------------------------------------------------------ query
+
+    def exists(self, path: str) -> bool:
+        return (
+            self.conn.execute("SELECT 1 FROM files WHERE path = ?", (path,)).fetchone() is not None
+        )
+
+    def files(
+        self,
+        under: str = "",
+        *,
+        suffix: str | None = None,
+        name: str | None = None,
+        recursive: bool = True,
+    ) -> list[str]:
+        """Indexed files below directory ``under`` (relative, "" for the root), by path."""
+        where, params = [], []
+        if under and recursive:
+            where.append("(dir = ? OR dir LIKE ? ESCAPE '\\')")
+            params += [under, _escape_like(under) + "/%"]
+        elif not recursive:
+            where.append("dir = ?")
+            params.append(under)
+        if suffix:
+            where.append("suffix = ?")
+            params.append(suffix)
+        if name:
+            where.append("name = ?")
+            params.append(name)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        return [
+            row[0]
+            for row in self.conn.execute(f"SELECT path FROM files{clause} ORDER BY path", params)
+        ]
+
+    def subdirs(self, under: str = "") -> list[str]:
+        """Names of the indexed (not ignored) directories directly in ``under``."""
+        return [
+            row[0].rpartition("/")[2]
+            for row in self.conn.execute(
+                "SELECT path FROM dirs WHERE parent = ? ORDER BY path", (under,)
+            )
+        ]
+
+    def assign_components(self, rule_key: str, rule: Callable[[str], str | None]) -> int:
+        """Store ``rule(path)`` as the component of every file not yet assigned by it.
+
+        ``rule_key`` names the rule (e.g. the project type); files assigned by a
+        different rule, or new and changed files, are assigned again. Returns
+        the number of files (re)assigned.
+        """
+        rows = self.conn.execute(
+            "SELECT path FROM files WHERE component_rule IS NOT ?", (rule_key,)
+        ).fetchall()
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE files SET component = ?, component_rule = ? WHERE path = ?",
+                    [(rule(path), rule_key, path) for (path,) in rows],
+                )
+            self.generation += 1
+        return len(rows)
+
+    def _cached(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Result of ``compute()``, reused until the index changes."""
+        hit = self._cache.get(key)
+        if hit is None or hit[0] != self.generation:
+            hit = self._cache[key] = (self.generation, compute())
+        return hit[1]
+
+    def components(self) -> list[str]:
+        """Assigned components, ordered by the first path that belongs to each."""
+        return list(
+            self._cached(
+                "components",
+                lambda: [
+                    row[0]
+                    for row in self.conn.execute(
+                        "SELECT component FROM files WHERE component IS NOT NULL "
+                        "GROUP BY component ORDER BY MIN(path)"
+                    )
+                ],
+            )
+        )
+
+    def component_of(self, paths: Iterable[str]) -> dict[str, str]:
+        """Component of each indexed path that has one."""
+        result: dict[str, str] = {}
+        paths = [Path(p).as_posix().strip("/") for p in paths]
+        for i in range(0, len(paths), 500):
+            chunk = paths[i : i + 500]
+            result.update(
+                self.conn.execute(
+                    "SELECT path, component FROM files WHERE component IS NOT NULL "
+                    f"AND path IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            )
+        return result
+
+    def dependencies(self) -> dict[str, list[str]]:
+        """Component -> components it imports from (internal imports only)."""
+
+        def compute() -> dict[str, list[str]]:
+            deps: dict[str, set[str]] = {}
+            for src, dst in self.conn.execute(
+                "SELECT DISTINCT a.component, b.component FROM edges "
+                "JOIN files a ON a.path = edges.src JOIN files b ON b.path = edges.dst "
+                "WHERE a.component IS NOT NULL AND b.component IS NOT NULL "
+                "AND a.component != b.component"
+            ):
+                deps.setdefault(src, set()).add(dst)
+            return {component: sorted(targets) for component, targets in sorted(deps.items())}
+
+        return {k: list(v) for k, v in self._cached("dependencies", compute).items()}
+
+    def dependents(self, paths: Iterable[str]) -> list[str]:
+        """Components with files that import any of ``paths``."""
+        paths = [Path(p).as_posix().strip("/") for p in paths]
+        found: set[str] = set()
+        for i in range(0, len(paths), 500):
+            chunk = paths[i : i + 500]
+            found.update(
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT DISTINCT files.component FROM edges "
+                    "JOIN files ON files.path = edges.src "
+                    f"WHERE files.component IS NOT NULL AND edges.dst IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return sorted(found)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _resolve_python(spec: str, importer: str, modules: dict[str, str]) -> list[str]:
+    module, _, names = spec.partition(":")
+    if module.startswith("."):
+        # relative to the importer's package (its directory), one level up per extra dot
+        level = len(module) - len(module.lstrip("."))
+        package = importer.split("/")[:-1]
+        if level - 1 > len(package):
+            return []
+        package = package[: len(package) - (level - 1)]
+        module = ".".join(part for part in (*package, module.lstrip(".")) if part)
+    targets = []
+    for name in names.split(",") if names else []:
+        target = modules.get(f"{module}.{name}" if module else name)
+        if target:
+            targets.append(target)
+    if not targets and module in modules:
+        targets.append(modules[module])
+    return targets
+
+
+def _resolve_js(spec: str, importer: str, files: Collection[str]) -> list[str]:
+    if not spec.startswith("."):
+        return []  # package import
+    base = os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace(os.sep, "/")
+    for ext in _JS_EXTENSIONS:
+        if base + ext in files:
+            return [base + ext]
+    return []
@@ -0,0 +1,147 @@
+"""Benchmark: DataFrame -> table loading, iterrows path vs chunked bulk loader.
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+
+Usage:
+    python src/testing/benchmark_bulk_loader.py [rows]
+"""
+
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np
+import pandas as pd
+
+ROWS = 1_000_000
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    score = rng.random(rows)
+    score[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            "Company ID": np.arange(rows),
+            "Region Code": rng.integers(1, 27, rows),
+            "Score": score,
+            "Name": pd.Series(rng.integers(0, 50_000, rows)).map("company-{}".format),
+            "Registered": pd.Timestamp("2000-01-01")
+            + pd.to_timedelta(rng.integers(0, 9000, rows), "D"),
+            "Active": rng.random(rows) < 0.8,
+        }
+    )
+
+
+async def _legacy(manager, table: str, df: pd.DataFrame) -> None:
+    """The pre-loader implementation: iterrows -> list of dicts -> one execute()."""
+    from sqlalchemy import Boolean as SABoolean
+    from sqlalchemy import Column, DateTime, Float, Integer, MetaData, Table, Text, text
+
+    def map_dtype(col):
+        t = df[col].dtype
+        if pd.api.types.is_integer_dtype(t):
+            return Integer
+        if pd.api.types.is_float_dtype(t):
+            return Float
+        if pd.api.types.is_datetime64_any_dtype(t):
+            return DateTime
+        if pd.api.types.is_bool_dtype(t):
+            return SABoolean
+        return Text
+
+    safe = {c: str(c).lower().replace(" ", "_").replace("-", "_") for c in df.columns}
+    metadata = MetaData()
+    columns = [Column("row_id", Integer, primary_key=True, autoincrement=True)]
+    columns += [Column(safe[c], map_dtype(c)) for c in df.columns]
+
+    def sync_create(connection):
+        Table(table, metadata, *columns, extend_existing=True)
+        metadata.create_all(connection)
+
+    async with manager._engine.begin() as conn:
+        await conn.run_sync(sync_create)
+
+    async with await manager.get_session() as session:
+        data = []
+        for _, row in df.iterrows():
+            d = {}
+            for c in df.columns:
+                v = row[c]
+                d[safe[c]] = None if v is None or (isinstance(v, float) and np.isnan(v)) else v
+            data.append(d)
+        cols = ", ".join(f'"{safe[c]}"' for c in df.columns)
+        marks = ", ".join(f":{safe[c]}" for c in df.columns)
+        await session.execute(text(f'INSERT INTO "{table}" ({cols}) VALUES ({marks})'), data)
+        await session.commit()
+
+
+async def _run_mode(mode: str, rows: int) -> dict:
+    from sqlalchemy import text
+
+    from src.brain.memory.db.manager import DatabaseManager
+
+    df = _frame(rows)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager()
+        manager.db_url = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        await manager.initialize()
+        if mode == "legacy":
+            # The old path cannot bind pandas Timestamps at all; give it strings
+            df["Registered"] = df["Registered"].astype(str)
+        t0 = time.perf_counter()
+        if mode == "legacy":
+            await _legacy(manager, "bench", df)
+        else:
+            assert await manager.create_table_from_df("bench", df)
+        elapsed = time.perf_counter() - t0
+        async with await manager.get_session() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM bench"))).scalar()
+        await manager.close()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "mode": mode,
+        "rows": count,
+        "seconds": elapsed,
+        "rows_per_sec": count / elapsed,
+        "frame_rss_mb": rss_before / 1024,
+        "peak_rss_mb": rss_after / 1024,
+        "report": manager.last_load_report,
+    }
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        rows = int(sys.argv[3])
+        print(json.dumps(asyncio.run(_run_mode(sys.argv[2], rows))))
+        return
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    print(f"{rows:,} rows, 6 columns (int, int, float w/ NaN, str, datetime, bool)")
+    for mode in ("legacy", "bulk"):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, str(rows)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{r['mode']:<7} {r['seconds']:8.2f}s  {r['rows_per_sec']:>10,.0f} rows/s  "
+            f"peak RSS {r['peak_rss_mb']:7.0f}MB (frame alone {r['frame_rss_mb']:.0f}MB)"
+        )
+        if r["report"]:
+            print(f"{'':<7} {r['report']}")
+
+
+if __name__ == "__main__":
+    main()
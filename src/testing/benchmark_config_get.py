@@ -0,0 +1,113 @@
+"""Benchmark: config.get throughput, dotted-path walk vs compiled snapshot.
+
+Builds the configuration the brain runs with (built-in defaults merged with
+config/config.yaml.template) and times ``get`` for a mix of keys:
+- legacy:   split the dotted path, walk the nested dicts and run the
+            placeholder substitution on every call (the previous get)
+- compiled: ConfigSnapshot.get, one lookup in the flattened key map
+and ``SystemConfig.view`` for a typed section read.
+
+Usage:
+    python src/testing/benchmark_config_get.py [calls]
+"""
+
+import os
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import src.brain.config as brain_config  # noqa: E402
+
+CALLS = 200_000
+KEYS = [
+    ("scalar", "models.default"),
+    ("nested scalar", "agents.atlas.max_tokens"),
+    ("placeholder path", "system.workspace_path"),
+    ("missing key", "agents.atlas.nonexistent"),
+    ("section dict", "orchestrator"),
+]
+
+
+def _legacy_get(raw: dict, key_path: str, default: Any = None) -> Any:
+    """The previous SystemConfig.get (without the sequential-thinking special case)."""
+
+    def substitute(value: Any) -> Any:
+        if isinstance(value, str):
+
+            def replace_match(match):
+                var_name = match.group(1)
+                if var_name == "PROJECT_ROOT":
+                    return str(brain_config.PROJECT_ROOT)
+                if var_name == "CONFIG_ROOT":
+                    return str(brain_config.CONFIG_ROOT)
+                if var_name == "HOME":
+                    return str(Path.home())
+                return os.getenv(var_name, match.group(0))
+
+            return re.sub(r"\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}", replace_match, value)
+        if isinstance(value, list):
+            return [substitute(item) for item in value]
+        if isinstance(value, dict):
+            return {k: substitute(v) for k, v in value.items()}
+        return value
+
+    value: Any = raw
+    for key in key_path.split("."):
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            return default
+    return substitute(value)
+
+
+def main() -> None:
+    import yaml
+
+    from src.brain.config import deep_merge
+    from src.brain.config.config_loader import config
+    from src.brain.config.config_runtime import OrchestratorSettings
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else CALLS
+    template = PROJECT_ROOT / "config" / "config.yaml.template"
+    raw = deep_merge(config._get_defaults(), yaml.safe_load(template.read_text()) or {})
+    config._install(raw)
+    print(f"config.get benchmark: {calls:,} calls per key, {len(config._snapshot.values)} keys")
+
+    header = f"{'':<50} {'legacy':>10} {'compiled':>10} {'speedup':>9}"
+    print(f"\n{header}\n{'-' * len(header)}")
+    for label, key in KEYS:
+        assert config.get(key) == _legacy_get(raw, key), key
+        legacy = min(timeit.repeat(lambda k=key: _legacy_get(raw, k), number=calls, repeat=3))
+        compiled = min(timeit.repeat(lambda k=key: config.get(k), number=calls, repeat=3))
+        print(
+            f"{label + ' (' + key + ')':<50} {legacy / calls * 1e9:>8.0f}ns"
+            f" {compiled / calls * 1e9:>8.0f}ns {legacy / compiled:>8.1f}x"
+        )
+
+    legacy = min(
+        timeit.repeat(
+            lambda: _legacy_get(raw, "orchestrator", {}).get("task_timeout", 1200.0),
+            number=calls,
+            repeat=3,
+        )
+    )
+    typed = min(
+        timeit.repeat(
+            lambda: config.view("orchestrator", OrchestratorSettings).task_timeout,
+            number=calls,
+            repeat=3,
+        )
+    )
+    print(
+        f"{'orchestrator task_timeout, dict vs view':<50} {legacy / calls * 1e9:>8.0f}ns"
+        f" {typed / calls * 1e9:>8.0f}ns {legacy / typed:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
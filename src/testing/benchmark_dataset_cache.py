@@ -0,0 +1,119 @@
+"""Benchmark: data-analysis tool session, per-call parsing vs the Arrow dataset cache.
+
+Generates an N-row CSV (default 1,500,000 rows) and runs the tool chain an
+analyst session issues against one file:
+    read_metadata -> analyze_dataset -> generate_statistics -> data_aggregation
+    -> data_aggregation (filtered) -> create_visualization -> interpret_column_data
+- legacy: the previous _load_dataframe (pd.read_csv on every call)
+- cached: FRAME_CACHE (first full load converts to Arrow IPC, later calls
+          memory-map it with column projection / filter pushdown)
+A second cached session on the warm cache shows steady state.
+
+Usage:
+    python src/testing/benchmark_dataset_cache.py [rows]
+"""
+
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+ROWS = 1_500_000
+
+
+def _write(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(11)
+    pd.DataFrame(
+        {
+            "edrpou": 30_000_000 + np.arange(rows),
+            "region": rng.choice(["Київ", "Львів", "Одеса", "Харків", "Дніпро"], rows),
+            "year": rng.integers(2010, 2025, rows),
+            "employees": rng.integers(1, 500, rows),
+            "revenue": rng.random(rows) * 1e6,
+            "profit": rng.normal(0, 1e4, rows),
+            "name": "ТОВ Компанія " + pd.Series(np.arange(rows) % 90_000).astype(str),
+        }
+    ).to_csv(path, index=False)
+
+
+def _legacy_load(data_source: str, **kwargs):
+    """The previous _load_dataframe body for local CSV files."""
+    kwargs.pop("columns", None)
+    kwargs.pop("filters", None)
+    try:
+        return pd.read_csv(Path(data_source), **kwargs), None
+    except Exception as e:
+        return None, f"Failed to load data: {e!s}"
+
+
+def _session(server, source: str) -> list[tuple[str, float]]:
+    calls = [
+        ("read_metadata", lambda: server.read_metadata(source)),
+        ("analyze_dataset", lambda: server.analyze_dataset(source, "summary")),
+        ("generate_statistics", lambda: server.generate_statistics(source)),
+        ("data_aggregation", lambda: server.data_aggregation(source, "region")),
+        (
+            "aggregation+filter",
+            lambda: server.data_aggregation(
+                source, "region", ["mean"], filters=[["year", ">=", 2020]]
+            ),
+        ),
+        (
+            "create_visualization",
+            lambda: server.create_visualization(source, "histogram", x_axis="revenue"),
+        ),
+        ("interpret_column_data", lambda: server.interpret_column_data(source, ["region"])),
+    ]
+    timings = []
+    for name, call in calls:
+        t0 = time.perf_counter()
+        result = asyncio.run(call())
+        assert result.get("success"), (name, result.get("error"))
+        timings.append((name, time.perf_counter() - t0))
+    return timings
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    from src.mcp_server import data_analysis_server as server
+    from src.mcp_server.dataset_cache import DatasetCache
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "companies.csv"
+        _write(source, rows)
+        print(
+            f"Dataset cache benchmark: {rows:,} rows "
+            f"({source.stat().st_size / 1e6:.0f} MB CSV), 7-call tool session\n"
+        )
+
+        cached_load = server._load_dataframe
+        server._load_dataframe = _legacy_load
+        legacy = _session(server, str(source))
+        server._load_dataframe = cached_load
+
+        server.FRAME_CACHE = DatasetCache(Path(tmp) / "frames")
+        cold = _session(server, str(source))
+        warm = _session(server, str(source))
+
+        header = f"{'call':<22} {'legacy':>9} {'cached':>9} {'warm':>9}"
+        print(header)
+        print("-" * len(header))
+        for (name, a), (_, b), (_, c) in zip(legacy, cold, warm, strict=True):
+            print(f"{name:<22} {a:>8.2f}s {b:>8.2f}s {c:>8.2f}s")
+        totals = [sum(t for _, t in timings) for timings in (legacy, cold, warm)]
+        print("-" * len(header))
+        print(f"{'session':<22} {totals[0]:>8.2f}s {totals[1]:>8.2f}s {totals[2]:>8.2f}s")
+        print(f"\ncache: {server.FRAME_CACHE.info()}")
+
+
+if __name__ == "__main__":
+    main()
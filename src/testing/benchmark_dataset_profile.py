@@ -0,0 +1,137 @@
+"""Benchmark: summary statistics from persisted column sketches vs exact pandas passes.
+
+Generates an N-row Parquet file (default 10,000,000 rows) and answers the
+statistics the data-analysis tools report (describe + variance/skew/kurtosis,
+distinct counts, frequent values):
+- exact:    pandas over the fully loaded frame, recomputed on every query
+- profile:  ProfileStore (one chunk-wise sketch pass, persisted), then repeated
+            queries served from the stored sketches
+Both also answer a filtered partition (year >= 2020). Accuracy of the
+approximate parts (quartiles, distinct counts) is printed alongside.
+
+Usage:
+    python src/testing/benchmark_dataset_profile.py [rows]
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+ROWS = 10_000_000
+FILTERS = [["year", ">=", 2020]]
+
+
+def _write(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(17)
+    pd.DataFrame(
+        {
+            "region": rng.choice(["Київ", "Львів", "Одеса", "Харків", "Дніпро"], rows),
+            "year": rng.integers(2010, 2025, rows),
+            "employees": rng.integers(1, 5_000, rows),
+            "revenue": rng.lognormal(10, 1.5, rows),
+            "profit": rng.normal(0, 1e4, rows),
+        }
+    ).to_parquet(path)
+
+
+def _exact(df: pd.DataFrame) -> dict:
+    numeric = df.select_dtypes(include=[np.number])
+    return {
+        "describe": numeric.describe(),
+        "shape": {c: (numeric[c].var(), numeric[c].skew(), numeric[c].kurt()) for c in numeric},
+        "distinct": df.nunique().to_dict(),
+        "top": df["region"].value_counts().to_dict(),
+    }
+
+
+def _sketched(profile) -> dict:
+    return {
+        "describe": pd.DataFrame(profile.describe()),
+        "shape": {c: profile.shape_stats(c) for c in profile.numeric_columns},
+        "distinct": {c: s.distinct for c, s in profile.columns.items()},
+        "top": dict(profile.columns["region"].topk.top(10)),
+    }
+
+
+def _timed(call):
+    t0 = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - t0
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    from src.mcp_server.data_analysis_server import _read_source
+    from src.mcp_server.dataset_cache import DatasetCache
+    from src.mcp_server.dataset_profile import ProfileStore
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "companies.parquet"
+        _write(source, rows)
+        print(f"Dataset profile benchmark: {rows:,} rows, 5 columns\n")
+
+        def exact_query(filtered: bool = False) -> dict:
+            df = pd.read_parquet(source)
+            if filtered:
+                df = df[df["year"] >= 2020]
+            return _exact(df)
+
+        exact, t_exact = _timed(exact_query)
+        exact_part, t_exact_part = _timed(lambda: exact_query(filtered=True))
+
+        cache = DatasetCache(Path(tmp) / "frames", background=False)
+        store = ProfileStore(Path(tmp) / "profiles")
+        profile, t_build = _timed(lambda: store.profile(cache, source, _read_source))
+        # a fresh store (new server process) reads the persisted sketches
+        reloaded, t_load = _timed(
+            lambda: ProfileStore(Path(tmp) / "profiles").profile(cache, source, _read_source)
+        )
+        sketched, t_answer = _timed(lambda: _sketched(reloaded))
+        part, t_part = _timed(lambda: store.profile(cache, source, _read_source, filters=FILTERS))
+        _, t_part_again = _timed(
+            lambda: store.profile(cache, source, _read_source, filters=FILTERS)
+        )
+
+        header = f"{'query':<28} {'exact':>9} {'profile':>9}"
+        print(header)
+        print("-" * len(header))
+        print(f"{'first query (full file)':<28} {t_exact:>8.2f}s {t_build:>8.2f}s")
+        print(f"{'repeated query':<28} {t_exact:>8.2f}s {t_load + t_answer:>8.3f}s")
+        print(f"{'filtered partition (first)':<28} {t_exact_part:>8.2f}s {t_part:>8.2f}s")
+        print(f"{'filtered partition (again)':<28} {t_exact_part:>8.2f}s {t_part_again:>8.3f}s")
+
+        quartiles = ["25%", "50%", "75%"]
+        want = exact["describe"]
+        got = sketched["describe"][want.columns]
+        quartile_error = float(
+            (abs(got.loc[quartiles] - want.loc[quartiles]) / want.loc["std"]).max().max()
+        )
+        moment_error = max(
+            abs(sketched["shape"][c]["variance"] - exact["shape"][c][0]) / exact["shape"][c][0]
+            for c in want.columns
+        )
+        distinct_error = max(
+            abs(sketched["distinct"][c] - n) / n for c, n in exact["distinct"].items()
+        )
+        part_mean = part.columns["revenue"].moments.mean
+        part_error = abs(part_mean - exact_part["describe"]["revenue"]["mean"]) / part_mean
+        print(
+            f"\naccuracy: quartiles {quartile_error:.1e} std, variance {moment_error:.1e} rel, "
+            f"distinct {distinct_error:.2%}, top values exact: {sketched['top'] == exact['top']}, "
+            f"partition mean {part_error:.1e} rel"
+        )
+        size = sum(p.stat().st_size for p in (Path(tmp) / "profiles").glob("*.json"))
+        print(f"stored sketches: {size / 1e3:.0f} KB for {len(store._memory)} profiles")
+
+
+if __name__ == "__main__":
+    main()
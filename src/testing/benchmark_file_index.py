@@ -0,0 +1,167 @@
+"""Benchmark: workspace file lookups, directory walks vs the file index.
+
+Generates a synthetic tree of N files (default 200,000; 40 files per
+directory, three levels deep, mixed extensions) and compares:
+- legacy: what context gathering did, os.walk + fnmatch on every lookup
+- index:  FileIndexService; the initial scan (memory only and with the
+          files table in a temporary SQLite database), a refresh with nothing
+          changed, a refresh after 100 files were added, and in-memory glob,
+          extension, recency and trigram name queries
+
+Usage:
+    python src/testing/benchmark_file_index.py [files]
+"""
+
+import asyncio
+import fnmatch
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+FILES = 200_000
+PER_DIR = 40
+REPEAT = 3
+EXTENSIONS = [".py", ".ts", ".md", ".json", ".txt", ".yaml", ".html", ".css"]
+WORDS = ["config", "loader", "service", "handler", "utils", "model", "view", "client"]
+
+
+def _generate(root: Path, count: int) -> None:
+    for i in range(count):
+        d = i // PER_DIR
+        directory = root / f"pkg{d // 2500:02d}" / f"mod{d // 50 % 50:02d}" / f"part{d % 50:02d}"
+        if i % PER_DIR == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        name = f"{WORDS[i % 8]}_{WORDS[i // 8 % 8]}_{i}{EXTENSIONS[i % len(EXTENSIONS)]}"
+        (directory / name).write_bytes(b"x" * (i % 512))
+
+
+def _walk(root: Path, predicate) -> list[str]:
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        found += [os.path.join(dirpath, f) for f in filenames if predicate(f)]
+    return found
+
+
+def _median_s(fn, repeat: int = REPEAT) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def main() -> None:
+    from src.brain.memory.db.manager import DatabaseManager
+    from src.brain.memory.file_index import FileIndexService
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else FILES
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        t0 = time.perf_counter()
+        _generate(root, count)
+        print(
+            f"File index benchmark: {count:,} files (generated in {time.perf_counter() - t0:.1f}s)"
+        )
+
+        queries = {
+            "glob **/config_*.py": (
+                lambda f: fnmatch.fnmatch(f, "config_*.py"),
+                lambda s: s.glob("**/config_*.py", limit=None),
+            ),
+            "extension .md": (
+                lambda f: f.endswith(".md"),
+                lambda s: s.by_extension(".md", limit=None),
+            ),
+            "20 most recent": (
+                None,
+                lambda s: s.recent(20),
+            ),
+            "name contains 'loader_12'": (
+                lambda f: "loader_12" in f.lower(),
+                lambda s: s.search("loader_12", limit=20),
+            ),
+        }
+
+        def recent_walk():
+            paths = _walk(root, lambda f: True)
+            return sorted(paths, key=os.path.getmtime, reverse=True)[:20]
+
+        legacy = {}
+        for name, (predicate, _) in queries.items():
+            fn = recent_walk if predicate is None else (lambda p=predicate: _walk(root, p))
+            legacy[name] = _median_s(fn, 1 if predicate is None else REPEAT)
+
+        service = FileIndexService([root], watch=False, poll_interval=0)
+        scan_s = _median_s(lambda: asyncio.run(_fresh_start(service)), 1)
+
+        async def with_db():
+            manager = DatabaseManager()
+            manager.db_url = f"sqlite+aiosqlite:///{tmp}/index.db"
+            await manager.initialize()
+            db_service = FileIndexService([root], db=manager, watch=False, poll_interval=0)
+            t0 = time.perf_counter()
+            await db_service.start()
+            cold = time.perf_counter() - t0
+            restarted = FileIndexService([root], db=manager, watch=False, poll_interval=0)
+            t0 = time.perf_counter()
+            await restarted.start()
+            warm = time.perf_counter() - t0
+            await manager.close()
+            return cold, warm
+
+        db_cold_s, db_warm_s = asyncio.run(with_db())
+
+        service.full_scan_interval = float("inf")
+        unchanged_s = _median_s(lambda: asyncio.run(service.refresh()))
+        batches = iter(range(10**6))
+
+        def add_files():
+            batch = next(batches)
+            for i in range(100):
+                (root / f"pkg00/mod00/part{i % 10:02d}/new_{batch}_{i}.py").write_text("x\n")
+            return asyncio.run(service.refresh())
+
+        changed_s = _median_s(add_files)
+        indexed = {
+            name: _median_s(lambda q=query: q(service)) for name, (_, query) in queries.items()
+        }
+        for name, (predicate, query) in queries.items():
+            if predicate is not None:
+                expected = len(_walk(root, predicate))
+                got = sum(predicate(e.name) for e in query(service))
+                assert got == (min(expected, 20) if "contains" in name else expected), name
+
+    header = f"{'':<40} {'legacy walk':>12} {'index':>10} {'speedup':>9}"
+    print(f"\n{header}\n{'-' * len(header)}")
+    for name in queries:
+        print(
+            f"{name:<40} {legacy[name] * 1000:>10.1f}ms {indexed[name] * 1000:>8.2f}ms"
+            f" {legacy[name] / indexed[name]:>8.0f}x"
+        )
+    print(f"\n{'index maintenance':<40} {'time':>12}\n{'-' * 53}")
+    for name, seconds in [
+        ("initial scan, memory only", scan_s),
+        ("initial scan + files table (empty)", db_cold_s),
+        ("restart, files table already current", db_warm_s),
+        ("refresh, nothing changed", unchanged_s),
+        ("refresh, 100 files added", changed_s),
+    ]:
+        print(f"{name:<40} {seconds:>11.3f}s")
+    print(f"\n{service.status()['entries']:,} entries, {service.workers} scan workers")
+
+
+async def _fresh_start(service) -> None:
+    service.ready = False
+    await service.start()
+
+
+if __name__ == "__main__":
+    main()
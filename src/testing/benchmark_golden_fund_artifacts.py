@@ -0,0 +1,113 @@
+"""Benchmark: Golden Fund raw artifacts, per-run copies vs the content-addressed store.
+
+Re-ingests one N-row CSV source (default 300,000 rows) R times and parses it
+into batches each time, as ingest_dataset does:
+- legacy:    copy to RAW_DIR/<run_id>_raw.csv, then DataParser.iter_batches
+- artifacts: ArtifactStore.put_file under the source's ref (hash, dedup, zstd),
+             then ArtifactStore.iter_batches (mmap parse, Arrow parse cache)
+             and the scheduled ArtifactStore.maybe_gc
+for two feeds:
+- identical: the publisher re-serves the same bytes every run
+- modified:  one record changes between runs (new content each time)
+
+Reports wall time per run and bytes kept on disk after all runs, with no
+manual gc: only what the store cleans up on its own is freed.
+
+Usage:
+    python src/testing/benchmark_golden_fund_artifacts.py [rows] [runs]
+"""
+
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+ROWS = 300_000
+RUNS = 5
+BATCH_SIZE = 50_000
+
+
+def _csv(rows: int) -> bytes:
+    lines = ["edrpou,name,city,amount,registered"] + [
+        f"{30_000_000 + i},ТОВ Компанія {i % 40_000},Київ,{i * 17 % 100_000}.50,"
+        f"20{i % 24:02d}-0{1 + i % 9}-1{i % 10}"
+        for i in range(rows)
+    ]
+    return "\n".join(lines).encode()
+
+
+def _modified(payload: bytes, run: int) -> bytes:
+    head, _, rest = payload.partition(b"\n")
+    first, _, tail = rest.partition(b"\n")
+    return b"\n".join([head, first.replace(b"50,", f"{run:02d},".encode(), 1), tail])
+
+
+def _disk(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else RUNS
+    logging.disable(logging.INFO)
+    from src.mcp_server.golden_fund.lib.parser import DataParser
+    from src.mcp_server.golden_fund.lib.storage.artifacts import ArtifactStore
+
+    parser = DataParser()
+    base = _csv(rows)
+    print(
+        f"Golden Fund artifact benchmark: {rows:,} rows ({len(base) / 1e6:.1f} MB CSV), "
+        f"{runs} ingestions per feed\n"
+    )
+    header = (
+        f"{'feed':<10} {'mode':<10} {'first run':>10} {'later runs':>11} {'disk MB':>8} {'rows':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for feed in ("identical", "modified"):
+        payloads = [base if feed == "identical" else _modified(base, i) for i in range(runs)]
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            download = root / "download.csv"
+            results = {}
+
+            raw_dir = root / "raw"
+            raw_dir.mkdir()
+            times = []
+            for i, payload in enumerate(payloads):
+                download.write_bytes(payload)
+                t0 = time.perf_counter()
+                raw_file = raw_dir / f"run{i}_raw.csv"
+                shutil.copyfile(download, raw_file)
+                n = sum(len(b) for b in parser.iter_batches(raw_file, "csv", BATCH_SIZE))
+                times.append(time.perf_counter() - t0)
+            results["legacy"] = (times, _disk(raw_dir), n)
+
+            store = ArtifactStore(root / "artifacts")
+            times = []
+            for payload in payloads:
+                download.write_bytes(payload)
+                t0 = time.perf_counter()
+                artifact = store.put_file(download, "ingest/https://data.gov.ua/r.csv", move=True)
+                n = sum(len(b) for b in store.iter_batches(artifact.sha256, parser, "csv"))
+                store.maybe_gc()
+                times.append(time.perf_counter() - t0)
+            results["artifacts"] = (times, _disk(root / "artifacts"), n)
+            store.close()
+
+            for mode, (times, disk, n) in results.items():
+                later = sum(times[1:]) / max(1, len(times) - 1)
+                print(
+                    f"{feed:<10} {mode:<10} {times[0]:>9.2f}s {later:>10.2f}s "
+                    f"{disk / 1e6:>8.1f} {n:>9,}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark: Golden Fund CKAN enrichment, serial loop vs the concurrent crawler.
+
+Serves a fake CKAN portal on localhost (package_search plus N CSV resources,
+each answered after an artificial latency; a few resources are byte-identical
+mirrors) and ingests every resource with ["parse", "store_sql"]:
+- serial:  the previous RecursiveEnricher loop - one ingest_dataset(url) per
+           package, download then parse/store, one after another
+- crawler: EnrichmentCrawler worker pool, first run (downloads + ingests)
+- rerun:   the crawler again with revisit_after=0 - every URL revalidates with
+           If-None-Match and is answered 304
+
+Usage:
+    python src/testing/benchmark_golden_fund_crawler.py [resources] [latency_s]
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+RESOURCES = 24
+LATENCY = 0.25
+ROWS = 2_000
+MIRRORS = 4  # resources whose bytes repeat an earlier one
+
+
+def _csv(seed: int) -> bytes:
+    lines = ["edrpou,name,city,amount"] + [
+        f"{30_000_000 + seed * ROWS + i},ТОВ Компанія {seed}-{i},Київ,{i * 17 % 1000}"
+        for i in range(ROWS)
+    ]
+    return "\n".join(lines).encode()
+
+
+def _serve(files: dict[str, bytes], latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path.endswith("/package_search"):
+                rows = int(parse_qs(parts.query).get("rows", ["10"])[0])
+                base = f"http://{self.headers['Host']}/files"
+                packages = [
+                    {
+                        "id": name,
+                        "title": f"Реєстр компаній {name}",
+                        "resources": [{"format": "CSV", "url": f"{base}/{name}"}],
+                    }
+                    for name in list(files)[:rows]
+                ]
+                body = json.dumps({"success": True, "result": {"results": packages}}).encode()
+                self._send(200, body, {})
+                return
+            time.sleep(latency)
+            body = files[parts.path.rsplit("/", 1)[-1]]
+            etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", {"ETag": etag})
+            else:
+                self._send(200, body, {"ETag": etag})
+
+        def _send(self, status, body, headers):
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else RESOURCES
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else LATENCY
+    logging.disable(logging.WARNING)
+    from src.mcp_server.golden_fund.lib.connectors.ckan_connector import CKANConnector
+    from src.mcp_server.golden_fund.lib.crawler import EnrichmentCrawler
+    from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+    from src.mcp_server.golden_fund.tools.ingest import ingest_dataset
+
+    files = {f"r{i:03d}.csv": _csv(i % (n - MIRRORS)) for i in range(n)}
+    server = _serve(files, latency)
+    base = f"http://127.0.0.1:{server.server_port}/api/3"
+    pipeline = ["parse", "store_sql"]
+    query = "реєстр компаній"
+    print(
+        f"Golden Fund crawler benchmark: {n} CSV resources x {ROWS:,} rows, "
+        f"{latency * 1000:.0f}ms latency, {MIRRORS} byte-identical mirrors\n"
+    )
+    header = f"{'mode':<10} {'wall':>8} {'ingested':>9} {'dup':>5} {'304':>5} {'MB':>6}"
+    print(header)
+    print("-" * len(header))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runtime = StorageRuntime(Path(tmp) / "serial")
+        ckan = CKANConnector(base)
+
+        async def serial() -> int:
+            done = 0
+            for pkg in ckan.search_packages(query, rows=n):
+                resource = ckan.find_resources_by_format(pkg, ["CSV", "JSON"])[0]
+                url = ckan.get_resource_url(resource)
+                outcome = await ingest_dataset(
+                    url, type="csv", process_pipeline=pipeline, runtime=runtime
+                )
+                done += outcome.success
+            return done
+
+        t0 = time.perf_counter()
+        done = asyncio.run(serial())
+        wall = time.perf_counter() - t0
+        total_mb = sum(len(b) for b in files.values()) / 1e6
+        print(f"{'serial':<10} {wall:>7.2f}s {done:>9} {0:>5} {0:>5} {total_mb:>6.1f}")
+        runtime.close()
+
+        runtime = StorageRuntime(Path(tmp) / "crawler")
+        crawler = EnrichmentCrawler(
+            ckan,
+            ingest_dataset,
+            runtime=runtime,
+            process_pipeline=pipeline,
+            rows=n,
+            max_items=n,
+            concurrency=8,
+            per_host=8,
+            host_interval=0.0,
+            revisit_after=0,
+        )
+        for mode in ("crawler", "rerun"):
+            t0 = time.perf_counter()
+            report = asyncio.run(crawler.crawl(query))
+            wall = time.perf_counter() - t0
+            counts = report.counts()
+            print(
+                f"{mode:<10} {wall:>7.2f}s {counts.get('ingested', 0):>9} "
+                f"{counts.get('duplicate', 0):>5} {counts.get('not_modified', 0):>5} "
+                f"{report.bytes / 1e6:>6.1f}"
+            )
+        crawler.close()
+        runtime.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Benchmark: Golden Fund keyword indexing, legacy FTS5 table vs external-content engine.
+
+Indexes N synthetic registry records (the shape KeywordSink produces) with:
+- legacy:  self-contained FTS5 table, per-row INSERT OR REPLACE in a Python loop
+- engine:  compact document table + external-content FTS5, executemany batches,
+           automerge, a final 'optimize', BM25 column weights and snippets
+
+Then runs the same query mix against both and reports throughput, on-disk
+size and query latency percentiles.
+
+Usage:
+    python src/testing/benchmark_golden_fund_fts.py [docs]
+"""
+
+import json
+import logging
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+DOCS = 1_000_000
+BATCH = 10_000
+QUERIES = 300
+
+_CITIES = ["Київ", "Львів", "Одеса", "Харків", "Дніпро", "Запоріжжя", "Вінниця", "Полтава"]
+_WORDS = [
+    "будівельна",
+    "компанія",
+    "агро",
+    "торгівля",
+    "логістика",
+    "енерго",
+    "фармація",
+    "сервіс",
+    "металург",
+    "транспорт",
+    "інвест",
+    "технології",
+]
+
+
+def _docs(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    for i in range(n):
+        name = f"ТОВ {rng.choice(_WORDS).capitalize()} {rng.choice(_WORDS)} {i % 50_000}"
+        rec = {
+            "edrpou": str(10_000_000 + i),
+            "name": name,
+            "city": rng.choice(_CITIES),
+            "kved": f"{rng.randint(1, 99)}.{rng.randint(10, 99)}",
+        }
+        yield {
+            "id": f"bench_{i}",
+            "title": name,
+            "content": " ".join(f"{k}:{v}" for k, v in rec.items()),
+            "description": "Part of dataset bench",
+            **rec,
+        }
+
+
+def _batches(n: int):
+    batch = []
+    for doc in _docs(n):
+        batch.append(doc)
+        if len(batch) == BATCH:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _legacy_index(db: Path, n: int) -> float:
+    """The pre-engine SearchStorage.index_documents, one call per batch."""
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS golden_fund_index USING fts5("
+            "id, title, content, description, source_json UNINDEXED)"
+        )
+    t0 = time.perf_counter()
+    for batch in _batches(n):
+        with sqlite3.connect(db) as conn:
+            for item in batch:
+                conn.execute(
+                    "INSERT OR REPLACE INTO golden_fund_index "
+                    "(id, title, content, description, source_json) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        item["id"],
+                        item["title"],
+                        item["content"],
+                        item["description"],
+                        json.dumps(item, ensure_ascii=False),
+                    ),
+                )
+            conn.commit()
+    return time.perf_counter() - t0
+
+
+def _legacy_search(conn: sqlite3.Connection, query: str) -> int:
+    rows = conn.execute(
+        "SELECT id, source_json, rank FROM golden_fund_index "
+        "WHERE golden_fund_index MATCH ? ORDER BY rank LIMIT 10",
+        (query.replace('"', '""'),),
+    ).fetchall()
+    for row in rows:
+        json.loads(row[1])
+    return len(rows)
+
+
+def _queries(rng: random.Random) -> list[str]:
+    out = []
+    for _ in range(QUERIES):
+        kind = rng.random()
+        if kind < 0.4:
+            out.append(str(10_000_000 + rng.randrange(DOCS)))  # exact EDRPOU
+        elif kind < 0.8:
+            out.append(f"{rng.choice(_WORDS)} {rng.choice(_CITIES)}")  # two terms
+        else:
+            out.append(rng.choice(_WORDS))  # common single term
+    return out
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+
+def _time_queries(fn, queries: list[str]) -> dict:
+    times, hits = [], 0
+    for q in queries:
+        t0 = time.perf_counter()
+        hits += fn(q)
+        times.append(time.perf_counter() - t0)
+    return {"p50": _pct(times, 0.5), "p95": _pct(times, 0.95), "hits": hits}
+
+
+def _size(db: Path) -> float:
+    return sum(p.stat().st_size for p in db.parent.glob(db.name + "*")) / 1024 / 1024
+
+
+def main() -> None:
+    global DOCS
+    DOCS = int(sys.argv[1]) if len(sys.argv) > 1 else DOCS
+    logging.disable(logging.INFO)
+    from src.mcp_server.golden_fund.lib.storage.fts import FTSConfig
+    from src.mcp_server.golden_fund.lib.storage.search import SearchStorage
+
+    queries = _queries(random.Random(3))
+    print(f"Golden Fund FTS benchmark: {DOCS:,} documents, {len(queries)} queries\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = Path(tmp) / "legacy.db"
+        legacy_s = _legacy_index(legacy_db, DOCS)
+        with sqlite3.connect(legacy_db) as conn:
+            legacy_q = _time_queries(lambda q: _legacy_search(conn, q), queries)
+        legacy_mb = _size(legacy_db)
+
+        engine_db = Path(tmp) / "engine.db"
+        store = SearchStorage(
+            db_path=engine_db, fts_config=FTSConfig(batch_size=BATCH, optimize_every=0)
+        )
+        t0 = time.perf_counter()
+        for batch in _batches(DOCS):
+            store.index_documents(batch)
+        engine_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        store.optimize()
+        optimize_s = time.perf_counter() - t0
+        engine_q = _time_queries(lambda q: store.search(q).data["total"], queries)
+        store.close()
+        engine_mb = _size(engine_db)
+
+    header = f"{'mode':<8} {'index s':>9} {'docs/s':>9} {'size MB':>9} {'q p50':>9} {'q p95':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, secs, mb, q in (
+        ("legacy", legacy_s, legacy_mb, legacy_q),
+        ("engine", engine_s, engine_mb, engine_q),
+    ):
+        print(
+            f"{name:<8} {secs:>9.1f} {DOCS / secs:>9,.0f} {mb:>9.1f} "
+            f"{q['p50']:>7.2f}ms {q['p95']:>7.2f}ms"
+        )
+    print(
+        f"\nengine optimize: {optimize_s:.1f}s; hits legacy={legacy_q['hits']} engine={engine_q['hits']}"
+    )
+    print(f"Indexing speedup: {legacy_s / engine_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
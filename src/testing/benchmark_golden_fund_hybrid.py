@@ -0,0 +1,215 @@
+"""Benchmark: Golden Fund search quality and latency, waterfall vs hybrid retrieval.
+
+Builds a synthetic labeled corpus - a company registry ingested with
+["store_sql"] only (as large reference registries usually are) and a contracts
+table referencing it ingested with ["store_sql", "keyword_index"] - then
+scores a graded query set with nDCG@10 for:
+- keyword:   FTS5 only
+- waterfall: the previous search_golden_fund default - keyword, then vector
+             only if keyword found nothing, then the structured SQL fallback
+- hybrid:    all sources concurrently, RRF-fused and deduplicated
+
+The vector source is whatever the environment provides; without chromadb it
+is reported unavailable and the comparison covers keyword + structured.
+
+Usage:
+    python src/testing/benchmark_golden_fund_hybrid.py [companies]
+"""
+
+import asyncio
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+COMPANIES = 5_000
+QUERIES_PER_KIND = 40
+
+_PREFIXES = ["Агро", "Енерго", "Буд", "Мет", "Фарм", "Транс", "Інвест", "Теле"]
+_ROOTS = ["сервіс", "торг", "постач", "пром", "трейд", "альянс"]
+_TAGS = ["Альфа", "Вега", "Оріон", "Сігма", "Дельта", "Гамма", "Омега", "Зеніт", "Атлас", "Бриз"]
+_CITIES = ["Київ", "Львів", "Одеса", "Харків", "Дніпро", "Вінниця"]
+_SUBJECTS = ["поставка обладнання", "ремонт доріг", "закупівля палива", "послуги охорони"]
+
+
+def _corpus(n: int, seed: int = 5) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = random.Random(seed)
+    registry = pd.DataFrame(
+        {
+            "edrpou": [str(30_000_000 + i * 7) for i in range(n)],
+            "name": [
+                f"{rng.choice(_PREFIXES)}{rng.choice(_ROOTS)} {rng.choice(_TAGS)}" for _ in range(n)
+            ],
+            "city": [rng.choice(_CITIES) for _ in range(n)],
+        }
+    )
+    suppliers = rng.choices(range(n), k=n)
+    contracts = pd.DataFrame(
+        {
+            "contract_id": [f"UA-{2024}-{i:06d}" for i in range(n)],
+            "supplier_edrpou": [registry.edrpou[s] for s in suppliers],
+            "supplier_name": [registry.name[s] for s in suppliers],
+            "subject": [rng.choice(_SUBJECTS) for _ in range(n)],
+        }
+    )
+    return registry, contracts
+
+
+def _labeled_queries(registry: pd.DataFrame, contracts: pd.DataFrame, seed: int = 9) -> list:
+    """(kind, query, {result identity: gain}) with gains 3 = exact, 2 = strong, 1 = related."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(QUERIES_PER_KIND):
+        # exact identifier: the registry row, then contracts that name it
+        i = rng.randrange(len(registry))
+        code = registry.edrpou[i]
+        gains = {f"registry#{i}": 3}
+        for j in contracts.index[contracts.supplier_edrpou == code]:
+            gains[f"contracts#{j}"] = 2
+        out.append(("edrpou", code, gains))
+
+        # full name + city: that company first, same name elsewhere is related
+        i = rng.randrange(len(registry))
+        name, city = registry.name[i], registry.city[i]
+        same = registry.index[registry.name == name]
+        gains = {f"registry#{j}": 3 if registry.city[j] == city else 1 for j in same}
+        out.append(("name+city", f"{name} {city}", gains))
+
+        # exact name: every company with that name
+        i = rng.randrange(len(registry))
+        name = registry.name[i]
+        gains = {f"registry#{j}": 2 for j in registry.index[registry.name == name]}
+        for j in contracts.index[contracts.supplier_name == name]:
+            gains[f"contracts#{j}"] = 1
+        out.append(("name", name, gains))
+
+        # identifier prefix (typed partially): FTS tokens cannot match it
+        i = rng.randrange(len(registry))
+        prefix = registry.edrpou[i][:7]
+        gains = {f"registry#{j}": 2 for j in registry.index[registry.edrpou.str.startswith(prefix)]}
+        out.append(("edrpou prefix", prefix, gains))
+    return out
+
+
+def _ndcg(ranked: list[str], gains: dict[str, int], k: int = 10) -> float:
+    dcg = sum(gains.get(key, 0) / math.log2(pos + 2) for pos, key in enumerate(ranked[:k]))
+    ideal = sorted(gains.values(), reverse=True)[:k]
+    idcg = sum(g / math.log2(pos + 2) for pos, g in enumerate(ideal))
+    return dcg / idcg if idcg else 0.0
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else COMPANIES
+    logging.disable(logging.WARNING)
+    from src.mcp_server.golden_fund.lib.retrieval import (
+        HybridRetriever,
+        keyword_backend,
+        structured_backend,
+        vector_backend,
+    )
+    from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+    from src.mcp_server.golden_fund.tools.ingest import _index_keyword_batch
+
+    registry, contracts = _corpus(n)
+    queries = _labeled_queries(registry, contracts)
+    runs = {"registry": "20240101_000000_aaaaaa", "contracts": "20240101_000001_bbbbbb"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runtime = StorageRuntime(Path(tmp))
+        for label, df in (("registry", registry), ("contracts", contracts)):
+            runtime.sql.store_dataset(df, f"dataset_{runs[label]}")
+            if label == "contracts":
+                _index_keyword_batch(df, runs[label], runtime.search)
+        tables = {f"dataset_{run}": label for label, run in runs.items()}
+
+        backends = {
+            "keyword": keyword_backend(runtime.search),
+            "vector": vector_backend(runtime.vector),
+            "structured": structured_backend(lambda q, k: runtime.sql.index.search(q, limit=k)),
+        }
+        hybrid = HybridRetriever(backends)
+
+        def identity(hit_id: str) -> str:
+            # map a hit back to '<label>#<row>' for judging
+            if "#" in hit_id:  # structured: '<table>#<rowid>'
+                table, rowid = hit_id.rsplit("#", 1)
+                return f"{tables[table]}#{int(rowid) - 1}"
+            run, row = hit_id.rsplit("_", 1)
+            return f"{tables.get(f'dataset_{run}', run)}#{row}"
+
+        def run_single(name: str, query: str, limit: int = 10) -> list[str]:
+            try:
+                hits = backends[name](query, limit)
+            except Exception:
+                return []
+            return [identity(h["id"]) for h in hits]
+
+        def run_waterfall(query: str) -> list[str]:
+            for name, limit in (("keyword", 10), ("vector", 10), ("structured", 5)):
+                ranked = run_single(name, query, limit)
+                if ranked:
+                    return ranked
+            return []
+
+        def run_hybrid(query: str) -> list[str]:
+            response = asyncio.run(hybrid.search(query, limit=10))
+            ranked = []
+            for result in response.results:
+                # a fused result is judged by its best-ranked member
+                source = min(result.sources, key=lambda s: result.sources[s]["rank"])
+                member = next(k for k in sorted(result.keys) if k.startswith(f"{source}:"))
+                ranked.append(identity(member.split(":", 1)[1]))
+            return ranked
+
+        modes = {
+            "keyword": lambda q: run_single("keyword", q),
+            "waterfall": run_waterfall,
+            "hybrid": run_hybrid,
+        }
+        scores = {m: {} for m in modes}
+        latency = {m: [] for m in modes}
+        for mode, fn in modes.items():
+            fn(queries[0][1])  # warm caches
+            for kind, query, gains in queries:
+                t0 = time.perf_counter()
+                ranked = fn(query)
+                latency[mode].append(time.perf_counter() - t0)
+                scores[mode].setdefault(kind, []).append(_ndcg(ranked, gains))
+        vector_status = asyncio.run(hybrid.search("probe")).sources["vector"].status
+        runtime.close()
+
+    kinds = list(dict.fromkeys(k for k, _, _ in queries))
+    print(
+        f"Golden Fund hybrid retrieval benchmark: {n:,} companies + {n:,} contracts, "
+        f"{len(queries)} labeled queries (vector source: {vector_status})\n"
+    )
+    header = f"{'mode':<10} " + " ".join(f"{k:>14}" for k in kinds)
+    header += f" {'nDCG@10':>9} {'p50':>9} {'p95':>9}"
+    print(header)
+    print("-" * len(header))
+    for mode in modes:
+        per_kind = [sum(scores[mode][k]) / len(scores[mode][k]) for k in kinds]
+        overall = sum(sum(v) for v in scores[mode].values()) / len(queries)
+        print(
+            f"{mode:<10} "
+            + " ".join(f"{v:>14.3f}" for v in per_kind)
+            + f" {overall:>9.3f} {_pct(latency[mode], 0.5):>7.2f}ms"
+            f" {_pct(latency[mode], 0.95):>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark: Golden Fund ingestion, whole-frame serial stages vs streaming pipeline.
+
+Generates CSV and Parquet files locally and ingests them with:
+- serial:    parse the whole file, then store_sql, keyword_index, validate one by one
+- streaming: batched parse fanned out to concurrent sinks via bounded queues
+
+Each run executes in its own subprocess (HOME redirected to a temp dir) so
+peak RSS is measured independently.
+
+Usage:
+    python src/testing/benchmark_golden_fund_ingest.py [rows] [--with-fts]
+"""
+
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+ROWS = 5_000_000
+
+
+def _generate(path: Path, rows: int) -> None:
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(
+        {
+            "edrpou": rng.integers(10_000_000, 99_999_999, rows),
+            "name": pd.Series(rng.integers(0, 100_000, rows)).map("ТОВ Компанія {}".format),
+            "position": np.where(rng.random(rows) < 0.001, "director", ""),
+            "region": rng.integers(1, 27, rows),
+            "capital": rng.random(rows) * 1e6,
+        }
+    )
+    if path.suffix == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, row_group_size=250_000)
+
+
+async def _serial(path: Path, kind: str, stages: list[str]) -> dict:
+    """The pre-streaming flow: whole DataFrame in memory, one stage after another."""
+    from src.mcp_server.golden_fund.lib.parser import DataParser
+    from src.mcp_server.golden_fund.lib.storage import SearchStorage, SQLStorage
+    from src.mcp_server.golden_fund.lib.validation import DataValidator
+    from src.mcp_server.golden_fund.tools import ingest
+
+    timings = {}
+    t0 = time.perf_counter()
+    df = DataParser().parse(path, format_hint=kind).data
+    timings["parse"] = time.perf_counter() - t0
+    if "store_sql" in stages:
+        t0 = time.perf_counter()
+        SQLStorage().store_dataset(df, "dataset_serial", source_url=str(path))
+        timings["store_sql"] = time.perf_counter() - t0
+    if "keyword_index" in stages:
+        t0 = time.perf_counter()
+        ingest._index_keyword_batch(df, "serial", SearchStorage())
+        timings["keyword_index"] = time.perf_counter() - t0
+    if "validate" in stages:
+        t0 = time.perf_counter()
+        ingest._validate_batch(df, "serial", DataValidator())
+        timings["validate"] = time.perf_counter() - t0
+    return {"rows": len(df), "stages": {k: round(len(df) / v) for k, v in timings.items()}}
+
+
+async def _streaming(path: Path, kind: str, stages: list[str]) -> dict:
+    from src.mcp_server.golden_fund.tools import ingest
+
+    outcome = await ingest.ingest_dataset(str(path), kind, ["parse", *stages])
+    return {"message": outcome.summary.split("Throughput: ")[-1]}
+
+
+def _child(mode: str, path: Path, stages: list[str]) -> None:
+    kind = path.suffix.lstrip(".")
+    t0 = time.perf_counter()
+    if mode == "serial":
+        result = asyncio.run(_serial(path, kind, stages))
+    else:
+        result = asyncio.run(_streaming(path, kind, stages))
+    result["wall_seconds"] = round(time.perf_counter() - t0, 2)
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if args and args[0] == "child":
+        _child(args[1], Path(args[2]), args[3].split(","))
+        return
+    if args and args[0] == "generate":
+        _generate(Path(args[1]), int(args[2]))
+        return
+
+    rows = int(args[0]) if args else ROWS
+    stages = ["store_sql", "validate"]
+    if "--with-fts" in sys.argv:
+        stages.insert(1, "keyword_index")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "HOME": tmp}
+        for suffix in (".csv", ".parquet"):
+            path = Path(tmp) / f"companies{suffix}"
+            t0 = time.perf_counter()
+            # In a subprocess: ru_maxrss survives fork/exec, so the parent must stay small
+            subprocess.run([sys.executable, __file__, "generate", str(path), str(rows)], check=True)
+            size_mb = path.stat().st_size / 1e6
+            print(
+                f"\n{path.name}: {rows:,} rows, {size_mb:,.0f}MB "
+                f"(generated in {time.perf_counter() - t0:.1f}s), stages={stages}"
+            )
+            for mode in ("serial", "streaming"):
+                proc = subprocess.run(
+                    [sys.executable, __file__, "child", mode, str(path), ",".join(stages)],
+                    capture_output=True,
+                    text=True,
+                    env=env,
+                    check=True,
+                )
+                r = json.loads(proc.stdout.strip().splitlines()[-1])
+                detail = r.get("stages") or r.get("message")
+                print(
+                    f"  {mode:<9} wall {r['wall_seconds']:8.2f}s  peak RSS {r['peak_rss_mb']:6,}MB"
+                    f"  {detail}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: Golden Fund per-call backend construction vs the shared storage runtime.
+
+Runs N small ingests (20-row CSV through parse/store_sql/keyword_index) and
+N keyword searches in two modes:
+- per_call: every call builds its own scraper/parser/storages, opens fresh
+            SQLite connections and re-runs schema setup (the pre-runtime flow)
+- runtime:  one StorageRuntime with pooled connections shared by all calls
+
+Usage:
+    python src/testing/benchmark_golden_fund_runtime.py [calls]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+CALLS = 1_000
+PIPELINE = ["parse", "store_sql", "keyword_index"]
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+
+async def _run(mode: str, root: Path, source: Path, calls: int) -> dict:
+    from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+    from src.mcp_server.golden_fund.tools import ingest
+
+    ingest.RAW_DIR = root / "raw"
+    ingest.RAW_DIR.mkdir(parents=True, exist_ok=True)
+    shared = StorageRuntime(root / "data") if mode == "runtime" else None
+    connections = 0
+
+    ingest_times, search_times = [], []
+    t_total = time.perf_counter()
+    for i in range(calls):
+        runtime = shared or StorageRuntime(root / "data")
+        t0 = time.perf_counter()
+        outcome = await ingest.ingest_dataset(str(source), "csv", PIPELINE, runtime=runtime)
+        ingest_times.append(time.perf_counter() - t0)
+        assert outcome.success and outcome.rows == 20, outcome.summary
+
+        t0 = time.perf_counter()
+        result = runtime.search.search(f"Company{i % 20}", limit=5)
+        search_times.append(time.perf_counter() - t0)
+        assert result.success, result.error
+
+        if shared is None:
+            connections += sum(
+                runtime.health()[name].get("connections_opened", 0) for name in ("sql", "search")
+            )
+            runtime.close()
+    total = time.perf_counter() - t_total
+    if shared is not None:
+        health = shared.health()
+        connections = sum(health[name]["connections_opened"] for name in ("sql", "search"))
+        shared.close()
+
+    pairs = [a + b for a, b in zip(ingest_times, search_times, strict=True)]
+    return {
+        "total_s": total,
+        "ingest_p50_ms": _pct(ingest_times, 0.5),
+        "ingest_p95_ms": _pct(ingest_times, 0.95),
+        "search_p50_ms": _pct(search_times, 0.5),
+        "search_p95_ms": _pct(search_times, 0.95),
+        "mean_ms": statistics.mean(pairs) * 1000,
+        "connections": connections,
+    }
+
+
+async def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else CALLS
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        source = tmp_path / "small.csv"
+        source.write_text(
+            "id,name,city\n" + "".join(f"{i},Company{i},Kyiv\n" for i in range(20)),
+            encoding="utf-8",
+        )
+
+        print(f"Golden Fund runtime benchmark: {calls} ingest + {calls} search calls\n")
+        results = {}
+        for mode in ("per_call", "runtime"):
+            results[mode] = await _run(mode, tmp_path / mode, source, calls)
+
+    header = (
+        f"{'mode':<10} {'total s':>8} {'ingest p50':>11} {'ingest p95':>11} "
+        f"{'search p50':>11} {'search p95':>11} {'conns':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for mode, r in results.items():
+        print(
+            f"{mode:<10} {r['total_s']:>8.2f} {r['ingest_p50_ms']:>9.2f}ms "
+            f"{r['ingest_p95_ms']:>9.2f}ms {r['search_p50_ms']:>9.3f}ms "
+            f"{r['search_p95_ms']:>9.3f}ms {r['connections']:>7}"
+        )
+
+    per_call, runtime = results["per_call"], results["runtime"]
+    saved = per_call["mean_ms"] - runtime["mean_ms"]
+    print(
+        f"\nSetup overhead removed: {saved:.2f}ms per ingest+search pair "
+        f"({saved / per_call['mean_ms'] * 100:.0f}% of per-call time), "
+        f"{per_call['total_s'] - runtime['total_s']:.1f}s over {calls} calls"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""Benchmark: Golden Fund structured lookups, LIKE table scans vs the structured index.
+
+Ingests T dataset tables of R registry rows each (T = 10, 100, 1000) and runs
+EDRPOU lookups and name-substring queries for entities spread over all tables:
+- legacy:   the previous _search_sql_fallback - PRAGMA table_info plus an
+            OR-chain of LIKE '%q%' over the 3 most recent tables (and any
+            table whose metadata matches), so older tables are never seen
+- scan_all: the same LIKE scan over every table (what full recall would cost)
+- index:    StructuredIndex exact keys (lookup) and trigram FTS (search)
+
+Usage:
+    python src/testing/benchmark_golden_fund_structured.py [rows_per_table]
+"""
+
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+TABLE_COUNTS = (10, 100, 1000)
+ROWS = 1_000
+QUERIES = 50
+SCAN_ALL_QUERIES = 5  # full scans get slow; sample fewer
+
+_WORDS = ["Агро", "Енерго", "Буд", "Мет", "Фарм", "Транс", "Інвест", "Теле"]
+
+
+def _table(t: int, rows: int) -> pd.DataFrame:
+    base = 10_000_000 + t * rows
+    return pd.DataFrame(
+        {
+            "edrpou": [str(base + i) for i in range(rows)],
+            "name": [f"ТОВ {_WORDS[(t + i) % len(_WORDS)]}сервіс {base + i}" for i in range(rows)],
+            "city": ["Київ" if i % 3 else "Одеса" for i in range(rows)],
+        }
+    )
+
+
+def _legacy(sql, query: str, tables: list[str] | None = None) -> list[dict]:
+    """The pre-index fallback (scans ``tables`` instead when given)."""
+    if tables is None:
+        meta = sql.query(
+            "SELECT table_name FROM datasets_metadata WHERE dataset_name LIKE ? OR source_url LIKE ?",
+            (f"%{query}%", f"%{query}%"),
+        ).data
+        recent = sql.query(
+            "SELECT table_name FROM datasets_metadata ORDER BY ingested_at DESC, id DESC LIMIT 3"
+        ).data
+        tables = list({r["table_name"] for r in meta + recent})
+    rows = []
+    for table in tables:
+        cols = [
+            r["name"]
+            for r in sql.query(f"PRAGMA table_info({table})").data
+            if "TEXT" in str(r["type"]).upper() or "CHAR" in str(r["type"]).upper()
+        ]
+        where = " OR ".join(f"{c} LIKE ?" for c in cols)
+        res = sql.query(
+            f"SELECT rowid AS _rowid, * FROM {table} WHERE {where} LIMIT 5",
+            tuple([f"%{query}%"] * len(cols)),
+        )
+        rows.extend({**r, "_source_table": table} for r in res.data or [])
+    return rows
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+
+def _measure(fn, queries: list[tuple[str, str]]) -> dict:
+    times, found = [], 0
+    for query, expected in queries:
+        t0 = time.perf_counter()
+        rows = fn(query)
+        times.append(time.perf_counter() - t0)
+        found += any(str(r.get("edrpou")) == expected for r in rows)
+    return {"p50": _pct(times, 0.5), "p95": _pct(times, 0.95), "recall": found / len(queries)}
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    logging.disable(logging.INFO)
+    from src.mcp_server.golden_fund.lib.storage.sql import SQLStorage
+
+    rng = random.Random(1)
+    print(f"Golden Fund structured index benchmark: {rows:,} rows per table\n")
+    header = (
+        f"{'tables':>7} {'kind':<10} {'mode':<9} {'p50':>10} {'p95':>10} {'recall':>7}"
+        f"   (ingest+index {'s':>1})"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for count in TABLE_COUNTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            sql = SQLStorage(Path(tmp) / "golden.db")
+            t0 = time.perf_counter()
+            for t in range(count):
+                sql.store_dataset(_table(t, rows), f"dataset_{t:05d}")
+            ingest_s = time.perf_counter() - t0
+            tables = [f"dataset_{t:05d}" for t in range(count)]
+
+            picks = [(rng.randrange(count), rng.randrange(rows)) for _ in range(QUERIES)]
+            codes = [str(10_000_000 + t * rows + i) for t, i in picks]
+            # lower-case, word + code: LIKE folds ASCII only, so Cyrillic case matters
+            names = [
+                f"{_WORDS[(t + i) % len(_WORDS)].lower()}сервіс {code}"
+                for (t, i), code in zip(picks, codes, strict=True)
+            ]
+            for kind, queries, indexed in (
+                ("edrpou", list(zip(codes, codes, strict=True)), sql.index.lookup),
+                ("substring", list(zip(names, codes, strict=True)), sql.index.search),
+            ):
+                results = {
+                    "legacy": _measure(lambda q: _legacy(sql, q), queries),
+                    "scan_all": _measure(
+                        lambda q: _legacy(sql, q, tables), queries[:SCAN_ALL_QUERIES]
+                    ),
+                    "index": _measure(indexed, queries),
+                }
+                for mode, r in results.items():
+                    print(
+                        f"{count:>7} {kind:<10} {mode:<9} {r['p50']:>8.2f}ms {r['p95']:>8.2f}ms "
+                        f"{r['recall']:>7.0%}   ({ingest_s:.1f})"
+                    )
+            sql.close()
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Benchmark: per-record logging cost, per-handler masking vs the queued pipeline.
+
+Logs N records (default 20,000) of a typical brain mix - mostly clean status
+lines, some with secrets, some Cyrillic - from a coroutine on a running event
+loop, the way agents log:
+- legacy:   the previous setup (file + console + UI handlers in the caller's
+            thread, SecretFilter on each handler, one create_task per record
+            for the UI publish)
+- pipeline: setup_logging (one queue put; message formatted and masked once,
+            handlers on the listener thread, UI published in batches)
+Also reports mask_sensitive_data per string against the previous sequential
+re.sub loop. The console handler writes to /dev/null.
+
+Usage:
+    python src/testing/benchmark_log_pipeline.py [records]
+"""
+
+import asyncio
+import logging
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+RECORDS = 20_000
+
+MESSAGES = [
+    ("[ORCHESTRATOR] Step %d completed in %.2fs (tool=filesystem.read_file)", (3, 1.24)),
+    ("[TETYANA] Executing tool %s with %d arguments", ("terminal.execute_command", 2)),
+    ("[ATLAS] Аналізую запит користувача: відкрити браузер і знайти погоду (%d)", (1,)),
+    ("[STATE] Saved session %s", ("session_20261019",)),
+    ("[MCP] Connecting to %s with %s", ("postgres", "password: hunter2")),
+    ("[GRISHA] Verification passed for step %d", (7,)),
+    ("[GIT] Pushing with %s", ("ghp_" + "x" * 36,)),
+    ("[VOICE] Transcribed %d chars in %.1fms", (120, 35.2)),
+]
+
+
+def _legacy_mask(text: str) -> str:
+    """The previous mask_sensitive_data."""
+    from src.brain.monitoring.utils.security import SENSITIVE_PATTERNS
+
+    for pattern, replacement in SENSITIVE_PATTERNS:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+class _LegacySecretFilter(logging.Filter):
+    def filter(self, record):
+        if not isinstance(record.msg, str):
+            return True
+        record.msg = _legacy_mask(record.msg)
+        if record.args:
+            record.args = tuple(_legacy_mask(a) if isinstance(a, str) else a for a in record.args)
+        return True
+
+
+class _LegacyUIHandler(logging.Handler):
+    """The previous UIHandler: one publish task per record."""
+
+    def emit(self, record):
+        from src.brain.core.services.state_manager import state_manager
+
+        entry = {
+            "source": record.name,
+            "type": record.levelname.lower(),
+            "content": self.format(record),
+            "timestamp": time.strftime("%H:%M", time.localtime(record.created)),
+        }
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(state_manager.publish_events("logs", [entry]))
+
+
+def _legacy_logger(log_dir: Path, console) -> logging.Logger:
+    logger = logging.getLogger("bench_legacy")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handlers = [
+        RotatingFileHandler(log_dir / "legacy.log", maxBytes=10 * 1024 * 1024, backupCount=5),
+        logging.StreamHandler(console),
+        _LegacyUIHandler(),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler.addFilter(_LegacySecretFilter())
+        logger.addHandler(handler)
+    return logger
+
+
+async def _log(logger: logging.Logger, records: int) -> list[float]:
+    latencies = []
+    for i in range(records):
+        msg, args = MESSAGES[i % len(MESSAGES)]
+        t0 = time.perf_counter()
+        logger.info(msg, *args)
+        latencies.append(time.perf_counter() - t0)
+        if i % 100 == 0:
+            await asyncio.sleep(0)  # let publish tasks run, as a busy app would
+    await asyncio.sleep(0.3)
+    return latencies
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS
+    import src.brain.config as brain_config
+    from src.brain.core.services.state_manager import state_manager
+    from src.brain.monitoring.logger import _stop_listener, setup_logging
+    from src.brain.monitoring.utils.security import mask_sensitive_data
+
+    published = {"legacy": 0, "pipeline": 0, "calls": 0}
+    mode = "legacy"
+
+    async def publish_events(channel, messages):
+        published[mode] += len(messages)
+        published["calls"] += 1
+
+    # stands in for Redis: counts what would be published
+    state_manager.publish_events = publish_events
+
+    print(f"Log pipeline benchmark: {records:,} records\n")
+    header = f"{'string':<26} {'legacy us':>10} {'masked us':>10}"
+    print(header)
+    print("-" * len(header))
+    for msg, args in MESSAGES[:5]:
+        text = msg % args
+        legacy = timeit.timeit(lambda t=text: _legacy_mask(t), number=5000) / 5000
+        masked = timeit.timeit(lambda t=text: mask_sensitive_data(t), number=5000) / 5000
+        print(f"{text[:26]:<26} {legacy * 1e6:>10.2f} {masked * 1e6:>10.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        results = []
+        legacy_logger = _legacy_logger(Path(tmp), devnull)
+        t0 = time.perf_counter()
+        latencies = asyncio.run(_log(legacy_logger, records))
+        results.append(("legacy", latencies, time.perf_counter() - t0 - 0.3))
+        legacy_calls = published["calls"]
+
+        mode = "pipeline"
+        brain_config.LOG_DIR = Path(tmp)
+        sys.stderr, stderr = devnull, sys.stderr  # the console handler binds stderr
+        try:
+            pipeline_logger = setup_logging("bench_pipeline")
+        finally:
+            sys.stderr = stderr
+        t0 = time.perf_counter()
+        latencies = asyncio.run(_log(pipeline_logger, records))
+        results.append(("pipeline", latencies, time.perf_counter() - t0 - 0.3))
+        t0 = time.perf_counter()
+        _stop_listener("bench_pipeline")
+        drain = time.perf_counter() - t0
+
+        print(f"\n{'mode':<10} {'p50 us':>8} {'p99 us':>9} {'records/s':>10} {'published':>10}")
+        print("-" * 51)
+        for name, latencies, elapsed in results:
+            cuts = statistics.quantiles(latencies, n=100)
+            print(
+                f"{name:<10} {cuts[49] * 1e6:>8.1f} {cuts[98] * 1e6:>9.1f} "
+                f"{records / elapsed:>10,.0f} {published[name]:>10,}"
+            )
+        print(
+            f"\nUI publish calls: legacy {legacy_calls:,}, "
+            f"pipeline {published['calls'] - legacy_calls:,}; listener drain after run "
+            f"{drain * 1000:.1f}ms (the UI buffer keeps at most 1,000 entries per flush)"
+        )
+        for name, log_file in (("legacy", "legacy.log"), ("pipeline", "bench_pipeline.log")):
+            leaked = "hunter2" in (Path(tmp) / log_file).read_text(encoding="utf-8")
+            print(f"{name}: secrets in log file: {leaked}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark: MessageBus throughput, delivery latency and DB writes.
+
+Three agents exchange messages round-robin. Compares:
+- legacy: per-message commit in send() + polling consumers (receive + sleep)
+- indexed: write-behind batched persistence + wait_for() consumers
+
+Persistence goes to a temporary SQLite database.
+
+Usage:
+    python src/testing/benchmark_message_bus.py [messages]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.brain.core.server.message_bus import AgentMsg, MessageBus, MessageType
+from src.brain.memory.db.manager import db_manager
+from src.brain.memory.db.schema import Session as DBSession
+
+AGENTS = ("atlas", "tetyana", "grisha")
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+# Per-message commits are slow; the legacy run uses a slice and is reported per message
+LEGACY_MESSAGES = max(1, MESSAGES // 20)
+POLL_INTERVAL = 0.01
+
+
+async def _count_rows() -> int:
+    from sqlalchemy import func, select
+
+    from src.brain.memory.db.schema import AgentMessage
+
+    async with await db_manager.get_session() as session:
+        return (await session.execute(select(func.count()).select_from(AgentMessage))).scalar()
+
+
+def _make(i: int, session_id: uuid.UUID) -> AgentMsg:
+    return AgentMsg(
+        from_agent=AGENTS[i % 3],
+        to_agent=AGENTS[(i + 1) % 3],
+        message_type=MessageType.FEEDBACK,
+        payload={"seq": i, "sent": time.perf_counter()},
+        session_id=session_id,
+        step_id=str(i),
+    )
+
+
+async def _run(name: str, count: int, session_id: uuid.UUID, legacy: bool) -> None:
+    bus = MessageBus()
+    bus._db_available = True
+    if legacy:
+        bus._batcher.batch_size = 1
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def consumer(agent: str) -> None:
+        while not done.is_set():
+            if legacy:
+                msgs = await bus.receive(agent)
+                if not msgs:
+                    await asyncio.sleep(POLL_INTERVAL)
+            else:
+                msg = await bus.wait_for(agent, timeout=0.1)
+                msgs = [msg] if msg else []
+            now = time.perf_counter()
+            latencies.extend(now - m.payload["sent"] for m in msgs)
+            if len(latencies) >= count:
+                done.set()
+
+    rows_before = await _count_rows()
+    consumers = [asyncio.create_task(consumer(a)) for a in AGENTS]
+    t0 = time.perf_counter()
+    for i in range(count):
+        await bus.send(_make(i, session_id))
+        if legacy:
+            await bus.flush()  # old behaviour: commit inside send()
+        elif i % 64 == 0:
+            await asyncio.sleep(0)  # let consumers run, as a real agent loop would
+    await done.wait()
+    await bus.close()
+    elapsed = time.perf_counter() - t0
+    for task in consumers:
+        task.cancel()
+
+    lat = sorted(latencies)
+    stats = bus.stats
+    rows = await _count_rows() - rows_before
+    print(
+        f"{name:<8} msgs={count:>7,}  {count / elapsed:>9,.0f} msg/s  "
+        f"latency p50={statistics.median(lat) * 1000:7.2f}ms "
+        f"p95={lat[int(len(lat) * 0.95) - 1] * 1000:7.2f}ms "
+        f"p99={lat[int(len(lat) * 0.99) - 1] * 1000:7.2f}ms  "
+        f"db_writes={stats['db_writes']:,} ({stats['db_writes'] / count:.3f}/msg)  rows={rows:,}"
+    )
+
+
+async def main():
+    # Per-message INFO logs would dominate the measurement
+    logging.getLogger("brain.message_bus").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager.db_url = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        await db_manager.initialize()
+        session_id = uuid.uuid4()
+        async with await db_manager.get_session() as session:
+            session.add(DBSession(id=session_id))
+            await session.commit()
+
+        print(f"3 agents, {MESSAGES:,} messages (legacy slice: {LEGACY_MESSAGES:,})")
+        await _run("legacy", LEGACY_MESSAGES, session_id, legacy=True)
+        await _run("indexed", MESSAGES, session_id, legacy=False)
+        await db_manager._engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""Benchmark: concurrent SQLite writers under the legacy vs tuned storage profile.
+
+Simulates logs, message bus, knowledge graph and tool-execution writers
+committing small transactions concurrently while readers query the same DB.
+
+Usage:
+    python src/testing/benchmark_sqlite_profile.py [writers] [writes_per_writer]
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import text
+
+from src.brain.memory.db.manager import DatabaseManager
+from src.brain.memory.db.storage_profile import get_profile, is_busy_error
+
+WRITERS = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+WRITES = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+READERS = 4
+PAYLOAD = "x" * 512
+
+
+async def _bench(profile: str, tmp: str) -> None:
+    manager = DatabaseManager()
+    manager.db_url = f"sqlite+aiosqlite:///{tmp}/{profile}.db"
+    manager.storage_profile = get_profile(profile)
+    await manager.initialize()
+
+    async with manager.write_session() as session:
+        await session.execute(
+            text("CREATE TABLE bench (id INTEGER PRIMARY KEY, writer INT, payload TEXT)")
+        )
+        await session.commit()
+
+    latencies: list[float] = []
+    errors = 0
+    reads = 0
+    stop = asyncio.Event()
+
+    async def writer(n: int) -> None:
+        nonlocal errors
+        for i in range(WRITES):
+            t0 = time.perf_counter()
+            try:
+                async with manager.write_session() as session:
+                    await session.execute(
+                        text("INSERT INTO bench (writer, payload) VALUES (:w, :p)"),
+                        {"w": n, "p": PAYLOAD},
+                    )
+                    await session.commit()
+            except Exception as e:
+                if not is_busy_error(e):
+                    raise
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    async def reader() -> None:
+        nonlocal reads
+        while not stop.is_set():
+            async with await manager.get_session() as session:
+                await session.execute(text("SELECT COUNT(*), MAX(id) FROM bench"))
+            reads += 1
+            await asyncio.sleep(0.001)
+
+    readers = [asyncio.create_task(reader()) for _ in range(READERS)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(writer(n) for n in range(WRITERS)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await asyncio.gather(*readers)
+
+    async with await manager.get_session() as session:
+        rows = (await session.execute(text("SELECT COUNT(*) FROM bench"))).scalar()
+    metrics = manager.storage_metrics()
+    await manager.close()
+
+    lat = sorted(latencies)
+    print(
+        f"{profile:<9} {rows / elapsed:>8,.0f} commits/s  rows={rows:,}  busy_errors={errors}  "
+        f"latency p50={statistics.median(lat) * 1000:6.2f}ms "
+        f"p95={lat[int(len(lat) * 0.95) - 1] * 1000:7.2f}ms "
+        f"max={lat[-1] * 1000:7.2f}ms  reads={reads:,}"
+    )
+    if metrics["single_writer"]:
+        print(f"{'':<9} lock waits: {metrics['lock']}")
+
+
+async def main():
+    print(f"{WRITERS} writers x {WRITES} commits, {READERS} concurrent readers")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("legacy", "balanced"):
+            await _bench(profile, tmp)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
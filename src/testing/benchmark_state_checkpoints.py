@@ -0,0 +1,123 @@
+"""Benchmark: full-JSON session saves vs delta checkpoints.
+
+Simulates a long session (large log/message buffers, a few new entries per
+step) and reports bytes written and latency per checkpoint.
+
+Usage:
+    python src/testing/benchmark_state_checkpoints.py            # fakeredis
+    REDIS_URL=redis://localhost:6379/15 python src/testing/benchmark_state_checkpoints.py
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.brain.core.services.session_checkpoints import SessionCheckpointer
+
+STEPS = 300
+LOG_CAPACITY = 1000
+MESSAGE_CAPACITY = 500
+
+
+def _entry(i: int) -> dict:
+    digest = hashlib.sha256(str(i).encode()).hexdigest()
+    return {"id": f"log-{i}", "timestamp": time.time(), "agent": "TETYANA", "message": digest * 4}
+
+
+def _make_state() -> dict:
+    return {
+        "system_state": "EXECUTING",
+        "current_plan": {"goal": "benchmark", "steps": [{"id": i} for i in range(20)]},
+        "logs": [_entry(i) for i in range(LOG_CAPACITY)],
+        "messages": [
+            {"type": "ai", "content": _entry(i)["message"]} for i in range(MESSAGE_CAPACITY)
+        ],
+        "step_results": [],
+    }
+
+
+def _advance(state: dict, step: int) -> None:
+    base = LOG_CAPACITY + step * 5
+    for i in range(5):
+        state["logs"].append(_entry(base + i))
+    del state["logs"][:5]  # ring buffer eviction
+    state["step_results"].append({"step_id": str(step), "success": True})
+    state["system_state"] = "VERIFYING" if step % 2 else "EXECUTING"
+
+
+async def _client():
+    url = os.getenv("REDIS_URL")
+    if url:
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(url, decode_responses=True)
+        await client.flushdb()
+        return client, url
+    import fakeredis
+
+    return fakeredis.aioredis.FakeRedis(decode_responses=True), "fakeredis"
+
+
+def _report(name: str, sizes: list[int], latencies: list[float]) -> None:
+    lat = sorted(latencies)
+    p95 = lat[int(len(lat) * 0.95) - 1]
+    print(
+        f"{name:<22} bytes/ckpt avg={statistics.mean(sizes):>10,.0f}  total={sum(sizes):>12,}  "
+        f"latency p50={statistics.median(lat) * 1000:6.2f}ms p95={p95 * 1000:6.2f}ms"
+    )
+
+
+async def main():
+    client, backend = await _client()
+    print(
+        f"Backend: {backend}; {STEPS} checkpoints, {LOG_CAPACITY} logs, {MESSAGE_CAPACITY} messages"
+    )
+
+    # 1. Legacy: SET the whole session JSON on every save
+    state = _make_state()
+    sizes, latencies = [], []
+    for step in range(STEPS):
+        _advance(state, step)
+        t0 = time.perf_counter()
+        payload = json.dumps(state, default=str)
+        await client.set("bench:legacy:session", payload)
+        latencies.append(time.perf_counter() - t0)
+        sizes.append(len(payload))
+    _report("full JSON (legacy)", sizes, latencies)
+
+    # 2. Delta log + periodic snapshots, with and without zstd
+    for compression in ("none", "zstd"):
+        state = _make_state()
+        checkpointer = SessionCheckpointer(
+            client, lambda k, c=compression: f"bench:{c}:{k}", compression=compression
+        )
+        sizes, latencies = [], []
+        for step in range(STEPS):
+            _advance(state, step)
+            t0 = time.perf_counter()
+            written = await checkpointer.save("session", state)
+            latencies.append(time.perf_counter() - t0)
+            sizes.append(written)
+        _report(f"delta ({compression})", sizes, latencies)
+        print(f"{'':<22} {checkpointer.stats}")
+
+        t0 = time.perf_counter()
+        restored = await SessionCheckpointer(
+            client, lambda k, c=compression: f"bench:{c}:{k}"
+        ).restore("session")
+        assert restored == json.loads(json.dumps(state, default=str))
+        print(f"{'':<22} restore (snapshot + replay): {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
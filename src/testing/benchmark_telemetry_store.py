@@ -0,0 +1,162 @@
+"""Benchmark: monitoring DB writes, per-event connections vs the write-behind TelemetryStore.
+
+Replays N telemetry events (default 20,000) the way MonitoringSystem emits
+them - request_logs rows, structured log rows and numeric metric samples -
+from T caller threads (default 1 and 4):
+- legacy:    the previous _save_to_db (new sqlite3 connection + commit per event)
+- telemetry: TelemetryStore.put / record_metric (queue append; batched WAL
+             transactions on the writer thread, metrics as 1s/1m/1h rollups)
+Reports caller-side latency (p50/p99 per event), throughput including the
+final flush, and rows stored.
+
+Usage:
+    python src/testing/benchmark_telemetry_store.py [events]
+"""
+
+import json
+import logging
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+logger = logging.getLogger(__name__)
+
+EVENTS = 20_000
+THREADS = (1, 4)
+
+
+def _schema(db_path: Path) -> None:
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE logs (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, "
+            "level TEXT, service TEXT, message TEXT, data JSON)"
+        )
+        conn.execute(
+            "CREATE TABLE request_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, "
+            "request_type TEXT, status TEXT, duration REAL)"
+        )
+
+
+def _legacy_save(db_path: Path, table: str, data: dict) -> None:
+    """The previous MonitoringSystem._save_to_db."""
+    try:
+        with sqlite3.connect(db_path) as conn:
+            columns = ", ".join(data.keys())
+            placeholders = ", ".join(["?"] * len(data))
+            sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+            conn.execute(sql, list(data.values()))
+            conn.commit()
+    except Exception as e:
+        logger.error(f"Failed to write to monitoring DB ({table}): {e}")
+
+
+def _event(i: int) -> tuple[str, dict | float]:
+    kind = i % 3
+    if kind == 0:
+        return "request_logs", {
+            "timestamp": datetime.now().isoformat(),
+            "request_type": "chat",
+            "status": "success",
+            "duration": i / 1000,
+        }
+    if kind == 1:
+        return "logs", {
+            "timestamp": datetime.now().isoformat(),
+            "level": "info",
+            "service": "atlastrinity",
+            "message": f"event {i}",
+            "data": json.dumps({"step": i}),
+        }
+    return "metric", i / 10
+
+
+def _run(emit, events: int, threads: int) -> list[float]:
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+
+    def worker(n: int) -> None:
+        own = latencies[n]
+        for i in range(n, events, threads):
+            table, payload = _event(i)
+            t0 = time.perf_counter()
+            emit(table, payload)
+            own.append(time.perf_counter() - t0)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return [x for own in latencies for x in own]
+
+
+def _rows(db_path: Path) -> int:
+    with sqlite3.connect(db_path) as conn:
+        tables = ["logs", "request_logs", "metric_rollups"]
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        return sum(
+            conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables if t in names
+        )
+
+
+def main() -> None:
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else EVENTS
+    from src.brain.monitoring.telemetry import TelemetryStore
+
+    print(f"Telemetry store benchmark: {events:,} events (1/3 requests, logs, metric samples)\n")
+    header = f"{'mode':<10} {'threads':>7} {'p50 us':>8} {'p99 us':>9} {'events/s':>10} {'rows':>7}"
+    print(header)
+    print("-" * len(header))
+    for threads in THREADS:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "legacy.db"
+            _schema(db_path)
+
+            def legacy(table, payload, db_path=db_path):
+                if table == "metric":
+                    # MetricsCollector.record went through log_for_grafana -> logs row
+                    payload = {"timestamp": datetime.now().isoformat(), "message": str(payload)}
+                    table = "logs"
+                _legacy_save(db_path, table, payload)
+
+            t0 = time.perf_counter()
+            latencies = _run(legacy, events, threads)
+            elapsed = time.perf_counter() - t0
+            results = [("legacy", latencies, elapsed, _rows(db_path))]
+
+            db_path = Path(tmp) / "telemetry.db"
+            _schema(db_path)
+            store = TelemetryStore(db_path)
+
+            def telemetry(table, payload, store=store):
+                if table == "metric":
+                    store.record_metric("custom.value", payload)
+                else:
+                    store.put(table, payload)
+
+            t0 = time.perf_counter()
+            latencies = _run(telemetry, events, threads)
+            store.flush(timeout=60)
+            elapsed = time.perf_counter() - t0
+            store.close()
+            results.append(("telemetry", latencies, elapsed, _rows(db_path)))
+
+            for mode, latencies, elapsed, rows in results:
+                cuts = statistics.quantiles(latencies, n=100)
+                print(
+                    f"{mode:<10} {threads:>7} {cuts[49] * 1e6:>8.1f} {cuts[98] * 1e6:>9.1f} "
+                    f"{events / elapsed:>10,.0f} {rows:>7,}"
+                )
+        if threads == THREADS[-1]:
+            print(f"\ntelemetry stats: {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
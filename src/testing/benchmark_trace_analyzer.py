@@ -0,0 +1,185 @@
+"""Benchmark: brain.log trace analysis, whole-file regex scan vs the streaming span engine.
+
+Writes a synthetic brain.log of N MB (default 2048) in the format setup_logging
+produces: sessions -> tasks -> step attempts -> dispatcher calls/results, buried
+in ~90% unrelated lines (LLM traffic, agent chatter), with injected loops,
+retry storms and latency outliers. Compares:
+- legacy:    the previous parse_brain_log + analyze_trace_issues (reads every
+             line, recognizes only "Calling tool:" lines)
+- streaming: analyze_log_file (mmap + marker scan, span store, analyses)
+then appends 1% more log and re-runs both (the engine resumes from its
+checkpoint), and finally re-runs on an unchanged file.
+
+Usage:
+    python src/testing/benchmark_trace_analyzer.py [megabytes]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TextIO
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+MEGABYTES = 2048
+
+NOISE = [
+    (
+        "httpx - INFO - HTTP Request: POST https://api.githubcopilot.com/chat/completions "
+        '"HTTP/1.1 200 OK"'
+    ),
+    "brain - INFO - [TETYANA] Thinking about the next action for the current step...",
+    "brain - INFO - [ATLAS] Аналізую запит користувача: відкрити браузер і знайти погоду",
+    "brain - INFO - [STATE] Checkpoint saved (delta 14, 2.1 KB)",
+    "brain - INFO - [GRISHA] Verification passed: screenshot matches expected state",
+    "brain - INFO - [MCP] Connected to filesystem (12 tools)",
+    "brain - INFO - [VOICE] Transcribed 120 chars in 35.2ms",
+    "brain - WARNING - [TETYANA] Vision analysis returned low confidence (0.41)",
+]
+TOOLS = [
+    ("filesystem.read_file", 8),
+    ("filesystem.write_file", 12),
+    ("macos-use.macos-use_click_and_traverse", 450),
+    ("terminal.execute_command", 900),
+    ("puppeteer.puppeteer_navigate", 1500),
+    ("memory.search", 25),
+]
+
+
+class _LogWriter:
+    def __init__(self, seed: int = 7):
+        self.f: TextIO | None = None
+        self.rng = random.Random(seed)
+        self.clock = datetime(2026, 10, 1, 8, 0, 0)
+        self.session = 0
+
+    def line(self, message: str, logger: str = "brain", level: str = "INFO") -> None:
+        self.clock += timedelta(milliseconds=self.rng.randint(1, 40))
+        stamp = self.clock.strftime("%Y-%m-%d %H:%M:%S")
+        self.f.write(
+            f"{stamp},{self.clock.microsecond // 1000:03d} - {logger} - {level} - {message}\n"
+        )
+
+    def noise(self, count: int) -> None:
+        for _ in range(count):
+            self.clock += timedelta(milliseconds=self.rng.randint(1, 40))
+            stamp = self.clock.strftime("%Y-%m-%d %H:%M:%S")
+            self.f.write(
+                f"{stamp},{self.clock.microsecond // 1000:03d} - {self.rng.choice(NOISE)}\n"
+            )
+
+    def call(self, tool: str, mean_ms: int, args: str, fail: bool = False, slow: bool = False):
+        self.line(f"[DISPATCHER] Calling {tool}")
+        ms = mean_ms * (20 if slow else self.rng.uniform(0.5, 1.5))
+        self.noise(self.rng.randint(2, 6))
+        self.clock += timedelta(milliseconds=ms)
+        if fail:
+            self.line(f"Error calling tool {tool}: Connection reset by peer", level="ERROR")
+        status = "error" if fail else "ok"
+        self.line(f"[DISPATCHER] Finished {tool} status={status} duration_ms={ms:.1f} args={args}")
+
+    def session_block(self) -> None:
+        rng = self.rng
+        self.session += 1
+        self.line(f"[SYSTEM] Нова сесія розпочата (session_{self.session})")
+        for task in range(3):
+            steps = rng.randint(2, 5)
+            self.line(f"[ORCHESTRATOR] Task started: {steps} steps: task {task} of {self.session}")
+            for step in range(1, steps + 1):
+                attempts = 3 if rng.random() < 0.03 else 1
+                for attempt in range(1, attempts + 1):
+                    self.line(f"[ORCHESTRATOR] Step {step}, Attempt {attempt}: do thing {step}")
+                    self.noise(rng.randint(20, 40))
+                    looping = rng.random() < 0.02
+                    storm = rng.random() < 0.01
+                    for n in range(6 if looping or storm else rng.randint(1, 3)):
+                        tool, mean_ms = TOOLS[0] if looping else rng.choice(TOOLS)
+                        args = "a0a0a0a0a0a0" if looping else f"{rng.getrandbits(48):012x}"
+                        fail = storm or rng.random() < 0.02
+                        self.call(tool, mean_ms, args, fail, slow=rng.random() < 0.002)
+                        self.noise(rng.randint(3, 10))
+                    if attempt < attempts:
+                        self.line(
+                            f"[ORCHESTRATOR] Step {step} failed. Error: tool failed.",
+                            level="WARNING",
+                        )
+                    else:
+                        self.line(f"[ORCHESTRATOR] Step {step} completed successfully")
+            self.line("[ORCHESTRATOR] Task finished: ok")
+
+    def grow(self, path: Path, megabytes: float) -> None:
+        with open(path, "a", encoding="utf-8") as self.f:
+            target = self.f.tell() + int(megabytes * 1024 * 1024)
+            while self.f.tell() < target:
+                self.session_block()
+
+
+def _timed(call):
+    t0 = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - t0
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else MEGABYTES
+    from src.mcp_server.trace_analyzer import (
+        analyze_log_file,
+        analyze_trace_issues,
+        parse_brain_log,
+    )
+
+    def legacy(path):
+        entries = parse_brain_log(path)
+        return entries, analyze_trace_issues(entries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "brain.log"
+        writer = _LogWriter()
+        (_, t_gen) = _timed(lambda: writer.grow(log, megabytes))
+        size = log.stat().st_size
+        print(f"Trace analyzer benchmark: {size / 1e9:.2f} GB log, {writer.session:,} sessions")
+        print(f"(generated in {t_gen:.0f}s)\n")
+
+        (entries, legacy_issues), t_legacy = _timed(lambda: legacy(log))
+        report, t_full = _timed(lambda: analyze_log_file(str(log)))
+        writer.grow(log, megabytes / 100)
+        _, t_legacy_inc = _timed(lambda: legacy(log))
+        report_inc, t_inc = _timed(lambda: analyze_log_file(str(log)))
+        _, t_noop = _timed(lambda: analyze_log_file(str(log)))
+
+        header = f"{'run':<24} {'legacy':>9} {'streaming':>10}"
+        print(header)
+        print("-" * len(header))
+        print(f"{'full log':<24} {t_legacy:>8.1f}s {t_full:>9.1f}s")
+        print(f"{'after +1% appended':<24} {t_legacy_inc:>8.1f}s {t_inc:>9.2f}s")
+        print(f"{'unchanged log':<24} {t_legacy_inc:>8.1f}s {t_noop:>9.3f}s")
+        print(
+            f"\nthroughput: {size / 1e6 / t_full:,.0f} MB/s (legacy {size / 1e6 / t_legacy:,.0f})"
+        )
+
+        print(f"\nlegacy: {len(entries):,} calls seen, {len(legacy_issues)} issues")
+        spans = report_inc["spans"]
+        print(
+            "streaming: "
+            + ", ".join(f"{kind} {sum(c.values()):,}" for kind, c in sorted(spans.items()))
+            + f" spans; {report_inc['issue_count']} issue groups"
+        )
+        by_type: dict[str, int] = {}
+        for issue in report_inc["issues"]:
+            by_type[issue["type"]] = by_type.get(issue["type"], 0) + issue["count"]
+        print(f"issues by type: {by_type}")
+        slowest = report_inc["critical_paths"][0]
+        print(
+            f"slowest task {slowest['duration_s']:.1f}s, tool time {slowest['tool_time_s']:.1f}s, "
+            f"critical path {len(slowest['path'])} steps"
+        )
+        store = log.with_name("brain.trace.db")
+        print(f"trace store: {store.stat().st_size / 1e6:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
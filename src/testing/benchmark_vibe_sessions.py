@@ -0,0 +1,173 @@
+"""Benchmark: vibe_list_sessions latency, directory scan vs the session catalog.
+
+Creates N (default 10,000) Vibe session files of about 8 KB each (metadata,
+stats and a short message history) and times listing them:
+- legacy: the previous vibe_list_sessions body (glob, stat every file to sort
+          by mtime, json-load the page); a text filter has to load every file
+- catalog: SessionCatalog.refresh() followed by SessionCatalog.list(), with
+          the poll interval disabled so every call checks the directory
+
+Cases: the default first page, a deep page (offset 5000), a prompt text filter,
+and the first page right after 10 new sessions were written. The catalog's
+one-off cold build (parsing every file once) is reported separately.
+Each case is run several times and the median is shown.
+
+Usage:
+    python src/testing/benchmark_vibe_sessions.py [sessions]
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SESSIONS = 10_000
+REPEAT = 5
+
+
+def _write_session(directory: Path, i: int) -> None:
+    messages = [{"role": "system", "content": "You are Vibe, a coding assistant. " * 20}]
+    messages.append({"role": "user", "content": f"Fix failing test number {i} in module_{i % 97}"})
+    for step in range(6):
+        messages.append({"role": "assistant", "content": f"Step {step}: reading files " * 10})
+        messages.append({"role": "tool", "content": "def handler(request): ...\n" * 20})
+    data = {
+        "metadata": {
+            "session_id": f"{i:08x}-bench",
+            "start_time": f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}T10:00:00",
+            "end_time": f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}T10:30:00",
+            "stats": {"steps": 6, "session_prompt_tokens": 1200, "session_completion_tokens": 300},
+        },
+        "messages": messages,
+    }
+    path = directory / f"session_2026_{i:06d}.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+# --- the previous implementation --------------------------------------------
+
+
+def _legacy_list(session_dir: Path, limit: int, offset: int = 0, query: str | None = None):
+    files = sorted(
+        session_dir.glob("session_*.json"), key=lambda x: x.stat().st_mtime, reverse=True
+    )
+    if not query:
+        files = files[offset : offset + limit]
+    sessions = []
+    for f in files:
+        with open(f, encoding="utf-8") as jf:
+            data = json.load(jf)
+        if query and not any(
+            query.lower() in str(m.get("content", "")).lower()
+            for m in data.get("messages", [])
+            if m.get("role") == "user"
+        ):
+            continue
+        meta = data.get("metadata", {})
+        stats = meta.get("stats", {})
+        sessions.append(
+            {
+                "session_id": meta.get("session_id"),
+                "timestamp": meta.get("start_time"),
+                "steps": stats.get("steps", 0),
+                "prompt_tokens": stats.get("session_prompt_tokens", 0),
+                "completion_tokens": stats.get("session_completion_tokens", 0),
+                "file": f.name,
+            }
+        )
+    return sessions[offset : offset + limit] if query else sessions
+
+
+def _median_ms(fn, repeat: int = REPEAT) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    from src.mcp_server.vibe_sessions import SessionCatalog
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else SESSIONS
+    with tempfile.TemporaryDirectory() as tmp:
+        session_dir = Path(tmp) / "session"
+        session_dir.mkdir()
+        print(f"Vibe session listing benchmark: {count:,} session files")
+        for i in range(count):
+            _write_session(session_dir, i)
+        total_mb = sum(p.stat().st_size for p in session_dir.iterdir()) / 1e6
+        print(f"  {total_mb:.0f} MB on disk\n")
+        time.sleep(2.1)  # let the directory mtime settle (see RACY_WINDOW_NS)
+
+        catalog = SessionCatalog(session_dir, Path(tmp) / "index.db", poll_interval=0)
+        t0 = time.perf_counter()
+        catalog.refresh()
+        cold_ms = (time.perf_counter() - t0) * 1000
+
+        def via_catalog(**kwargs):
+            def run():
+                catalog.refresh()
+                return catalog.list(**kwargs)
+
+            return run
+
+        cases = [
+            (
+                "first page (10)",
+                lambda: _legacy_list(session_dir, 10),
+                via_catalog(limit=10),
+            ),
+            (
+                "deep page (50 @ 5000)",
+                lambda: _legacy_list(session_dir, 50, 5000),
+                via_catalog(limit=50, offset=5000),
+            ),
+            (
+                "text filter (10)",
+                lambda: _legacy_list(session_dir, 10, query="module_42"),
+                via_catalog(limit=10, query="module_42"),
+            ),
+        ]
+        results = [(name, _median_ms(old), _median_ms(new)) for name, old, new in cases]
+
+        def after_new_sessions(fn):
+            def run():
+                for i in range(count, count + 10):
+                    _write_session(session_dir, i)
+                fn()
+                for i in range(count, count + 10):
+                    (session_dir / f"session_2026_{i:06d}.json").unlink()
+
+            return run
+
+        # both sides pay the same 10 writes and 10 unlinks
+        results.append(
+            (
+                "first page after 10 new",
+                _median_ms(after_new_sessions(lambda: _legacy_list(session_dir, 10)), 3),
+                _median_ms(after_new_sessions(via_catalog(limit=10)), 3),
+            )
+        )
+        catalog.refresh()
+        newest = [s["file"] for s in _legacy_list(session_dir, 10)]
+        assert newest == [row["file"] for row in catalog.list(limit=10)[0]]
+        catalog.close()
+        db_mb = (Path(tmp) / "index.db").stat().st_size / 1e6
+
+    header = f"{'':<26} {'legacy':>12} {'catalog':>12} {'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, old, new in results:
+        print(f"{name:<26} {old:>10.1f}ms {new:>10.1f}ms {old / new:>8.0f}x")
+    print(f"\ncatalog cold build: {cold_ms / 1000:.1f}s once, index {db_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
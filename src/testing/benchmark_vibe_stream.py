@@ -0,0 +1,229 @@
+"""Benchmark: Vibe output stream handling, 1 KB chunk reader vs the line-framed reader.
+
+A fake Vibe process writes N MB (default 100) of mixed output to stdout and a
+little to stderr: ANSI-coloured status lines, spinner lines redrawn with "\\r",
+structured JSON log lines, Ukrainian text, TUI box drawing and long tool dumps.
+Both readers consume it through asyncio subprocess pipes, with the vibe_mcp
+logger writing DEBUG to a file as the server does and a fake MCP context that
+counts ctx.log calls:
+- legacy: the previous _read_vibe_stream (1 KB reads, per-chunk decode, every
+          fragment cleaned, masked, JSON-parsed, logged and sent to the client,
+          all chunks kept and joined at the end)
+- framed: VibeStreamReader + OutputBuffer + ProgressEmitter as used by
+          _execute_vibe_with_retries
+Peak RSS is sampled after each run (framed runs first).
+
+Usage:
+    python src/testing/benchmark_vibe_stream.py [megabytes]
+"""
+
+import asyncio
+import json
+import logging
+import re
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+MEGABYTES = 100
+MAX_OUTPUT_CHARS = 500_000
+
+FAKE_VIBE = r"""
+import json, sys
+megabytes = float(sys.argv[1])
+lines = []
+for i in range(40):
+    lines.append(f"\x1b[36m[{i:03d}]\x1b[0m Reading file src/brain/module_{i}.py ({i * 37} lines)\n")
+    lines.append(f"Thinking… {i}\rThinking… {i} tokens\r\x1b[2KThinking… done\n")
+    lines.append(json.dumps({"role": "assistant", "content": f"Step {i}: перевіряю конфігурацію"}) + "\n")
+    lines.append(json.dumps({"role": "tool", "content": "x" * 300}) + "\n")
+    lines.append(f"Аналізую залежності модуля {i}: усе гаразд ✓\n")
+    lines.append("╭" + "─" * 60 + "╮\n")
+    lines.append("def handler(request):  # " + "long tool output " * 20 + "\n")
+block = "".join(lines).encode()
+target = int(megabytes * 1024 * 1024)
+out, err = sys.stdout.buffer, sys.stderr.buffer
+written = 0
+while written < target:
+    out.write(block)
+    written += len(block)
+    err.write(b"WARNING: deprecated option --foo\n")
+out.write(json.dumps({"role": "assistant", "content": "FINAL-ANSWER"}).encode() + b"\n")
+out.flush()
+"""
+
+
+class _Ctx:
+    def __init__(self):
+        self.calls = 0
+
+    async def log(self, level, message, logger_name=None):
+        self.calls += 1
+
+
+# --- the previous implementation --------------------------------------------
+
+_ANSI = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+
+async def _legacy_read(stream, chunks, stream_name, ctx, *, logger, mask, spam):
+    async def emit(level, message):
+        await ctx.log(level, message, logger_name="vibe_mcp")
+
+    async def handle(line):
+        if any(c < "\x20" for c in line if c not in "\t\n\r"):
+            line = "".join(c for c in line if c >= "\x20" or c in "\t\n\r")
+        line = mask(line.strip())
+        if not line:
+            return
+        try:
+            obj = json.loads(line)
+            if isinstance(obj, dict) and obj.get("role") and obj.get("content"):
+                message = f"[VIBE-THOUGHT] {str(obj['content'])[:200]}"
+                logger.info(message)
+                await emit("info", message)
+                return
+        except (json.JSONDecodeError, ValueError):
+            pass
+        if any(t in line for t in spam) or len(line) >= 1000:
+            return
+        logger.debug(mask(f"[VIBE_{stream_name}] {line}"))
+        await emit("warning" if stream_name == "ERR" else "info", f"[VIBE-LIVE] {line}")
+
+    stats = {"fragments": 0, "mangled": 0}
+    while True:
+        data = await asyncio.wait_for(stream.read(1024), timeout=60)
+        if not data:
+            break
+        chunks.append(data)
+        text = data.decode(errors="replace")
+        for line in text.split("\n"):
+            if line.strip():
+                stats["fragments"] += 1
+                stats["mangled"] += "�" in line
+                await handle(line)
+    return stats
+
+
+async def _run_legacy(megabytes, logger):
+    from src.brain.monitoring.utils.security import mask_sensitive_data
+    from src.mcp_server.vibe_stream import SPAM_TRIGGERS
+
+    ctx = _Ctx()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        FAKE_VIBE,
+        str(megabytes),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out_chunks, err_chunks = [], []
+    t0 = time.perf_counter()
+    hooks = {"logger": logger, "mask": mask_sensitive_data, "spam": SPAM_TRIGGERS}
+    stats = await asyncio.gather(
+        _legacy_read(process.stdout, out_chunks, "OUT", ctx, **hooks),
+        _legacy_read(process.stderr, err_chunks, "ERR", ctx, **hooks),
+    )
+    await process.wait()
+    retained = sum(map(len, out_chunks))
+    stdout = _ANSI.sub("", b"".join(out_chunks).decode(errors="replace"))
+    stdout = stdout[:MAX_OUTPUT_CHARS]
+    elapsed = time.perf_counter() - t0
+    return {
+        "elapsed": elapsed,
+        "ctx_calls": ctx.calls,
+        "retained": retained,
+        "handled": sum(s["fragments"] for s in stats),
+        "mangled": sum(s["mangled"] for s in stats),
+        "has_final_answer": "FINAL-ANSWER" in stdout,
+    }
+
+
+# --- the framed reader -------------------------------------------------------
+
+
+async def _run_framed(megabytes):
+    from src.mcp_server.vibe_stream import (
+        OutputBuffer,
+        ProgressEmitter,
+        VibeStreamReader,
+        read_vibe_stream,
+    )
+
+    ctx = _Ctx()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        FAKE_VIBE,
+        str(megabytes),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    t0 = time.perf_counter()
+    out_buf, err_buf = OutputBuffer(MAX_OUTPUT_CHARS), OutputBuffer(MAX_OUTPUT_CHARS)
+    progress = ProgressEmitter(ctx.log)
+    await asyncio.gather(
+        read_vibe_stream(process.stdout, VibeStreamReader("OUT", out_buf, progress), 60),
+        read_vibe_stream(process.stderr, VibeStreamReader("ERR", err_buf, progress), 60),
+    )
+    await progress.flush()
+    await process.wait()
+    stdout = out_buf.text()
+    elapsed = time.perf_counter() - t0
+    return {
+        "elapsed": elapsed,
+        "ctx_calls": ctx.calls,
+        "retained": len(stdout.encode()),
+        "mangled": stdout.count("�"),
+        "has_final_answer": "FINAL-ANSWER" in stdout,
+    }
+
+
+def _rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else MEGABYTES
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = logging.getLogger("vibe_mcp")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        handler = logging.FileHandler(Path(tmp) / "vibe_server.log", encoding="utf-8")
+        logger.addHandler(handler)
+
+        print(f"Vibe stream benchmark: {megabytes:.0f} MB of mixed output\n")
+        framed = asyncio.run(_run_framed(megabytes))
+        framed["rss"] = _rss_mb()
+        framed["log"] = handler.stream.tell()
+        legacy = asyncio.run(_run_legacy(megabytes, logger))
+        legacy["rss"] = _rss_mb()
+        legacy["log"] = handler.stream.tell() - framed["log"]
+
+    header = f"{'':<28} {'legacy':>14} {'framed':>14}"
+    print(header)
+    print("-" * len(header))
+    rows = [
+        ("time", lambda r: f"{r['elapsed']:.1f}s"),
+        ("throughput", lambda r: f"{megabytes / r['elapsed']:.1f} MB/s"),
+        ("ctx.log calls", lambda r: f"{r['ctx_calls']:,}"),
+        ("vibe_server.log written", lambda r: f"{r['log'] / 1e6:.1f} MB"),
+        ("output retained", lambda r: f"{r['retained'] / 1e6:.1f} MB"),
+        ("peak RSS (cumulative)", lambda r: f"{r['rss']:.0f} MB"),
+        ("U+FFFD in handled text", lambda r: f"{r['mangled']:,}"),
+        ("final answer in result", lambda r: str(r["has_final_answer"])),
+    ]
+    for name, fmt in rows:
+        print(f"{name:<28} {fmt(legacy):>14} {fmt(framed):>14}")
+    print(f"\nlegacy handled {legacy['handled']:,} line fragments one at a time")
+
+
+if __name__ == "__main__":
+    main()
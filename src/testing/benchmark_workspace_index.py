@@ -0,0 +1,170 @@
+"""Benchmark: project analysis for the diagram tools, tree rescan vs the workspace index.
+
+Generates a Python monorepo of N files (default 50,000): packages under src/
+with modules that import each other, docs and fixtures, plus an ignored
+node_modules/ and __pycache__/ of another 10% that the index never walks.
+Then runs what devtools_update_architecture_diagrams does, analysis plus
+detect_changed_components for 50 modified files:
+- legacy: the previous project_analyzer (rglob over src/ on every call, every
+          modified file matched against every component name)
+- index:  analyze_project_structure + detect_changed_components on a
+          WorkspaceIndex; cold (empty index: every file read, hashed and
+          parsed), warm (nothing changed) and warm after 50 files were edited
+
+Usage:
+    python src/testing/benchmark_workspace_index.py [files]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+FILES = 50_000
+MODULES_PER_PACKAGE = 40
+MODIFIED = 50
+
+
+def _generate(root: Path, count: int) -> list[str]:
+    """Write the tree; returns the source modules (relative paths)."""
+    (root / "pyproject.toml").write_text("[project]\nname = 'mono'\n")
+    (root / "main.py").write_text("from src.pkg0000.mod00 import run\n")
+    modules: list[str] = []
+    sources = int(count * 0.8)
+    for i in range(sources // MODULES_PER_PACKAGE):
+        package = root / "src" / f"pkg{i:04d}"
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        for j in range(MODULES_PER_PACKAGE - 1):
+            rel = f"src/pkg{i:04d}/mod{j:02d}.py"
+            dep = f"src.pkg{(i * 7 + j) % (sources // MODULES_PER_PACKAGE):04d}.mod{j:02d}"
+            (root / rel).write_text(
+                f"import os\nfrom {dep} import run as other\nfrom .mod{(j + 1) % 39:02d} import run\n\n"
+                f"class Model{j}:\n    pass\n\n\ndef run():\n    return other()\n"
+                + "# filler\n"
+                * 40
+            )
+            modules.append(rel)
+    others = count - sources
+    for i in range(others):
+        target = root / ("docs" if i % 2 else "fixtures") / f"group{i % 100:03d}"
+        target.mkdir(parents=True, exist_ok=True)
+        (target / f"item{i:05d}.{'md' if i % 2 else 'json'}").write_text("{}\n" * 20)
+    for i in range(count // 10):  # ignored trees
+        target = root / ("node_modules" if i % 2 else "src/pkg0000/__pycache__") / f"d{i % 50}"
+        target.mkdir(parents=True, exist_ok=True)
+        (target / f"f{i}.js").write_text("module.exports = 1\n")
+    return modules
+
+
+# --- the previous implementation --------------------------------------------
+
+
+def _legacy_analyze(project_path: Path) -> dict[str, Any]:
+    info: dict[str, Any] = {"entry_points": [], "components": [], "directories": {}}
+    for pattern in ["main.py", "app.py", "__main__.py", "run.py", "start.py"]:
+        if (project_path / pattern).exists():
+            info["entry_points"].append(pattern)
+    for src_dir in ["src", "app", project_path.name]:
+        src_path = project_path / src_dir
+        if src_path.exists() and src_path.is_dir():
+            info["directories"][src_dir] = list(src_path.glob("*.py"))
+            for py_file in src_path.rglob("*.py"):
+                if py_file.stem not in ["__init__", "__pycache__"]:
+                    info["components"].append(py_file.stem.replace("_", " ").title())
+    return info
+
+
+def _legacy_detect(analysis: dict[str, Any], modified_files: list[str]) -> list[str]:
+    affected = set()
+    for file_path in modified_files:
+        for entry_point in analysis.get("entry_points", []):
+            if entry_point in file_path:
+                affected.add("Main Entry Point")
+        for dir_name in analysis.get("directories", {}):
+            if dir_name in file_path:
+                affected.add(f"{dir_name.title()} Module")
+        for component in analysis.get("components", []):
+            if component.lower().replace(" ", "_") in file_path.lower():
+                affected.add(component)
+    return list(affected)
+
+
+def _median_s(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def main() -> None:
+    from src.mcp_server.project_analyzer import analyze_project_structure, detect_changed_components
+    from src.mcp_server.workspace_index import WorkspaceIndex
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else FILES
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "mono"
+        root.mkdir()
+        print(f"Workspace index benchmark: {count:,} files (+{count // 10:,} ignored)")
+        modules = _generate(root, count)
+        modified = modules[:: len(modules) // MODIFIED][:MODIFIED]
+
+        def legacy():
+            analysis = _legacy_analyze(root)
+            return analysis, _legacy_detect(analysis, modified)
+
+        legacy_s = _median_s(legacy)
+        legacy_analysis, _ = legacy()
+
+        index = WorkspaceIndex(root, Path(tmp) / "index.db")
+
+        def indexed():
+            analysis = analyze_project_structure(root, index)
+            return analysis, detect_changed_components(analysis, "", modified, index=index)
+
+        t0 = time.perf_counter()
+        analysis, affected = indexed()
+        cold_s = time.perf_counter() - t0
+        warm_s = _median_s(indexed)
+
+        def after_edits():
+            stamp = time.time_ns()
+            for rel in modified:
+                with open(root / rel, "a") as f:
+                    f.write(f"# edit {stamp}\n")
+            return indexed()
+
+        edited_s = _median_s(after_edits)
+        stats = index.refresh()
+        index.close()
+        db_mb = (Path(tmp) / "index.db").stat().st_size / 1e6
+        walked = sum(len(files) for _, _, files in os.walk(root))
+
+    header = f"{'':<34} {'time':>9}"
+    print(f"\n{header}\n{'-' * len(header)}")
+    for name, seconds in [
+        ("legacy (rglob + name matching)", legacy_s),
+        ("index, cold (empty index)", cold_s),
+        ("index, warm (no changes)", warm_s),
+        (f"index, warm after {MODIFIED} edits", edited_s),
+    ]:
+        print(f"{name:<34} {seconds:>8.2f}s")
+    print(
+        f"\n{walked:,} files on disk, {stats['files']:,} indexed, index {db_mb:.1f} MB"
+        f"\ncomponents: legacy {len(legacy_analysis['components']):,} entries,"
+        f" index {len(analysis['components']):,} distinct;"
+        f" {sum(map(len, analysis['component_dependencies'].values())):,} dependency edges"
+        f"\naffected components for {MODIFIED} modified files: {len(affected)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -251,6 +251,7 @@ TEST_ARGS = {
     "devtools_check_complexity": {},
     "devtools_check_types_python": {},
     "devtools_check_types_ts": {},
+    "devtools_run_static_analysis": {"path": "src/__init__.py"},
     "devtools_lint_python": {},
     "devtools_lint_js": {},
     "devtools_analyze_trace": {},
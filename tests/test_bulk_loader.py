@@ -0,0 +1,120 @@
+"""Tests for the chunked DataFrame -> table loader"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.brain.memory.db.bulk_loader import BulkLoader, chunk_rows, infer_columns
+from src.brain.memory.db.manager import DatabaseManager
+
+
+def _frame(n: int = 25) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "Company ID": np.arange(n),
+            "Score": np.where(np.arange(n) % 5 == 0, np.nan, np.arange(n) / 2),
+            "Name": [None if i % 7 == 0 else f"name-{i}" for i in range(n)],
+            "Created-At": pd.date_range("2024-01-01", periods=n, freq="h"),
+            "active": np.arange(n) % 2 == 0,
+            "row_id": np.arange(n) * 10,
+            "extra": [Decimal(i) if i % 3 else {"k": i} for i in range(n)],
+        }
+    )
+    df.loc[3, "Created-At"] = pd.NaT
+    return df
+
+
+def test_infer_columns_sanitizes_and_types():
+    cols = infer_columns(_frame())
+    assert [(c.name, c.kind) for c in cols] == [
+        ("company_id", "integer"),
+        ("score", "float"),
+        ("name", "text"),
+        ("created_at", "datetime"),
+        ("active", "boolean"),
+        ("original_row_id", "integer"),
+        ("extra", "text"),
+    ]
+
+
+def test_chunk_rows_converts_missing_values_and_leaves_frame_untouched():
+    df = _frame()
+    before = df.copy()
+    rows = chunk_rows(df, infer_columns(df), 0, 8)
+
+    assert len(rows) == 8
+    assert rows[0][1] is None and rows[0][2] is None  # NaN / None
+    assert rows[3][3] is None  # NaT
+    assert rows[1] == (1, 0.5, "name-1", "2024-01-01 01:00:00.000000", 0, 10, "1")
+    assert all(type(v) in (int, float, str, type(None)) for row in rows for v in row)
+    pd.testing.assert_frame_equal(df, before)
+
+
+@pytest.mark.asyncio
+async def test_create_table_from_df_loads_in_chunks_and_indexes(tmp_path):
+    manager = DatabaseManager()
+    manager.db_url = f"sqlite+aiosqlite:///{tmp_path}/bulk.db"
+    await manager.initialize()
+    try:
+        df = _frame(103)
+        assert await manager.create_table_from_df("dataset_test", df, chunk_size=10)
+
+        report = manager.last_load_report
+        assert report["rows"] == 103 and report["chunks"] == 11
+        assert report["indexes"] == [
+            "ix_dataset_test_company_id",
+            "ix_dataset_test_original_row_id",
+        ]
+
+        async with await manager.get_session() as session:
+            rows = (
+                await session.execute(
+                    text(
+                        "SELECT company_id, score, name, created_at, active, original_row_id "
+                        "FROM dataset_test ORDER BY row_id"
+                    )
+                )
+            ).all()
+            plan = (
+                await session.execute(
+                    text("EXPLAIN QUERY PLAN SELECT * FROM dataset_test WHERE company_id = 5")
+                )
+            ).all()
+
+        assert len(rows) == 103
+        assert rows[2] == (2, 1.0, "name-2", "2024-01-01 02:00:00.000000", 1, 20)
+        assert rows[5][1] is None and rows[7][2] is None and rows[3][3] is None
+        assert "ix_dataset_test_company_id" in str(plan)
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_load_leaves_no_partial_rows(tmp_path):
+    manager = DatabaseManager()
+    manager.db_url = f"sqlite+aiosqlite:///{tmp_path}/bulk.db"
+    await manager.initialize()
+    try:
+        df = pd.DataFrame({"company_id": np.arange(25)})
+        async with manager._engine.begin() as conn:
+            await conn.exec_driver_sql(
+                "CREATE TABLE dataset_bad (row_id INTEGER PRIMARY KEY, "
+                "company_id INTEGER CHECK (company_id < 15))"
+            )
+
+        loader = BulkLoader(manager._engine, chunk_size=10)
+        with pytest.raises(Exception, match="CHECK constraint"):
+            await loader.load("dataset_bad", df, infer_columns(df))
+
+        async with await manager.get_session() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM dataset_bad"))).scalar()
+        assert count == 0  # the first chunk was valid but is rolled back with the rest
+    finally:
+        await manager.close()
@@ -0,0 +1,206 @@
+"""Tests for the compiled configuration runtime (identical lookups, reload, typed views)"""
+
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.brain.config import CONFIG_ROOT, PROJECT_ROOT, config_loader, deep_merge
+from src.brain.config.config_loader import SystemConfig, config
+from src.brain.config.config_runtime import (
+    OrchestratorSettings,
+    build_view,
+    compile_config,
+)
+
+TEMPLATES = Path(__file__).parent.parent / "config"
+
+
+def _legacy_substitute(value: Any) -> Any:
+    """The pre-compilation ``SystemConfig._substitute_placeholders``, verbatim."""
+    if isinstance(value, str):
+
+        def replace_match(match):
+            var_name = match.group(1)
+            if var_name == "PROJECT_ROOT":
+                return str(PROJECT_ROOT)
+            if var_name == "CONFIG_ROOT":
+                return str(CONFIG_ROOT)
+            if var_name == "HOME":
+                return str(Path.home())
+            return os.getenv(var_name, match.group(0))
+
+        return re.sub(r"\$\{([a-zA-Z_][a-zA-Z0-9_]*)\}", replace_match, value)
+    if isinstance(value, list):
+        return [_legacy_substitute(item) for item in value]
+    if isinstance(value, dict):
+        return {k: _legacy_substitute(v) for k, v in value.items()}
+    return value
+
+
+def _legacy_get(raw: dict, key_path: str, default: Any = None) -> Any:
+    """The pre-compilation ``SystemConfig.get``, verbatim."""
+    value: Any = raw
+    for key in key_path.split("."):
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            return default
+    if key_path == "mcp.sequential_thinking.model" and not value:
+        return _legacy_get(raw, "models.reasoning") or _legacy_get(raw, "models.default")
+    return _legacy_substitute(value)
+
+
+def _probe_keys(node: Any, prefix: str = "") -> list[str]:
+    """Every dotted path in ``node`` plus near misses (unknown leaves, list indexes)."""
+    keys = []
+    if isinstance(node, dict):
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            keys += [path, f"{path}.missing", f"{path}.0"]
+            keys += _probe_keys(value, f"{path}.")
+    return keys
+
+
+def _real_configs() -> list[tuple[str, dict]]:
+    templates = {}
+    for name in ("config.yaml.template", "behavior_config.yaml.template"):
+        with open(TEMPLATES / name, encoding="utf-8") as f:
+            templates[name] = yaml.safe_load(f) or {}
+    defaults = deep_merge(config._get_defaults(), templates["config.yaml.template"])
+    sources = [("defaults + config.yaml.template", defaults), *templates.items()]
+    edge = {
+        "a.b": 1,
+        "a": {"b": 2, "": "empty key", 3: "int key", "env": "${ATLAS_TEST_VAR}/x"},
+        "mcp": {"sequential_thinking": {"model": ""}},
+        "models": {"reasoning": "${HOME}/r", "default": "d"},
+        "nothing": None,
+        "paths": ["${PROJECT_ROOT}/a", {"nested": "${CONFIG_ROOT}"}],
+    }
+    sources.append(("edge cases", deep_merge(defaults, edge)))
+    return sources
+
+
+@pytest.mark.parametrize(
+    ("name", "raw"), _real_configs(), ids=lambda v: v if isinstance(v, str) else ""
+)
+def test_compiled_get_matches_legacy_lookup(name, raw, monkeypatch):
+    snapshot = compile_config(
+        raw,
+        inherited_model=lambda: (
+            _legacy_get(raw, "models.reasoning") or _legacy_get(raw, "models.default")
+        ),
+    )
+    keys = [*_probe_keys(raw), "", "nope", "agents.nope.model", "mcp.sequential_thinking.model"]
+    for env_value in ("first", "second"):
+        monkeypatch.setenv("ATLAS_TEST_VAR", env_value)
+        monkeypatch.setenv("HOME", f"/tmp/{env_value}")
+        for key in keys:
+            assert snapshot.get(key) == _legacy_get(raw, key), (name, key)
+            assert snapshot.get(key, "dflt") == _legacy_get(raw, key, "dflt"), (name, key)
+
+
+def test_global_config_matches_legacy_lookup():
+    for key in _probe_keys(config.all):
+        assert config.get(key) == _legacy_get(config.all, key), key
+
+
+def test_containers_are_fresh_copies():
+    raw = {"security": {"dangerous_commands": ["rm -r"]}}
+    snapshot = compile_config(raw)
+    first = snapshot.get("security")
+    first["dangerous_commands"].append("mkfs")
+    first["extra"] = True
+    assert snapshot.get("security") == {"dangerous_commands": ["rm -r"]}
+    assert raw == {"security": {"dangerous_commands": ["rm -r"]}}
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    """A SystemConfig reading from a temporary CONFIG_ROOT."""
+    monkeypatch.setattr(config_loader, "CONFIG_ROOT", tmp_path / "cfg")
+    monkeypatch.setattr(config_loader, "MCP_DIR", tmp_path / "cfg" / "mcp")
+    instance = object.__new__(SystemConfig)
+    instance._init()
+    yield instance
+    instance.stop_watching()
+
+
+def _write(instance: SystemConfig, data: dict) -> None:
+    path = config_loader.CONFIG_ROOT / "config.yaml"
+    current = yaml.safe_load(path.read_text()) or {}
+    path.write_text(yaml.safe_dump(deep_merge(current, data)))
+    # make sure the stamp changes even on coarse mtime filesystems
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_swaps_snapshot_and_notifies(isolated):
+    seen_all, seen_orch = [], []
+    isolated.subscribe(seen_all.append)
+    unsubscribe = isolated.subscribe(seen_orch.append, prefix="orchestrator")
+    generation = isolated._snapshot.generation
+
+    assert isolated.reload_if_changed() == frozenset()
+    _write(isolated, {"orchestrator": {"task_timeout": 42}, "logging": {"level": "DEBUG"}})
+    changed = isolated.reload_if_changed()
+    assert {"orchestrator", "orchestrator.task_timeout", "logging.level"} <= changed
+    assert isolated.get("orchestrator.task_timeout") == 42
+    assert isolated._snapshot.generation == generation + 1
+    assert seen_all == [changed]
+    assert seen_orch == [frozenset({"orchestrator", "orchestrator.task_timeout"})]
+
+    unsubscribe()
+    _write(isolated, {"orchestrator": {"task_timeout": 43}})
+    isolated.reload()
+    assert len(seen_orch) == 1 and len(seen_all) == 2
+
+    # a broken file keeps the last good configuration
+    (config_loader.CONFIG_ROOT / "config.yaml").write_text("orchestrator: [unclosed\n")
+    assert isolated.reload() == frozenset()
+    assert isolated.get("orchestrator.task_timeout") == 43
+
+
+def test_watcher_hot_reloads(isolated):
+    isolated.start_watching(interval=0.02)
+    _write(isolated, {"orchestrator": {"subtask_timeout": 77}})
+    deadline = time.monotonic() + 5
+    while isolated.get("orchestrator.subtask_timeout") != 77 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert isolated.get("orchestrator.subtask_timeout") == 77
+
+
+def test_typed_views(isolated, caplog):
+    _write(
+        isolated,
+        {"orchestrator": {"task_timeout": 90, "max_recursion_depth": "deep", "extra": 1}},
+    )
+    isolated.reload()
+    view = isolated.view("orchestrator", OrchestratorSettings)
+    assert view.task_timeout == 90.0 and isinstance(view.task_timeout, float)
+    assert view.max_recursion_depth == 5  # wrong type: default, with a warning
+    assert "orchestrator.max_recursion_depth" in caplog.text
+    assert isolated.view("orchestrator", OrchestratorSettings) is view  # cached per snapshot
+
+    _write(isolated, {"orchestrator": {"task_timeout": 91}})
+    isolated.reload()
+    assert isolated.view("orchestrator", OrchestratorSettings).task_timeout == 91.0
+
+    @dataclass(frozen=True)
+    class Models:
+        default: str
+        vision: str = ""
+        fallback: str | None = None
+
+    models = build_view("models", Models, {"default": "copilot:gpt-4o", "vision": None})
+    assert models == Models("copilot:gpt-4o", "", None)
+    with pytest.raises(ValueError, match=r"models\.default"):
+        build_view("models", Models, {"default": 3})
@@ -0,0 +1,147 @@
+"""Tests for the data-analysis dataset cache (Arrow copies, pushdown, invalidation, LRU)"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.dataset_cache import DatasetCache, apply_subset
+from src.mcp_server.dataset_profile import ProfileStore
+
+
+def _frame(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(
+        {
+            "region": rng.choice(["Київ", "Львів", "Одеса", None], n),
+            "year": rng.integers(2015, 2025, n),
+            "amount": rng.random(n) * 1000,
+            "name": [f"ТОВ {i}" for i in range(n)],
+        }
+    )
+
+
+def _read(path: Path, nrows=None, **kwargs) -> pd.DataFrame:
+    return pd.read_csv(path, nrows=nrows, **kwargs)
+
+
+def test_cached_loads_match_pandas(tmp_path):
+    source = tmp_path / "data.csv"
+    _frame(5_000).to_csv(source, index=False)
+    expected = pd.read_csv(source)
+    cache = DatasetCache(tmp_path / "frames", background=False)
+
+    first = cache.load(source, _read)
+    second = cache.load(source, _read)
+    assert (cache.stats.misses, cache.stats.hits, cache.stats.conversions) == (1, 1, 1)
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+    # projection, pushdown and limits agree with the pandas equivalent
+    filters = [["year", ">=", 2020], ["region", "in", ["Київ", "Одеса"]]]
+    for kwargs in (
+        {"columns": ["amount", "missing", "region"]},
+        {"columns": lambda numeric: [c for c, num in numeric.items() if num]},
+        {"filters": filters},
+        {"filters": filters, "columns": ["name"], "nrows": 50},
+        {"nrows": 123},
+    ):
+        got = cache.load(source, _read, **kwargs)
+        want = apply_subset(expected, **kwargs)
+        pd.testing.assert_frame_equal(got, want)
+    assert list(cache.load(source, _read, columns=["amount", "region"]).columns) == [
+        "amount",
+        "region",
+    ]
+
+    # read options are part of the key
+    cache.load(source, _read, {"usecols": ["year"]})
+    assert cache.stats.conversions == 2
+
+    # a rewritten file is a new entry; the stale copy is dropped
+    _frame(10).to_csv(source, index=False)
+    os.utime(source, ns=(1, 1))
+    assert len(cache.load(source, _read)) == 10
+    assert cache.info()["entries"] == 2
+
+
+def test_row_limited_miss_converts_in_background(tmp_path):
+    source = tmp_path / "data.csv"
+    _frame(3_000).to_csv(source, index=False)
+    cache = DatasetCache(tmp_path / "frames")
+
+    preview = cache.load(source, _read, nrows=100)
+    assert len(preview) == 100 and cache.stats.partial_reads == 1
+    cache.wait()
+    assert cache.stats.conversions == 1
+    pd.testing.assert_frame_equal(cache.load(source, _read, nrows=100), preview)
+    assert cache.stats.hits == 1
+
+
+def test_lru_budget_and_uncacheable_frames(tmp_path):
+    cache = DatasetCache(tmp_path / "frames", background=False)
+    sources = []
+    for i in range(3):
+        source = tmp_path / f"d{i}.csv"
+        _frame(2_000).to_csv(source, index=False)
+        sources.append(source)
+    cache.load(sources[0], _read)
+    entry_size = cache.info()["bytes"]
+    cache.budget_bytes = int(entry_size * 2.5)
+    cache.load(sources[1], _read)
+    cache.load(sources[0], _read)  # refresh: d1 is now least recently used
+    cache.load(sources[2], _read)
+    assert cache.stats.evictions == 1 and cache.info()["entries"] == 2
+    cache.load(sources[0], _read)
+    assert cache.stats.hits == 2
+
+    # recency does not depend on file timestamps: with every mtime equal, the
+    # entry read last still survives and the least recently used one goes
+    for entry in (tmp_path / "frames").glob("*.arrow"):
+        os.utime(entry, ns=(1, 1))
+    cache.load(sources[1], _read)  # miss: d1 was evicted above
+    assert cache.stats.evictions == 2
+    cache.load(sources[0], _read)
+    assert cache.stats.hits == 3
+
+    # a new process orders the entries it finds by mtime
+    restarted = DatasetCache(tmp_path / "frames", budget_bytes=cache.budget_bytes)
+    assert list(restarted._recency) == sorted(
+        restarted._recency, key=lambda n: (tmp_path / "frames" / n).stat().st_mtime_ns
+    )
+
+    # mixed-type object columns cannot become Arrow: served directly, never cached
+    mixed = tmp_path / "mixed.json"
+    mixed.write_text('[{"v": 1}, {"v": "x"}, {"v": [1, 2]}]')
+    df = cache.load(mixed, lambda p, nrows=None: pd.read_json(p))
+    assert len(df) == 3 and cache.stats.fallbacks == 1
+
+
+def test_tools_use_projection_and_filters(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from src.mcp_server import data_analysis_server as server
+
+    monkeypatch.setattr(server, "FRAME_CACHE", DatasetCache(tmp_path / "frames", background=False))
+    monkeypatch.setattr(server, "PROFILES", ProfileStore(tmp_path / "profiles"))
+    source = tmp_path / "data.csv"
+    frame = _frame(4_000)
+    frame.to_csv(source, index=False)
+    expected = pd.read_csv(source)
+
+    result = asyncio.run(
+        server.data_aggregation(str(source), "region", ["sum"], filters=[["year", "<", 2018]])
+    )
+    want = expected[expected["year"] < 2018].groupby("region")[["year", "amount"]].sum()
+    got = pd.DataFrame(result["aggregated_data"]).set_index("region")
+    np.testing.assert_allclose(got["amount_sum"], want["amount"])
+
+    stats = asyncio.run(server.generate_statistics(str(source)))
+    assert set(stats["descriptive"]) == {"year", "amount"}
+    columns = asyncio.run(server.interpret_column_data(str(source), ["region", "nope"]))
+    assert columns["columns_interpretation"][1]["error"] == "Column not found in data"
+    assert server.FRAME_CACHE.stats.conversions == 1
@@ -0,0 +1,157 @@
+"""Tests for the dataset profile sketches (accuracy against exact pandas results)"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.dataset_cache import DatasetCache
+from src.mcp_server.dataset_profile import DatasetProfile, ProfileStore
+
+
+def _frame(n: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    amount = rng.lognormal(3, 1.2, n)
+    amount[::11] = np.nan
+    return pd.DataFrame(
+        {
+            "amount": amount,
+            "year": rng.integers(2000, 2025, n),
+            "region": rng.choice(["Київ", "Львів", "Одеса", "Харків", None], n),
+            "code": rng.integers(0, 200_000, n).astype(str),
+        }
+    )
+
+
+def _chunks(df: pd.DataFrame, size: int):
+    return (df.iloc[i : i + size] for i in range(0, len(df), size))
+
+
+def _read(path: Path, nrows=None, **kwargs) -> pd.DataFrame:
+    return pd.read_csv(path, nrows=nrows, **kwargs)
+
+
+def test_sketches_match_pandas():
+    df = _frame(300_000)
+    profile = DatasetProfile.build(_chunks(df, 40_000))
+    assert profile.rows == len(df)
+
+    # moments are exact up to float error
+    for col in ("amount", "year"):
+        series = df[col].dropna()
+        stats = profile.shape_stats(col)
+        moments = profile.columns[col].moments
+        assert moments.n == len(series)
+        assert moments.mean == pytest.approx(series.mean(), rel=1e-9)
+        assert stats["variance"] == pytest.approx(series.var(), rel=1e-6)
+        assert stats["skewness"] == pytest.approx(series.skew(), abs=1e-4)
+        assert stats["kurtosis"] == pytest.approx(series.kurtosis(), abs=1e-4)
+        assert (moments.min, moments.max) == (series.min(), series.max())
+
+    # t-digest quantiles: rank error well under 1%
+    values = np.sort(df["amount"].dropna().to_numpy())
+    for q in (0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999):
+        rank = np.searchsorted(values, profile.columns["amount"].quantile(q)) / len(values)
+        assert abs(rank - q) < 0.005
+
+    # HyperLogLog distinct counts within 3%; small domains are exact via top-k
+    code = profile.columns["code"]
+    assert not code.topk.exact
+    assert code.distinct == pytest.approx(df["code"].nunique(), rel=0.03)
+    assert profile.columns["year"].distinct == df["year"].nunique()
+
+    region = profile.columns["region"]
+    assert region.topk.exact and region.nulls == df["region"].isna().sum()
+    assert dict(region.topk.top(10)) == df["region"].value_counts().to_dict()
+    assert region.kind == "string" and profile.columns["amount"].kind == "float"
+
+
+def test_merge_equals_single_pass():
+    df = _frame(60_000, seed=8)
+    whole = DatasetProfile.build([df])
+    merged = DatasetProfile()
+    for part in _chunks(df, 7_000):
+        merged.merge(DatasetProfile.build([part]))
+
+    assert merged.rows == whole.rows
+    for col in ("amount", "year"):
+        a, b = merged.columns[col].moments, whole.columns[col].moments
+        assert a.n == b.n
+        assert a.mean == pytest.approx(b.mean, rel=1e-12)
+        assert a.m4 == pytest.approx(b.m4, rel=1e-9)
+    assert np.array_equal(merged.columns["code"].hll.registers, whole.columns["code"].hll.registers)
+    assert merged.columns["region"].topk.counts == whole.columns["region"].topk.counts
+    described = pd.DataFrame(merged.describe())
+    expected = df[["amount", "year"]].describe()
+    np.testing.assert_allclose(
+        described.loc[["count", "mean", "std", "min", "max"]],
+        expected.loc[["count", "mean", "std", "min", "max"]],
+        rtol=1e-9,
+    )
+    np.testing.assert_allclose(
+        described.loc[["25%", "50%", "75%"]], expected.loc[["25%", "50%", "75%"]], rtol=0.01
+    )
+
+
+def test_store_persists_profiles_and_filtered_partitions(tmp_path):
+    source = tmp_path / "data.csv"
+    df = _frame(20_000, seed=4)
+    df.to_csv(source, index=False)
+    expected = pd.read_csv(source)
+    cache = DatasetCache(tmp_path / "frames", background=False)
+    store = ProfileStore(tmp_path / "profiles", batch_rows=3_000)
+
+    profile = store.profile(cache, source, _read)
+    again = ProfileStore(tmp_path / "profiles").profile(cache, source, _read)
+    assert store.stats["builds"] == 1
+    assert json.dumps(again.to_dict()) == json.dumps(profile.to_dict())
+
+    filters = [["year", ">=", 2015], ["region", "==", "Львів"]]
+    part = store.profile(cache, source, _read, filters=filters)
+    subset = expected[(expected["year"] >= 2015) & (expected["region"] == "Львів")]
+    assert part.rows == len(subset) and store.stats["builds"] == 2
+    assert part.columns["amount"].moments.mean == pytest.approx(subset["amount"].mean())
+    assert part.columns["region"].distinct == 1
+
+    # a rewritten file gets a fresh profile; the old ones are dropped
+    _frame(500, seed=9).to_csv(source, index=False)
+    assert store.profile(cache, source, _read).rows == 500
+    assert len(list((tmp_path / "profiles").glob("*.json"))) == 1
+
+
+def test_tools_answer_from_profile(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from src.mcp_server import data_analysis_server as server
+
+    monkeypatch.setattr(server, "FRAME_CACHE", DatasetCache(tmp_path / "frames", background=False))
+    monkeypatch.setattr(server, "PROFILES", ProfileStore(tmp_path / "profiles"))
+    source = tmp_path / "data.csv"
+    _frame(8_000, seed=6).to_csv(source, index=False)
+    expected = pd.read_csv(source)
+
+    summary = asyncio.run(server.analyze_dataset(str(source)))
+    assert summary["row_count"] == len(expected)
+    assert summary["missing_values"]["amount"] == expected["amount"].isna().sum()
+    assert summary["categorical_summary"]["region"] == expected["region"].value_counts().to_dict()
+
+    stats = asyncio.run(server.generate_statistics(str(source), filters=[["year", "<", 2010]]))
+    subset = expected[expected["year"] < 2010]
+    assert stats["descriptive"]["amount"]["mean"] == pytest.approx(subset["amount"].mean())
+    assert stats["additional"]["amount"]["skewness"] == pytest.approx(
+        subset["amount"].skew(), abs=1e-4
+    )
+    inferential = asyncio.run(server.generate_statistics(str(source), "inferential"))
+    assert inferential["sample_size"] == len(expected)
+
+    # "code" overflows top-k and is counted exactly from the rows instead
+    columns = asyncio.run(server.interpret_column_data(str(source), ["region", "code"]))
+    region, code = columns["columns_interpretation"]
+    assert region["unique_count"] == expected["region"].nunique()
+    assert code["unique_count"] == expected["code"].nunique()
+    assert server.PROFILES.stats == {"hits": 2, "builds": 2}
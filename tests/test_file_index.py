@@ -0,0 +1,228 @@
+"""Tests for the workspace file index (scan, incremental refresh, queries, files table)"""
+
+import asyncio
+import hashlib
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.brain.memory.db.manager import DatabaseManager
+from src.brain.memory.db.schema import FileIndex
+from src.brain.memory.file_index import (
+    FileIndexService,
+    Observer,
+    _View,
+    glob_to_regex,
+    workspace_files_context,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "ws"
+    files = {
+        "src/app/main.py": "print('main')\n",
+        "src/app/utils.py": "def util(): ...\n",
+        "src/app/templates/index.html": "<html></html>\n",
+        "src/lib/config_loader.py": "CONFIG = {}\n",
+        "docs/README.md": "# Docs\n",
+        "docs/guide/setup.md": "Setup\n",
+        "node_modules/dep/index.js": "skipped\n",
+        ".git/HEAD": "ref\n",
+    }
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    old = time.time() - 7200
+    for path in root.rglob("*"):
+        os.utime(path, (old, old))
+    os.utime(root / "src/lib/config_loader.py", (old + 60, old + 60))
+    return root
+
+
+def _service(root: Path, **kwargs) -> FileIndexService:
+    return FileIndexService([root], watch=False, poll_interval=0, workers=4, **kwargs)
+
+
+def _names(entries) -> list[str]:
+    return [e.name for e in entries]
+
+
+def test_glob_to_regex():
+    assert glob_to_regex("**/*.py").match("a/b/c.py")
+    assert glob_to_regex("**/*.py").match("c.py")
+    assert not glob_to_regex("*.py").match("a/c.py")
+    assert glob_to_regex("src/?at[!x].md").match("src/data.md")
+    assert not glob_to_regex("src/?at[!x].md").match("src/datx.md")
+
+
+def test_scan_and_queries(tree):
+    service = _service(tree)
+    asyncio.run(service.start())
+    status = service.status()
+    assert status["ready"] and status["entries"] == 12  # 6 files + 6 directories
+    assert not any("node_modules" in p or ".git" in p for p in service._entries)
+
+    assert _names(service.glob("**/*.py")) == ["main.py", "utils.py", "config_loader.py"]
+    assert _names(service.glob("src/app/*.py")) == ["main.py", "utils.py"]
+    assert _names(service.glob("**/*loader*")) == ["config_loader.py"]
+    assert _names(service.glob("**/[mu]tils.py")) == ["utils.py"]
+    assert _names(service.glob("*.py", root=tree / "src/app")) == ["main.py", "utils.py"]
+    assert _names(service.by_extension("md")) == ["README.md", "setup.md"]
+    assert service.recent(1)[0].name == "config_loader.py"
+
+    assert _names(service.search("utils"))[0] == "utils.py"
+    assert _names(service.search("LOADER")) == ["config_loader.py"]
+    assert _names(service.search("templates")) == ["templates"]
+    assert "config_loader.py" in _names(service.search("confg_loader"))  # fuzzy
+    assert service.search("zzzzzz") == []
+
+
+def test_incremental_refresh_by_polling(tree):
+    service = _service(tree)
+    asyncio.run(service.start())
+    assert asyncio.run(service.refresh())["upserted"] == 0
+
+    (tree / "src/app/new_module.py").write_text("x = 1\n")
+    (tree / "src/app/pkg/sub").mkdir(parents=True)
+    (tree / "src/app/pkg/sub/deep.py").write_text("y = 2\n")
+    (tree / "docs/README.md").unlink()
+    (tree / "docs/guide/setup.md").unlink()
+    (tree / "docs/guide").rmdir()
+
+    result = asyncio.run(service.refresh())
+    # new: new_module.py, pkg, sub, deep.py; gone: README.md, guide, setup.md
+    assert result["upserted"] == 4 and result["removed"] == 3
+    assert _names(service.glob("**/*.py")) == [
+        "main.py",
+        "new_module.py",
+        "deep.py",
+        "utils.py",
+        "config_loader.py",
+    ]
+    assert service.by_extension(".md") == [] and service.search("setup") == []
+    assert service.recent(1)[0].name in {"new_module.py", "deep.py"}
+
+    # a recently modified file is re-stat'ed even though its directory did not change
+    time.sleep(0.01)
+    (tree / "src/app/new_module.py").write_text("x = 12345\n")
+    assert asyncio.run(service.refresh())["upserted"] == 1
+    assert service._entries[str(tree / "src/app/new_module.py")].size == 10
+
+
+def test_index_builds_run_off_the_event_loop(tree, monkeypatch):
+    build = _View.build
+    threads = []
+
+    def recording_build(scanned):
+        threads.append(threading.current_thread())
+        return build(scanned)
+
+    monkeypatch.setattr(_View, "build", staticmethod(recording_build))
+    service = _service(tree)
+
+    async def scenario():
+        await service.start()
+        main = str(tree / "src/app/main.py")
+        digest = await service.content_hash(main)
+        bulk = tree / "bulk"
+        bulk.mkdir()
+        for i in range(1100):
+            (bulk / f"f{i}.txt").write_text("")
+        await service.refresh()
+        for path in bulk.iterdir():
+            path.unlink()
+        bulk.rmdir()
+        await service.refresh()  # most ids are now stale: compacts
+        return main, digest
+
+    main, digest = asyncio.run(scenario())
+    assert len(threads) == 2 and threading.main_thread() not in threads
+    assert len(service._by_id) == len(service._entries) == 12
+    assert service._entries[main].content_hash == digest
+    assert _names(service.glob("src/app/*.py")) == ["main.py", "utils.py"]
+    assert _names(service.search("LOADER")) == ["config_loader.py"]
+
+
+@pytest.mark.skipif(Observer is None, reason="watchdog not installed")
+def test_incremental_refresh_by_watcher(tree):
+    async def scenario():
+        service = FileIndexService([tree], poll_interval=0, workers=4)
+        await service.start()
+        try:
+            assert service.status()["watcher"]
+            (tree / "src/lib/fresh.py").write_text("z = 3\n")
+            for _ in range(100):
+                if service._dirty:
+                    break
+                await asyncio.sleep(0.02)
+            assert (await service.refresh())["upserted"] >= 1  # the file, maybe its directory
+            assert _names(service.search("fresh")) == ["fresh.py"]
+        finally:
+            await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_lazy_content_hash(tree):
+    service = _service(tree)
+    asyncio.run(service.start())
+    path = str(tree / "src/app/main.py")
+    assert service._entries[path].content_hash is None
+    digest = asyncio.run(service.content_hash(path))
+    assert digest == hashlib.sha256(b"print('main')\n").hexdigest()
+    assert service.stats["hashed"] == 1
+    asyncio.run(service.content_hash(path))
+    assert service.stats["hashed"] == 1
+    assert asyncio.run(service.content_hash(tree / "missing.py")) is None
+
+
+def test_files_table_populated_and_reconciled(tree, tmp_path):
+    manager = DatabaseManager()
+    manager.db_url = f"sqlite+aiosqlite:///{tmp_path}/index.db"
+
+    async def rows():
+        async with await manager.get_session() as session:
+            result = await session.execute(select(FileIndex.path, FileIndex.content_hash))
+            return {os.path.relpath(p, tree): h for p, h in result}
+
+    async def scenario():
+        await manager.initialize()
+        service = _service(tree, db=manager)
+        await service.start()
+        assert len(await rows()) == 12
+        digest = await service.content_hash(tree / "src/app/main.py")
+        assert (await rows())["src/app/main.py"] == digest
+
+        (tree / "src/app/utils.py").unlink()
+        await service.refresh()
+        assert "src/app/utils.py" not in await rows()
+
+        # a new process reuses stored hashes of unchanged files
+        restarted = _service(tree, db=manager)
+        await restarted.start()
+        assert restarted._entries[str(tree / "src/app/main.py")].content_hash == digest
+        assert len(await rows()) == 11
+        await manager.close()
+
+    asyncio.run(scenario())
+
+
+def test_workspace_files_context(tree):
+    service = _service(tree)
+    text = asyncio.run(
+        workspace_files_context("Please fix the bug in config_loader.py and *.md", service)
+    )
+    lines = text.splitlines()
+    assert lines[0] == "Workspace files:"
+    assert lines[1].startswith(f"- {tree / 'src/lib/config_loader.py'} (")
+    assert any("README.md" in line for line in lines)
+    assert asyncio.run(workspace_files_context("how are you today", service)) == ""
@@ -0,0 +1,177 @@
+"""Tests for the Golden Fund artifact store (dedup, refcounts, zstd, parse cache, gc)"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.golden_fund.lib.parser import DataParser
+from src.mcp_server.golden_fund.lib.storage import artifacts
+from src.mcp_server.golden_fund.lib.storage.artifacts import ArtifactStore
+from src.mcp_server.golden_fund.lib.storage.blob import BlobStorage
+
+
+def _frame(n: int, seed: int = 0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "edrpou": [f"{30_000_000 + seed + i}" for i in range(n)],
+            "name": [f"ТОВ Компанія {i}" for i in range(n)],
+            "amount": [i * 1.5 for i in range(n)],
+        }
+    )
+
+
+def test_dedup_refcounts_and_gc(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts")
+    source = tmp_path / "a.csv"
+    _frame(2_000).to_csv(source, index=False)
+    payload = source.read_bytes()
+
+    first = store.put_file(source, "ingest/a")
+    assert first.codec == "zstd" and first.stored_size < first.size == len(payload)
+    assert not first.deduplicated and first.refcount == 1
+    assert store.read_bytes(first.sha256) == payload
+    assert store.local_path(first.sha256).read_bytes() == payload
+
+    # same bytes under a second ref: one object, two references
+    copy = tmp_path / "b.csv"
+    copy.write_bytes(payload)
+    second = store.put_file(copy, "ingest/b", move=True)
+    assert second.deduplicated and second.refcount == 2 and not copy.exists()
+    # re-binding a ref to the content it already holds does not count twice
+    assert store.put_file(source, "ingest/a").refcount == 2
+    assert store.usage()["objects"] == 1
+
+    # ref "ingest/a" moves to new content: the old object loses one reference
+    _frame(2_000, seed=1).to_csv(source, index=False)
+    moved = store.put_file(source, "ingest/a")
+    assert moved.sha256 != first.sha256
+    assert store.info(first.sha256).refcount == 1
+    assert store.resolve("ingest/a") == moved.sha256
+
+    assert store.gc()["objects"] == 0
+    assert store.release("ingest/b") and not store.release("ingest/b")
+    report = store.gc()
+    assert report["objects"] == 1 and not first.path.exists()
+    assert store.info(first.sha256) is None and store.info(moved.sha256).refcount == 1
+    store.close()
+
+
+def test_parse_cache_replays_identical_batches(tmp_path, monkeypatch):
+    store = ArtifactStore(tmp_path / "artifacts")
+    parser = DataParser()
+    source = tmp_path / "people.csv"
+    _frame(1_234).to_csv(source, index=False)
+    sha256 = store.put_file(source, "ingest/people").sha256
+
+    parsed = list(store.iter_batches(sha256, parser, "csv", batch_size=500))
+    assert store.stats == {**store.stats, "parse_misses": 1, "parse_hits": 0}
+    cached = list(store.iter_batches(sha256, parser, "csv", batch_size=300))
+    assert store.stats["parse_hits"] == 1
+    assert [len(b) for b in parsed] == [500, 500, 234]
+    assert [len(b) for b in cached] == [300, 300, 300, 300, 34]
+    assert cached[1].index[0] == 300
+    pd.testing.assert_frame_equal(
+        pd.concat(parsed, ignore_index=True), pd.concat(cached, ignore_index=True)
+    )
+
+    # a parser upgrade invalidates the cache; gc drops the stale result
+    monkeypatch.setattr(artifacts, "PARSER_VERSION", "next")
+    list(store.iter_batches(sha256, parser, "csv", batch_size=500))
+    assert store.stats["parse_misses"] == 2 and store.usage()["parsed_results"] == 2
+    assert store.gc()["parsed"] == 1
+
+    # an abandoned parse never commits a partial cache entry
+    other = store.put_bytes(b"a,b\n1,2\n3,4\n", "ingest/small", suffix=".csv").sha256
+    batches = store.iter_batches(other, parser, "csv", batch_size=1)
+    next(batches)
+    batches.close()
+    assert store.usage()["parsed_results"] == 1
+
+    # gc drops parse results once their artifact is unreferenced
+    store.release("ingest/people")
+    report = store.gc()
+    assert report["parsed"] == 1 and store.usage()["parsed_results"] == 0
+    assert not list((tmp_path / "artifacts" / "tmp").iterdir())
+    store.close()
+
+
+def test_budgets_are_enforced_as_files_are_written(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts", unpacked_budget=1, gc_interval=3600)
+    parser = DataParser()
+    unpacked = tmp_path / "artifacts" / "unpacked"
+    parsed = tmp_path / "artifacts" / "parsed"
+
+    shas = []
+    for seed in range(3):
+        source = tmp_path / f"{seed}.csv"
+        _frame(2_000, seed=seed).to_csv(source, index=False)
+        sha256 = store.put_file(source, f"ingest/{seed}", move=True).sha256
+        # the moved source is the only unpacked copy kept, even over budget
+        assert [p.name for p in unpacked.iterdir()] == [sha256]
+        list(store.iter_batches(sha256, parser, "csv"))
+        if artifacts.ARROW_AVAILABLE:  # replays come from the parse result
+            assert not list(unpacked.iterdir())
+        shas.append(sha256)
+
+    if artifacts.ARROW_AVAILABLE:
+        sizes = sorted(p.stat().st_size for p in parsed.iterdir())
+        store.parsed_budget = sizes[-1] + sizes[0]
+        source = tmp_path / "3.csv"
+        _frame(2_000, seed=3).to_csv(source, index=False)
+        newest = store.put_file(source, "ingest/3").sha256
+        list(store.iter_batches(newest, parser, "csv"))
+        # only the most recently used results fit the budget
+        kept = {p.name.split(".")[0] for p in parsed.iterdir()}
+        assert newest in kept and shas[0] not in kept
+        assert store.usage()["parsed_results"] == len(kept)
+
+    # a ref moved to new content: the old object goes at the next scheduled collection
+    assert store.maybe_gc()["objects"] == 0
+    source = tmp_path / "moved.csv"
+    _frame(10, seed=9).to_csv(source, index=False)
+    store.put_file(source, "ingest/0")
+    assert store.maybe_gc() is None  # within gc_interval
+    store.gc_interval = 0
+    assert store.maybe_gc()["objects"] == 1 and store.info(shas[0]) is None
+    store.close()
+
+
+def test_blob_store_and_ingest_deduplicate(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+    from src.mcp_server.golden_fund.tools import ingest
+
+    runtime = StorageRuntime(tmp_path / "data")
+    blob = runtime.blob
+    assert isinstance(blob, BlobStorage)
+    one = blob.store({"k": [1, 2, 3]}, "one.json")
+    two = blob.store({"k": [1, 2, 3]}, "two.json")
+    assert one.success and two.data["deduplicated"]
+    assert one.data["sha256"] == two.data["sha256"]
+    assert blob.retrieve("two.json").data == {"k": [1, 2, 3]}
+    assert blob.retrieve("missing.json").error == "File not found"
+
+    monkeypatch.setattr(ingest, "RAW_DIR", tmp_path / "raw")
+    source = tmp_path / "people.csv"
+    _frame(1_234).to_csv(source, index=False)
+
+    def run() -> str:
+        result = asyncio.run(
+            ingest.ingest_dataset(
+                str(source), "csv", ["parse", "validate"], batch_size=500, runtime=runtime
+            )
+        )
+        assert result.success and result.rows == 1234, result.summary
+        return result.summary
+
+    first, second = run(), run()
+    assert "Parsed 1234 records." in first and "Parsed 1234 records." in second
+    assert "deduplicated" not in first and "deduplicated" in second
+    usage = runtime.artifacts.usage()
+    assert (usage["parse_misses"], usage["parse_hits"]) == (1, 1)
+    assert not list((tmp_path / "raw").iterdir())
+    runtime.close()
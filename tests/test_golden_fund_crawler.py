@@ -0,0 +1,199 @@
+"""Tests for the Golden Fund enrichment crawler (worker pool, dedupe, conditional GETs, budgets)"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.golden_fund.lib.connectors.ckan_connector import CKANConnector
+from src.mcp_server.golden_fund.lib.crawler import EnrichmentCrawler, relevance
+from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+from src.mcp_server.golden_fund.lib.streaming import IngestResult
+from src.mcp_server.golden_fund.tools.ingest import ingest_dataset
+
+
+class FakeCKAN:
+    """A CKAN portal on localhost: package_search plus CSV resources served with latency."""
+
+    def __init__(self, files: dict[str, tuple[str, bytes]], latency: float = 0.2):
+        self.files = files  # name -> (package title, body)
+        self.latency = latency
+        self.requests: list[tuple[float, str, int]] = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == "/api/3/action/package_search":
+                    rows = int(parse_qs(parts.query).get("rows", ["10"])[0])
+                    self._send(200, json.dumps(fake.search(rows)).encode())
+                    return
+                name = parts.path.rsplit("/", 1)[-1]
+                time.sleep(fake.latency)
+                _, body = fake.files[name]
+                etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+                status = 304 if self.headers.get("If-None-Match") == etag else 200
+                fake.requests.append((time.monotonic(), name, status))
+                self._send(status, b"" if status == 304 else body, {"ETag": etag})
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def search(self, rows: int) -> dict:
+        packages = [
+            {
+                "id": name,
+                "title": title,
+                "resources": [{"format": "CSV", "url": f"{self.url}/files/{name}"}],
+            }
+            for name, (title, _) in self.files.items()
+        ]
+        return {"success": True, "result": {"results": packages[:rows]}}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _csv(seed: int, rows: int = 50) -> bytes:
+    lines = ["edrpou,name,city"] + [
+        f"{30_000_000 + seed * 1000 + i},ТОВ Компанія {seed}-{i},Київ" for i in range(rows)
+    ]
+    return "\n".join(lines).encode()
+
+
+def _crawler(fake: FakeCKAN, runtime: StorageRuntime, ingest=ingest_dataset, **kwargs):
+    return EnrichmentCrawler(
+        CKANConnector(f"{fake.url}/api/3"),
+        ingest,
+        runtime=runtime,
+        process_pipeline=["parse", "store_sql"],
+        **{"host_interval": 0.0, "per_host": 8, "concurrency": 6, "rows": 10, **kwargs},
+    )
+
+
+def test_concurrent_crawl_dedupes_content_and_revalidates(tmp_path):
+    files = {f"r{i}.csv": (f"Реєстр компаній {i}", _csv(i)) for i in range(5)}
+    files["copy.csv"] = ("Реєстр компаній (дзеркало)", _csv(0))  # same bytes as r0
+    fake = FakeCKAN(files, latency=0.3)
+    runtime = StorageRuntime(tmp_path)
+    crawler = _crawler(fake, runtime, revisit_after=0)
+    try:
+        report = asyncio.run(crawler.crawl("реєстр компаній"))
+        assert report.discovered == 6
+        assert report.counts() == {"ingested": 5, "duplicate": 1}
+        # six 0.3s downloads one after another would take 1.8s
+        assert report.elapsed < 1.2
+        meta = runtime.sql.query("SELECT source_url FROM datasets_metadata").data
+        assert len(meta) == 5
+        assert all(r["source_url"].startswith(fake.url) for r in meta)
+
+        # second run: every URL revalidates with If-None-Match and nothing is re-ingested
+        again = asyncio.run(crawler.crawl("реєстр компаній"))
+        assert again.counts() == {"not_modified": 6}
+        assert [s for _, _, s in fake.requests[-6:]] == [304] * 6
+        assert len(runtime.sql.query("SELECT id FROM datasets_metadata").data) == 5
+
+        # within revisit_after a URL is not requested at all
+        crawler.revisit_after = 3600
+        before = len(fake.requests)
+        assert asyncio.run(crawler.crawl("реєстр компаній")).counts() == {"fresh": 6}
+        assert len(fake.requests) == before
+    finally:
+        crawler.close()
+        runtime.close()
+        fake.close()
+
+
+def test_rate_limit_priority_and_persistent_frontier(tmp_path):
+    files = {
+        "a.csv": ("Бюджет міста", _csv(1)),
+        "b.csv": ("Закупівлі палива Київ", _csv(2)),
+        "c.csv": ("Закупівлі палива", _csv(3)),
+        "d.csv": ("Погода", _csv(4)),
+    }
+    fake = FakeCKAN(files, latency=0.0)
+    ingested: list[str] = []
+
+    async def fake_ingest(path, **kwargs):
+        ingested.append(kwargs["source_url"].rsplit("/", 1)[-1])
+        return IngestResult("test", success=True, summary="Ingestion test successful.")
+
+    runtime = StorageRuntime(tmp_path)
+    crawler = _crawler(
+        fake, runtime, ingest=fake_ingest, concurrency=4, per_host=1, host_interval=0.15
+    )
+    try:
+        report = asyncio.run(crawler.crawl("закупівлі палива Київ", max_items=2))
+        # one host, one request at a time, 150ms apart, most relevant first
+        assert ingested == ["b.csv", "c.csv"]
+        starts = [t for t, _, _ in fake.requests]
+        assert all(b - a >= 0.14 for a, b in itertools.pairwise(starts))
+        assert report.stopped == "items"
+        assert report.counts() == {"ingested": 2, "deferred": 2}
+
+        # the deferred resources are still in the frontier for the next run
+        pending = crawler.state.pending("закупівлі палива київ")
+        assert {p.url.rsplit("/", 1)[-1] for p in pending} == {"a.csv", "d.csv"}
+        report = asyncio.run(crawler.crawl("закупівлі палива Київ", max_bytes=len(_csv(1)) + 10))
+        assert report.stopped == "bytes"
+        assert report.counts()["ingested"] == 1
+    finally:
+        crawler.close()
+        runtime.close()
+        fake.close()
+
+
+def test_failed_ingest_is_retried_whatever_its_summary_says(tmp_path):
+    fake = FakeCKAN({"a.csv": ("Реєстр", _csv(1))}, latency=0.0)
+    outcomes = [
+        # partial result: the text still reads "successful", the status does not
+        IngestResult("t1", success=False, summary="Ingestion t1 successful. Partial."),
+        IngestResult("t2", success=True, summary="Ingestion t2 done."),
+    ]
+
+    async def fake_ingest(path, **kwargs):
+        return outcomes.pop(0)
+
+    runtime = StorageRuntime(tmp_path)
+    crawler = _crawler(fake, runtime, ingest=fake_ingest, revisit_after=0)
+    try:
+        report = asyncio.run(crawler.crawl("реєстр"))
+        assert report.counts() == {"failed": 1}
+        assert [p.url.rsplit("/", 1)[-1] for p in crawler.state.pending("реєстр")] == ["a.csv"]
+
+        # the content was not recorded as ingested, so the retry ingests it again
+        assert asyncio.run(crawler.crawl("реєстр")).counts() == {"ingested": 1}
+        assert not outcomes
+    finally:
+        crawler.close()
+        runtime.close()
+        fake.close()
+
+
+def test_relevance_prefers_title_matches():
+    query = "закупівлі палива"
+    strong = {"title": "Закупівля палива 2024", "tags": [{"name": "паливо"}]}
+    weak = {"title": "Бюджет", "notes": "у тому числі закупівлі"}
+    assert relevance(query, strong, rank=3) > relevance(query, weak, rank=0)
+    assert relevance("", strong) == 0.0
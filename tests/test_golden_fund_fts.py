@@ -0,0 +1,97 @@
+"""Tests for the Golden Fund FTS5 keyword index (external content, tokenizers, ranking)"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.golden_fund.lib.storage.fts import FTSConfig
+from src.mcp_server.golden_fund.lib.storage.search import SearchStorage
+
+
+def _store(tmp_path: Path, **config) -> SearchStorage:
+    return SearchStorage(db_path=tmp_path / "idx.db", fts_config=FTSConfig(**config))
+
+
+def test_batch_upsert_keeps_index_in_sync(tmp_path):
+    store = _store(tmp_path, batch_size=2)
+    docs = [
+        {"id": str(i), "title": f"Doc {i}", "content": "alpha", "city": "Lviv"} for i in range(5)
+    ]
+    assert store.index_documents(docs).data["indexed_count"] == 5
+    assert store.index.stats["batches"] == 3
+
+    store.index_documents({"id": "3", "title": "Doc 3", "content": "omega"})
+    hits = store.search("alpha").data["results"]
+    assert sorted(h["id"] for h in hits) == ["0", "1", "2", "4"]
+    (hit,) = store.search("omega").data["results"]
+    assert hit["source"] == {"id": "3", "title": "Doc 3", "content": "omega", "description": ""}
+    assert store.search("alpha").data["results"][0]["source"]["city"] == "Lviv"  # extra kept
+    assert store.index.count() == 5
+
+    assert store.index.delete(["0", "1", "missing"]) == 2
+    assert sorted(h["id"] for h in store.search("alpha").data["results"]) == ["2", "4"]
+    store.close()
+
+
+def test_ukrainian_diacritics_folding_and_query_sanitizing(tmp_path):
+    store = _store(tmp_path)
+    store.index_documents({"id": "k", "title": "Київ", "content": "Столиця України"})
+    assert store.search("Київ").data["total"] == 1
+    assert store.search("Киів").data["total"] == 1  # ї folded to і
+    assert store.search("україни").data["total"] == 1
+    # Invalid FTS5 syntax falls back to quoted terms instead of failing
+    res = store.search('столиця: "україни')
+    assert res.success and res.data["total"] == 1
+    store.close()
+
+
+def test_bm25_weights_snippet_and_trigram(tmp_path):
+    store = _store(tmp_path, trigram=True)
+    store.index_documents(
+        [
+            {"id": "body", "title": "Report", "content": "metropolitan transit budget"},
+            {"id": "head", "title": "Metropolitan", "content": "annual report"},
+        ]
+    )
+    results = store.search("metropolitan").data["results"]
+    assert [r["id"] for r in results] == ["head", "body"]  # title weighted above content
+    assert "[metropolitan]" in results[1]["snippet"].lower()
+    assert results[0]["score"] > results[1]["score"] > 0
+
+    assert store.search("tropol").data["total"] == 0
+    assert store.search("tropol", substring=True).data["total"] == 2
+    assert (
+        "[Metropolitan]"
+        in store.search("metropolitan", highlight=True).data["results"][0]["highlight"]
+    )
+    assert store.optimize().success
+    store.close()
+
+
+def test_tokenizer_change_rebuilds_and_legacy_table_migrates(tmp_path):
+    db = tmp_path / "idx.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE VIRTUAL TABLE golden_fund_index USING fts5("
+            "id, title, content, description, source_json UNINDEXED)"
+        )
+        conn.execute(
+            "INSERT INTO golden_fund_index VALUES (?, ?, ?, ?, ?)",
+            ("old", "Legacy", "runs fast", "", '{"id": "old", "title": "Legacy", "x": 1}'),
+        )
+
+    store = SearchStorage(db_path=db)
+    (hit,) = store.search("legacy").data["results"]
+    assert hit["source"]["x"] == 1
+    assert store.search("running").data["total"] == 0
+    store.close()
+
+    store = SearchStorage(db_path=db, fts_config=FTSConfig(tokenizer="porter"))
+    assert store.index.stats["rebuilds"] == 1
+    assert store.search("running").data["total"] == 1  # stemmed after rebuild
+    store.close()
+    with sqlite3.connect(db) as conn:
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    assert "golden_fund_index" not in names
@@ -0,0 +1,78 @@
+"""Tests for the Golden Fund storage runtime (pooled SQLite backends, lazy Chroma)"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.golden_fund.lib.storage.pool import SQLitePool
+from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+
+
+def test_pool_reuses_connections_across_threads(tmp_path):
+    pool = SQLitePool(tmp_path / "p.db", readers=2)
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+
+    def work(i: int) -> None:
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO t VALUES (?)", (i,))
+        with pool.reader() as conn:
+            conn.execute("SELECT COUNT(*) FROM t").fetchone()
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 50
+    # one writer + at most two readers, regardless of call count
+    assert pool.stats["connections_opened"] <= 3
+    assert pool.health_check()["journal_mode"] == "wal"
+
+    pool.close()
+    with pytest.raises(RuntimeError), pool.writer():
+        pass
+
+
+def test_writer_rolls_back_on_error(tmp_path):
+    pool = SQLitePool(tmp_path / "p.db")
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(ValueError), pool.writer() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+        raise ValueError("boom")
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_runtime_shares_backends_and_shuts_down(tmp_path):
+    runtime = StorageRuntime(tmp_path)
+    assert runtime.health()["sql"]["status"] == "not started"
+
+    sql = runtime.sql
+    assert runtime.sql is sql
+    assert sql.store_dataset(pd.DataFrame({"a": [1, 2]}), "demo").success
+    assert sql.query("SELECT COUNT(*) AS n FROM demo").data == [{"n": 2}]
+
+    search = runtime.search
+    assert search.index_documents([{"id": "1", "title": "Kyiv Metro"}]).success
+    assert search.search("kyiv").data["total"] == 1
+
+    # Chroma is not opened until first use
+    assert runtime.vector.health_check()["initialized"] is False
+
+    health = runtime.health()
+    assert health["sql"]["ok"] and health["search"]["ok"]
+
+    runtime.close()
+    runtime.close()
+    with pytest.raises(RuntimeError):
+        _ = runtime.sql
@@ -0,0 +1,246 @@
+"""Tests for streaming Golden Fund ingestion (batch parsers, pipeline, sinks)"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.golden_fund.lib.parser import DataParser
+from src.mcp_server.golden_fund.lib.streaming import BatchSink, StreamingPipeline
+
+
+def _frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": range(n),
+            "name": [f"Person {i}" for i in range(n)],
+            "position": ["director" if i == n - 1 else "" for i in range(n)],
+        }
+    )
+
+
+def test_csv_parquet_and_jsonl_stream_in_batches(tmp_path):
+    df = _frame(250)
+    df.to_csv(tmp_path / "d.csv", index=False)
+    df.to_parquet(tmp_path / "d.parquet", row_group_size=100)
+    df.to_json(tmp_path / "d.jsonl", orient="records", lines=True)
+
+    parser = DataParser()
+    for name in ("d.csv", "d.parquet", "d.jsonl"):
+        batches = list(parser.iter_batches(tmp_path / name, batch_size=60))
+        assert [len(b) for b in batches] == [60, 60, 60, 60, 10], name
+        assert pd.concat(batches)["name"].tolist() == df["name"].tolist()
+
+
+def test_xml_iterparse_yields_one_record_per_child(tmp_path):
+    items = "".join(
+        f'<company code="{i}"><name>Firm {i}</name><city>Kyiv</city></company>' for i in range(7)
+    )
+    (tmp_path / "d.xml").write_text(f"<?xml version='1.0'?><data>{items}</data>")
+
+    batches = list(DataParser().iter_batches(tmp_path / "d.xml", batch_size=3))
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert batches[0].iloc[1].to_dict() == {"code": "1", "name": "Firm 1", "city": "Kyiv"}
+
+
+def test_csv_encoding_is_chosen_for_the_whole_file(tmp_path):
+    # UTF-8 for the first batches, then one latin-1 byte near the end
+    rows = [f"{i},Person {i}" for i in range(200)] + ["200,Caf\xe9"]
+    (tmp_path / "d.csv").write_bytes(("id,name\n" + "\n".join(rows) + "\n").encode("latin1"))
+
+    for memory_map in (False, True):
+        batches = list(
+            DataParser().iter_batches(tmp_path / "d.csv", batch_size=50, memory_map=memory_map)
+        )
+        assert sum(len(b) for b in batches) == 201
+        assert batches[-1]["name"].iloc[-1] == "Caf\xe9"
+
+
+def test_unknown_format_raises(tmp_path):
+    (tmp_path / "d.bin").write_bytes(b"\0")
+    with pytest.raises(ValueError):
+        DataParser().iter_batches(tmp_path / "d.bin")
+
+
+class _Recorder(BatchSink):
+    def __init__(self, name: str, fail_at: int | None = None, stop_after: int | None = None):
+        self.name = name
+        self.fail_at = fail_at
+        self.stop_after = stop_after
+        self.offsets: list[int] = []
+
+    def write(self, batch, offset):
+        if offset == self.fail_at:
+            raise RuntimeError("boom")
+        self.offsets.append(offset)
+
+    def done(self):
+        return self.stop_after is not None and len(self.offsets) >= self.stop_after
+
+    def close(self):
+        return f"{self.name}: {len(self.offsets)}"
+
+
+def test_pipeline_fans_out_and_isolates_sink_failures():
+    batches = (pd.DataFrame({"v": range(i * 10, i * 10 + 10)}) for i in range(6))
+    ok = _Recorder("ok")
+    broken = _Recorder("broken", fail_at=20)
+    early = _Recorder("early", stop_after=2)
+
+    report = asyncio.run(StreamingPipeline([ok, broken, early], queue_size=1).run(batches))
+
+    assert report.rows == 60
+    assert ok.offsets == [0, 10, 20, 30, 40, 50]
+    assert broken.offsets == [0, 10]
+    assert report.stages["broken"].errors == 1
+    assert early.offsets == [0, 10]
+    assert report.stages["parse"].batches == 6
+    assert report.messages == {"ok": "ok: 6", "broken": "broken: 2", "early": "early: 2"}
+    assert "Throughput:" in report.throughput_summary()
+
+
+def test_pipeline_reports_parse_errors():
+    def gen():
+        yield pd.DataFrame({"v": [1, 2]})
+        raise ValueError("bad row")
+
+    report = asyncio.run(StreamingPipeline([_Recorder("ok")]).run(gen()))
+    assert report.rows == 2
+    assert report.parse_error == "bad row"
+
+
+def test_ingest_dataset_streams_csv_into_sql_and_fts(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+    from src.mcp_server.golden_fund.tools import ingest
+
+    monkeypatch.setattr(ingest, "RAW_DIR", tmp_path / "raw")
+    source = tmp_path / "people.csv"
+    _frame(1234).to_csv(source, index=False)
+
+    runtime = StorageRuntime(tmp_path / "data")
+    result = asyncio.run(
+        ingest.ingest_dataset(
+            str(source),
+            "csv",
+            ["parse", "store_sql", "keyword_index", "validate"],
+            batch_size=500,
+            runtime=runtime,
+        )
+    )
+    runtime.close()
+
+    assert result.success and result.rows == 1234 and not result.failed_stages
+    message = result.summary
+    assert "Parsed 1234 records." in message
+    assert "Indexed 1234 records for keyword search." in message
+    assert "Validation passed." in message
+    assert "Throughput:" in message
+
+    table = result.table
+    assert f"Stored in SQL table '{table}'." in message
+    golden = tmp_path / "data/golden_fund/golden.db"
+    with sqlite3.connect(golden) as conn:
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 1234
+        assert conn.execute(
+            "SELECT row_count FROM datasets_metadata WHERE table_name = ?", (table,)
+        ).fetchone() == (1234,)
+    search = tmp_path / "data/search/golden_fund_index.db"
+    with sqlite3.connect(search) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM golden_fund_index_docs").fetchone()[0] == 1234
+
+
+def _ingest(tmp_path, monkeypatch, source: Path, kind: str, batch_size: int = 500):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from src.mcp_server.golden_fund.lib.storage.runtime import StorageRuntime
+    from src.mcp_server.golden_fund.tools import ingest
+
+    monkeypatch.setattr(ingest, "RAW_DIR", tmp_path / "raw")
+    runtime = StorageRuntime(tmp_path / "data")
+    try:
+        return asyncio.run(
+            ingest.ingest_dataset(
+                str(source),
+                kind,
+                ["parse", "store_sql", "keyword_index"],
+                batch_size=batch_size,
+                runtime=runtime,
+            )
+        )
+    finally:
+        runtime.close()
+
+
+def _stored_rows(tmp_path, table: str) -> list[dict]:
+    with sqlite3.connect(tmp_path / "data/golden_fund/golden.db") as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(r) for r in conn.execute(f"SELECT * FROM {table} ORDER BY rowid")]
+
+
+def test_ingest_records_with_new_fields_in_later_batches(tmp_path, monkeypatch):
+    records = [{"id": i, "name": f"Firm {i}"} for i in range(5)]
+    records += [{"id": 5, "name": "Firm 5", "city": "Kyiv"}, {"id": 6, "edrpou": "12345678"}]
+    source = tmp_path / "firms.jsonl"
+    source.write_text("\n".join(json.dumps(r) for r in records))
+
+    result = _ingest(tmp_path, monkeypatch, source, "jsonl", batch_size=3)
+    message = result.summary
+    assert result.success and message.startswith("Ingestion ") and " successful." in message
+    assert "Parsed 7 records." in message and "Indexed 7 records" in message
+    rows = _stored_rows(tmp_path, result.table)
+    assert [r["id"] for r in rows] == list(range(7))
+    assert rows[5]["city"] == "Kyiv" and rows[0]["city"] is None
+    assert rows[6]["edrpou"] == 12345678 and rows[6]["name"] is None
+
+    # the structured index was rebuilt over the widened table
+    from src.mcp_server.golden_fund.lib.storage.sql import SQLStorage
+
+    storage = SQLStorage(tmp_path / "data/golden_fund/golden.db")
+    try:
+        names = {c.name for c in storage.index.catalog()[0].columns}
+        assert {"id", "name", "city", "edrpou"} <= names
+    finally:
+        storage.close()
+
+
+def test_ingest_xml_with_mixed_record_fields(tmp_path, monkeypatch):
+    items = "".join(f"<firm><name>Firm {i}</name></firm>" for i in range(4))
+    items += '<firm code="9"><name>Late</name><city>Lviv</city></firm>'
+    source = tmp_path / "firms.xml"
+    source.write_text(f"<?xml version='1.0'?><data>{items}</data>")
+
+    result = _ingest(tmp_path, monkeypatch, source, "xml", batch_size=2)
+    assert result.success and result.rows == 5, result.summary
+    rows = _stored_rows(tmp_path, result.table)
+    assert [r["name"] for r in rows][-1] == "Late"
+    assert rows[-1]["city"] == "Lviv" and rows[-1]["code"] == "9"
+
+
+def test_ingest_reports_partial_runs_as_failures(tmp_path, monkeypatch):
+    from src.mcp_server.golden_fund.lib.storage.sql import SQLStorage
+
+    calls = []
+    original = SQLStorage.store_dataset
+
+    def flaky(self, df, *args, **kwargs):
+        calls.append(len(df))
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("disk I/O error")
+        return original(self, df, *args, **kwargs)
+
+    monkeypatch.setattr(SQLStorage, "store_dataset", flaky)
+    source = tmp_path / "people.csv"
+    _frame(30).to_csv(source, index=False)
+
+    result = _ingest(tmp_path, monkeypatch, source, "csv", batch_size=10)
+    message = result.summary
+    assert not result.success and result.failed_stages == ["store_sql"]
+    assert " failed." in message.split("Raw data")[0] and "successful" not in message
+    assert "Incomplete stages: store_sql." in message
+    assert "Indexed 30 records" in message  # other sinks are unaffected
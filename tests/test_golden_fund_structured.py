@@ -0,0 +1,106 @@
+"""Tests for the Golden Fund structured index (column catalog, entity keys, FTS shadow tables)"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.golden_fund.lib.storage.sql import SQLStorage
+from src.mcp_server.golden_fund.lib.storage.structured import ID_COLUMN, normalize_key
+
+
+def _registry(start: int, n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "edrpou": [start + i for i in range(n)],  # stored as INTEGER: leading zeros lost
+            "name": [f"ТОВ Агросвіт {start + i}" for i in range(n)],
+            "city": ["Київ" if i % 2 else "Львів" for i in range(n)],
+        }
+    )
+
+
+def test_catalog_roles_and_exact_lookup(tmp_path):
+    sql = SQLStorage(tmp_path / "g.db")
+    assert sql.store_dataset(_registry(32106, 3), "dataset_a").success
+    codes = pd.DataFrame({"code_value": ["12345678", "87654321"], "note": ["x", "y"]})
+    assert sql.store_dataset(codes, "dataset_b").success
+
+    roles = {c.name: c.role for c in sql.index.columns("dataset_a")}
+    assert roles == {"edrpou": "id", "name": "name", "city": "text"}
+    # 8-digit values mark a column as an identifier even without a telling name
+    assert {c.name: c.role for c in sql.index.columns("dataset_b")}["code_value"] == "id"
+
+    (row,) = sql.index.lookup("00032107")
+    assert row["name"] == "ТОВ Агросвіт 32107"
+    assert (row["_source_table"], row["_rowid"], row["_match_column"]) == ("dataset_a", 2, "edrpou")
+    assert sql.index.lookup("  тов   АГРОСВІТ 32108 ")[0]["edrpou"] == 32108
+    assert sql.index.lookup("87654321")[0]["note"] == "y"
+    assert sql.index.lookup("99999999") == []
+    assert normalize_key(32106.0) == normalize_key("0032106") == "32106"
+    sql.close()
+
+
+def test_id_column_names_match_whole_words_only(tmp_path):
+    for name in ("edrpou", "Код ЄДРПОУ", "edrpou_code", "ipn", "INN", "rnokpp", "tax_id", "іпн"):
+        assert ID_COLUMN.search(name), name
+    for name in ("beginning", "postcode", "country_code", "syntax", "dinner", "taxonomy"):
+        assert not ID_COLUMN.search(name), name
+
+    sql = SQLStorage(tmp_path / "g.db")
+    df = pd.DataFrame(
+        {
+            "beginning": ["2024-01-01", "2024-02-01"],
+            "postcode": ["01001", "79000"],
+            "country_code": ["UA", "PL"],
+            "syntax": ["a", "b"],
+        }
+    )
+    assert sql.store_dataset(df, "places").success
+    assert {c.role for c in sql.index.columns("places")} == {"text"}
+    sql.close()
+
+
+def test_search_covers_all_tables_and_follows_appends(tmp_path):
+    sql = SQLStorage(tmp_path / "g.db")
+    for i in range(6):
+        sql.store_dataset(_registry(10_000 * (i + 1), 4), f"dataset_{i}")
+    # streaming ingest appends batches to the same table
+    sql.store_dataset(_registry(90_000, 2), "dataset_0")
+
+    rows = sql.index.search("агросвіт 9000", limit=5)
+    assert [(r["_source_table"], r["_match"]) for r in rows] == [
+        ("dataset_0", "substring"),
+        ("dataset_0", "substring"),
+    ]
+    # the oldest table is searched too (the LIKE fallback only saw the 3 newest)
+    exact = sql.index.search("ТОВ Агросвіт 10001")
+    assert exact[0]["_match"] == "exact" and exact[0]["_source_table"] == "dataset_0"
+    assert len(sql.index.search("Агросвіт", limit=2, max_results=5)) == 5
+    assert sql.index.search("ль") == []  # below trigram length: exact keys only
+
+    # replacing a table drops its old keys and shadow rows
+    sql.store_dataset(_registry(80_000, 1), "dataset_0", if_exists="replace")
+    assert sql.index.lookup("10001") == []
+    assert sql.index.search("Агросвіт 1000") == []  # stale rowids would now hit new rows
+    assert [r["edrpou"] for r in sql.index.search("Агросвіт 8000")] == [80_000]
+    sql.close()
+
+
+def test_existing_tables_are_backfilled(tmp_path):
+    db = tmp_path / "g.db"
+    SQLStorage(db).close()
+    with sqlite3.connect(db) as conn:
+        # a table ingested before the index existed
+        _registry(40_000, 3).to_sql("dataset_old", conn, index=False)
+        conn.execute(
+            "INSERT INTO datasets_metadata (dataset_name, table_name, row_count) "
+            "VALUES ('dataset_old', 'dataset_old', 3)"
+        )
+
+    sql = SQLStorage(db)
+    assert sql.index.lookup("40002")[0]["name"] == "ТОВ Агросвіт 40002"
+    assert sql.health_check()["structured_index"]["tables"] == 1
+    sql.close()
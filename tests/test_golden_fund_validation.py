@@ -0,0 +1,150 @@
+"""Tests for Golden Fund columnar validation (completeness parity, column checks, short-circuit)"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.golden_fund.lib.validation import (
+    ColumnarValidator,
+    ColumnCheck,
+    DataValidator,
+)
+
+NAME_FIELDS = ["name", "director", "employee", "person", "full_name"]
+ROLE_FIELDS = ["position", "role", "title", "job_title", "occupation"]
+
+
+def _legacy_employees(records):
+    """The previous per-record loop, as the reference."""
+    found = []
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            continue
+        name = next((str(record[f]) for f in NAME_FIELDS if record.get(f)), None)
+        role = next((str(record[f]) for f in ROLE_FIELDS if record.get(f)), None)
+        if name and role:
+            found.append({"record_index": i, "name": name, "role": role, "record": record})
+    return found
+
+
+def _random_records(rng: random.Random, n: int) -> list:
+    values = [None, "", "Олена", "Іван Петренко", 0, 7, False, True, "директор", " "]
+    records: list = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            records.append("not a record")
+            continue
+        fields = rng.sample(NAME_FIELDS + ROLE_FIELDS + ["edrpou", "city"], rng.randint(0, 6))
+        records.append({f: rng.choice(values) for f in fields})
+    return records
+
+
+def test_completeness_matches_legacy_loop():
+    validator = DataValidator()
+    rng = random.Random(3)
+    for n in (1, 5, 40, 300):
+        records = _random_records(rng, n)
+        expected = _legacy_employees(records)
+        res = validator.validate_data_completeness(records, context="parity")
+        assert res.success is bool(expected)
+        if expected:
+            assert res.data["valid_employees"] == expected
+            assert res.data["total_records"] == n
+            assert res.metadata["valid_employees_found"] == len(expected)
+        else:
+            assert res.metadata["valid_employees_found"] == 0
+            assert res.warnings[1] == f"Checked {n} records but found no valid employee-role pairs"
+
+    single = validator.validate_data_completeness({"director": "Іван", "role": "CEO"})
+    assert single.data["valid_employees"][0]["name"] == "Іван"
+    assert validator.validate_data_completeness([]).error.startswith("Empty dataset")
+    assert validator.validate_data_completeness("text").error.startswith("Unsupported")
+
+    # a DataFrame is scanned column-wise: same details, string keys, positional indexes
+    frame = pd.DataFrame(
+        {
+            "name": ["A", None, "C", ""],
+            "director": [None, "B", None, "D"],
+            "position": ["", "head", "clerk", None],
+            "title": ["t", None, None, "x"],
+        },
+        index=[10, 11, 12, 13],
+    )
+    res = validator.validate_data_completeness(frame)
+    records = [
+        {k: (None if pd.isna(v) else v) for k, v in r.items()} for r in frame.to_dict("records")
+    ]
+    assert [(e["record_index"], e["name"], e["role"]) for e in res.data["valid_employees"]] == [
+        (e["record_index"], e["name"], e["role"]) for e in _legacy_employees(records)
+    ]
+    assert res.metadata["column_stats"]["name"]["nulls"] == 1
+    assert res.metadata["column_stats"]["name"]["empty"] == 1
+
+
+def test_completeness_short_circuits_on_success():
+    n = 600_000
+    frame = pd.DataFrame({"name": np.where(np.arange(n) % 2, "Ім'я", ""), "role": "бухгалтер"})
+    res = DataValidator().validate_data_completeness(frame, stop_on_success=True, max_details=3)
+    assert res.success
+    assert len(res.data["valid_employees"]) == 3
+    assert res.metadata["short_circuit"] == "passed"
+    assert res.metadata["rows_scanned"] < n
+    assert res.data["total_records"] == n
+
+
+def test_column_checks_and_stats():
+    frame = pd.DataFrame(
+        {
+            "edrpou": ["12345678", "1234567", "12345678", None, "87654321"],
+            "amount": [10.0, -5.0, 3.5, 1e9, np.nan],
+            "region": [1, 2, 3, 99, 2],
+            "opened": ["2024-01-02", "2024-13-01", None, "2023-05-06", "2022-02-02"],
+            "qty": ["1", "2.5", "x", None, "4"],
+        }
+    )
+    checks = [
+        ColumnCheck("edrpou", "completeness", max_failures=1),
+        ColumnCheck("edrpou", "regex", pattern=r"\d{8}", max_failures=1),
+        ColumnCheck("edrpou", "unique", max_failures=1),
+        ColumnCheck("amount", "range", min=0, max=1e6, max_failures=1),
+        ColumnCheck("region", "referential", values=range(1, 28), max_failures=1),
+        ColumnCheck("opened", "type", dtype="datetime", max_failures=1),
+        ColumnCheck("qty", "type", dtype="integer", max_failures=5),
+        ColumnCheck("missing", "completeness", max_failures=5),
+    ]
+    # chunk size 2: uniqueness is tracked across chunk boundaries
+    engine = ColumnarValidator(checks, chunk_rows=2)
+    engine.feed(frame)
+    res = engine.result("test")
+    failures = {name: c["failures"] for name, c in res.data["checks"].items()}
+    assert failures == {
+        "completeness:edrpou": 1,
+        "regex:edrpou": 1,
+        "unique:edrpou": 1,
+        "range:amount": 2,
+        "referential:region": 1,
+        "type:opened": 1,
+        "type:qty": 2,
+        "completeness:missing": 4,
+    }
+    assert res.data["checks"]["unique:edrpou"]["samples"] == [{"row": 2, "value": "12345678"}]
+    assert not res.success and res.error == "Column checks failed: range:amount"
+    stats = res.data["column_stats"]["amount"]
+    assert (stats["rows"], stats["nulls"], stats["min"], stats["max"]) == (4, 0, -5.0, 1e9)
+    # range:amount tipped over in the second chunk; the fifth row was never needed
+    assert (res.metadata["short_circuit"], res.metadata["rows_validated"]) == ("failed", 4)
+
+    # with no tolerance the first failing chunk decides the outcome
+    strict = ColumnarValidator([ColumnCheck("edrpou", "regex", pattern=r"\d{8}")], chunk_rows=2)
+    assert strict.feed(frame) and strict.rows == 2
+
+    passing = [ColumnCheck("region", "range", min=0, max=100)]
+    big = pd.DataFrame({"region": np.arange(1_000) % 27})
+    sampled = DataValidator().validate_columns(big, passing, sample_rows=300)
+    assert sampled.success and sampled.metadata["short_circuit"] == "sampled"
+    assert sampled.metadata["rows_validated"] == 300
@@ -0,0 +1,124 @@
+"""Tests for the queued logging pipeline and the single-pass secret masking"""
+
+import asyncio
+import logging
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.brain.monitoring.logger import UIHandler, _stop_listener, setup_logging
+from src.brain.monitoring.utils.security import (
+    _SCREEN,
+    SENSITIVE_PATTERNS,
+    has_sensitive_candidates,
+    mask_sensitive_data,
+)
+
+CORPUS = [
+    "[ORCHESTRATOR] Step 3 completed in 1.24s (tool=filesystem.read_file)",
+    "password: hunter2 and Bearer abc.def-ghi",
+    "Bearer token=abc",
+    "longprefixpassword: value",
+    "sshpass -p s3cr3t ssh user@host",
+    "mysql --password=topsecret -u root",
+    "gh token ghp_" + "a1B2" * 9 + " and ghu_" + "x" * 30,
+    "key AIzaSy" + "A" * 33 + " end",
+    "contact admin@example.com.ua now",
+    "card 1234 5678 9012 3456, other 1234-5678-9012-3456",
+    "session 0123456789abcdefXYZ done",
+    "[ATLAS] Аналізую запит: відкрити браузер, TOKEN: значення",
+    "Kelvin ſecret=x and İ12345678901234567 ٣٣٣٣٣٣٣٣٣٣٣٣٣٣٣٣",
+    "",
+]
+
+
+def _legacy_mask(text: str) -> str:
+    """The previous mask_sensitive_data: every pattern, in order, on every call."""
+    for pattern, replacement in SENSITIVE_PATTERNS:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+def _fuzz(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    alphabet = "abcXYZ0189@#$%^&+=-_ .:\"'\n/АбвІїſKİı٣"
+    pieces = ["password", "PWD", "token", "Secret", "-p ", "--password ", "ghp_", "AIzaSy"]
+    pieces += ["bearer ", "@", "1234", "5678-", "x.com"]
+    return [
+        "".join(
+            rng.choice(pieces) if rng.random() < 0.15 else rng.choice(alphabet)
+            for _ in range(rng.randint(0, 60))
+        )
+        for _ in range(count)
+    ]
+
+
+def test_masking_matches_sequential_patterns():
+    for text in CORPUS + _fuzz(20_000):
+        assert mask_sensitive_data(text) == _legacy_mask(text), text
+        # the pre-check never skips text that some pattern would match
+        if _SCREEN.search(text):
+            assert has_sensitive_candidates(text), text
+    assert mask_sensitive_data(None) is None  # type: ignore[arg-type]
+    assert not has_sensitive_candidates(CORPUS[0])
+
+
+def test_records_are_masked_once_before_the_handlers(tmp_path, monkeypatch):
+    import src.brain.config as brain_config
+
+    monkeypatch.setattr(brain_config, "LOG_DIR", tmp_path)
+    log = setup_logging("pipeline_test")
+    try:
+        log.info("login with password: %s", "hunter2")
+        log.info("Bearer %s for %s", "abc.def", "admin@example.com")
+        log.info("plain %d", 42)
+        try:
+            raise ValueError("token=leaked")
+        except ValueError:
+            log.exception("failed")
+        logging.getLogger("pipeline_test.child").info("child secret: x1")
+    finally:
+        _stop_listener("pipeline_test")
+        log.handlers.clear()
+
+    text = (tmp_path / "pipeline_test.log").read_text(encoding="utf-8")
+    for secret in ("hunter2", "abc.def", "admin@example.com", "leaked", "x1"):
+        assert secret not in text
+    assert "password=****MASKED****" in text and "plain 42" in text
+    assert "Traceback" in text and "pipeline_test.child" in text
+
+
+def test_ui_handler_publishes_batches(monkeypatch):
+    from src.brain.core.services.state_manager import state_manager
+
+    batches: list[list[dict]] = []
+
+    async def publish_events(channel, messages):
+        batches.append([channel, *messages])
+
+    monkeypatch.setattr(state_manager, "publish_events", publish_events)
+    handler = UIHandler(interval=0.05)
+    handler.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+
+    async def scenario():
+        handler.bind_running_loop()
+        # the listener thread emits; publishing happens on the bound loop
+        records = [
+            logging.LogRecord("brain", logging.INFO, "", 0, f"event {i}", None, None)
+            for i in range(50)
+        ]
+        await asyncio.to_thread(lambda: [handler.handle(r) for r in records])
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+    assert len(batches) == 1
+    channel, *entries = batches[0]
+    assert channel == "logs" and len(entries) == 50
+    assert entries[0]["content"] == "[brain] event 0" and entries[0]["type"] == "info"
+
+    # without a running loop nothing is buffered
+    handler.handle(logging.LogRecord("brain", logging.INFO, "", 0, "late", None, None))
+    assert not handler._pending
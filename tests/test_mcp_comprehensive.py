@@ -499,6 +499,7 @@ ALL_SERVERS_TOOLS: dict[str, dict[str, Any]] = {
             "devtools_check_complexity",
             "devtools_check_types_python",
             "devtools_check_types_ts",
+            "devtools_run_static_analysis",
             "devtools_run_context_check",
             "devtools_analyze_trace",
             "devtools_update_architecture_diagrams",
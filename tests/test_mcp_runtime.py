@@ -151,6 +151,7 @@ SAFE_TEST_ARGS: dict[str, dict[str, dict]] = {
         "devtools_check_complexity": {"path": str(PROJECT_ROOT / "src" / "__init__.py")},
         "devtools_check_types_python": {"path": str(PROJECT_ROOT / "src" / "__init__.py")},
         "devtools_check_types_ts": {},
+        "devtools_run_static_analysis": {"path": "src/__init__.py"},
         "devtools_analyze_trace": {},
         "devtools_run_context_check": {
             "test_file": str(PROJECT_ROOT / "tests" / "logic_tests" / "sample_scenarios.yaml")
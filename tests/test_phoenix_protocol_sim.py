@@ -22,15 +22,45 @@ class MockRedis:
     async def get(self, key):
         return self.data.get(key)
 
-    async def delete(self, key):
-        if key in self.data:
-            del self.data[key]
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
 
     async def keys(self, pattern):
         import fnmatch
 
         return [k for k in self.data if fnmatch.fnmatch(k, pattern)]
 
+    async def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    async def lrange(self, key, start, end):
+        return list(self.data.get(key, []))
+
+    def pipeline(self, transaction=True):
+        return MockPipeline(self)
+
+
+class MockPipeline:
+    """Queues commands and runs them against MockRedis on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [await getattr(self.redis, name)(*args) for name, args in commands]
+
 
 async def test_phoenix_cycle_sim():
     print("--- Testing Phoenix Protocol (Restart & Resume) Simulation ---")
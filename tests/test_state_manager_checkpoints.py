@@ -0,0 +1,192 @@
+"""Tests for delta-based session checkpoints in StateManager (fakeredis)"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.brain.core.services.session_checkpoints import (
+    PayloadCodec,
+    SessionCheckpointer,
+    apply_ops,
+    diff_state,
+    encode_state,
+)
+from src.brain.core.services.state_manager import StateManager
+
+
+@pytest.fixture
+def manager():
+    sm = StateManager(prefix="test")
+    sm.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    sm.checkpointer = SessionCheckpointer(sm.redis_client, sm._key, compact_every=5)
+    sm.available = True
+    return sm
+
+
+def _state(n_logs: int) -> dict:
+    return {
+        "system_state": "EXECUTING",
+        "current_plan": {"goal": "демо", "steps": [{"id": 1}]},
+        "logs": [
+            {"id": f"log-{i}", "message": hashlib.sha256(str(i).encode()).hexdigest() * 3}
+            for i in range(n_logs)
+        ],
+        "step_results": [],
+    }
+
+
+def test_diff_and_apply_roundtrip_with_ring_shift():
+    old = _state(10)
+    new = _state(12)
+    new["logs"] = new["logs"][3:]  # ring buffer evicted three entries
+    new["system_state"] = "VERIFYING"
+    del new["step_results"]
+
+    ops = diff_state(encode_state(old), encode_state(new))
+    kinds = {op["k"]: op["op"] for op in ops}
+    assert kinds == {"logs": "list", "system_state": "set", "step_results": "del"}
+    log_op = next(op for op in ops if op["k"] == "logs")
+    assert log_op["drop"] == 3 and len(log_op["add"]) == 2
+
+    restored = apply_ops(json.loads(json.dumps(old)), ops)
+    assert restored == json.loads(json.dumps(new))
+
+
+def test_codec_compresses_large_payloads():
+    codec = PayloadCodec("zstd", min_size=64)
+    text = json.dumps(_state(50))
+    encoded = codec.encode(text)
+    if codec.enabled:
+        assert encoded.startswith("z:") and len(encoded) < len(text)
+    assert codec.decode(encoded) == text
+    assert codec.decode("{}") == "{}"
+
+
+async def test_save_writes_deltas_and_restore_replays(manager):
+    state = _state(100)
+    first = await manager.checkpointer.save("s1", state)
+    for i in range(3):
+        state["logs"].append({"id": f"new-{i}", "message": "y"})
+        state["system_state"] = f"STEP-{i}"
+        written = await manager.checkpointer.save("s1", state)
+        assert 0 < written < first
+
+    assert await manager.redis_client.llen(manager.checkpointer.deltas_key("s1")) == 3
+    restored = await manager.restore_session("s1")
+    assert restored == json.loads(json.dumps(state, default=str))
+
+    # A fresh process (no cached encoding) restores the same state
+    fresh = SessionCheckpointer(manager.redis_client, manager._key)
+    assert await fresh.restore("s1") == restored
+
+
+async def test_compaction_folds_deltas_into_snapshot(manager):
+    state = _state(20)
+    await manager.save_session("s2", state)
+    for i in range(6):
+        state["logs"].append({"id": f"n{i}"})
+        await manager.save_session("s2", state)
+
+    # compact_every=5 -> the delta log was folded into a snapshot at least once
+    assert manager.checkpointer.stats["snapshots"] >= 2
+    assert await manager.redis_client.llen(manager.checkpointer.deltas_key("s2")) < 5
+    assert (await manager.restore_session("s2"))["logs"][-1] == {"id": "n5"}
+
+
+async def test_unchanged_save_is_skipped(manager):
+    state = _state(5)
+    await manager.save_session("s3", state)
+    assert await manager.checkpointer.save("s3", state) == 0
+    assert manager.checkpointer.stats["skipped"] == 1
+
+
+async def test_persisted_bases_are_bounded_and_released(manager):
+    checkpointer = SessionCheckpointer(manager.redis_client, manager._key, max_sessions=3)
+    states = {f"s{i}": _state(3) for i in range(5)}
+    for session_id, state in states.items():
+        await checkpointer.save(session_id, state)
+    await checkpointer.save("s2", states["s2"])  # touch: s2 becomes most recent
+
+    assert list(checkpointer._persisted) == ["s3", "s4", "s2"]
+    assert set(checkpointer._locks) == {"s3", "s4", "s2"}
+
+    # An evicted session falls back to a snapshot and still restores intact
+    snapshots = checkpointer.stats["snapshots"]
+    states["s0"]["system_state"] = "DONE"
+    await checkpointer.save("s0", states["s0"])
+    assert checkpointer.stats["snapshots"] == snapshots + 1
+    assert "s3" not in checkpointer._persisted
+    assert await checkpointer.restore("s0") == json.loads(json.dumps(states["s0"]))
+
+    manager.checkpointer = checkpointer
+    manager.release_session("s4")
+    assert "s4" not in checkpointer._persisted and "s4" not in checkpointer._locks
+    assert await manager.restore_session("s4") == json.loads(json.dumps(states["s4"]))
+
+
+async def test_session_index_orders_by_activity_and_migrates_legacy_keys(manager):
+    # Legacy full-JSON session written before the index existed
+    await manager.redis_client.set(manager._key("session:legacy"), json.dumps(_state(1)))
+    await manager.redis_client.set(manager._key("session:legacy2:deltas"), "[]")
+
+    sessions = await manager.list_sessions()
+    assert [s["id"] for s in sessions] == ["legacy"]
+    assert (await manager.restore_session("legacy"))["system_state"] == "EXECUTING"
+
+    await manager.save_session("older", _state(1))
+    await manager.save_session("newer", _state(1))
+    ids = [s["id"] for s in await manager.list_sessions()]
+    assert ids[:2] == ["newer", "older"]
+    assert [s["id"] for s in await manager.list_sessions(limit=1)] == ["newer"]
+
+    await manager.delete_session("older")
+    assert "older" not in [s["id"] for s in await manager.list_sessions()]
+    assert await manager.restore_session("older") is None
+
+
+async def test_legacy_sessions_are_indexed_after_an_earlier_save(manager):
+    # After an upgrade the first save creates the index before anything lists it
+    await manager.redis_client.set(manager._key("session:legacy"), json.dumps(_state(1)))
+    await manager.save_session("fresh", _state(1))
+
+    sessions = await manager.list_sessions()
+    assert [s["id"] for s in sessions] == ["fresh", "legacy"]
+    assert sessions[0]["last_activity"] > 0  # the migration did not reset its score
+
+    # the migration runs once: later snapshots are indexed by save() itself
+    await manager.redis_client.set(manager._key("session:stray"), json.dumps(_state(1)))
+    restarted = SessionCheckpointer(manager.redis_client, manager._key)
+    assert [s["id"] for s in await restarted.list()] == ["fresh", "legacy"]
+
+
+async def test_redis_mcp_reads_snapshot_plus_deltas(monkeypatch):
+    redis_server = pytest.importorskip("src.mcp_server.redis_server")
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_server, "_redis_client", client)
+    sm = StateManager(prefix=redis_server.STATE_PREFIX)
+    sm.redis_client = client
+    sm.checkpointer = SessionCheckpointer(client, sm._key, compress_min_bytes=64)
+    sm.available = True
+
+    state = _state(30)
+    await sm.save_session("live", state)
+    state["system_state"] = "VERIFYING"
+    state["logs"].append({"id": "latest", "message": "after snapshot"})
+    await sm.save_session("live", state)
+    assert await client.llen(sm.checkpointer.deltas_key("live")) == 1
+
+    result = await redis_server.redis_session_state(fields=["system_state", "logs"], tail=2)
+    assert result["found"] and result["session_id"] == "live"
+    assert result["state"]["system_state"] == "VERIFYING"
+    assert result["state"]["logs"][-1]["id"] == "latest" and len(result["state"]["logs"]) == 2
+    assert set(result["state"]) == {"system_state", "logs"}
+
+    missing = await redis_server.redis_session_state(session_id="nope")
+    assert missing == {"success": True, "session_id": "nope", "state": None, "found": False}
@@ -0,0 +1,184 @@
+"""Tests for the static-analysis engine (sharding, per-file cache, merged diagnostics)"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.static_analysis import (
+    ANALYZERS,
+    AnalysisEngine,
+    Analyzer,
+    Diagnostic,
+    merge_diagnostics,
+    shard,
+)
+
+# Reports every line containing TODO and logs how many files each run received
+FAKE_TOOL = """
+import sys
+log, *files = sys.argv[1:]
+with open(log, "a") as f:
+    f.write(f"{len(files)}\\n")
+for path in files:
+    for n, line in enumerate(open(path), 1):
+        if "TODO" in line:
+            print(f"{path}:{n}: TODO left in code")
+"""
+
+
+def _parse_todo(stdout, stderr, returncode, root):
+    return [
+        Diagnostic(m[1], int(m[2]), 1, "todo", "warning", m[3], "todo")
+        for m in re.finditer(r"^(.+?):(\d+): (.+)$", stdout, re.MULTILINE)
+    ]
+
+
+def _fake(log: Path, *, per_file: bool = True) -> dict[str, Analyzer]:
+    return {
+        "todo": Analyzer(
+            name="todo",
+            kind="lint",
+            commands=((sys.executable, "-c", FAKE_TOOL),),
+            args=(str(log),),
+            parse=_parse_todo,
+            per_file=per_file,
+            config_files=("todo.toml",),
+            version_args=(),
+        )
+    }
+
+
+def _runs(log: Path) -> list[int]:
+    return [int(n) for n in log.read_text().split()] if log.exists() else []
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    for i in range(60):
+        path = root / "src" / f"pkg{i % 3}" / f"mod{i:02d}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n# TODO: tidy\n" if i % 10 == 0 else "x = 1\n")
+    (root / "src" / "__pycache__").mkdir()
+    (root / "src" / "__pycache__" / "skip.py").write_text("# TODO never analyzed\n")
+    (root / "README.md").write_text("TODO")
+    return root
+
+
+def test_shard():
+    files = [f"f{i}.py" for i in range(100)]
+    assert [len(s) for s in shard(files, 4)] == [25, 25, 25, 25]
+    assert [len(s) for s in shard(files, 3)] == [34, 33, 33]
+    assert shard(files[:30], 8) == [files[:30]]  # too few files to be worth splitting
+    assert [f for part in shard(files, 16) for f in part] == files
+
+
+def test_merge_diagnostics():
+    merged = merge_diagnostics(
+        [
+            Diagnostic("a.py", 3, 1, "S101", "warning", "Use of assert", "ruff"),
+            Diagnostic("a.py", 3, 1, "B101", "error", "assert used", "bandit"),
+            Diagnostic("a.py", 1, 1, "unused-import", "warning", "unused import 'os'", "vulture"),
+            Diagnostic("a.py", 1, 8, "F401", "warning", "`os` imported but unused", "ruff"),
+            Diagnostic("a.py", 1, 8, "F401", "warning", "`os` imported but unused", "ruff"),
+            Diagnostic("b.py", 1, 1, "E501", "warning", "Line too long", "ruff"),
+        ]
+    )
+    assert [(d["path"], d["line"], d["rule"], d["tools"]) for d in merged] == [
+        ("a.py", 1, "F401", ["vulture", "ruff"]),
+        ("a.py", 3, "S101", ["ruff", "bandit"]),
+        ("b.py", 1, "E501", ["ruff"]),
+    ]
+    assert merged[1]["severity"] == "error" and merged[1]["code"] == "B101"
+
+
+def test_engine_caches_per_file_and_shards(project, tmp_path):
+    log = tmp_path / "runs.log"
+    with AnalysisEngine(project, tmp_path / "cache.db", workers=2, analyzers=_fake(log)) as engine:
+        report = asyncio.run(engine.run(["src"]))
+        stats = report["analyzers"]["todo"]
+        assert stats["files"] == 60 and stats["analyzed"] == 60
+        assert stats["cached"] == 0 and stats["shards"] == 2
+        assert sorted(_runs(log)) == [30, 30]
+        assert report["diagnostic_count"] == 6 and not report["success"]
+        assert report["diagnostics"][0] == {
+            "path": "src/pkg0/mod00.py",
+            "line": 2,
+            "column": 1,
+            "code": "todo",
+            "severity": "warning",
+            "message": "TODO left in code",
+            "rule": "todo",
+            "tools": ["todo"],
+        }
+
+        # unchanged: everything from the cache, no subprocess
+        again = asyncio.run(engine.run(["src"]))
+        assert again["analyzers"]["todo"]["cached"] == 60 and len(_runs(log)) == 2
+        assert again["diagnostics"] == report["diagnostics"]
+
+        # one file changed: only that file is analyzed again
+        (project / "src/pkg1/mod01.py").write_text("# TODO new\nx = 2\n")
+        events = []
+
+        async def collect():
+            async for event in engine.stream(["src"]):
+                events.append(event)
+
+        asyncio.run(collect())
+        assert [e["event"] for e in events] == ["cached", "shard", "done"]
+        assert events[0]["files"] == 59 and events[1]["files"] == 1
+        assert events[-1]["report"]["diagnostic_count"] == 7 and _runs(log)[-1] == 1
+
+        # a config change invalidates every file
+        (project / "todo.toml").write_text("strict = true\n")
+        assert asyncio.run(engine.run(["src"]))["analyzers"]["todo"]["analyzed"] == 60
+
+
+def test_whole_program_analyzer_reruns_on_any_change(project, tmp_path):
+    log = tmp_path / "runs.log"
+    analyzers = _fake(log, per_file=False)
+    with AnalysisEngine(project, tmp_path / "cache.db", workers=4, analyzers=analyzers) as engine:
+        asyncio.run(engine.run(["src"]))
+        assert _runs(log) == [60]  # never sharded
+        assert asyncio.run(engine.run(["src"]))["analyzers"]["todo"]["cached"] == 60
+        (project / "src/pkg2/mod02.py").write_text("x = 3\n")
+        asyncio.run(engine.run(["src"]))
+        assert _runs(log) == [60, 60]
+
+
+def test_missing_and_unknown_analyzers(project, tmp_path):
+    missing = {
+        "ghost": Analyzer(
+            name="ghost",
+            kind="lint",
+            commands=(("atlastrinity-no-such-analyzer",),),
+            args=(),
+            parse=_parse_todo,
+        )
+    }
+    with AnalysisEngine(project, tmp_path / "cache.db", analyzers=missing) as engine:
+        report = asyncio.run(engine.run(["src"]))
+        assert report["analyzers"]["ghost"]["error"] == "ghost is not installed"
+        assert not report["success"]
+        with pytest.raises(ValueError, match="Unknown analyzers: nope"):
+            asyncio.run(engine.run(["src"], ["nope"]))
+
+
+@pytest.mark.skipif(ANALYZERS["ruff"].resolve() is None, reason="ruff not installed")
+def test_ruff_through_engine(tmp_path):
+    root = tmp_path / "lintme"
+    root.mkdir()
+    (root / "pyproject.toml").write_text('[tool.ruff.lint]\nselect = ["F401"]\n')
+    (root / "bad.py").write_text("import os\n")
+    (root / "good.py").write_text("print(1)\n")
+    with AnalysisEngine(root, tmp_path / "cache.db", analyzers=ANALYZERS) as engine:
+        report = asyncio.run(engine.run(["."], ["ruff"]))
+    assert [(d["path"], d["line"], d["code"]) for d in report["diagnostics"]] == [
+        ("bad.py", 1, "F401")
+    ]
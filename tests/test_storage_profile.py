@@ -0,0 +1,135 @@
+"""Tests for SQLite storage profiles (PRAGMAs, single writer, maintenance)"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.brain.memory.db.manager import DatabaseManager
+from src.brain.memory.db.storage_profile import LockMetrics, WriterQueue, get_profile
+
+
+async def _manager(tmp_path, profile: str) -> DatabaseManager:
+    manager = DatabaseManager()
+    manager.db_url = f"sqlite+aiosqlite:///{tmp_path}/profile.db"
+    manager.storage_profile = get_profile(profile)
+    await manager.initialize()
+    assert manager.available
+    return manager
+
+
+def test_get_profile_fallback_and_overrides():
+    assert get_profile("nope").name == "balanced"
+    tuned = get_profile("balanced", {"busy_timeout": 100})
+    assert tuned.pragmas["busy_timeout"] == 100
+    assert tuned.pragmas["journal_mode"] == "WAL"
+    assert get_profile("legacy").single_writer is False
+
+
+@pytest.mark.asyncio
+async def test_balanced_profile_applies_pragmas_on_reader_and_writer(tmp_path):
+    manager = await _manager(tmp_path, "balanced")
+    try:
+        async with await manager.get_session() as session:
+            assert (await session.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await session.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert (await session.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+            assert (await session.execute(text("PRAGMA foreign_keys"))).scalar() == 1
+
+        async with manager.write_session() as session:
+            assert (await session.execute(text("PRAGMA temp_store"))).scalar() == 2  # MEMORY
+            await session.execute(text("CREATE TABLE t (v INTEGER)"))
+            await session.commit()
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_serialized_and_measured(tmp_path):
+    manager = await _manager(tmp_path, "balanced")
+    try:
+        seeded = manager.storage_metrics()["lock"]["acquisitions"]  # seed data at startup
+        async with manager.write_session() as session:
+            await session.execute(text("CREATE TABLE t (v INTEGER)"))
+            await session.commit()
+
+        async def writer(n: int) -> None:
+            for i in range(20):
+                async with manager.write_session() as session:
+                    await session.execute(text("INSERT INTO t VALUES (:v)"), {"v": n * 100 + i})
+                    await session.commit()
+
+        await asyncio.gather(*(writer(n) for n in range(8)))
+
+        async with await manager.get_session() as session:
+            assert (await session.execute(text("SELECT COUNT(*) FROM t"))).scalar() == 160
+
+        metrics = manager.storage_metrics()
+        assert metrics["single_writer"] is True
+        assert metrics["lock"]["acquisitions"] == seeded + 161
+        assert metrics["lock"]["busy_errors"] == 0
+        assert metrics["lock"]["max_queue_depth"] > 1
+
+        row = await manager._maintenance.checkpoint()
+        assert row is not None and row[0] == 0  # not blocked
+        await manager._maintenance.optimize()
+        assert manager.storage_metrics()["maintenance"]["checkpoints"] == 1
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_knowledge_graph_writes_go_through_the_writer_queue(tmp_path, monkeypatch):
+    from src.brain.memory.db.schema import KGNode
+    from src.brain.memory.knowledge_graph import KnowledgeGraph
+
+    kg_module = sys.modules[KnowledgeGraph.__module__]  # the package shadows it with an instance
+
+    manager = await _manager(tmp_path, "balanced")
+    monkeypatch.setattr(kg_module, "db_manager", manager)
+    monkeypatch.setattr(kg_module.long_term_memory, "available", False, raising=False)
+    try:
+        graph = KnowledgeGraph()
+        before = manager.storage_metrics()["lock"]["acquisitions"]
+        assert await graph.add_node("ENTITY", "entity:a", sync_to_vector=False)
+        assert await graph.add_edge("entity:trinity", "entity:a", "KNOWS")
+        assert manager.storage_metrics()["lock"]["acquisitions"] == before + 2
+
+        # A conflicting batch falls back to per-node upserts; each must take
+        # its own write slot rather than nesting inside the batch's.
+        batch = [{"node_id": "entity:a"}, {"node_id": "entity:b"}]
+        result = await asyncio.wait_for(graph.batch_add_nodes(batch), timeout=10)
+        assert result == {"success": True, "count": 2}
+        async with await manager.get_session() as session:
+            assert await session.get(KGNode, "entity:b") is not None
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_legacy_profile_has_no_writer_queue(tmp_path):
+    manager = await _manager(tmp_path, "legacy")
+    try:
+        async with manager.write_session() as session:
+            assert (await session.execute(text("PRAGMA journal_mode"))).scalar() == "delete"
+        assert manager.storage_metrics()["single_writer"] is False
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_queue_is_fifo():
+    queue = WriterQueue(LockMetrics())
+    order: list[int] = []
+
+    async def take(n: int) -> None:
+        async with queue:
+            order.append(n)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(take(n) for n in range(10)))
+    assert order == list(range(10))
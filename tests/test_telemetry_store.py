@@ -0,0 +1,132 @@
+"""Tests for the write-behind telemetry store (batching, rollups, drops, retention)"""
+
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.brain.monitoring.telemetry import TelemetryStore
+
+
+def _create_logs(db_path: Path) -> None:
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE logs (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, "
+            "level TEXT, message TEXT)"
+        )
+
+
+def _scalar(db_path: Path, sql: str) -> Any:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(sql).fetchone()[0]
+
+
+def test_rows_are_written_in_batches(tmp_path):
+    db_path = tmp_path / "monitoring.db"
+    _create_logs(db_path)
+    store = TelemetryStore(db_path, flush_interval=10, batch_size=500)
+    try:
+        for i in range(2_000):
+            assert store.put(
+                "logs",
+                {"timestamp": datetime.now().isoformat(), "level": "info", "message": str(i)},
+            )
+        assert store.flush()
+        assert _scalar(db_path, "SELECT COUNT(*) FROM logs") == 2_000
+        assert _scalar(db_path, "SELECT message FROM logs ORDER BY id DESC LIMIT 1") == "1999"
+        stats = store.stats()
+        assert stats["written"] == 2_000 and stats["pending"] == 0 and stats["dropped"] == 0
+        assert stats["batches"] <= 5
+
+        # a bad row fails its batch without stopping the writer
+        store.put("missing_table", {"x": 1})
+        assert store.flush() and store.failed == 1 and store.is_alive()
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        store.close()
+
+
+def test_metric_rollups(tmp_path):
+    store = TelemetryStore(tmp_path / "monitoring.db", flush_interval=10)
+    base = 1_700_000_040.0  # start of a minute
+    try:
+        for i in range(120):  # two samples per second for a minute
+            store.record_metric("latency", i, {"route": "chat"}, timestamp=base + i / 2)
+        store.record_metric("latency", 1000, {"route": "stt"}, timestamp=base)
+        assert store.flush()
+
+        seconds = [r for r in store.read_rollups("latency", "1s") if r["tags"] == {"route": "chat"}]
+        assert len(seconds) == 60
+        assert seconds[0] == {
+            "bucket": int(base),
+            "tags": {"route": "chat"},
+            "count": 2,
+            "total": 1.0,
+            "value_min": 0.0,
+            "value_max": 1.0,
+            "last": 1.0,
+        }
+        minute = store.read_rollups("latency", "1m")
+        assert [(r["tags"]["route"], r["count"], r["total"]) for r in minute] == [
+            ("chat", 120, sum(range(120))),
+            ("stt", 1, 1000.0),
+        ]
+
+        # later samples merge into the stored buckets
+        store.record_metric("latency", -5, {"route": "chat"}, timestamp=base + 30)
+        assert store.flush()
+        chat = store.read_rollups("latency", "1h")[0]
+        assert (chat["count"], chat["value_min"], chat["last"]) == (121, -5.0, -5.0)
+    finally:
+        store.close()
+
+
+def test_queue_bound_drops_and_counts(tmp_path):
+    store = TelemetryStore(
+        tmp_path / "monitoring.db", flush_interval=60, batch_size=10_000, max_pending=100
+    )
+    try:
+        accepted = [store.record_metric("m", i) for i in range(130)]
+        assert accepted.count(False) == 30 and store.dropped == 30
+        assert store.pending == 100 and store.lag >= 0
+        assert store.flush()
+        assert store.stats()["written"] == 100
+    finally:
+        store.close()
+
+
+def test_retention_deletes_incrementally(tmp_path):
+    db_path = tmp_path / "monitoring.db"
+    _create_logs(db_path)
+    old = (datetime.now() - timedelta(days=30)).isoformat()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO logs (timestamp, level, message) VALUES (?, 'info', 'old')",
+            [(old,)] * 250,
+        )
+    store = TelemetryStore(
+        db_path,
+        flush_interval=0.01,
+        retention={"logs": 14 * 86400},
+        rollup_retention={"1s": 3600},
+        retention_interval=0,
+        retention_batch=100,
+    )
+    try:
+        store.put(
+            "logs", {"timestamp": datetime.now().isoformat(), "level": "info", "message": "new"}
+        )
+        store.record_metric("m", 1, timestamp=time.time() - 7200)
+        deadline = time.time() + 5
+        while store.retention_deleted < 251 and time.time() < deadline:
+            time.sleep(0.02)
+        assert store.retention_deleted == 251  # 250 logs in batches of 100 + one 1s bucket
+        assert _scalar(db_path, "SELECT COUNT(*) FROM logs") == 1
+        assert _scalar(db_path, "SELECT COUNT(*) FROM metric_rollups") == 2  # 1m and 1h kept
+    finally:
+        store.close()
@@ -0,0 +1,204 @@
+"""Tests for the streaming trace analyzer (span model, checkpoints, analyses)"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.trace_analyzer import analyze_log_file, ingest_log, trace_report
+from src.mcp_server.trace_store import TraceStore
+
+START = datetime(2026, 10, 1, 9, 0, 0)
+
+
+class _Log:
+    def __init__(self):
+        self.clock = START
+        self.lines: list[str] = []
+
+    def add(self, message: str, ms: int = 100, level: str = "INFO") -> None:
+        self.clock += timedelta(milliseconds=ms)
+        stamp = self.clock.strftime("%Y-%m-%d %H:%M:%S")
+        millis = self.clock.microsecond // 1000
+        self.lines.append(f"{stamp},{millis:03d} - brain - {level} - {message}\n")
+
+    def call(self, tool: str, ms: float, args: str = "a1", status: str = "ok") -> None:
+        self.add(f"[DISPATCHER] Calling {tool}")
+        self.add(f"[DISPATCHER] Finished {tool} status={status} duration_ms={ms} args={args}", 0)
+
+    def text(self) -> str:
+        return "".join(self.lines)
+
+
+def _session() -> _Log:
+    log = _Log()
+    log.add("[SYSTEM] Нова сесія розпочата (session_1)")
+    log.add("[ORCHESTRATOR] Task started: 2 steps: open the report")
+    log.add("[ORCHESTRATOR] Step 1, Attempt 1: read file")
+    log.add("[TETYANA] Thinking...")
+    for _ in range(4):
+        log.call("filesystem.read_file", 50.0, args="same")
+    log.add("[ORCHESTRATOR] Step 1 completed successfully")
+    for attempt in (1, 2, 3):
+        log.add(f"[ORCHESTRATOR] Step 2, Attempt {attempt}: click button")
+        log.add("[DISPATCHER] Calling macos-use.macos-use_click")
+        log.add("Error calling tool macos-use.macos-use_click: element not found", level="ERROR")
+        log.add(
+            "[DISPATCHER] Finished macos-use.macos-use_click status=error duration_ms=300.0 "
+            f"args=c{attempt}",
+            300,
+        )
+        if attempt < 3:
+            log.add("[ORCHESTRATOR] Step 2 failed. Error: element not found.", level="WARNING")
+    log.add("[DISPATCHER] Unknown tool: 'teleport'.", level="WARNING")
+    log.add("[ORCHESTRATOR] Step 2 completed successfully", 2000)
+    log.add("[ORCHESTRATOR] Task finished: ok")
+    return log
+
+
+def test_spans_and_analyses(tmp_path):
+    log_path = tmp_path / "brain.log"
+    log_path.write_text(_session().text(), encoding="utf-8")
+
+    result = analyze_log_file(str(log_path))
+    assert result["success"] and result["parsed_entries"] == 7
+    # the session span is still open (kept in the checkpoint, not stored yet)
+    assert result["spans"] == {
+        "task": {"ok": 1},
+        "step": {"ok": 2, "error": 2},
+        "tool": {"ok": 4, "error": 3},
+    }
+
+    with TraceStore(tmp_path / "brain.trace.db") as store:
+        task_id = store.conn.execute("SELECT id FROM spans WHERE kind = 'task'").fetchone()[0]
+        steps = store.children(task_id)
+        assert [(s.name, s.attrs["attempt"], s.status) for s in steps] == [
+            ("1", 1, "ok"),
+            ("2", 1, "error"),
+            ("2", 2, "error"),
+            ("2", 3, "ok"),
+        ]
+        calls = store.children(steps[1].id)
+        assert calls[0].attrs["error"] == "element not found"
+        assert abs(calls[0].duration - 0.3) < 1e-6
+
+    kinds = {(i["type"], i["severity"]) for i in result["issues"]}
+    assert ("loop", "medium") in kinds  # 4 identical read_file calls
+    assert ("retry_storm", "medium") in kinds  # step 2 needed 3 attempts, then succeeded
+    assert ("error", "high") in kinds  # unknown tool
+    assert ("inefficiency", "low") in kinds  # read_file 4x back to back
+
+    path = result["critical_paths"][0]
+    assert [p["step"] for p in path["path"]] == ["1", "2", "2", "2"]
+    assert path["path"][-1]["slowest_tool"] == "macos-use.macos-use_click"
+    assert result["tools"]["macos-use.macos-use_click"]["error_rate"] == 1.0
+
+
+def test_incremental_ingest_matches_one_pass(tmp_path):
+    text = _session().text() * 3
+    whole = tmp_path / "whole.log"
+    whole.write_text(text, encoding="utf-8")
+    with TraceStore(tmp_path / "whole.db") as store:
+        ingest_log(whole, store)
+        expected = trace_report(store)
+
+    # written in pieces, cut mid-line and mid-span, ingested after each piece
+    grown = tmp_path / "grown.log"
+    raw = text.encode()
+    with TraceStore(tmp_path / "grown.db") as store:
+        for cut in (0, 1000, 1001, 2500, len(raw) // 2, len(raw)):
+            with open(grown, "ab") as f:
+                f.write(raw[grown.stat().st_size if grown.exists() else 0 : cut])
+            stats = ingest_log(grown, store, window=700)
+            assert stats["offset"] == raw.rfind(b"\n", 0, cut) + 1
+        assert trace_report(store) == expected
+        again = ingest_log(grown, store)
+        assert again["bytes_read"] == 0 and again["marker_lines"] == 0
+
+
+def test_rotation_finishes_old_file_first(tmp_path):
+    log_path = tmp_path / "brain.log"
+    first, second = _session().text(), _session().text()
+    log_path.write_text(first[: len(first) // 2], encoding="utf-8")
+    with TraceStore(tmp_path / "trace.db") as store:
+        ingest_log(log_path, store)
+        # the logger appends, rotates (brain.log -> brain.log.1), starts a new file
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(first[len(first) // 2 :])
+        log_path.rename(tmp_path / "brain.log.1")
+        log_path.write_text(second, encoding="utf-8")
+        stats = ingest_log(log_path, store)
+        assert stats["offset"] == len(second.encode())
+        assert trace_report(store)["spans"]["task"] == {"ok": 2}
+
+
+def test_latency_outliers(tmp_path):
+    log = _Log()
+    log.add("[ORCHESTRATOR] Task started: 1 steps: search")
+    log.add("[ORCHESTRATOR] Step 1, Attempt 1: search memory")
+    for i in range(40):
+        log.call("memory.search", 20.0 + i % 5, args=f"q{i}")
+    log.call("memory.search", 2000.0, args="slow")
+    log.add("[ORCHESTRATOR] Step 1 completed successfully")
+    (tmp_path / "brain.log").write_text(log.text(), encoding="utf-8")
+
+    result = analyze_log_file(str(tmp_path / "brain.log"))
+    latency = [i for i in result["issues"] if i["type"] == "latency"]
+    assert len(latency) == 1 and "memory.search" in latency[0]["description"]
+    assert result["tools"]["memory.search"]["max_ms"] == 2000.0
+
+
+def _nested_session() -> _Log:
+    log = _Log()
+    log.add("[SYSTEM] Нова сесія розпочата (session_1)")
+    log.add("[ORCHESTRATOR] Task started: 2 steps: prepare the release")
+    log.add("[ORCHESTRATOR] Step 1, Attempt 1: run the build subtask")
+    # subtask node: the orchestrator runs the nested plan recursively
+    log.add("[ORCHESTRATOR] Task started: 2 steps: run the build", 1000)
+    log.add("[ORCHESTRATOR] Step 1, Attempt 1: compile")
+    log.call("terminal.execute_command", 4000.0)
+    log.add("[ORCHESTRATOR] Step 1 completed successfully", 4000)
+    log.add("[ORCHESTRATOR] Step 2, Attempt 1: package")
+    log.add("[ORCHESTRATOR] Step 2 completed successfully", 3000)
+    log.add("[ORCHESTRATOR] Task finished: ok")
+    log.add("[ORCHESTRATOR] Step 1 completed successfully")
+    log.add("[ORCHESTRATOR] Step 2, Attempt 1: publish")
+    log.call("filesystem.write_file", 100.0)
+    log.add("[ORCHESTRATOR] Step 2 completed successfully", 4400)
+    log.add("[ORCHESTRATOR] Task finished: ok")
+    return log
+
+
+def test_subtasks_nest_under_the_step_that_started_them(tmp_path):
+    log_path = tmp_path / "brain.log"
+    log_path.write_text(_nested_session().text(), encoding="utf-8")
+
+    result = analyze_log_file(str(log_path))
+    assert result["spans"]["task"] == {"ok": 2}
+    assert result["spans"]["step"] == {"ok": 4}
+
+    with TraceStore(tmp_path / "brain.trace.db") as store:
+        parent_id, parent_parent, status, start, end = store.conn.execute(
+            "SELECT id, parent_id, status, start, end FROM spans WHERE name LIKE 'prepare%'"
+        ).fetchone()
+        # the parent task was not cut short by its subtask: it ran 13.3s and succeeded
+        assert status == "ok" and abs(end - start - 13.3) < 1e-6
+        assert parent_parent is not None  # the (still open) session
+        steps = store.children(parent_id)
+        assert [(s.name, s.status) for s in steps] == [("1", "ok"), ("2", "ok")]
+        assert store.children(steps[1].id)[0].name == "filesystem.write_file"
+
+        (subtask,) = store.children(steps[0].id)
+        assert subtask.kind == "task" and subtask.status == "ok"
+        assert abs(subtask.duration - 7.4) < 1e-6
+        sub_steps = store.children(subtask.id)
+        assert [s.name for s in sub_steps] == ["1", "2"]
+        assert store.children(sub_steps[0].id)[0].name == "terminal.execute_command"
+        expected = trace_report(store)
+    assert len(result["critical_paths"]) == 2
+
+    # the open frames round-trip through the checkpoint between windows
+    with TraceStore(tmp_path / "windowed.db") as store:
+        ingest_log(log_path, store, window=200)
+        assert trace_report(store) == expected
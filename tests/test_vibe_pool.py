@@ -0,0 +1,223 @@
+"""Tests for the Vibe worker pool (concurrency, workspace locks, FIFO queue, temp homes)
+
+Runs go through a fake `vibe` executable that logs its start/end time, sleeps and
+writes output, the way run_vibe_subprocess drives the real CLI.
+"""
+
+import asyncio
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.vibe_pool import (
+    TempHomePool,
+    VibePool,
+    VibeQueueTimeoutError,
+    is_read_only_invocation,
+)
+
+FAKE_VIBE = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+name = args[args.index("-p") + 1]
+with open(os.environ["FAKE_VIBE_LOG"], "a") as log:
+    log.write(f"start {{name}} {{time.monotonic()}}\\n")
+for i in range(3):
+    print(f"Thinking about {{name}} ({{i}})", flush=True)
+    time.sleep({sleep} / 3)
+with open(os.path.join(os.getcwd(), "out.txt"), "a") as out:
+    out.write(name + "\\n")
+with open(os.environ["FAKE_VIBE_LOG"], "a") as log:
+    log.write(f"end {{name}} {{time.monotonic()}}\\n")
+"""
+
+
+@pytest.fixture
+def fake_vibe(tmp_path, monkeypatch):
+    script = tmp_path / "vibe"
+    script.write_text(FAKE_VIBE.format(python=sys.executable, sleep=0.4), encoding="utf-8")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "runs.log"
+    monkeypatch.setenv("FAKE_VIBE_LOG", str(log))
+    return script, log
+
+
+async def _run(pool, vibe, name, cwd, mode="auto-approve", **slot):
+    argv = [str(vibe), "-p", name, "--agent", mode]
+    async with pool.slot(str(cwd), write=not is_read_only_invocation(argv), **slot):
+        process = await asyncio.create_subprocess_exec(
+            *argv, cwd=cwd, env=os.environ.copy(), stdout=asyncio.subprocess.PIPE
+        )
+        stdout, _ = await process.communicate()
+    assert process.returncode == 0 and f"Thinking about {name} (2)" in stdout.decode()
+    return name
+
+
+def _intervals(log: Path) -> dict[str, list[float]]:
+    spans: dict[str, list[float]] = {}
+    for line in log.read_text().splitlines():
+        _, name, stamp = line.split()
+        spans.setdefault(name, []).append(float(stamp))
+    return spans
+
+
+def _peak(spans: dict[str, list[float]], names) -> int:
+    events = sorted((t, d) for n in names for t, d in zip(spans[n], (1, -1), strict=True))
+    peak = running = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def _overlap(spans, a, b) -> bool:
+    return spans[a][0] < spans[b][1] and spans[b][0] < spans[a][1]
+
+
+def test_read_only_detection():
+    assert is_read_only_invocation(["vibe", "-p", "x", "--agent", "plan"])
+    assert is_read_only_invocation(["vibe", "vibe-status"])
+    assert not is_read_only_invocation(["vibe", "-p", "x", "--agent", "auto-approve"])
+    assert not is_read_only_invocation(["vibe", "-p", "x"])  # builtin default may edit
+    assert not is_read_only_invocation(["vibe", "install", "pkg"])
+
+
+def test_readers_share_workspace_up_to_worker_limit(tmp_path, fake_vibe):
+    vibe, log = fake_vibe
+    pool = VibePool(max_workers=2)
+
+    async def main():
+        names = [f"review{i}" for i in range(4)]
+        return await asyncio.gather(*(_run(pool, vibe, n, tmp_path, "plan") for n in names))
+
+    t0 = time.monotonic()
+    names = asyncio.run(main())
+    elapsed = time.monotonic() - t0
+    spans = _intervals(log)
+    assert _peak(spans, names) == 2
+    assert elapsed < 4 * 0.4  # two at a time, not one after another
+    assert pool.status() == {
+        "max_workers": 2,
+        "running": [],
+        "queued": [],
+        "completed": 4,
+        "timed_out": 0,
+    }
+
+
+def test_writers_serialize_per_workspace(tmp_path, fake_vibe):
+    vibe, log = fake_vibe
+    repo, other = tmp_path / "repo", tmp_path / "other"
+    (repo / "pkg").mkdir(parents=True)
+    other.mkdir()
+    pool = VibePool(max_workers=4)
+
+    async def main():
+        await asyncio.gather(
+            _run(pool, vibe, "edit1", repo),
+            _run(pool, vibe, "edit2", repo / "pkg"),  # nested tree: same lock
+            _run(pool, vibe, "plan1", repo, "plan"),
+            _run(pool, vibe, "edit3", other),
+        )
+
+    asyncio.run(main())
+    spans = _intervals(log)
+    assert not _overlap(spans, "edit1", "edit2")
+    assert not _overlap(spans, "edit1", "plan1") and not _overlap(spans, "edit2", "plan1")
+    assert _overlap(spans, "edit1", "edit3")  # different workspace runs in parallel
+    # FIFO within the workspace: submission order is kept
+    assert spans["edit1"][1] <= spans["edit2"][0] <= spans["edit2"][1] <= spans["plan1"][0]
+    assert (repo / "out.txt").read_text() == "edit1\nplan1\n"
+    assert (repo / "pkg" / "out.txt").read_text() == "edit2\n"
+
+
+def test_fifo_positions_and_timeout(tmp_path, fake_vibe):
+    vibe, log = fake_vibe
+    pool = VibePool(max_workers=1)
+    positions: dict[str, list[int]] = {}
+
+    def reporter(name):
+        async def on_wait(position, job):
+            positions.setdefault(name, []).append(position)
+
+        return on_wait
+
+    async def main():
+        first = asyncio.create_task(_run(pool, vibe, "a", tmp_path))
+        await asyncio.sleep(0)
+        rest = [
+            asyncio.create_task(_run(pool, vibe, name, tmp_path, on_wait=reporter(name)))
+            for name in ("b", "c")
+        ]
+        await asyncio.sleep(0)
+        late = _run(pool, vibe, "late", tmp_path, timeout=0.2, on_wait=reporter("late"))
+        with pytest.raises(VibeQueueTimeoutError):
+            await late
+        assert [job["position"] for job in pool.status()["queued"]] == [1, 2]
+        return await asyncio.gather(first, *rest)
+
+    assert asyncio.run(main()) == ["a", "b", "c"]
+    spans = _intervals(log)
+    assert spans["a"][1] <= spans["b"][0] and spans["b"][1] <= spans["c"][0]
+    assert "late" not in spans
+    assert positions == {"b": [1], "c": [2, 1], "late": [3]}
+    assert pool.timed_out == 1 and pool.waiting == 0 and pool.running == 0
+
+
+def test_cancelled_waiter_leaves_queue(tmp_path, fake_vibe):
+    vibe, _ = fake_vibe
+    pool = VibePool(max_workers=1)
+
+    async def main():
+        first = asyncio.create_task(_run(pool, vibe, "a", tmp_path))
+        waiter = asyncio.create_task(_run(pool, vibe, "b", tmp_path))
+        await asyncio.sleep(0.05)
+        assert pool.waiting == 1
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert pool.waiting == 0
+        await first
+        assert pool.running == 0
+
+    asyncio.run(main())
+
+
+def test_temp_home_pool_reuses_homes(tmp_path):
+    builds = []
+
+    def build(key):
+        def make():
+            path = tmp_path / f"vibe_home_{len(builds)}"
+            path.mkdir()
+            (path / "config.toml").write_text(key)
+            builds.append(path)
+            return str(path)
+
+        return make
+
+    homes = TempHomePool(max_idle=1)
+    first = homes.checkout("model-a", build("model-a"))
+    second = homes.checkout("model-a", build("model-a"))  # concurrent run: its own home
+    assert first != second and len(builds) == 2
+    assert homes.checkin(first) and homes.checkin(second)
+    assert not Path(first).exists()  # over max_idle, the oldest is dropped
+    assert homes.checkin(second)  # releasing twice is harmless
+    assert homes.checkout("model-a", build("model-a")) == second
+    assert homes.checkout("model-b", build("model-b")) != second and len(builds) == 3
+    assert not homes.checkin(str(tmp_path / "unknown"))
+
+    homes.checkin(second)
+    homes.max_age_s = 0
+    time.sleep(0.01)
+    rebuilt = homes.checkout("model-a", build("model-a"))
+    assert rebuilt != second and not Path(second).exists()
+    homes.checkin(rebuilt)
+    homes.clear()
+    assert not Path(rebuilt).exists()
+    assert homes.built == 4 and homes.reused == 1
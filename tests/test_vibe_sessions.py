@@ -0,0 +1,126 @@
+"""Tests for the Vibe session catalog (incremental index, paging, filters, lazy bodies)"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server import vibe_sessions
+from src.mcp_server.vibe_sessions import SessionCatalog, parse_session_file
+
+
+def _write_session(directory: Path, sid: str, prompt: str, *, ended=True, mtime=None, steps=3):
+    path = directory / f"session_{sid}.json"
+    data = {
+        "metadata": {
+            "session_id": sid,
+            "start_time": f"2026-01-{int(sid[-2:]) % 28 + 1:02d}T10:00:00",
+            "end_time": "2026-01-01T11:00:00" if ended else None,
+            "stats": {
+                "steps": steps,
+                "session_prompt_tokens": 100,
+                "session_completion_tokens": 20,
+            },
+        },
+        "messages": [
+            {"role": "system", "content": "You are Vibe"},
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": "ok"},
+        ],
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    sessions = tmp_path / "session"
+    sessions.mkdir()
+    base = time.time() - 3 * 86400  # old enough to be outside the hot set
+    for i in range(30):
+        _write_session(sessions, f"s{i:04d}", f"fix bug number {i}", mtime=base + i)
+    cat = SessionCatalog(sessions, tmp_path / "index.db", poll_interval=0)
+    yield cat
+    cat.close()
+
+
+def test_parse_session_file(tmp_path):
+    path = _write_session(tmp_path, "abc01", "  Refactor\n the   parser " + "x" * 300, ended=False)
+    fields = parse_session_file(path)
+    assert fields["session_id"] == "abc01" and fields["status"] == "active"
+    assert fields["steps"] == 3 and fields["prompt_tokens"] == 100
+    assert fields["summary"].startswith("Refactor the parser xxx")
+    assert len(fields["summary"]) == vibe_sessions.SUMMARY_CHARS
+
+    broken = tmp_path / "session_half.json"
+    broken.write_text('{"metadata": {"session_id": "ha', encoding="utf-8")
+    assert parse_session_file(broken) == {"session_id": "half", "status": "unreadable"}
+
+
+def test_paging_and_filters(catalog):
+    assert catalog.refresh() == {"added": 30, "updated": 0, "removed": 0}
+    rows, total = catalog.list(limit=10)
+    assert total == 30 and [r["session_id"] for r in rows[:2]] == ["s0029", "s0028"]
+    page, _ = catalog.list(limit=10, offset=25)
+    assert [r["session_id"] for r in page] == ["s0004", "s0003", "s0002", "s0001", "s0000"]
+
+    rows, total = catalog.list(query="NUMBER 1")  # case-insensitive prompt match
+    assert total == 11 and all("number 1" in r["summary"] for r in rows)
+    assert catalog.list(query="100%")[1] == 0  # wildcards are literal
+    assert catalog.list(status="active")[1] == 0
+    assert catalog.list(since="2026-01-27")[1] == 2
+
+
+def test_incremental_refresh_parses_only_changes(catalog):
+    catalog.refresh()
+    assert catalog.parsed == 30
+    assert catalog.refresh() == {"added": 0, "updated": 0, "removed": 0}
+    assert catalog.parsed == 30  # nothing re-parsed
+
+    sessions = catalog.session_dir
+    _write_session(sessions, "s9999", "brand new session", ended=False)
+    (sessions / "session_s0005.json").unlink()
+    (sessions / "notes.txt").write_text("not a session")
+    assert catalog.refresh() == {"added": 1, "updated": 0, "removed": 1}
+    assert catalog.parsed == 31
+
+    # An active session is rewritten in place: the directory mtime does not
+    # change, the hot-set check picks it up
+    catalog._set_state(dir_mtime_ns=sessions.stat().st_mtime_ns)
+    _write_session(sessions, "s9999", "brand new session", steps=7)
+    assert catalog.refresh() == {"added": 0, "updated": 1, "removed": 0}
+    (row,), _ = catalog.list(limit=1)
+    assert row["session_id"] == "s9999" and row["steps"] == 7 and row["status"] == "ended"
+
+
+def test_poll_interval_throttles_refresh(tmp_path):
+    sessions = tmp_path / "session"
+    sessions.mkdir()
+    with SessionCatalog(sessions, tmp_path / "index.db", poll_interval=3600) as cat:
+        cat.refresh()
+        _write_session(sessions, "s0001", "hello")
+        assert cat.refresh()["added"] == 0  # polled too recently
+        assert cat.refresh(force=True)["added"] == 1
+
+
+def test_resolve_and_lazy_load(catalog, tmp_path):
+    catalog.refresh()
+    assert catalog.resolve("session_s0007.json").name == "session_s0007.json"
+    assert catalog.resolve("s0007").name == "session_s0007.json"
+    assert catalog.resolve("s001").name == "session_s0019.json"  # newest partial match
+    assert catalog.resolve("missing") is None
+    body = catalog.load("s0007")
+    assert body["messages"][1]["content"] == "fix bug number 7"
+
+    # The index survives a restart and is reused without parsing
+    catalog.close()
+    with SessionCatalog(catalog.session_dir, catalog.db_path, poll_interval=0) as reopened:
+        assert reopened.refresh(force=True) == {"added": 0, "updated": 0, "removed": 0}
+        assert reopened.parsed == 0 and reopened.list()[1] == 30
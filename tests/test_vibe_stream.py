@@ -0,0 +1,167 @@
+"""Tests for the Vibe output stream reader (framing, decoding, buffering, progress)"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.vibe_stream import (
+    OutputBuffer,
+    ProgressEmitter,
+    VibeStreamReader,
+    format_vibe_line,
+    read_vibe_stream,
+)
+
+
+class _Sink:
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    async def __call__(self, level: str, message: str) -> None:
+        self.calls.append((level, message))
+
+
+def _feed_bytewise(reader: VibeStreamReader, data: bytes) -> None:
+    for i in range(len(data)):
+        reader.feed(data[i : i + 1])
+    reader.feed(b"", final=True)
+
+
+def test_framing_decoding_and_ansi():
+    raw = (
+        "Привіт, світ ✓\r\n"  # CRLF, multi-byte characters
+        "\x1b[32mgreen\x1b[0m text\x07\n"
+        "Thinking 1\rThinking 2\r\x1b[2KThinking 3\n"  # status redrawn in place
+        "tail without newline"
+    ).encode()
+    buffer = OutputBuffer(10_000)
+    _feed_bytewise(VibeStreamReader("OUT", buffer), raw)
+    assert buffer.text() == ("Привіт, світ ✓\ngreen text\nThinking 3\ntail without newline\n")
+
+
+def _feed_chunked(reader: VibeStreamReader, data: bytes, size: int = 4096) -> None:
+    for i in range(0, len(data), size):
+        reader.feed(data[i : i + size])
+    reader.feed(b"", final=True)
+
+
+def test_long_single_line_output_stays_intact():
+    # a one-line --output json answer, well past the framing limit, read 4 KB at a time
+    answer = json.dumps({"role": "assistant", "content": "Готово ✓ " * 20_000}, ensure_ascii=False)
+    only = OutputBuffer(500_000)
+    _feed_chunked(VibeStreamReader("OUT", only), answer.encode())
+    assert only.text() == answer + "\n"
+    assert json.loads(only.text()) == json.loads(answer)
+
+    sink = _Sink()
+    progress = ProgressEmitter(sink, interval=0, max_lines=10)
+    mixed = OutputBuffer(500_000)
+    _feed_chunked(VibeStreamReader("OUT", mixed, progress), f"Thinking\n{answer}\nDone\n".encode())
+    asyncio.run(progress.flush())
+    assert mixed.text() == f"Thinking\n{answer}\nDone\n"
+    # pieces of the long line are never shown as progress lines
+    assert sink.calls == [("info", "🧠 [VIBE-THOUGHT] Thinking\n⚡ [VIBE-LIVE] Done")]
+
+
+def test_status_redraws_are_reported_once_per_change():
+    sink = _Sink()
+    progress = ProgressEmitter(sink, interval=0, max_lines=10)
+    buffer = OutputBuffer(10_000)
+    reader = VibeStreamReader("OUT", buffer, progress)
+    for frame in ("Working 1", "Working 1", "Working 2", "Working 3"):
+        reader.feed(f"{frame}\r".encode())
+    reader.feed(b"Done\n", final=True)
+    asyncio.run(progress.flush())
+    # the last redraw before the newline becomes the line; earlier ones are progress only
+    assert buffer.text() == "Done\n"
+    lines = sink.calls[0][1].split("\n")
+    assert lines == [f"⚡ [VIBE-LIVE] {t}" for t in ("Working 1", "Working 2", "Working 3", "Done")]
+
+
+def test_output_buffer_keeps_head_and_tail():
+    buffer = OutputBuffer(100, head_chars=20)
+    for i in range(1000):
+        buffer.append(f"line {i:04d}\n")
+    text = buffer.text()
+    assert text.startswith("line 0000\nline 0001\n")
+    assert text.endswith("line 0998\nline 0999\n")
+    assert buffer.dropped == 10_000 - 100
+    assert "[TRUNCATED: 9900 chars omitted from the middle]" in text
+
+    small = OutputBuffer(100)
+    small.append("abc")
+    small.append("def")
+    assert small.text() == "abcdef" and small.dropped == 0
+
+
+def test_progress_batches_and_rate_limits():
+    sink = _Sink()
+    progress = ProgressEmitter(sink, interval=3600, max_lines=3)
+    thought = json.dumps({"role": "assistant", "content": "plan the fix"})
+    progress.add("OUT", f"noise 1\nnoise 2\n╭──────╮\n{thought}\nRunning tests")
+    progress.add("ERR", "oops password=hunter2")
+
+    async def run():
+        await progress.maybe_flush()  # first flush goes out immediately
+        progress.add("OUT", "later")
+        await progress.maybe_flush()  # within the interval: held back
+
+    asyncio.run(run())
+    assert sink.calls == [
+        (
+            "info",
+            "… (+3 more output lines)\n🧠 [VIBE-THOUGHT] plan the fix\n🔧 [VIBE-ACTION] Running tests",
+        ),
+        ("warning", "⚡ [VIBE-LIVE] oops password=****MASKED****"),
+    ]
+    asyncio.run(progress.flush())
+    assert sink.calls[-1] == ("info", "⚡ [VIBE-LIVE] later")
+
+
+def test_format_vibe_line():
+    assert format_vibe_line('{"role": "tool", "content": "ls"}', "OUT") == (
+        "info",
+        "🔧 [VIBE-ACTION] ls",
+    )
+    assert format_vibe_line('{"not": "a log"}', "OUT") == (
+        "info",
+        '⚡ [VIBE-LIVE] {"not": "a log"}',
+    )
+    assert format_vibe_line("Welcome to Vibe", "OUT") is None
+    assert format_vibe_line("x" * 1000, "OUT") is None
+    assert format_vibe_line("boom", "ERR") == ("warning", "⚡ [VIBE-LIVE] boom")
+
+
+def test_read_vibe_stream_from_subprocess():
+    script = (
+        "import sys, time\n"
+        "out = sys.stdout.buffer\n"
+        "for i in range(2000):\n"
+        "    out.write(f'\\x1b[1mрядок {i}\\x1b[0m\\n'.encode())\n"
+        "    if i % 500 == 0:\n"
+        "        out.flush(); time.sleep(0.01)\n"
+        "out.write('Thinking…\\rThinking… done\\n'.encode())\n"
+    )
+
+    async def run():
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", script, stdout=asyncio.subprocess.PIPE
+        )
+        sink = _Sink()
+        progress = ProgressEmitter(sink, interval=0.05, max_lines=5)
+        buffer = OutputBuffer(200, head_chars=50)
+        await read_vibe_stream(process.stdout, VibeStreamReader("OUT", buffer, progress), 10)
+        await progress.flush()
+        await process.wait()
+        return buffer, sink
+
+    buffer, sink = asyncio.run(run())
+    text = buffer.text()
+    assert text.startswith("рядок 0\nрядок 1\n")
+    assert text.endswith("рядок 1999\nThinking… done\n")
+    assert "\x1b" not in text and "�" not in text
+    assert sink.calls[-1][1].endswith("🧠 [VIBE-THOUGHT] Thinking… done")
+    assert all(len(message.split("\n")) <= 6 for _, message in sink.calls)
@@ -0,0 +1,159 @@
+"""Tests for the workspace index behind the project analyzer (incremental refresh, facts, queries)"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mcp_server.diagram_generator import generate_architecture_diagram
+from src.mcp_server.project_analyzer import analyze_project_structure, detect_changed_components
+from src.mcp_server.workspace_index import WorkspaceIndex, extract_facts
+
+
+def _write(root: Path, rel: str, text: str = "") -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "shop"
+    _write(root, "pyproject.toml", "[project]\nname = 'shop'\n")
+    _write(root, ".gitignore", "# build output\n*.log\n/generated/\ndocs/_build\n")
+    _write(root, "main.py", "from src.cart import Cart\n")
+    _write(root, "src/__init__.py")
+    _write(
+        root, "src/cart.py", "from .pricing import total\nimport json\n\nclass Cart:\n    pass\n"
+    )
+    _write(root, "src/pricing.py", "from src.utils import money\n\ndef total():\n    return 0\n")
+    _write(root, "src/utils/__init__.py", "from . import money\n")
+    _write(root, "src/utils/money.py", "def fmt(x):\n    return str(x)\n")
+    _write(root, "src/node_modules/pkg/index.py", "raise SystemExit")  # never walked
+    _write(root, "generated/big.py", "x = 1\n")  # ignored by /generated/
+    _write(root, "debug.log", "noise")
+    _write(root, "docs/_build/page.html")
+    _write(root, "docs/index.md", "# Shop")
+    return root
+
+
+def test_extract_facts():
+    imports, symbols = extract_facts(
+        "import os, sys\nfrom .a import b, c as d\nfrom ..pkg import (\n    x,\n)\n"
+        "class Foo:\n    def method(self): ...\nasync def run():\n    import inner\n",
+        "python",
+    )
+    assert imports == ["os", "sys", ".a:b,c", "..pkg:", "inner"]
+    assert symbols == ["Foo", "run"]
+
+    imports, symbols = extract_facts(
+        "import React from 'react';\nimport { a } from \"./util\";\n"
+        "const x = require('../lib/x');\nexport * from './types';\n"
+        "export default function App() {}\nexport const API = 1;\n",
+        "typescript",
+    )
+    assert imports == ["react", "./util", "../lib/x", "./types"]
+    assert symbols == ["App", "API"]
+
+
+def test_refresh_is_incremental_and_respects_ignores(project, tmp_path):
+    with WorkspaceIndex(project, tmp_path / "index.db") as index:
+        first = index.refresh()
+        assert first["added"] == 9 and first["files"] == 9
+        assert index.files("src", suffix=".py") == [
+            "src/__init__.py",
+            "src/cart.py",
+            "src/pricing.py",
+            "src/utils/__init__.py",
+            "src/utils/money.py",
+        ]
+        assert not index.exists("debug.log") and not index.exists("generated/big.py")
+        assert not index.exists("docs/_build/page.html") and index.exists("docs/index.md")
+        assert index.subdirs("src") == ["utils"]
+
+        assert index.refresh() | {"elapsed_s": 0} == {
+            "files": 9,
+            "added": 0,
+            "updated": 0,
+            "touched": 0,
+            "removed": 0,
+            "elapsed_s": 0,
+        }
+
+        os.utime(project / "src/cart.py", ns=(1, 1))  # same content, new mtime
+        _write(project, "src/pricing.py", "def total():\n    return 1\n")
+        _write(project, "src/tax.py", "from src.pricing import total\n")
+        (project / "docs/index.md").unlink()
+        result = index.refresh()
+        assert (result["added"], result["updated"], result["touched"], result["removed"]) == (
+            1,
+            1,
+            1,
+            1,
+        )
+
+        # targeted refresh of known paths only
+        _write(
+            project, "src/utils/money.py", "def fmt(x):\n    return f'{x}$'\n\ndef parse(s): ...\n"
+        )
+        result = index.refresh(paths=["src/utils/money.py", "src/node_modules/pkg/index.py"])
+        assert result["updated"] == 1 and result["added"] == 0
+
+
+def test_analysis_components_and_dependencies(project, tmp_path):
+    with WorkspaceIndex(project, tmp_path / "index.db") as index:
+        analysis = analyze_project_structure(project, index)
+        assert analysis["project_type"] == "python"
+        assert analysis["entry_points"] == ["main.py"]
+        assert analysis["components"] == ["Cart", "Pricing", "Money"]
+        assert sorted(analysis["directories"]["src"]) == [
+            project / "src/__init__.py",
+            project / "src/cart.py",
+            project / "src/pricing.py",
+        ]
+        # relative, absolute and package imports resolved to files
+        assert analysis["component_dependencies"] == {"Cart": ["Pricing"], "Pricing": ["Money"]}
+        assert index.dependents(["src/utils/money.py"]) == ["Pricing"]
+
+        affected = detect_changed_components(
+            analysis, "", ["src/utils/money.py", "main.py", "src/removed_module.py"], index=index
+        )
+        assert sorted(affected) == ["Main Entry Point", "Money", "Src Module"]
+
+        diagram = generate_architecture_diagram(project, analysis)
+        assert "- **Cart** → Pricing" in diagram and "- **Pricing** → Money" in diagram
+
+        # a new module shows up on the next analysis without re-reading the rest
+        _write(project, "src/shipping.py", "from .cart import Cart\n")
+        analysis = analyze_project_structure(project, index)
+        assert analysis["components"] == ["Cart", "Pricing", "Shipping", "Money"]
+        assert analysis["component_dependencies"]["Shipping"] == ["Cart"]
+
+
+def test_generic_and_node_projects(tmp_path):
+    web = tmp_path / "web"
+    _write(web, "package.json", '{"main": "server.js", "dependencies": {"express": "4"}}')
+    _write(web, "src/app.ts", "import { route } from './api-routes/index';\n")
+    _write(web, "src/api-routes/index.ts", "export function route() {}\n")
+    _write(web, "src/ui/button.tsx", "import { route } from '../api-routes';\n")
+    _write(web, "node_modules/express/index.js")
+    with WorkspaceIndex(web, tmp_path / "web.db") as index:
+        analysis = analyze_project_structure(web, index)
+    assert analysis["project_type"] == "nodejs"
+    assert analysis["directories"]["src"] == ["app.ts"]
+    assert analysis["components"] == ["Api Routes", "Ui"]
+    assert analysis["component_dependencies"] == {"Ui": ["Api Routes"]}
+
+    misc = tmp_path / "misc"
+    _write(misc, "README.md")
+    _write(misc, "scripts/run.sh")
+    _write(misc, ".cache/x")
+    (misc / "empty").mkdir()
+    with WorkspaceIndex(misc, tmp_path / "misc.db") as index:
+        analysis = analyze_project_structure(misc, index)
+    assert analysis["key_files"] == ["README.md"]
+    assert analysis["components"] == ["Empty", "Scripts"]